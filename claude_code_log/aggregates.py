@@ -0,0 +1,311 @@
+#!/usr/bin/env python3
+"""Session and project statistics accumulated one transcript entry at a time.
+
+The cache index, the session navigation of rendered pages and the projects
+index page all show the same per-session statistics: the summary linked
+through leafUuid, a preview of the first user message, token usage counted
+once per requestId and the range of timestamps. SessionAggregator computes
+them in a single pass with add(), and partial aggregates of consecutive
+parts of a stream combine with merge(). It is a Pydantic model, so that
+partial aggregates can be stored in the cache.
+"""
+
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from pydantic import BaseModel
+
+from .models import (
+    AssistantTranscriptEntry,
+    SummaryTranscriptEntry,
+    TranscriptEntry,
+    UserTranscriptEntry,
+)
+from .parser import extract_text_content
+
+# Session id, epoch milliseconds and input, output, cache creation and cache
+# read tokens of a request, counted for the first entry carrying its requestId
+RequestUsage = Tuple[str, Optional[int], int, int, int, int]
+
+
+def _is_before(ms: Optional[int], other_ms: Optional[int]) -> bool:
+    """Whether a timestamp is strictly earlier, missing ones being earliest."""
+    return (-1 if ms is None else ms) < (-1 if other_ms is None else other_ms)
+
+
+class SessionCacheData(BaseModel):
+    """Cached session-level information."""
+
+    session_id: str
+    summary: Optional[str] = None
+    first_timestamp: str
+    last_timestamp: str
+    message_count: int
+    first_user_message: str
+    cwd: Optional[str] = None  # Working directory from session messages
+    total_input_tokens: int = 0
+    total_output_tokens: int = 0
+    total_cache_creation_tokens: int = 0
+    total_cache_read_tokens: int = 0
+    # Epoch milliseconds of first_timestamp and last_timestamp
+    first_timestamp_ms: Optional[int] = None
+    last_timestamp_ms: Optional[int] = None
+    # Epoch milliseconds of the message first_user_message previews
+    first_user_message_ms: Optional[int] = None
+
+
+class SessionAggregator(BaseModel):
+    """Per-session and project totals of the entries added so far."""
+
+    sessions: Dict[str, SessionCacheData] = {}
+    # Message UUID to session, from assistant entries and from the others
+    uuid_to_session: Dict[str, str] = {}
+    uuid_to_session_backup: Dict[str, str] = {}
+    # (leafUuid, summary) of summary entries, resolved once all are known
+    summaries: List[Tuple[str, str]] = []
+    requests: Dict[str, RequestUsage] = {}
+
+    total_message_count: int = 0
+    total_input_tokens: int = 0
+    total_output_tokens: int = 0
+    total_cache_creation_tokens: int = 0
+    total_cache_read_tokens: int = 0
+    earliest_timestamp: str = ""
+    latest_timestamp: str = ""
+    earliest_ms: Optional[int] = None
+    latest_ms: Optional[int] = None
+
+    @classmethod
+    def from_entries(cls, entries: Iterable[TranscriptEntry]) -> "SessionAggregator":
+        """Aggregate all the given entries."""
+        aggregator = cls()
+        for entry in entries:
+            aggregator.add(entry)
+        return aggregator
+
+    @classmethod
+    def from_file_entries(
+        cls, entries: Iterable[TranscriptEntry]
+    ) -> "SessionAggregator":
+        """Aggregate a file's entries in the order iter_project streams them.
+
+        That is by timestamp, keeping the file order of ties and putting
+        entries without a timestamp (summaries) first.
+        """
+        return cls.from_entries(
+            sorted(
+                entries,
+                key=lambda entry: (
+                    -1
+                    if getattr(entry, "timestamp_ms", None) is None
+                    else getattr(entry, "timestamp_ms")
+                ),
+            )
+        )
+
+    def add_links(self, entry: TranscriptEntry) -> None:
+        """Record only what links summaries to sessions.
+
+        For entries that don't count towards session statistics but whose
+        UUIDs summaries may refer to.
+        """
+        if isinstance(entry, SummaryTranscriptEntry):
+            self.summaries.append((entry.leafUuid, entry.summary))
+            return
+        message_uuid = getattr(entry, "uuid", "")
+        session_id = getattr(entry, "sessionId", "")
+        if message_uuid and session_id:
+            # There is often duplication, in that case we want to prioritise the assistant
+            # message because summaries are generated from Claude's (last) success message
+            if type(entry) is AssistantTranscriptEntry:
+                self.uuid_to_session[message_uuid] = session_id
+            else:
+                self.uuid_to_session_backup[message_uuid] = session_id
+
+    def add(self, entry: TranscriptEntry) -> None:
+        """Aggregate an entry, in the order of the stream."""
+        self.total_message_count += 1
+        self.add_links(entry)
+
+        entry_ms = getattr(entry, "timestamp_ms", None)
+        if entry_ms is not None:
+            if self.latest_ms is None or entry_ms > self.latest_ms:
+                self.latest_ms = entry_ms
+                self.latest_timestamp = getattr(entry, "timestamp")
+            if self.earliest_ms is None or entry_ms < self.earliest_ms:
+                self.earliest_ms = entry_ms
+                self.earliest_timestamp = getattr(entry, "timestamp")
+
+        if isinstance(entry, SummaryTranscriptEntry):
+            return
+        session_id = getattr(entry, "sessionId", "")
+        if not session_id:
+            return
+
+        timestamp = getattr(entry, "timestamp", "")
+        session = self.sessions.get(session_id)
+        if session is None:
+            session = self.sessions[session_id] = SessionCacheData(
+                session_id=session_id,
+                first_timestamp=timestamp,
+                last_timestamp=timestamp,
+                first_timestamp_ms=entry_ms,
+                last_timestamp_ms=entry_ms,
+                message_count=0,
+                first_user_message="",
+                cwd=getattr(entry, "cwd", None),
+            )
+        session.message_count += 1
+        if timestamp:
+            session.last_timestamp = timestamp
+        if entry_ms is not None:
+            session.last_timestamp_ms = entry_ms
+
+        # Get first user message for preview
+        if isinstance(entry, UserTranscriptEntry) and not session.first_user_message:
+            from .utils import create_session_preview, should_use_as_session_starter
+
+            text_content = extract_text_content(entry.message.content)
+            if should_use_as_session_starter(text_content):
+                session.first_user_message = create_session_preview(text_content)
+                session.first_user_message_ms = entry_ms
+
+        # Count token usage once per requestId, as responses are often
+        # split over several entries
+        if isinstance(entry, AssistantTranscriptEntry):
+            usage = entry.message.usage
+            request_id = entry.requestId
+            if usage and request_id and request_id not in self.requests:
+                self._count_request(
+                    request_id,
+                    (
+                        session_id,
+                        entry_ms,
+                        usage.input_tokens or 0,
+                        usage.output_tokens or 0,
+                        usage.cache_creation_input_tokens or 0,
+                        usage.cache_read_input_tokens or 0,
+                    ),
+                )
+
+    def _count_request(
+        self, request_id: str, request: RequestUsage, sign: int = 1
+    ) -> None:
+        """Add a request's token usage to its session and the totals.
+
+        With a sign of -1, a request counted before is taken off again.
+        """
+        if sign > 0:
+            self.requests[request_id] = request
+        else:
+            del self.requests[request_id]
+        session_id, _, input_tokens, output_tokens, cache_creation, cache_read = request
+        self.total_input_tokens += sign * input_tokens
+        self.total_output_tokens += sign * output_tokens
+        self.total_cache_creation_tokens += sign * cache_creation
+        self.total_cache_read_tokens += sign * cache_read
+        session = self.sessions.get(session_id)
+        if session is not None:
+            session.total_input_tokens += sign * input_tokens
+            session.total_output_tokens += sign * output_tokens
+            session.total_cache_creation_tokens += sign * cache_creation
+            session.total_cache_read_tokens += sign * cache_read
+
+    def merge(self, other: "SessionAggregator") -> None:
+        """Add the aggregates of entries that come after this one's in the stream.
+
+        The result is what adding other's entries after this one's would
+        give. Parts that overlap in time, such as the files of a project,
+        can be merged too: session timestamp ranges are then combined by
+        time, and the first user message of a session is the earlier of the
+        two parts' first user messages. A request in both parts is counted
+        once, for the part where it comes first.
+        """
+        self.total_message_count += other.total_message_count
+        if other.latest_ms is not None and (
+            self.latest_ms is None or other.latest_ms > self.latest_ms
+        ):
+            self.latest_ms = other.latest_ms
+            self.latest_timestamp = other.latest_timestamp
+        if other.earliest_ms is not None and (
+            self.earliest_ms is None or other.earliest_ms < self.earliest_ms
+        ):
+            self.earliest_ms = other.earliest_ms
+            self.earliest_timestamp = other.earliest_timestamp
+
+        self.uuid_to_session.update(other.uuid_to_session)
+        self.uuid_to_session_backup.update(other.uuid_to_session_backup)
+        self.summaries.extend(other.summaries)
+
+        for session_id, other_session in other.sessions.items():
+            session = self.sessions.get(session_id)
+            if session is None:
+                # Token usage is added below, request by request
+                self.sessions[session_id] = other_session.model_copy(
+                    update={
+                        "total_input_tokens": 0,
+                        "total_output_tokens": 0,
+                        "total_cache_creation_tokens": 0,
+                        "total_cache_read_tokens": 0,
+                    }
+                )
+                continue
+            session.message_count += other_session.message_count
+            if _is_before(other_session.first_timestamp_ms, session.first_timestamp_ms):
+                session.first_timestamp = other_session.first_timestamp
+                session.first_timestamp_ms = other_session.first_timestamp_ms
+                session.cwd = other_session.cwd
+            if other_session.first_user_message and (
+                not session.first_user_message
+                or _is_before(
+                    other_session.first_user_message_ms,
+                    session.first_user_message_ms,
+                )
+            ):
+                session.first_user_message = other_session.first_user_message
+                session.first_user_message_ms = other_session.first_user_message_ms
+            if not _is_before(
+                other_session.last_timestamp_ms, session.last_timestamp_ms
+            ):
+                session.last_timestamp = other_session.last_timestamp
+                session.last_timestamp_ms = other_session.last_timestamp_ms
+
+        for request_id, request in other.requests.items():
+            counted = self.requests.get(request_id)
+            if counted is not None:
+                if not _is_before(request[1], counted[1]):
+                    continue
+                # Counted for the earlier of the two entries, like a stream
+                self._count_request(request_id, counted, -1)
+            self._count_request(request_id, request)
+
+    @property
+    def session_summaries(self) -> Dict[str, str]:
+        """Summaries mapped to sessions via leafUuid -> message UUID -> session ID.
+
+        Summaries can be in different sessions (and files) than the messages
+        they summarize, so this is only resolved once everything is added.
+        """
+        session_summaries: Dict[str, str] = {}
+        for leaf_uuid, summary in self.summaries:
+            if leaf_uuid in self.uuid_to_session:
+                session_summaries[self.uuid_to_session[leaf_uuid]] = summary
+            elif (
+                leaf_uuid in self.uuid_to_session_backup
+                and self.uuid_to_session_backup[leaf_uuid] not in session_summaries
+            ):
+                session_summaries[self.uuid_to_session_backup[leaf_uuid]] = summary
+        return session_summaries
+
+    def session_data(self) -> Dict[str, SessionCacheData]:
+        """Return copies of the sessions with their summaries resolved."""
+        session_summaries = self.session_summaries
+        return {
+            session_id: session.model_copy(
+                update={"summary": session_summaries.get(session_id)}
+            )
+            for session_id, session in self.sessions.items()
+        }
+
+    def session_ids(self) -> Set[str]:
+        """Return the sessions seen so far."""
+        return set(self.sessions)
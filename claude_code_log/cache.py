@@ -1,14 +1,225 @@
 #!/usr/bin/env python3
 """Cache management for Claude Code Log to improve performance."""
 
+import bisect
+import gzip
+import hashlib
+import io
 import json
+import lzma
+import os
+import re
+import shutil
+import sqlite3
+import time
+from contextlib import ExitStack, contextmanager
 from pathlib import Path
-from typing import Any, Dict, List, Optional, cast
+from typing import (
+    Any,
+    BinaryIO,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Literal,
+    Optional,
+    Set,
+    Tuple,
+    cast,
+    TYPE_CHECKING,
+)
 from datetime import datetime
 from pydantic import BaseModel
 from packaging import version
 
-from .models import TranscriptEntry
+from .aggregates import SessionAggregator, SessionCacheData
+from .fileio import (
+    TEMP_SUFFIX,
+    atomic_write,
+    atomic_write_bytes,
+    atomic_write_text,
+    file_lock,
+)
+from .models import (
+    LazyContentList,
+    TranscriptEntry,
+    ValidationLevel,
+    decode_transcript_entry,
+    timestamp_to_ms,
+)
+
+if TYPE_CHECKING:
+    from .parser import TimestampPrefilter
+
+# Bytes before the parsed offset covered by CachedFileInfo.tail_checksum
+TAIL_CHECKSUM_BYTES = 4096
+
+# Where cached entries and the project index are stored: per-file JSON
+# caches next to index.json, or a single SQLite database
+CacheBackend = Literal["json", "sqlite"]
+CACHE_BACKENDS: tuple[CacheBackend, ...] = ("json", "sqlite")
+SQLITE_CACHE_FILE = "cache.db"
+
+# Advisory lock held by a CacheManager while it updates the project cache
+CACHE_LOCK_FILE = ".lock"
+
+# SQLite database of the rendered HTML fragments of messages
+FRAGMENT_CACHE_FILE = "fragments.db"
+
+# How per-file JSON caches are compressed, and the file suffix of each codec.
+# zstd needs the zstandard package (or Python 3.14's compression.zstd).
+CacheCodec = Literal["none", "gzip", "lzma", "zstd"]
+CACHE_CODECS: tuple[CacheCodec, ...] = ("none", "gzip", "lzma", "zstd")
+CODEC_SUFFIXES: Dict[CacheCodec, str] = {
+    "none": ".json",
+    "gzip": ".json.gz",
+    "lzma": ".json.xz",
+    "zstd": ".json.zst",
+}
+DEFAULT_CODEC_LEVELS: Dict[CacheCodec, Optional[int]] = {
+    "none": None,
+    "gzip": 6,
+    "lzma": 6,
+    "zstd": 3,
+}
+DEFAULT_CACHE_CODEC: CacheCodec = "none"
+
+
+def _zstd_module() -> Any:
+    """Return the zstd implementation, or None if none is installed."""
+    try:
+        from compression import zstd  # type: ignore[import-not-found]
+
+        return zstd
+    except ImportError:
+        pass
+    try:
+        import zstandard  # type: ignore[import-not-found]
+
+        return zstandard
+    except ImportError:
+        return None
+
+
+def available_codecs() -> tuple[CacheCodec, ...]:
+    """Return the codecs usable in this environment."""
+    return tuple(codec for codec in CACHE_CODECS if codec != "zstd" or _zstd_module())
+
+
+def compress_cache_data(
+    data: bytes, codec: CacheCodec, level: Optional[int] = None
+) -> bytes:
+    """Compress serialised cache data; level None uses the codec's default."""
+    if level is None:
+        level = DEFAULT_CODEC_LEVELS[codec]
+    if codec == "gzip":
+        return gzip.compress(data, compresslevel=cast(int, level), mtime=0)
+    if codec == "lzma":
+        return lzma.compress(data, preset=level)
+    if codec == "zstd":
+        zstd = _zstd_module()
+        if zstd is None:
+            raise ValueError("zstd compression needs the zstandard package")
+        if hasattr(zstd, "ZstdCompressor"):
+            return zstd.ZstdCompressor(level=level).compress(data)
+        return zstd.compress(data, level)
+    return data
+
+
+def decompress_cache_data(data: bytes, codec: CacheCodec) -> bytes:
+    """Reverse compress_cache_data."""
+    if codec == "gzip":
+        return gzip.decompress(data)
+    if codec == "lzma":
+        return lzma.decompress(data)
+    if codec == "zstd":
+        zstd = _zstd_module()
+        if zstd is None:
+            raise ValueError("zstd decompression needs the zstandard package")
+        if hasattr(zstd, "ZstdDecompressor"):
+            return zstd.ZstdDecompressor().decompress(data)
+        return zstd.decompress(data)
+    return data
+
+
+def codec_of_cache_file(cache_file: Path) -> CacheCodec:
+    """Tell a cache file's codec from its suffix."""
+    for codec in ("gzip", "lzma", "zstd"):
+        if cache_file.name.endswith(CODEC_SUFFIXES[codec]):
+            return codec
+    return "none"
+
+
+# Index of all projects, at the root of the projects directory
+PROJECTS_INDEX_FILE = "projects_index.json"
+PROJECTS_INDEX_LOCK_FILE = ".projects_index.lock"
+
+# Sorted timestamp index of a JSON cache file, kept next to it
+TIMESTAMP_INDEX_SUFFIX = ".tsidx"
+# Aggregates of a cached file's entries, kept next to its JSON cache
+AGGREGATES_SUFFIX = ".aggs"
+# Spans of a cache file at most this far apart are read in one go
+_SPAN_READ_GAP = 64 * 1024
+
+# Cache reads are recorded in the index, for least recently used eviction,
+# at most this often (in seconds) per file
+ACCESS_TIME_RESOLUTION = 3600
+
+# Blob references in serialised entries
+_BLOB_REF_PATTERN = re.compile(rb'"\$blob":\s*"([0-9a-f]{64})"')
+
+# Strings in message content at least this long are kept in the blob store
+BLOB_THRESHOLD = 8 * 1024
+BLOB_DIR = "blobs"
+
+
+def compute_tail_checksum(jsonl_path: Path, offset: int) -> str:
+    """Checksum the bytes just before offset, to tell appends from rewrites."""
+    start = max(0, offset - TAIL_CHECKSUM_BYTES)
+    with open(jsonl_path, "rb") as f:
+        f.seek(start)
+        return hashlib.sha256(f.read(offset - start)).hexdigest()
+
+
+def build_fingerprint(
+    jsonl_files: Iterable[Path],
+    *params: Any,
+    cache_manager: Optional["CacheManager"] = None,
+) -> str:
+    """Hash the inputs an output file is generated from.
+
+    With a cache manager, each cached source file counts with the state of
+    its cache: where parsing stopped and the checksum of the bytes before
+    it, as the output is rendered from the cached entries. Other files count
+    with their size and the checksum of their tail, as transcripts are only
+    appended to: an append or a rewrite changes the fingerprint, merely
+    touching a file doesn't. params holds everything else the output depends
+    on (title, date range...), which must be JSON serialisable.
+    """
+    sources: List[Tuple[str, int, str]] = []
+    for jsonl_path in sorted(jsonl_files):
+        cached_info = (
+            cache_manager.get_cached_file_info(jsonl_path)
+            if cache_manager is not None
+            else None
+        )
+        # Caches saved without a parse position count like uncached files
+        if cached_info is not None and (
+            cached_info.tail_checksum or not cached_info.message_count
+        ):
+            sources.append(
+                (jsonl_path.name, cached_info.parsed_offset, cached_info.tail_checksum)
+            )
+            continue
+        try:
+            size = jsonl_path.stat().st_size
+            sources.append(
+                (jsonl_path.name, size, compute_tail_checksum(jsonl_path, size))
+            )
+        except OSError:
+            continue
+    data = json.dumps([get_library_version(), sources, *params])
+    return hashlib.blake2b(data.encode("utf-8"), digest_size=16).hexdigest()
 
 
 class CachedFileInfo(BaseModel):
@@ -19,22 +230,169 @@ class CachedFileInfo(BaseModel):
     cached_mtime: float
     message_count: int
     session_ids: List[str]
+    # Size of the source when it was parsed (None for older caches); lines
+    # appended since make it differ even within the mtime tolerance
+    source_size: Optional[int] = None
+
+    # Timestamp range of the entries and the number without a timestamp,
+    # so that date-filtered loads can skip files entirely out of range
+    earliest_timestamp: str = ""
+    latest_timestamp: str = ""
+    no_timestamp_count: int = 0
+    # Epoch milliseconds of the earliest entry, which orders the file when
+    # projects are merged (None if it has none or was cached without it)
+    earliest_ms: Optional[int] = None
+
+    # Where parsing stopped (just past the last fully parsed line) and a
+    # checksum of the bytes before it, so appended files parse only new lines
+    parsed_offset: int = 0
+    parsed_lines: int = 0
+    tail_checksum: str = ""
+
+    # Compression of the JSON cache file (always "none" with SQLite)
+    codec: CacheCodec = "none"
+    codec_level: Optional[int] = None
+
+    # When the cached entries were last written or read (epoch seconds, see
+    # ACCESS_TIME_RESOLUTION), for least recently used eviction
+    last_accessed: float = 0.0
 
 
-class SessionCacheData(BaseModel):
-    """Cached session-level information."""
+class FileAggregates(BaseModel):
+    """Session and project aggregates of a cached file's entries.
 
-    session_id: str
-    summary: Optional[str] = None
-    first_timestamp: str
-    last_timestamp: str
+    They are merged into the project's aggregates, and stored apart from
+    the cache index (which every run reads) so that only merging reads
+    them. The version of the file they describe is identified by its
+    modification time and entry count in the index.
+    """
+
+    source_mtime: float
     message_count: int
-    first_user_message: str
-    cwd: Optional[str] = None  # Working directory from session messages
-    total_input_tokens: int = 0
-    total_output_tokens: int = 0
-    total_cache_creation_tokens: int = 0
-    total_cache_read_tokens: int = 0
+    aggregates: SessionAggregator
+
+    def describes(self, cached_info: CachedFileInfo) -> bool:
+        """Check that these are the aggregates of the indexed file version."""
+        return (
+            self.source_mtime == cached_info.source_mtime
+            and self.message_count == cached_info.message_count
+        )
+
+
+# A timestamp key of a JSON cache and the byte span of its entry list
+_KeySpan = Tuple[str, int, int]
+
+
+def encode_cache_members(
+    cache_data: Dict[str, List[Dict[str, Any]]],
+    opening: bytes = b"{\n",
+    offset: int = 0,
+) -> Tuple[bytes, List[_KeySpan]]:
+    """Encode a timestamp-keyed cache object, one key per line.
+
+    opening starts the members: the object's brace, or a comma to add them
+    to an existing object whose first offset bytes precede them. Returns the
+    bytes, closing brace included, and the span of each key's entry list in
+    the whole document.
+    """
+    parts = [opening]
+    position = offset + len(opening)
+    key_spans: List[_KeySpan] = []
+    for i, (key, entries) in enumerate(cache_data.items()):
+        member = (b",\n" if i else b"") + json.dumps(key).encode("utf-8") + b":"
+        value = json.dumps(entries, separators=(",", ":")).encode("utf-8")
+        position += len(member)
+        key_spans.append((key, position, position + len(value)))
+        position += len(value)
+        parts += [member, value]
+    parts.append(b"\n}")
+    return b"".join(parts), key_spans
+
+
+class TimestampIndex(BaseModel):
+    """Sorted timestamp index of a JSON cache file.
+
+    Holds the timestamp keys of the cache, in epoch milliseconds and sorted,
+    with the byte span of each key's entry list in the (decompressed) cache
+    document, so that the keys in a date range are found by binary search
+    and only their entries are decoded. The cache file it describes is
+    identified by its size and modification time.
+    """
+
+    cache_size: int
+    cache_mtime_ns: int
+    timestamps: List[int] = []
+    spans: List[Tuple[int, int]] = []
+    # Spans of keys without a parseable timestamp, which are always read
+    unindexed: List[Tuple[int, int]] = []
+
+    @classmethod
+    def build(
+        cls, key_spans: Iterable[_KeySpan], stat: os.stat_result
+    ) -> "TimestampIndex":
+        """Index the key spans of a freshly written cache file."""
+        return cls(cache_size=stat.st_size, cache_mtime_ns=stat.st_mtime_ns).extend(
+            key_spans, stat
+        )
+
+    def extend(
+        self, key_spans: Iterable[_KeySpan], stat: os.stat_result
+    ) -> "TimestampIndex":
+        """Return this index with keys appended to its cache file added."""
+        indexed = list(zip(self.timestamps, self.spans))
+        unindexed = list(self.unindexed)
+        for key, start, end in key_spans:
+            timestamp_ms = timestamp_to_ms(key)
+            if timestamp_ms is None:
+                unindexed.append((start, end))
+            else:
+                indexed.append((timestamp_ms, (start, end)))
+        indexed.sort()
+        return TimestampIndex(
+            cache_size=stat.st_size,
+            cache_mtime_ns=stat.st_mtime_ns,
+            timestamps=[timestamp_ms for timestamp_ms, _ in indexed],
+            spans=[span for _, span in indexed],
+            unindexed=unindexed,
+        )
+
+    def describes(self, stat: os.stat_result) -> bool:
+        """Check that this index was built for the cache file with this stat."""
+        return (
+            self.cache_size == stat.st_size and self.cache_mtime_ns == stat.st_mtime_ns
+        )
+
+    def spans_in_range(
+        self, from_ms: Optional[int], to_ms: Optional[int]
+    ) -> List[Tuple[int, int]]:
+        """Return the spans to read for an inclusive range, in document order."""
+        low = 0 if from_ms is None else bisect.bisect_left(self.timestamps, from_ms)
+        high = (
+            len(self.timestamps)
+            if to_ms is None
+            else bisect.bisect_right(self.timestamps, to_ms)
+        )
+        return sorted([*self.spans[low:high], *self.unindexed])
+
+
+def _read_spans(
+    f: BinaryIO, spans: List[Tuple[int, int]], size: int
+) -> Iterator[bytes]:
+    """Read spans (in document order) of a file, nearby ones in one go."""
+    i = 0
+    while i < len(spans):
+        start, end = spans[i]
+        j = i + 1
+        while j < len(spans) and spans[j][0] - end <= _SPAN_READ_GAP:
+            end = max(end, spans[j][1])
+            j += 1
+        if end > size:
+            raise ValueError("span past the end of the cache file")
+        f.seek(start)
+        region = f.read(end - start)
+        for span_start, span_end in spans[i:j]:
+            yield region[span_start - start : span_end - start]
+        i = j
 
 
 class ProjectCache(BaseModel):
@@ -65,35 +423,788 @@ class ProjectCache(BaseModel):
     earliest_timestamp: str = ""
     latest_timestamp: str = ""
 
+    # Input fingerprint (see build_fingerprint) of each generated HTML file
+    outputs: Dict[str, str] = {}
+
+
+class CacheItem(BaseModel):
+    """Something a project's cache can evict to make room."""
+
+    # The cached entries of a JSONL file, named by file name, or the
+    # rendered fragments last used on a day, named by its number
+    kind: Literal["file", "fragments"]
+    name: str
+    size: int
+    last_accessed: float
+
+
+class CacheGCStats(BaseModel):
+    """What a cache garbage collection removed."""
+
+    # Caches of JSONL files that no longer exist, or evicted to fit the budget
+    files_removed: int = 0
+    files_evicted: int = 0
+    orphans_removed: int = 0
+    blobs_removed: int = 0
+    fragments_removed: int = 0
+    bytes_before: int = 0
+    bytes_after: int = 0
+
+    def merge(self, other: "CacheGCStats") -> None:
+        """Add the counts from another stats object to this one."""
+        for field in type(self).model_fields:
+            setattr(self, field, getattr(self, field) + getattr(other, field))
+
+
+class ProjectFingerprint(BaseModel):
+    """Summary of a project's JSONL files that changes whenever they do."""
+
+    file_count: int
+    max_mtime: float
+    total_size: int
+
+
+class IndexedProject(BaseModel):
+    """A project's entry in the projects index."""
+
+    fingerprint: ProjectFingerprint
+    # The project's cache index without its per-file entries
+    project: ProjectCache
+
+
+class ProjectsIndexData(BaseModel):
+    """Projects index structure for projects_index.json."""
+
+    version: str
+    projects: Dict[str, IndexedProject] = {}
+
+
+_SQLITE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS aggregates (
+    id INTEGER PRIMARY KEY CHECK (id = 1),
+    data TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS files (
+    name TEXT PRIMARY KEY,
+    data TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS file_aggregates (
+    name TEXT PRIMARY KEY,
+    data TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS sessions (
+    session_id TEXT PRIMARY KEY,
+    data TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS entries (
+    file TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    session_id TEXT,
+    timestamp_ms INTEGER,
+    data TEXT NOT NULL,
+    PRIMARY KEY (file, position)
+);
+CREATE INDEX IF NOT EXISTS entries_session ON entries (session_id, timestamp_ms);
+CREATE INDEX IF NOT EXISTS entries_timestamp ON entries (file, timestamp_ms);
+"""
+
+# Open bounds of timestamp range queries
+_MIN_MS = -(2**63)
+_MAX_MS = 2**63 - 1
+
+# Entry row: (session_id, timestamp_ms, compact JSON of the entry)
+_EntryRow = Tuple[Optional[str], Optional[int], str]
+
+
+def _entry_row(entry_data: Dict[str, Any]) -> _EntryRow:
+    """Build the entries table columns of a serialised entry."""
+    session_id = entry_data.get("sessionId")
+    return (
+        session_id if isinstance(session_id, str) and session_id else None,
+        timestamp_to_ms(entry_data.get("timestamp")),
+        json.dumps(entry_data, separators=(",", ":")),
+    )
+
+
+class SqliteCacheStore:
+    """SQLite storage for a project's cached entries, files, sessions and aggregates.
+
+    Entries are stored one row each, in file order, with their session ID and
+    epoch millisecond timestamp indexed, so that date ranges and sessions can
+    be loaded without reading whole files. The project index is split into
+    the files, sessions and aggregates tables; the aggregates of each file
+    are in file_aggregates, which isn't part of the index.
+    """
+
+    def __init__(self, db_file: Path):
+        self.db_file = db_file
+        # Wait for other processes' transactions rather than failing
+        self._conn = sqlite3.connect(db_file, timeout=30.0)
+        # Switching to WAL can't wait for another process doing the same
+        with file_lock(db_file.with_name(db_file.name + ".lock")):
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.executescript(_SQLITE_SCHEMA)
+
+    def close(self) -> None:
+        """Close the database connection."""
+        self._conn.close()
+
+    def data_version(self) -> int:
+        """Return a number that changes when another connection commits."""
+        return self._conn.execute("PRAGMA data_version").fetchone()[0]
+
+    def load_project(self) -> Optional[Dict[str, Any]]:
+        """Read the project index in the ProjectCache layout, or None if empty."""
+        row = self._conn.execute("SELECT data FROM aggregates WHERE id = 1").fetchone()
+        if row is None:
+            return None
+        project_data = json.loads(row[0])
+        project_data["cached_files"] = {
+            name: json.loads(data)
+            for name, data in self._conn.execute("SELECT name, data FROM files")
+        }
+        project_data["sessions"] = {
+            session_id: json.loads(data)
+            for session_id, data in self._conn.execute(
+                "SELECT session_id, data FROM sessions"
+            )
+        }
+        return project_data
+
+    def save_project(self, project_cache: "ProjectCache") -> None:
+        """Replace the project index in a single transaction."""
+        aggregates = project_cache.model_dump(exclude={"cached_files", "sessions"})
+        with self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO aggregates (id, data) VALUES (1, ?)",
+                (json.dumps(aggregates),),
+            )
+            self._conn.execute("DELETE FROM files")
+            self._conn.executemany(
+                "INSERT INTO files (name, data) VALUES (?, ?)",
+                (
+                    (name, info.model_dump_json())
+                    for name, info in project_cache.cached_files.items()
+                ),
+            )
+            self._conn.execute("DELETE FROM sessions")
+            self._conn.executemany(
+                "INSERT INTO sessions (session_id, data) VALUES (?, ?)",
+                (
+                    (session_id, data.model_dump_json())
+                    for session_id, data in project_cache.sessions.items()
+                ),
+            )
+
+    def write_entries(
+        self, file_name: str, rows: Iterable[_EntryRow], start: int = 0
+    ) -> None:
+        """Store the entries of a file from position start onwards.
+
+        Entries already stored at or after start are replaced.
+        """
+        with self._conn:
+            self._conn.execute(
+                "DELETE FROM entries WHERE file = ? AND position >= ?",
+                (file_name, start),
+            )
+            self._conn.executemany(
+                "INSERT INTO entries (file, position, session_id, timestamp_ms, data)"
+                " VALUES (?, ?, ?, ?, ?)",
+                (
+                    (file_name, position, *row)
+                    for position, row in enumerate(rows, start)
+                ),
+            )
+
+    def read_entries(
+        self,
+        file_name: str,
+        from_ms: Optional[int] = None,
+        to_ms: Optional[int] = None,
+    ) -> Iterator[Dict[str, Any]]:
+        """Yield the stored entries of a file in file order.
+
+        With bounds, only entries whose timestamp is in the inclusive range,
+        or that have no parseable timestamp (like summaries), are read. Both
+        are looked up in the (file, timestamp_ms) index, rather than scanning
+        the file's rows, which a single OR condition would do.
+        """
+        if from_ms is None and to_ms is None:
+            cursor = self._conn.execute(
+                "SELECT data FROM entries WHERE file = ? ORDER BY position",
+                (file_name,),
+            )
+        else:
+            cursor = self._conn.execute(
+                "SELECT data FROM ("
+                " SELECT position, data FROM entries"
+                " WHERE file = ? AND timestamp_ms BETWEEN ? AND ?"
+                " UNION ALL"
+                " SELECT position, data FROM entries"
+                " WHERE file = ? AND timestamp_ms IS NULL"
+                ") ORDER BY position",
+                (
+                    file_name,
+                    _MIN_MS if from_ms is None else from_ms,
+                    _MAX_MS if to_ms is None else to_ms,
+                    file_name,
+                ),
+            )
+        for (data,) in cursor:
+            yield json.loads(data)
+
+    def read_session_entries(
+        self,
+        session_id: str,
+        from_ms: Optional[int] = None,
+        to_ms: Optional[int] = None,
+    ) -> Iterator[Dict[str, Any]]:
+        """Yield the stored entries of a session in timestamp order.
+
+        Entries without a timestamp come first; ties keep file order.
+        """
+        cursor = self._conn.execute(
+            "SELECT data FROM entries WHERE session_id = ?"
+            " AND (timestamp_ms IS NULL OR timestamp_ms BETWEEN ? AND ?)"
+            " ORDER BY COALESCE(timestamp_ms, -1), file, position",
+            (
+                session_id,
+                _MIN_MS if from_ms is None else from_ms,
+                _MAX_MS if to_ms is None else to_ms,
+            ),
+        )
+        for (data,) in cursor:
+            yield json.loads(data)
+
+    def write_file_aggregates(self, file_name: str, data: str) -> None:
+        """Store the aggregates of a file, as JSON."""
+        with self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO file_aggregates (name, data) VALUES (?, ?)",
+                (file_name, data),
+            )
+
+    def read_file_aggregates(self, file_name: str) -> Optional[str]:
+        """Read the stored aggregates of a file, if any."""
+        row = self._conn.execute(
+            "SELECT data FROM file_aggregates WHERE name = ?", (file_name,)
+        ).fetchone()
+        return None if row is None else row[0]
+
+    def file_sizes(self) -> Dict[str, int]:
+        """Return the bytes of stored entries and aggregates of each file."""
+        sizes: Dict[str, int] = dict(
+            self._conn.execute(
+                "SELECT file, SUM(LENGTH(data)) FROM entries GROUP BY file"
+            ).fetchall()
+        )
+        for file_name, size in self._conn.execute(
+            "SELECT name, LENGTH(data) FROM file_aggregates"
+        ):
+            sizes[file_name] = sizes.get(file_name, 0) + size
+        return sizes
+
+    def delete_files(self, file_names: Iterable[str]) -> None:
+        """Delete the stored entries and aggregates of files."""
+        file_names = list(file_names)
+        with self._conn:
+            self._conn.executemany(
+                "DELETE FROM entries WHERE file = ?",
+                ((file_name,) for file_name in file_names),
+            )
+            self._conn.executemany(
+                "DELETE FROM file_aggregates WHERE name = ?",
+                ((file_name,) for file_name in file_names),
+            )
+
+    def iter_blob_refs(self) -> Iterator[bytes]:
+        """Yield the digests of the blobs stored entries refer to."""
+        for (data,) in self._conn.execute(
+            "SELECT data FROM entries WHERE INSTR(data, '\"$blob\"') > 0"
+        ):
+            yield from _BLOB_REF_PATTERN.findall(data.encode("utf-8"))
+
+    def vacuum(self) -> None:
+        """Give the space of deleted entries back to the file system."""
+        self._conn.execute("VACUUM")
+        # VACUUM goes through the write-ahead log, which would keep its size
+        self._conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+
+    def clear(self) -> None:
+        """Delete all stored entries and the project index."""
+        with self._conn:
+            for table in (
+                "entries",
+                "file_aggregates",
+                "files",
+                "sessions",
+                "aggregates",
+            ):
+                self._conn.execute(f"DELETE FROM {table}")
+
+
+class BlobStore:
+    """Content-addressed storage for the large payloads of cached entries.
+
+    Long strings in message content (tool results, base64 images, file
+    contents passed to tools) are written once to blobs/<xx>/<sha256>, and
+    cached entries hold {"$blob": "<sha256>"} in their place, so a payload
+    repeated across entries, files and sessions is stored once. References
+    are resolved when an entry's content items are first read.
+
+    Blobs are compressed with the cache codec, the digest being that of the
+    uncompressed payload; a blob already stored with another codec is reused.
+    """
+
+    REF_KEY = "$blob"
+
+    def __init__(
+        self,
+        blob_dir: Path,
+        threshold: int = BLOB_THRESHOLD,
+        codec: CacheCodec = "none",
+        codec_level: Optional[int] = None,
+    ):
+        self.blob_dir = blob_dir
+        self.threshold = threshold
+        self.codec: CacheCodec = codec
+        self.codec_level = codec_level
+
+    def _blob_paths(self, digest: str) -> Iterator[Tuple[Path, CacheCodec]]:
+        """Yield the possible paths of a blob, this store's codec first."""
+        blob_dir = self.blob_dir / digest[:2]
+        for codec in (self.codec, *CACHE_CODECS):
+            suffix = CODEC_SUFFIXES[codec].removeprefix(".json")
+            yield blob_dir / f"{digest}{suffix}", codec
+
+    def put(self, text: str) -> str:
+        """Store a payload, if it isn't already, and return its digest."""
+        data = text.encode("utf-8")
+        digest = hashlib.sha256(data).hexdigest()
+        blob_paths = list(self._blob_paths(digest))
+        if not any(blob_path.exists() for blob_path, _ in blob_paths):
+            blob_path = blob_paths[0][0]
+            blob_path.parent.mkdir(parents=True, exist_ok=True)
+            # Concurrent writers of a blob store the same bytes, so no lock
+            atomic_write_bytes(
+                blob_path, compress_cache_data(data, self.codec, self.codec_level)
+            )
+        return digest
+
+    def get(self, digest: str) -> str:
+        """Read a stored payload."""
+        for blob_path, codec in self._blob_paths(digest):
+            try:
+                data = blob_path.read_bytes()
+            except FileNotFoundError:
+                continue
+            return decompress_cache_data(data, codec).decode("utf-8")
+        raise FileNotFoundError(f"No blob {digest} in {self.blob_dir}")
+
+    def _is_ref(self, value: Any) -> bool:
+        return (
+            isinstance(value, dict)
+            and len(cast(Dict[str, Any], value)) == 1
+            and isinstance(cast(Dict[str, Any], value).get(self.REF_KEY), str)
+        )
+
+    def externalize(self, value: Any) -> Any:
+        """Return value with its long strings replaced by blob references.
+
+        Containers are copied only where something was replaced.
+        """
+        if isinstance(value, str):
+            if len(value) >= self.threshold:
+                return {self.REF_KEY: self.put(value)}
+            return value
+        if isinstance(value, dict):
+            items = cast(Dict[str, Any], value)
+            replaced = {key: self.externalize(item) for key, item in items.items()}
+            if any(replaced[key] is not item for key, item in items.items()):
+                return replaced
+            return value
+        if isinstance(value, list):
+            items_list = cast(List[Any], value)
+            replaced_list = [self.externalize(item) for item in items_list]
+            if any(new is not old for new, old in zip(replaced_list, items_list)):
+                return replaced_list
+            return value
+        return value
+
+    def resolve(self, value: Any) -> Any:
+        """Return value with its blob references replaced by the payloads.
+
+        Containers are copied only where something was replaced. A missing
+        blob is replaced by a placeholder rather than failing the render.
+        """
+        if isinstance(value, dict):
+            if self._is_ref(value):
+                digest = cast(Dict[str, str], value)[self.REF_KEY]
+                try:
+                    return self.get(digest)
+                except Exception as e:
+                    print(f"Warning: Failed to load cached content {digest}: {e}")
+                    return "[Cached content missing]"
+            items = cast(Dict[str, Any], value)
+            resolved = {key: self.resolve(item) for key, item in items.items()}
+            if any(resolved[key] is not item for key, item in items.items()):
+                return resolved
+            return value
+        if isinstance(value, list):
+            items_list = cast(List[Any], value)
+            resolved_list = [self.resolve(item) for item in items_list]
+            if any(new is not old for new, old in zip(resolved_list, items_list)):
+                return resolved_list
+            return value
+        return value
+
+    def externalize_entry(self, entry_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Move the long strings of a serialised entry's message content out."""
+        message = entry_data.get("message")
+        if not isinstance(message, dict):
+            return entry_data
+        message_data = cast(Dict[str, Any], message)
+        content = message_data.get("content")
+        if not isinstance(content, list):
+            return entry_data
+        stored = self.externalize(content)
+        if stored is content:
+            return entry_data
+        return {**entry_data, "message": {**message_data, "content": stored}}
+
+    def decode_entry(
+        self, entry_data: Dict[str, Any], validation: ValidationLevel = "none"
+    ) -> TranscriptEntry:
+        """Decode a cached entry, resolving its blob references.
+
+        Unvalidated entries resolve them lazily, when their content items are
+        built; validation needs the payloads up front.
+        """
+        if validation != "none":
+            return decode_transcript_entry(self.resolve(entry_data), validation)
+
+        entry = decode_transcript_entry(entry_data, validation)
+        content = getattr(getattr(entry, "message", None), "content", None)
+        if isinstance(content, LazyContentList):
+            content.set_resolver(self.resolve)
+        return entry
+
+    def sweep(self, referenced: Set[str]) -> int:
+        """Delete the blobs whose digest isn't referenced; return how many.
+
+        Temporary files left by interrupted writes go too.
+        """
+        removed = 0
+        for blob_path in self.blob_dir.glob("*/*"):
+            if blob_path.name.endswith(TEMP_SUFFIX):
+                blob_path.unlink(missing_ok=True)
+            elif blob_path.name.split(".")[0] not in referenced:
+                blob_path.unlink(missing_ok=True)
+                removed += 1
+        return removed
+
+    def clear(self) -> None:
+        """Delete every stored payload."""
+        shutil.rmtree(self.blob_dir, ignore_errors=True)
+
+
+_FRAGMENT_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    id INTEGER PRIMARY KEY CHECK (id = 1),
+    version TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS fragments (
+    key TEXT PRIMARY KEY,
+    data TEXT NOT NULL,
+    used INTEGER NOT NULL DEFAULT 0
+);
+"""
+
+_SECONDS_PER_DAY = 24 * 3600
+
+
+def _day_number(timestamp: Optional[float] = None) -> int:
+    """Return the number of the (UTC) day of an epoch time, by default now."""
+    return int((time.time() if timestamp is None else timestamp) // _SECONDS_PER_DAY)
+
+
+class FragmentCache:
+    """Rendered HTML of messages, stored under a hash of what it depends on.
+
+    A message's fragments (its text and tool items, rendered to HTML) only
+    depend on its type, sidechain flag and content, so they are stored under
+    a hash of those and of the library version, and pages are assembled from
+    stored fragments, rendering only messages not seen before. Content
+    loaded from the cache is hashed as stored, so payloads kept in the blob
+    store are hashed by their digest rather than read.
+
+    Fragments are kept in a SQLite database; new ones are buffered and
+    written in batches. The database is emptied when the library version
+    changes. The day each fragment was last used is recorded, so that the
+    least recently used ones can be evicted.
+    """
+
+    # Fragments buffered before they are written
+    FLUSH_SIZE = 500
+
+    def __init__(self, db_file: Path, library_version: str):
+        self.db_file = db_file
+        self.library_version = library_version
+        self._pending: Dict[str, str] = {}
+        # Stored fragments used today that were last used on an earlier day
+        self._used: Set[str] = set()
+        self._today = _day_number()
+        self._conn = sqlite3.connect(db_file, timeout=30.0)
+        # Switching to WAL can't wait for another process doing the same
+        with file_lock(db_file.with_name(db_file.name + ".lock")):
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.executescript(_FRAGMENT_SCHEMA)
+            columns = [
+                column[1]
+                for column in self._conn.execute("PRAGMA table_info(fragments)")
+            ]
+            if "used" not in columns:
+                self._conn.execute(
+                    "ALTER TABLE fragments ADD COLUMN used INTEGER NOT NULL DEFAULT 0"
+                )
+            row = self._conn.execute("SELECT version FROM meta WHERE id = 1").fetchone()
+            if row is None or row[0] != library_version:
+                with self._conn:
+                    self._conn.execute("DELETE FROM fragments")
+                    self._conn.execute(
+                        "INSERT OR REPLACE INTO meta (id, version) VALUES (1, ?)",
+                        (library_version,),
+                    )
+
+    def close(self) -> None:
+        """Write buffered fragments and close the database."""
+        self.flush()
+        self._conn.close()
+
+    def key(self, message: TranscriptEntry) -> str:
+        """Hash the parts of a message its rendered fragments depend on."""
+        content = getattr(getattr(message, "message", None), "content", None)
+        if isinstance(content, LazyContentList) and content.pending:
+            # Hash the raw items rather than building their models
+            content = list(list.__iter__(content))
+        source = [
+            self.library_version,
+            getattr(message, "type", None),
+            bool(getattr(message, "isSidechain", False)),
+            content,
+        ]
+        data = json.dumps(
+            source,
+            sort_keys=True,
+            separators=(",", ":"),
+            default=lambda item: cast(BaseModel, item).model_dump(warnings=False),
+        )
+        return hashlib.blake2b(data.encode("utf-8"), digest_size=16).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        """Return the stored fragments of a key, as JSON, if any."""
+        if key in self._pending:
+            return self._pending[key]
+        row = self._conn.execute(
+            "SELECT data, used FROM fragments WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None:
+            return None
+        if row[1] < self._today:
+            self._used.add(key)
+        return row[0]
+
+    def put(self, key: str, data: str) -> None:
+        """Store the fragments of a key, as JSON."""
+        self._pending[key] = data
+        if len(self._pending) >= self.FLUSH_SIZE:
+            self.flush()
+
+    def flush(self) -> None:
+        """Write the buffered fragments and use days in one transaction."""
+        if not self._pending and not self._used:
+            return
+        with self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO fragments (key, data, used) VALUES (?, ?, ?)",
+                ((key, data, self._today) for key, data in self._pending.items()),
+            )
+            self._conn.executemany(
+                "UPDATE fragments SET used = ? WHERE key = ?",
+                ((self._today, key) for key in self._used),
+            )
+        self._pending = {}
+        self._used = set()
+
+    def usage(self) -> List[CacheItem]:
+        """Return the stored fragments grouped by the day they were last used."""
+        return [
+            CacheItem(
+                kind="fragments",
+                name=str(day),
+                size=size,
+                last_accessed=day * _SECONDS_PER_DAY,
+            )
+            for day, size in self._conn.execute(
+                "SELECT used, SUM(LENGTH(key) + LENGTH(data)) FROM fragments"
+                " GROUP BY used"
+            )
+        ]
+
+    def evict(self, days: Iterable[int]) -> int:
+        """Delete the fragments last used on days; return how many."""
+        self.flush()
+        with self._conn:
+            return sum(
+                self._conn.execute(
+                    "DELETE FROM fragments WHERE used = ?", (day,)
+                ).rowcount
+                for day in days
+            )
+
+    def vacuum(self) -> None:
+        """Give the space of deleted fragments back to the file system."""
+        self._conn.execute("VACUUM")
+        # VACUUM goes through the write-ahead log, which would keep its size
+        self._conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+
+    def clear(self) -> None:
+        """Delete every stored fragment."""
+        self._pending = {}
+        self._used = set()
+        with self._conn:
+            self._conn.execute("DELETE FROM fragments")
+
 
 class CacheManager:
     """Manages cache operations for a project directory."""
 
-    def __init__(self, project_path: Path, library_version: str):
+    def __init__(
+        self,
+        project_path: Path,
+        library_version: str,
+        backend: Optional[CacheBackend] = None,
+        codec: CacheCodec = DEFAULT_CACHE_CODEC,
+        codec_level: Optional[int] = None,
+    ):
         """Initialize cache manager for a project.
 
         Args:
             project_path: Path to the project directory containing JSONL files
             library_version: Current version of the library for cache invalidation
+            backend: "json" for per-file JSON caches with an index.json, or
+                "sqlite" for a single SQLite database. By default the backend
+                of an existing SQLite cache is kept, otherwise JSON is used.
+                Switching to SQLite migrates an existing JSON cache; switching
+                to JSON discards the SQLite cache.
+            codec: Compression of the per-file JSON caches and blobs written
+                from now on ("none", "gzip", "lzma" or "zstd"); files cached
+                with another codec are still read, and rewritten with this
+                one when they change. SQLite entries aren't compressed.
+            codec_level: Compression level, or None for the codec's default
         """
+        if codec not in available_codecs():
+            raise ValueError(f"Cache codec {codec!r} is not available")
         self.project_path = project_path
         self.library_version = library_version
         self.cache_dir = project_path / "cache"
         self.index_file = self.cache_dir / "index.json"
+        self.db_file = self.cache_dir / SQLITE_CACHE_FILE
+        self.lock_file = self.cache_dir / CACHE_LOCK_FILE
+        self.fragment_file = self.cache_dir / FRAGMENT_CACHE_FILE
+        self.codec: CacheCodec = codec
+        self.codec_level = (
+            DEFAULT_CODEC_LEVELS[codec] if codec_level is None else codec_level
+        )
+        self._blobs = BlobStore(
+            self.cache_dir / BLOB_DIR,
+            codec=codec,
+            codec_level=self.codec_level,
+        )
 
         # Ensure cache directory exists
         self.cache_dir.mkdir(exist_ok=True)
 
+        if backend is None:
+            backend = "sqlite" if self.db_file.exists() else "json"
+        self.backend: CacheBackend = backend
+        # Nesting depth of batch() and whether the index changed within it
+        self._batch_depth = 0
+        self._index_dirty = False
+        self._sqlite: Optional[SqliteCacheStore] = None
+        self._fragments: Optional[FragmentCache] = None
+        # Files whose cache was read, and when, not yet recorded in the index
+        self._accessed: Dict[str, float] = {}
+        # Parsed date ranges of filtered loads, as parsing is slow
+        self._prefilters: Dict[
+            Tuple[Optional[str], Optional[str]], "TimestampPrefilter"
+        ] = {}
+        if backend == "sqlite":
+            self._sqlite = SqliteCacheStore(self.db_file)
+        elif self.db_file.exists():
+            self._remove_sqlite_cache()
+
         # Load existing cache index if available
         self._project_cache: Optional[ProjectCache] = None
+        # Identifies the saved index this one was last loaded from or saved to
+        self._index_stamp: Optional[Tuple[int, ...]] = None
         self._load_project_cache()
 
+    def close(self) -> None:
+        """Record pending cache access times and release the SQLite connections."""
+        if self._accessed:
+            try:
+                with self.batch():
+                    self._save_project_cache()
+            except Exception as e:
+                print(f"Warning: Failed to save cache access times: {e}")
+        if self._sqlite is not None:
+            self._sqlite.close()
+            self._sqlite = None
+        if self._fragments is not None:
+            self._fragments.close()
+            self._fragments = None
+
+    @property
+    def fragments(self) -> FragmentCache:
+        """The project's cache of rendered message fragments, opened on use."""
+        if self._fragments is None:
+            self._fragments = FragmentCache(self.fragment_file, self.library_version)
+        return self._fragments
+
+    def _read_project_index(self) -> Tuple[Optional[Dict[str, Any]], bool]:
+        """Read the raw project index from the backend, or None if there is none.
+
+        Also returns whether the index was read from index.json. With the
+        SQLite backend that happens when the database is empty and a JSON
+        cache is left from the JSON backend; it is migrated once loaded.
+        """
+        if self._sqlite is not None:
+            project_data = self._sqlite.load_project()
+            if project_data is not None:
+                return project_data, False
+        if self.index_file.exists():
+            with open(self.index_file, "r", encoding="utf-8") as f:
+                return json.load(f), True
+        return None, False
+
     def _load_project_cache(self) -> None:
         """Load the project cache index from disk."""
-        if self.index_file.exists():
+        # Taken first, so that an index saved while this one is read is
+        # picked up by the next batch
+        stamp = self._current_index_stamp()
+        from_json_index = False
+        try:
+            cache_data, from_json_index = self._read_project_index()
+        except Exception as e:
+            print(f"Warning: Failed to load cache index, will rebuild: {e}")
+            cache_data = None
+
+        if cache_data is not None:
             try:
-                with open(self.index_file, "r", encoding="utf-8") as f:
-                    cache_data = json.load(f)
                 self._project_cache = ProjectCache.model_validate(cache_data)
 
                 # Check if cache version is compatible with current library version
@@ -107,30 +1218,175 @@ class CacheManager:
                 print(f"Warning: Failed to load cache index, will rebuild: {e}")
                 self._project_cache = None
 
+        loaded = self._project_cache is not None
+
         # Initialize empty cache if none exists
         if self._project_cache is None:
-            self._project_cache = ProjectCache(
-                version=self.library_version,
-                cache_created=datetime.now().isoformat(),
-                last_updated=datetime.now().isoformat(),
-                project_path=str(self.project_path),
-                cached_files={},
-                sessions={},
+            self._project_cache = self._empty_project_cache()
+
+        if self._sqlite is not None and self.index_file.exists():
+            with file_lock(self.lock_file):
+                if loaded and from_json_index:
+                    self._migrate_json_cache()
+                else:
+                    self._remove_json_cache()
+        self._index_stamp = stamp
+
+    def _empty_project_cache(self) -> ProjectCache:
+        """Create the index of a project with nothing cached."""
+        return ProjectCache(
+            version=self.library_version,
+            cache_created=datetime.now().isoformat(),
+            last_updated=datetime.now().isoformat(),
+            project_path=str(self.project_path),
+            cached_files={},
+            sessions={},
+        )
+
+    def _current_index_stamp(self) -> Optional[Tuple[int, ...]]:
+        """Identify the saved index, to tell whether another process replaced it."""
+        if self._sqlite is not None:
+            return (self._sqlite.data_version(),)
+        try:
+            stat = self.index_file.stat()
+        except OSError:
+            return None
+        return (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+
+    def _reload_project_cache(self) -> None:
+        """Pick up the index saved by another process since this one was read.
+
+        Called with the cache lock held, before updating the index, so that
+        updates made by concurrent runs aren't overwritten.
+        """
+        stamp = self._current_index_stamp()
+        if stamp == self._index_stamp:
+            return
+        try:
+            cache_data, _ = self._read_project_index()
+            project_cache = (
+                self._empty_project_cache()
+                if cache_data is None
+                else ProjectCache.model_validate(cache_data)
             )
+        except Exception as e:
+            print(f"Warning: Failed to reload cache index: {e}")
+            return
+        if self._is_cache_version_compatible(project_cache.version):
+            self._project_cache = project_cache
+            self._index_stamp = stamp
+
+    def _migrate_json_cache(self) -> None:
+        """Move a JSON cache into the SQLite database and remove its files.
+
+        Files whose JSON cache can't be read are dropped from the index, so
+        they are parsed again from source.
+        """
+        assert self._sqlite is not None and self._project_cache is not None
+        cached_files = self._project_cache.cached_files
+        for file_name, cached_info in list(cached_files.items()):
+            cache_file = self._get_cache_file_path(Path(file_name), cached_info.codec)
+            try:
+                entries_data = self._read_json_cache_file(cache_file)
+            except Exception:
+                del cached_files[file_name]
+                continue
+            self._sqlite.write_entries(
+                file_name, (_entry_row(entry_data) for entry_data in entries_data)
+            )
+            # Missing aggregates are computed again when merged
+            try:
+                self._sqlite.write_file_aggregates(
+                    file_name,
+                    self._get_aggregates_path(Path(file_name)).read_text(
+                        encoding="utf-8"
+                    ),
+                )
+            except OSError:
+                pass
+        self._save_project_cache()
+        self._remove_json_cache()
+
+    @contextmanager
+    def batch(self) -> Iterator["CacheManager"]:
+        """Collect index updates and save the index once at the end.
+
+        Cached entries are still written as they come in; only the index
+        write is deferred, so a crash within the batch leaves files that are
+        stored but not indexed, which are parsed again on the next run. The
+        index is saved when the outermost batch exits, even on error, since
+        it only records entries that were written. Batches can be nested.
+
+        The outermost batch holds the project's cache lock, so concurrent
+        runs update a project's cache one at a time, and starts from the
+        index as last saved, including files cached by another run. Every
+        update of the cache goes through a batch.
+        """
+        with ExitStack() as stack:
+            if self._batch_depth == 0:
+                stack.enter_context(file_lock(self.lock_file))
+                self._reload_project_cache()
+            self._batch_depth += 1
+            try:
+                yield self
+            finally:
+                self._batch_depth -= 1
+                if self._batch_depth == 0 and self._index_dirty:
+                    try:
+                        self._save_project_cache()
+                    except Exception as e:
+                        print(f"Warning: Failed to save cache index: {e}")
 
     def _save_project_cache(self) -> None:
-        """Save the project cache index to disk."""
+        """Save the project cache index to disk, or defer it within a batch."""
         if self._project_cache is None:
             return
+        if self._batch_depth:
+            self._index_dirty = True
+            return
+        self._index_dirty = False
 
         self._project_cache.last_updated = datetime.now().isoformat()
+        for file_name, accessed in self._accessed.items():
+            cached_info = self._project_cache.cached_files.get(file_name)
+            if cached_info is not None:
+                cached_info.last_accessed = max(cached_info.last_accessed, accessed)
+        self._accessed = {}
+
+        if self._sqlite is not None:
+            self._sqlite.save_project(self._project_cache)
+        else:
+            # Replace the index atomically so a crash never leaves it half written
+            with atomic_write(self.index_file, durable=True) as f:
+                json.dump(self._project_cache.model_dump(), f, separators=(",", ":"))
+        self._index_stamp = self._current_index_stamp()
+
+    def _get_cache_file_path(
+        self, jsonl_path: Path, codec: Optional[CacheCodec] = None
+    ) -> Path:
+        """Get the cache file path for a given JSONL file.
+
+        Without a codec, this is where the file's cache was written (per the
+        codec in its index entry), or for an uncached file where it would be.
+        """
+        if codec is None:
+            cached_info = self.get_cached_file_info(jsonl_path)
+            codec = cached_info.codec if cached_info is not None else self.codec
+        return self.cache_dir / f"{jsonl_path.stem}{CODEC_SUFFIXES[codec]}"
 
-        with open(self.index_file, "w", encoding="utf-8") as f:
-            json.dump(self._project_cache.model_dump(), f, indent=2)
+    def _has_cached_entries(self, jsonl_path: Path) -> bool:
+        """Check that the entries of an indexed file are in the store.
 
-    def _get_cache_file_path(self, jsonl_path: Path) -> Path:
-        """Get the cache file path for a given JSONL file."""
-        return self.cache_dir / f"{jsonl_path.stem}.json"
+        SQLite entries are written before the file is indexed, so only JSON
+        cache files need checking.
+        """
+        if self._sqlite is not None:
+            return True
+        cache_file = self._get_cache_file_path(jsonl_path)
+        return (
+            codec_of_cache_file(cache_file) in available_codecs()
+            and cache_file.exists()
+        )
 
     def is_file_cached(self, jsonl_path: Path) -> bool:
         """Check if a JSONL file has a valid cache entry."""
@@ -146,123 +1402,221 @@ class CacheManager:
             return False
 
         cached_info = self._project_cache.cached_files[file_key]
-        source_mtime = jsonl_path.stat().st_mtime
+        source_stat = jsonl_path.stat()
+
+        # Cache is valid if the file has the size and modification time it
+        # was parsed at, and the entries are stored
+        if (
+            cached_info.source_size is not None
+            and source_stat.st_size != cached_info.source_size
+        ):
+            return False
+        return abs(
+            source_stat.st_mtime - cached_info.source_mtime
+        ) < 1.0 and self._has_cached_entries(jsonl_path)
 
-        # Cache is valid if modification times match and cache file exists
-        cache_file = self._get_cache_file_path(jsonl_path)
-        return (
-            abs(source_mtime - cached_info.source_mtime) < 1.0 and cache_file.exists()
-        )
+    def _record_access(self, file_names: Iterable[str]) -> None:
+        """Note that the caches of files were read.
 
-    def load_cached_entries(self, jsonl_path: Path) -> Optional[List[TranscriptEntry]]:
-        """Load cached transcript entries for a JSONL file."""
+        Access times go into the index with its next save (or on close()),
+        and only once per ACCESS_TIME_RESOLUTION, so reads don't write.
+        """
+        if self._project_cache is None:
+            return
+        now = time.time()
+        for file_name in file_names:
+            cached_info = self._project_cache.cached_files.get(file_name)
+            if (
+                cached_info is not None
+                and now - cached_info.last_accessed >= ACCESS_TIME_RESOLUTION
+            ):
+                self._accessed[file_name] = now
+
+    def load_cached_entries(
+        self, jsonl_path: Path, validation: ValidationLevel = "none"
+    ) -> Optional[List[TranscriptEntry]]:
+        """Load cached transcript entries for a JSONL file.
+
+        Cached entries were decoded when the source was parsed, so by default
+        they are rebuilt without validation.
+        """
         if not self.is_file_cached(jsonl_path):
             return None
 
+        return self._read_cached_entries(jsonl_path, validation)
+
+    def _read_cached_entries(
+        self, jsonl_path: Path, validation: ValidationLevel = "none"
+    ) -> Optional[List[TranscriptEntry]]:
+        """Read every entry of a cache file, without checking it is up to date."""
         cache_file = self._get_cache_file_path(jsonl_path)
         try:
-            with open(cache_file, "r", encoding="utf-8") as f:
-                cache_data = json.load(f)
-
-            # Expect timestamp-keyed format - flatten all entries
-            entries_data: List[Dict[str, Any]] = []
-            for timestamp_entries in cache_data.values():
-                if isinstance(timestamp_entries, list):
-                    # Type cast to ensure Pyright knows this is List[Dict[str, Any]]
-                    entries_data.extend(cast(List[Dict[str, Any]], timestamp_entries))
+            if self._sqlite is not None:
+                entries_data: Iterable[Dict[str, Any]] = self._sqlite.read_entries(
+                    jsonl_path.name
+                )
+            else:
+                entries_data = self._read_json_cache_file(cache_file)
 
             # Deserialize back to TranscriptEntry objects
-            from .models import parse_transcript_entry
-
             entries = [
-                parse_transcript_entry(entry_dict) for entry_dict in entries_data
+                self._blobs.decode_entry(entry_dict, validation)
+                for entry_dict in entries_data
             ]
+            self._record_access([jsonl_path.name])
             return entries
         except Exception as e:
             print(f"Warning: Failed to load cached entries from {cache_file}: {e}")
             return None
 
-    def load_cached_entries_filtered(
-        self, jsonl_path: Path, from_date: Optional[str], to_date: Optional[str]
-    ) -> Optional[List[TranscriptEntry]]:
-        """Load cached entries with efficient timestamp-based filtering."""
-        if not self.is_file_cached(jsonl_path):
+    def get_append_position(self, jsonl_path: Path) -> Optional[Tuple[int, int]]:
+        """Return the byte offset and line number to resume parsing a grown file.
+
+        Returns None unless the file is at least as long as when it was cached
+        and the bytes before the cached offset are unchanged. So does a JSON
+        cache file written since it was indexed (e.g. by an interrupted
+        batch), whose entries the index doesn't account for.
+        """
+        cached_info = self.get_cached_file_info(jsonl_path)
+        if cached_info is None or not cached_info.tail_checksum:
+            return None
+        if not self._has_cached_entries(jsonl_path):
             return None
 
-        cache_file = self._get_cache_file_path(jsonl_path)
         try:
-            with open(cache_file, "r", encoding="utf-8") as f:
-                cache_data = json.load(f)
+            if (
+                self._sqlite is None
+                and self._get_cache_file_path(jsonl_path).stat().st_mtime
+                != cached_info.cached_mtime
+            ):
+                return None
+            if jsonl_path.stat().st_size < cached_info.parsed_offset:
+                return None
+            checksum = compute_tail_checksum(jsonl_path, cached_info.parsed_offset)
+        except OSError:
+            return None
+        if checksum != cached_info.tail_checksum:
+            return None
 
-            # If no date filtering needed, fall back to regular loading
-            if not from_date and not to_date:
-                return self.load_cached_entries(jsonl_path)
+        return cached_info.parsed_offset, cached_info.parsed_lines
 
-            # Parse date filters
-            from .parser import parse_timestamp
-            import dateparser
+    def load_appendable_entries(
+        self, jsonl_path: Path, validation: ValidationLevel = "none"
+    ) -> Optional[Tuple[List[TranscriptEntry], int, int]]:
+        """Load the cached entries of a file that has only been appended to.
 
-            from_dt = None
-            to_dt = None
+        Returns the entries with the byte offset and line number from which
+        the appended lines should be parsed, or None if the file needs a full
+        reparse.
+        """
+        position = self.get_append_position(jsonl_path)
+        if position is None:
+            return None
 
-            if from_date:
-                from_dt = dateparser.parse(from_date)
-                if from_dt and (
-                    from_date in ["today", "yesterday"] or "days ago" in from_date
-                ):
-                    from_dt = from_dt.replace(hour=0, minute=0, second=0, microsecond=0)
-
-            if to_date:
-                to_dt = dateparser.parse(to_date)
-                if to_dt:
-                    if to_date in ["today", "yesterday"] or "days ago" in to_date:
-                        to_dt = to_dt.replace(
-                            hour=23, minute=59, second=59, microsecond=999999
-                        )
-                    else:
-                        # For simple date strings like "2023-01-01", set to end of day
-                        to_dt = to_dt.replace(
-                            hour=23, minute=59, second=59, microsecond=999999
-                        )
+        entries = self._read_cached_entries(jsonl_path, validation)
+        cached_info = self.get_cached_file_info(jsonl_path)
+        # Entries appended to the store after the index was last saved (e.g.
+        # by an interrupted batch) would otherwise be parsed twice
+        if (
+            entries is None
+            or cached_info is None
+            or len(entries) != cached_info.message_count
+        ):
+            return None
+        return entries, position[0], position[1]
 
-            # Filter entries by timestamp
-            filtered_entries_data: List[Dict[str, Any]] = []
+    def _date_prefilter(
+        self, from_date: Optional[str], to_date: Optional[str]
+    ) -> "TimestampPrefilter":
+        """Parse a date range into a prefilter, once per range.
 
-            for timestamp_key, timestamp_entries in cache_data.items():
-                if timestamp_key == "_no_timestamp":
-                    # Always include entries without timestamps (like summaries)
-                    if isinstance(timestamp_entries, list):
-                        # Type cast to ensure Pyright knows this is List[Dict[str, Any]]
-                        filtered_entries_data.extend(
-                            cast(List[Dict[str, Any]], timestamp_entries)
-                        )
-                else:
-                    # Check if timestamp falls within range
-                    message_dt = parse_timestamp(timestamp_key)
-                    if message_dt:
-                        # Convert to naive datetime for comparison
-                        if message_dt.tzinfo:
-                            message_dt = message_dt.replace(tzinfo=None)
-
-                        # Apply date filtering
-                        if from_dt and message_dt < from_dt:
-                            continue
-                        if to_dt and message_dt > to_dt:
-                            continue
-
-                    if isinstance(timestamp_entries, list):
-                        # Type cast to ensure Pyright knows this is List[Dict[str, Any]]
-                        filtered_entries_data.extend(
-                            cast(List[Dict[str, Any]], timestamp_entries)
-                        )
+        Unlike parse_date_range, a to_date always ends at the end of its day.
+        """
+        key = (from_date, to_date)
+        if key in self._prefilters:
+            return self._prefilters[key]
 
-            # Deserialize filtered entries
-            from .models import parse_transcript_entry
+        from .parser import TimestampPrefilter
+        import dateparser
+
+        from_dt = None
+        to_dt = None
 
+        if from_date:
+            from_dt = dateparser.parse(from_date)
+            if from_dt and (
+                from_date in ["today", "yesterday"] or "days ago" in from_date
+            ):
+                from_dt = from_dt.replace(hour=0, minute=0, second=0, microsecond=0)
+
+        if to_date:
+            to_dt = dateparser.parse(to_date)
+            if to_dt:
+                to_dt = to_dt.replace(hour=23, minute=59, second=59, microsecond=999999)
+
+        prefilter = self._prefilters[key] = TimestampPrefilter(from_dt, to_dt)
+        return prefilter
+
+    def load_cached_entries_filtered(
+        self,
+        jsonl_path: Path,
+        from_date: Optional[str],
+        to_date: Optional[str],
+        validation: ValidationLevel = "none",
+    ) -> Optional[List[TranscriptEntry]]:
+        """Load cached entries with efficient timestamp-based filtering.
+
+        The date range is looked up in the cache file's sorted timestamp
+        index (or the entries table's index with SQLite), so only entries in
+        range (and entries without a timestamp) are read and decoded. Caches
+        without an index have their timestamp keys checked instead. If the
+        cache index shows that all of a file's timestamps are out of range
+        and it has no entries without one, the cache file isn't read at all.
+        """
+        if not self.is_file_cached(jsonl_path):
+            return None
+
+        # If no date filtering needed, fall back to regular loading
+        if not from_date and not to_date:
+            return self.load_cached_entries(jsonl_path, validation)
+
+        prefilter = self._date_prefilter(from_date, to_date)
+
+        cached_info = self.get_cached_file_info(jsonl_path)
+        if (
+            cached_info is not None
+            and cached_info.earliest_timestamp
+            and cached_info.no_timestamp_count == 0
+            and not prefilter.may_overlap(
+                cached_info.earliest_timestamp, cached_info.latest_timestamp
+            )
+        ):
+            return []
+
+        cache_file = self._get_cache_file_path(jsonl_path)
+        try:
+            if self._sqlite is not None:
+                filtered_entries_data: Iterable[Dict[str, Any]] = (
+                    self._sqlite.read_entries(
+                        jsonl_path.name, prefilter.from_ms, prefilter.to_ms
+                    )
+                )
+            else:
+                indexed_entries_data = self._read_indexed_json_cache_file(
+                    jsonl_path, cache_file, prefilter
+                )
+                filtered_entries_data = (
+                    indexed_entries_data
+                    if indexed_entries_data is not None
+                    else self._read_json_cache_file(cache_file, prefilter)
+                )
+
+            # Deserialize filtered entries
             entries = [
-                parse_transcript_entry(entry_dict)
+                self._blobs.decode_entry(entry_dict, validation)
                 for entry_dict in filtered_entries_data
             ]
+            self._record_access([jsonl_path.name])
             return entries
         except Exception as e:
             print(
@@ -270,72 +1624,683 @@ class CacheManager:
             )
             return None
 
+    def load_session_entries(
+        self,
+        session_id: str,
+        jsonl_files: Iterable[Path],
+        from_date: Optional[str] = None,
+        to_date: Optional[str] = None,
+        validation: ValidationLevel = "none",
+    ) -> Optional[List[TranscriptEntry]]:
+        """Load the cached entries of one session in timestamp order.
+
+        jsonl_files are the files that may contain the session; None is
+        returned unless they are all cached. Only the SQLite backend can look
+        up a session without reading whole files, so the JSON backend always
+        returns None. Entries may include some just outside the date range,
+        which callers filter exactly.
+        """
+        if self._sqlite is None:
+            return None
+        jsonl_files = list(jsonl_files)
+        if not all(self.is_file_cached(jsonl_path) for jsonl_path in jsonl_files):
+            return None
+
+        from_ms = to_ms = None
+        if from_date or to_date:
+            from .parser import TimestampPrefilter
+
+            prefilter = TimestampPrefilter.from_dates(from_date, to_date)
+            from_ms, to_ms = prefilter.from_ms, prefilter.to_ms
+
+        try:
+            entries = [
+                self._blobs.decode_entry(entry_data, validation)
+                for entry_data in self._sqlite.read_session_entries(
+                    session_id, from_ms, to_ms
+                )
+            ]
+            self._record_access(jsonl_path.name for jsonl_path in jsonl_files)
+            return entries
+        except Exception as e:
+            print(
+                f"Warning: Failed to load cached entries of session {session_id}: {e}"
+            )
+            return None
+
+    def _get_timestamp_index_path(self, jsonl_path: Path) -> Path:
+        """Get the path of the timestamp index of a file's JSON cache."""
+        return self.cache_dir / f"{jsonl_path.stem}{TIMESTAMP_INDEX_SUFFIX}"
+
+    def _write_timestamp_index(self, jsonl_path: Path, index: TimestampIndex) -> None:
+        """Store the timestamp index of a freshly written JSON cache file."""
+        atomic_write_text(
+            self._get_timestamp_index_path(jsonl_path), index.model_dump_json()
+        )
+
+    def _load_timestamp_index(
+        self, jsonl_path: Path, cache_stat: os.stat_result
+    ) -> Optional[TimestampIndex]:
+        """Load the timestamp index of a JSON cache file, if it describes it.
+
+        Caches written before indexes existed, or replaced by another run
+        after the index was read, have none.
+        """
+        try:
+            index = TimestampIndex.model_validate_json(
+                self._get_timestamp_index_path(jsonl_path).read_bytes()
+            )
+        except (OSError, ValueError):
+            return None
+        return index if index.describes(cache_stat) else None
+
+    def _get_aggregates_path(self, jsonl_path: Path) -> Path:
+        """Get the path of the aggregates of a file's JSON cache."""
+        return self.cache_dir / f"{jsonl_path.stem}{AGGREGATES_SUFFIX}"
+
+    def _write_file_aggregates(
+        self, cached_info: CachedFileInfo, aggregates: SessionAggregator
+    ) -> None:
+        """Store the aggregates of the file version described by cached_info."""
+        data = FileAggregates(
+            source_mtime=cached_info.source_mtime,
+            message_count=cached_info.message_count,
+            aggregates=aggregates,
+        ).model_dump_json()
+        jsonl_path = Path(cached_info.file_path)
+        if self._sqlite is not None:
+            self._sqlite.write_file_aggregates(jsonl_path.name, data)
+        else:
+            atomic_write_text(self._get_aggregates_path(jsonl_path), data)
+
+    def get_file_aggregates(self, jsonl_path: Path) -> Optional[SessionAggregator]:
+        """Get the aggregates of a cached file's entries.
+
+        Returns None if the file isn't indexed, or its aggregates weren't
+        stored for the indexed version (like files cached before they were).
+        """
+        cached_info = self.get_cached_file_info(jsonl_path)
+        if cached_info is None:
+            return None
+        try:
+            if self._sqlite is not None:
+                data = self._sqlite.read_file_aggregates(jsonl_path.name)
+                if data is None:
+                    return None
+            else:
+                data = self._get_aggregates_path(jsonl_path).read_text(encoding="utf-8")
+            file_aggregates = FileAggregates.model_validate_json(data)
+        except (OSError, ValueError, sqlite3.Error):
+            return None
+        if not file_aggregates.describes(cached_info):
+            return None
+        return file_aggregates.aggregates
+
+    def _read_indexed_json_cache_file(
+        self, jsonl_path: Path, cache_file: Path, prefilter: "TimestampPrefilter"
+    ) -> Optional[List[Dict[str, Any]]]:
+        """Read the entries of a JSON cache file in range, using its index.
+
+        Only the entry lists of timestamp keys in range (and of keys without
+        a timestamp) are read and decoded; uncompressed files are read at
+        their offsets. Returns None if the file has no usable index.
+        """
+        codec = codec_of_cache_file(cache_file)
+        with open(cache_file, "rb") as f:
+            # The index must describe the file that was opened
+            cache_stat = os.fstat(f.fileno())
+            index = self._load_timestamp_index(jsonl_path, cache_stat)
+            if index is None:
+                return None
+            spans = index.spans_in_range(prefilter.from_ms, prefilter.to_ms)
+            if codec == "none":
+                values = list(_read_spans(f, spans, cache_stat.st_size))
+            else:
+                document = decompress_cache_data(f.read(), codec)
+                values = list(_read_spans(io.BytesIO(document), spans, len(document)))
+
+        entries_data: List[Dict[str, Any]] = []
+        try:
+            for value in values:
+                entries_data.extend(json.loads(value))
+        except ValueError:
+            return None
+        return entries_data
+
+    @staticmethod
+    def _read_json_cache_file(
+        cache_file: Path, prefilter: Optional["TimestampPrefilter"] = None
+    ) -> List[Dict[str, Any]]:
+        """Read the entries of a timestamp-keyed JSON cache file.
+
+        With a prefilter, only entries whose timestamp key it contains and
+        entries without a timestamp are returned.
+        """
+        with open(cache_file, "rb") as f:
+            cache_data = json.loads(
+                decompress_cache_data(f.read(), codec_of_cache_file(cache_file))
+            )
+
+        entries_data: List[Dict[str, Any]] = []
+        for timestamp_key, timestamp_entries in cache_data.items():
+            # Always include entries without timestamps (like summaries)
+            if (
+                prefilter is not None
+                and not timestamp_key.startswith("_no_timestamp")
+                and not prefilter.contains(timestamp_key)
+            ):
+                continue
+
+            if isinstance(timestamp_entries, list):
+                # Type cast to ensure Pyright knows this is List[Dict[str, Any]]
+                entries_data.extend(cast(List[Dict[str, Any]], timestamp_entries))
+        return entries_data
+
+    def _serialize_entry(self, entry: TranscriptEntry) -> Dict[str, Any]:
+        """Serialise an entry for the cache, moving large payloads to blobs."""
+        # Unvalidated entries keep raw dicts in union fields such as
+        # toolUseResult; they serialise as-is, so skip the warnings
+        return self._blobs.externalize_entry(entry.model_dump(warnings=False))
+
+    def _group_by_timestamp(
+        self, entries: List[TranscriptEntry]
+    ) -> Dict[str, List[Dict[str, Any]]]:
+        """Serialise entries into the timestamp-keyed cache structure."""
+        cache_data: Dict[str, List[Dict[str, Any]]] = {}
+
+        for entry in entries:
+            # Get timestamp - use empty string as fallback for entries without timestamps
+            timestamp = (
+                getattr(entry, "timestamp", "") if hasattr(entry, "timestamp") else ""
+            )
+            if not timestamp:
+                # Use a special key for entries without timestamps (like summaries)
+                timestamp = "_no_timestamp"
+
+            # Store entry data under timestamp
+            if timestamp not in cache_data:
+                cache_data[timestamp] = []
+
+            cache_data[timestamp].append(self._serialize_entry(entry))
+
+        return cache_data
+
+    def _entry_rows(self, entries: List[TranscriptEntry]) -> Iterator[_EntryRow]:
+        """Serialise entries into rows of the SQLite entries table."""
+        for entry in entries:
+            yield _entry_row(self._serialize_entry(entry))
+
+    @staticmethod
+    def _session_ids(entries: List[TranscriptEntry]) -> List[str]:
+        """Extract the distinct session IDs of entries."""
+        session_ids: List[str] = []
+        for entry in entries:
+            if hasattr(entry, "sessionId"):
+                session_id = getattr(entry, "sessionId", "")
+                if session_id:
+                    session_ids.append(session_id)
+        return list(set(session_ids))  # Remove duplicates
+
+    @staticmethod
+    def _timestamp_range(entries: List[TranscriptEntry]) -> Dict[str, Any]:
+        """The timestamp range fields of the cache index entry of entries."""
+        timestamps = [
+            timestamp
+            for timestamp in (getattr(entry, "timestamp", "") for entry in entries)
+            if timestamp
+        ]
+        return {
+            "earliest_timestamp": min(timestamps, default=""),
+            "latest_timestamp": max(timestamps, default=""),
+            "no_timestamp_count": len(entries) - len(timestamps),
+            "earliest_ms": min(
+                (
+                    timestamp_ms
+                    for timestamp_ms in (
+                        getattr(entry, "timestamp_ms", None) for entry in entries
+                    )
+                    if timestamp_ms is not None
+                ),
+                default=None,
+            ),
+        }
+
+    def _cached_mtime(self, jsonl_path: Path, codec: CacheCodec) -> float:
+        """Modification time of the store holding a file's cached entries."""
+        if self._sqlite is not None:
+            return self.db_file.stat().st_mtime
+        return self._get_cache_file_path(jsonl_path, codec).stat().st_mtime
+
+    def _record_cached_file(
+        self,
+        jsonl_path: Path,
+        entries: List[TranscriptEntry],
+        session_ids: List[str],
+        parsed_offset: int,
+        parsed_lines: int,
+        aggregates: Optional[SessionAggregator] = None,
+        source_stat: Optional[os.stat_result] = None,
+    ) -> None:
+        """Update the cache index entry of a freshly written cache file.
+
+        The file's aggregates are computed from its entries unless given.
+        source_stat is the stat of the source taken before it was parsed,
+        which defaults to its current stat.
+        """
+        if self._project_cache is None:
+            return
+
+        codec: CacheCodec = "none"
+        codec_level = None
+        if self._sqlite is None:
+            codec, codec_level = self.codec, self.codec_level
+        if source_stat is None:
+            source_stat = jsonl_path.stat()
+        cached_info = CachedFileInfo(
+            file_path=str(jsonl_path),
+            source_mtime=source_stat.st_mtime,
+            source_size=source_stat.st_size,
+            cached_mtime=self._cached_mtime(jsonl_path, codec),
+            message_count=len(entries),
+            session_ids=session_ids,
+            **self._timestamp_range(entries),
+            parsed_offset=parsed_offset,
+            parsed_lines=parsed_lines,
+            tail_checksum=(
+                compute_tail_checksum(jsonl_path, parsed_offset)
+                if parsed_offset
+                else ""
+            ),
+            codec=codec,
+            codec_level=codec_level,
+            last_accessed=time.time(),
+        )
+        # Written before the index, so an indexed file version has them
+        self._write_file_aggregates(
+            cached_info,
+            (
+                aggregates
+                if aggregates is not None
+                else SessionAggregator.from_file_entries(entries)
+            ),
+        )
+        self._project_cache.cached_files[jsonl_path.name] = cached_info
+
+        self._save_project_cache()
+
     def save_cached_entries(
-        self, jsonl_path: Path, entries: List[TranscriptEntry]
+        self,
+        jsonl_path: Path,
+        entries: List[TranscriptEntry],
+        parsed_offset: int = 0,
+        parsed_lines: int = 0,
+        source_stat: Optional[os.stat_result] = None,
     ) -> None:
-        """Save parsed transcript entries to cache with timestamp-based structure."""
-        cache_file = self._get_cache_file_path(jsonl_path)
+        """Save parsed transcript entries to cache with timestamp-based structure.
+
+        parsed_offset and parsed_lines record where parsing of the source
+        stopped; when given, later appends to the file are parsed from there.
+        Pass the stat of the source taken before parsing it as source_stat,
+        so that lines appended meanwhile make the cache out of date.
+        """
+        cache_file = self._get_cache_file_path(jsonl_path, self.codec)
 
         try:
-            # Create timestamp-keyed cache structure for efficient date filtering
-            cache_data: Dict[str, Any] = {}
-
-            for entry in entries:
-                # Get timestamp - use empty string as fallback for entries without timestamps
-                timestamp = (
-                    getattr(entry, "timestamp", "")
-                    if hasattr(entry, "timestamp")
-                    else ""
+            with self.batch():
+                previous_file = self._get_cache_file_path(jsonl_path)
+                if self._sqlite is not None:
+                    self._sqlite.write_entries(
+                        jsonl_path.name, self._entry_rows(entries)
+                    )
+                else:
+                    # Create timestamp-keyed cache structure for efficient date filtering
+                    document, key_spans = encode_cache_members(
+                        self._group_by_timestamp(entries)
+                    )
+
+                    # Written under a temporary name, so readers see either
+                    # the previous cache or this one
+                    atomic_write_bytes(
+                        cache_file,
+                        compress_cache_data(document, self.codec, self.codec_level),
+                    )
+                    self._write_timestamp_index(
+                        jsonl_path, TimestampIndex.build(key_spans, cache_file.stat())
+                    )
+                    if previous_file != cache_file:
+                        previous_file.unlink(missing_ok=True)
+
+                # Update cache index
+                self._record_cached_file(
+                    jsonl_path,
+                    entries,
+                    self._session_ids(entries),
+                    parsed_offset,
+                    parsed_lines,
+                    source_stat=source_stat,
                 )
-                if not timestamp:
-                    # Use a special key for entries without timestamps (like summaries)
-                    timestamp = "_no_timestamp"
+        except Exception as e:
+            print(f"Warning: Failed to save cached entries to {cache_file}: {e}")
 
-                # Store entry data under timestamp
-                if timestamp not in cache_data:
-                    cache_data[timestamp] = []
+    def append_cached_entries(
+        self,
+        jsonl_path: Path,
+        new_entries: List[TranscriptEntry],
+        cached_count: int,
+        parsed_offset: int,
+        parsed_lines: int,
+        source_stat: Optional[os.stat_result] = None,
+    ) -> None:
+        """Add the entries parsed from a grown file to its existing cache.
+
+        new_entries were parsed from the lines appended after the cached
+        file's cached_count entries. They are stored after the cached entries,
+        which are neither read nor serialised again: the new timestamp keys
+        are written over the end of the JSON cache file and added to its
+        timestamp index, or the new rows inserted with SQLite. If the cache
+        was updated by another run since the append position was read, it is
+        kept when it was parsed at least as far, and dropped otherwise.
+        """
+        with self.batch():
+            cached_info = self.get_cached_file_info(jsonl_path)
+            if cached_info is None or cached_info.message_count != cached_count:
+                if (
+                    cached_info is not None
+                    and cached_info.parsed_offset < parsed_offset
+                ):
+                    self._remove_file_caches([jsonl_path.name])
+                return
+            self._append_cached_entries(
+                jsonl_path,
+                cached_info,
+                new_entries,
+                parsed_offset,
+                parsed_lines,
+                source_stat,
+            )
 
-                cache_data[timestamp].append(entry.model_dump())
+    def _append_cached_entries(
+        self,
+        jsonl_path: Path,
+        cached_info: CachedFileInfo,
+        new_entries: List[TranscriptEntry],
+        parsed_offset: int,
+        parsed_lines: int,
+        source_stat: Optional[os.stat_result],
+    ) -> None:
+        """Store the new entries of a grown file, holding the cache lock."""
+        cache_file = self._get_cache_file_path(jsonl_path)
+        try:
+            if self._sqlite is not None:
+                self._sqlite.write_entries(
+                    jsonl_path.name,
+                    self._entry_rows(new_entries),
+                    cached_info.message_count,
+                )
+            elif new_entries and not self._splice_json_cache(
+                jsonl_path, new_entries, cached_info.parsed_lines
+            ):
+                self._rewrite_appended_cache(
+                    jsonl_path,
+                    cached_info,
+                    new_entries,
+                    parsed_offset,
+                    parsed_lines,
+                    source_stat,
+                )
+                return
+            self._record_appended_file(
+                jsonl_path,
+                cached_info,
+                new_entries,
+                parsed_offset,
+                parsed_lines,
+                source_stat,
+            )
+        except Exception as e:
+            print(f"Warning: Failed to append cached entries to {cache_file}: {e}")
+            self._rewrite_appended_cache(
+                jsonl_path,
+                cached_info,
+                new_entries,
+                parsed_offset,
+                parsed_lines,
+                source_stat,
+            )
 
-            with open(cache_file, "w", encoding="utf-8") as f:
-                json.dump(cache_data, f, indent=2)
+    def _splice_json_cache(
+        self, jsonl_path: Path, new_entries: List[TranscriptEntry], first_line: int
+    ) -> bool:
+        """Add entries to the end of a file's JSON cache and timestamp index.
+
+        The new timestamp keys are written over the closing brace of the
+        cache object; a compressed cache is decompressed and compressed again
+        around them. Entries without a timestamp go under a key of their own
+        per append, named after the line parsing started at (first_line).
+        Returns False if the file has to be rewritten instead: when a new key
+        may already be in it, since JSON objects can't repeat keys, when it
+        has no current timestamp index to check that with, or when it was
+        written with another codec.
+        """
+        cache_file = self._get_cache_file_path(jsonl_path)
+        codec = codec_of_cache_file(cache_file)
+        if codec != self.codec:
+            return False
+        new_data = {
+            (f"_no_timestamp:{first_line}" if key == "_no_timestamp" else key): data
+            for key, data in self._group_by_timestamp(new_entries).items()
+        }
 
-            # Update cache index
-            if self._project_cache is not None:
-                source_mtime = jsonl_path.stat().st_mtime
-                cached_mtime = cache_file.stat().st_mtime
-
-                # Extract session IDs from entries
-                session_ids: List[str] = []
-                for entry in entries:
-                    if hasattr(entry, "sessionId"):
-                        session_id = getattr(entry, "sessionId", "")
-                        if session_id:
-                            session_ids.append(session_id)
-                session_ids = list(set(session_ids))  # Remove duplicates
-
-                self._project_cache.cached_files[jsonl_path.name] = CachedFileInfo(
-                    file_path=str(jsonl_path),
-                    source_mtime=source_mtime,
-                    cached_mtime=cached_mtime,
-                    message_count=len(entries),
-                    session_ids=session_ids,
+        replacement: Optional[bytes] = None
+        with open(cache_file, "r+b") as f:
+            index = self._load_timestamp_index(jsonl_path, os.fstat(f.fileno()))
+            if index is None:
+                return False
+            cached_timestamps = set(index.timestamps)
+            for key in new_data:
+                timestamp_ms = timestamp_to_ms(key)
+                if timestamp_ms in cached_timestamps or (
+                    timestamp_ms is None and not key.startswith("_no_timestamp:")
+                ):
+                    return False
+
+            if codec == "none":
+                f.seek(0, os.SEEK_END)
+                head_size = f.tell() - 2
+                f.seek(head_size)
+                closing = f.read()
+            else:
+                document = decompress_cache_data(f.read(), codec)
+                head_size = len(document) - 2
+                closing = document[head_size:]
+            # The object ends with its closing brace on a line of its own,
+            # after at least one key
+            if closing != b"\n}" or not (index.timestamps or index.unindexed):
+                raise ValueError("cache file is not a non-empty object")
+            body, key_spans = encode_cache_members(new_data, b",\n", head_size)
+            if codec == "none":
+                f.seek(head_size)
+                f.write(body)
+            else:
+                replacement = compress_cache_data(
+                    document[:head_size] + body, self.codec, self.codec_level
                 )
+        if replacement is not None:
+            # Replaced whole, so it is never seen half written
+            atomic_write_bytes(cache_file, replacement)
+        self._write_timestamp_index(
+            jsonl_path, index.extend(key_spans, cache_file.stat())
+        )
+        return True
 
-                self._save_project_cache()
-        except Exception as e:
-            print(f"Warning: Failed to save cached entries to {cache_file}: {e}")
+    def _rewrite_appended_cache(
+        self,
+        jsonl_path: Path,
+        cached_info: CachedFileInfo,
+        new_entries: List[TranscriptEntry],
+        parsed_offset: int,
+        parsed_lines: int,
+        source_stat: Optional[os.stat_result],
+    ) -> None:
+        """Write a grown file's cache again, with its cached and new entries.
 
-    def update_session_cache(self, session_data: Dict[str, SessionCacheData]) -> None:
-        """Update cached session information."""
+        For appends that can't be added to the cache as it is. If the cached
+        entries can't be read back, the file's cache is dropped so that it is
+        parsed again.
+        """
+        entries = self._read_cached_entries(jsonl_path)
+        if entries is None or len(entries) != cached_info.message_count:
+            self._remove_file_caches([jsonl_path.name])
+            return
+        self.save_cached_entries(
+            jsonl_path, entries + new_entries, parsed_offset, parsed_lines, source_stat
+        )
+
+    def _record_appended_file(
+        self,
+        jsonl_path: Path,
+        cached_info: CachedFileInfo,
+        new_entries: List[TranscriptEntry],
+        parsed_offset: int,
+        parsed_lines: int,
+        source_stat: Optional[os.stat_result],
+    ) -> None:
+        """Update the cache index entry of a file whose new entries were stored.
+
+        The entry is updated from the new entries alone, as are the file's
+        aggregates; aggregates that weren't stored are computed when they are
+        next merged.
+        """
         if self._project_cache is None:
             return
 
-        self._project_cache.sessions.update(
-            {session_id: data for session_id, data in session_data.items()}
+        # Read while they still describe the indexed file version
+        aggregates = self.get_file_aggregates(jsonl_path)
+        new_range = self._timestamp_range(new_entries)
+        earliest_timestamps = [
+            timestamp
+            for timestamp in (
+                cached_info.earliest_timestamp,
+                new_range["earliest_timestamp"],
+            )
+            if timestamp
+        ]
+        earliest_ms = cached_info.earliest_ms
+        # Files cached before earliest_ms was recorded stay without it
+        if earliest_ms is not None or not cached_info.earliest_timestamp:
+            earliest_ms = min(
+                (
+                    timestamp_ms
+                    for timestamp_ms in (earliest_ms, new_range["earliest_ms"])
+                    if timestamp_ms is not None
+                ),
+                default=None,
+            )
+        if source_stat is None:
+            source_stat = jsonl_path.stat()
+        updated_info = cached_info.model_copy(
+            update={
+                "source_mtime": source_stat.st_mtime,
+                "source_size": source_stat.st_size,
+                "cached_mtime": self._cached_mtime(jsonl_path, cached_info.codec),
+                "message_count": cached_info.message_count + len(new_entries),
+                "session_ids": list(
+                    set(cached_info.session_ids).union(self._session_ids(new_entries))
+                ),
+                "earliest_timestamp": min(earliest_timestamps, default=""),
+                "latest_timestamp": max(
+                    cached_info.latest_timestamp, new_range["latest_timestamp"]
+                ),
+                "no_timestamp_count": cached_info.no_timestamp_count
+                + new_range["no_timestamp_count"],
+                "earliest_ms": earliest_ms,
+                "parsed_offset": parsed_offset,
+                "parsed_lines": parsed_lines,
+                "tail_checksum": compute_tail_checksum(jsonl_path, parsed_offset),
+                "last_accessed": time.time(),
+            }
         )
+        if aggregates is not None:
+            aggregates.merge(SessionAggregator.from_file_entries(new_entries))
+            self._write_file_aggregates(updated_info, aggregates)
+        self._project_cache.cached_files[jsonl_path.name] = updated_info
+
         self._save_project_cache()
 
+    def _output_key(self, output_path: Path) -> str:
+        """Name outputs in the project directory by file name, others by path."""
+        if output_path.parent == self.project_path:
+            return output_path.name
+        return str(output_path.resolve())
+
+    def get_output_fingerprint(self, output_path: Path) -> Optional[str]:
+        """Return the input fingerprint an output was last generated from."""
+        if self._project_cache is None:
+            return None
+        return self._project_cache.outputs.get(self._output_key(output_path))
+
+    def record_outputs(self, fingerprints: Dict[Path, str]) -> None:
+        """Record the input fingerprints of freshly generated outputs."""
+        if not fingerprints:
+            return
+        with self.batch():
+            if self._project_cache is None:
+                return
+            for output_path, fingerprint in fingerprints.items():
+                self._project_cache.outputs[self._output_key(output_path)] = fingerprint
+            self._save_project_cache()
+
+    def get_cached_file_info(self, jsonl_path: Path) -> Optional[CachedFileInfo]:
+        """Get the cache index entry of a JSONL file, if any."""
+        if self._project_cache is None:
+            return None
+        return self._project_cache.cached_files.get(jsonl_path.name)
+
+    def merge_file_aggregates(
+        self, jsonl_files: List[Path]
+    ) -> Optional[SessionAggregator]:
+        """Merge the aggregates of cached files into the project's.
+
+        The files are merged in the order iter_project opens them, by their
+        earliest timestamp. The aggregates of files cached before they were
+        recorded are computed once from the cached entries. Returns None if
+        a file isn't cached, so the project has to be aggregated from its
+        entries.
+        """
+        parts: List[Tuple[int, int, SessionAggregator]] = []
+        with self.batch():
+            for file_index, jsonl_path in enumerate(jsonl_files):
+                cached_info = self.get_cached_file_info(jsonl_path)
+                if cached_info is None or not self.is_file_cached(jsonl_path):
+                    return None
+                aggregates = self.get_file_aggregates(jsonl_path)
+                if aggregates is None:
+                    entries = self._read_cached_entries(jsonl_path)
+                    if entries is None:
+                        return None
+                    aggregates = SessionAggregator.from_file_entries(entries)
+                    self._write_file_aggregates(cached_info, aggregates)
+                earliest_ms = aggregates.earliest_ms
+                parts.append(
+                    (-1 if earliest_ms is None else earliest_ms, file_index, aggregates)
+                )
+
+        project_aggregates = SessionAggregator()
+        for _, _, aggregates in sorted(parts, key=lambda part: part[:2]):
+            project_aggregates.merge(aggregates)
+        return project_aggregates
+
+    def update_session_cache(self, session_data: Dict[str, SessionCacheData]) -> None:
+        """Update cached session information."""
+        with self.batch():
+            if self._project_cache is None:
+                return
+
+            self._project_cache.sessions.update(
+                {session_id: data for session_id, data in session_data.items()}
+            )
+            self._save_project_cache()
+
     def update_project_aggregates(
         self,
         total_message_count: int,
@@ -347,26 +2312,29 @@ class CacheManager:
         latest_timestamp: str,
     ) -> None:
         """Update project-level aggregate information."""
-        if self._project_cache is None:
-            return
+        with self.batch():
+            if self._project_cache is None:
+                return
 
-        self._project_cache.total_message_count = total_message_count
-        self._project_cache.total_input_tokens = total_input_tokens
-        self._project_cache.total_output_tokens = total_output_tokens
-        self._project_cache.total_cache_creation_tokens = total_cache_creation_tokens
-        self._project_cache.total_cache_read_tokens = total_cache_read_tokens
-        self._project_cache.earliest_timestamp = earliest_timestamp
-        self._project_cache.latest_timestamp = latest_timestamp
+            project_cache = self._project_cache
+            project_cache.total_message_count = total_message_count
+            project_cache.total_input_tokens = total_input_tokens
+            project_cache.total_output_tokens = total_output_tokens
+            project_cache.total_cache_creation_tokens = total_cache_creation_tokens
+            project_cache.total_cache_read_tokens = total_cache_read_tokens
+            project_cache.earliest_timestamp = earliest_timestamp
+            project_cache.latest_timestamp = latest_timestamp
 
-        self._save_project_cache()
+            self._save_project_cache()
 
     def update_working_directories(self, working_directories: List[str]) -> None:
         """Update the list of working directories associated with this project."""
-        if self._project_cache is None:
-            return
+        with self.batch():
+            if self._project_cache is None:
+                return
 
-        self._project_cache.working_directories = working_directories
-        self._save_project_cache()
+            self._project_cache.working_directories = working_directories
+            self._save_project_cache()
 
     def get_modified_files(self, jsonl_files: List[Path]) -> List[Path]:
         """Get list of JSONL files that need to be reprocessed."""
@@ -382,10 +2350,21 @@ class CacheManager:
         """Get the cached project data if available."""
         return self._project_cache
 
-    def clear_cache(self) -> None:
-        """Clear all cache files and reset the project cache."""
+    def _remove_json_cache(self) -> None:
+        """Delete the per-file JSON caches and index.json."""
         if self.cache_dir.exists():
-            for cache_file in self.cache_dir.glob("*.json"):
+            # Along with files left half written by an interrupted run
+            cache_files = [
+                cache_file
+                for suffix in (
+                    *CODEC_SUFFIXES.values(),
+                    TIMESTAMP_INDEX_SUFFIX,
+                    AGGREGATES_SUFFIX,
+                    TEMP_SUFFIX,
+                )
+                for cache_file in self.cache_dir.glob(f"*{suffix}")
+            ]
+            for cache_file in cache_files:
                 if cache_file.name != "index.json":  # Don't delete the index file here
                     try:
                         cache_file.unlink()
@@ -398,15 +2377,238 @@ class CacheManager:
             except Exception as e:
                 print(f"Warning: Failed to delete cache index {self.index_file}: {e}")
 
-        # Reset the project cache
-        self._project_cache = ProjectCache(
-            version=self.library_version,
-            cache_created=datetime.now().isoformat(),
-            last_updated=datetime.now().isoformat(),
-            project_path=str(self.project_path),
-            cached_files={},
-            sessions={},
+    def _remove_sqlite_cache(self) -> None:
+        """Delete the SQLite database along with its WAL files."""
+        for db_file in (
+            self.db_file,
+            self.db_file.with_name(self.db_file.name + "-wal"),
+            self.db_file.with_name(self.db_file.name + "-shm"),
+        ):
+            try:
+                db_file.unlink(missing_ok=True)
+            except Exception as e:
+                print(f"Warning: Failed to delete cache database {db_file}: {e}")
+
+    def clear_cache(self) -> None:
+        """Clear all cache files and reset the project cache."""
+        with self.batch():
+            self._remove_json_cache()
+            if self._sqlite is not None:
+                self._sqlite.clear()
+            else:
+                self._remove_sqlite_cache()
+            self._blobs.clear()
+            if self._fragments is not None or self.fragment_file.exists():
+                self.fragments.clear()
+
+            # Reset the project cache
+            self._project_cache = self._empty_project_cache()
+            self._index_stamp = self._current_index_stamp()
+
+    def cache_size(self) -> int:
+        """Return the bytes taken by the project's cache directory."""
+        return _directory_size(self.cache_dir)
+
+    def _remove_file_caches(self, file_names: Iterable[str]) -> int:
+        """Delete the cached entries and index entries of files; return how many."""
+        if self._project_cache is None:
+            return 0
+        cached_files = self._project_cache.cached_files
+        removed = [file_name for file_name in file_names if file_name in cached_files]
+        if self._sqlite is not None:
+            self._sqlite.delete_files(removed)
+        for file_name in removed:
+            cached_info = cached_files.pop(file_name)
+            self._accessed.pop(file_name, None)
+            if self._sqlite is None:
+                jsonl_path = Path(file_name)
+                self._get_cache_file_path(jsonl_path, cached_info.codec).unlink(
+                    missing_ok=True
+                )
+                self._get_timestamp_index_path(jsonl_path).unlink(missing_ok=True)
+                self._get_aggregates_path(jsonl_path).unlink(missing_ok=True)
+        if removed:
+            self._save_project_cache()
+        return len(removed)
+
+    def _remove_orphaned_caches(self) -> int:
+        """Delete cached entries no index entry refers to; return how many files.
+
+        These are left by files cached under another name, and by runs
+        interrupted before they indexed what they wrote.
+        """
+        cached_files = (
+            self._project_cache.cached_files if self._project_cache is not None else {}
         )
+        if self._sqlite is not None:
+            orphans = set(self._sqlite.file_sizes()).difference(cached_files)
+            self._sqlite.delete_files(orphans)
+            return len(orphans)
+
+        expected = {self.index_file.name}
+        for file_name, cached_info in cached_files.items():
+            stem = Path(file_name).stem
+            expected.add(stem + CODEC_SUFFIXES[cached_info.codec])
+            expected.add(stem + TIMESTAMP_INDEX_SUFFIX)
+            expected.add(stem + AGGREGATES_SUFFIX)
+        removed = 0
+        for suffix in (
+            *CODEC_SUFFIXES.values(),
+            TIMESTAMP_INDEX_SUFFIX,
+            AGGREGATES_SUFFIX,
+            TEMP_SUFFIX,
+        ):
+            for cache_file in self.cache_dir.glob(f"*{suffix}"):
+                if cache_file.name not in expected and cache_file.is_file():
+                    cache_file.unlink(missing_ok=True)
+                    removed += 1
+        return removed
+
+    def _referenced_blobs(self) -> Optional[Set[str]]:
+        """Return the digests of the blobs cached entries refer to.
+
+        Returns None if a cache file can't be read, as the blobs it refers
+        to aren't known.
+        """
+        if self._sqlite is not None:
+            return {digest.decode("ascii") for digest in self._sqlite.iter_blob_refs()}
+        referenced: Set[str] = set()
+        if self._project_cache is None:
+            return referenced
+        for file_name, cached_info in self._project_cache.cached_files.items():
+            cache_file = self._get_cache_file_path(Path(file_name), cached_info.codec)
+            try:
+                document = decompress_cache_data(
+                    cache_file.read_bytes(), cached_info.codec
+                )
+            except FileNotFoundError:
+                continue
+            except Exception:
+                return None
+            referenced.update(
+                digest.decode("ascii") for digest in _BLOB_REF_PATTERN.findall(document)
+            )
+        return referenced
+
+    def _sweep_blobs(self) -> int:
+        """Delete the blobs no cached entry refers to; return how many."""
+        if not self._blobs.blob_dir.exists():
+            return 0
+        referenced = self._referenced_blobs()
+        if referenced is None:
+            return 0
+        return self._blobs.sweep(referenced)
+
+    def _compact(self, entries: bool, fragments: bool) -> None:
+        """Shrink the SQLite databases after deleting from them."""
+        try:
+            if entries and self._sqlite is not None:
+                self._sqlite.vacuum()
+            if fragments:
+                self.fragments.vacuum()
+        except sqlite3.Error as e:
+            print(f"Warning: Failed to compact the cache of {self.project_path}: {e}")
+
+    def collect_garbage(self) -> CacheGCStats:
+        """Remove what the cache holds for JSONL files that no longer exist.
+
+        Drops the index entries and cached entries of deleted files, the
+        sessions only they had and the fingerprints of deleted HTML files,
+        cached entries no index entry refers to, and blobs no cached entry
+        refers to.
+        """
+        stats = CacheGCStats(bytes_before=self.cache_size())
+        with self.batch():
+            if self._project_cache is not None:
+                project_cache = self._project_cache
+                deleted = [
+                    file_name
+                    for file_name in project_cache.cached_files
+                    if not (self.project_path / file_name).exists()
+                ]
+                deleted_sessions = {
+                    session_id
+                    for file_name in deleted
+                    for session_id in project_cache.cached_files[file_name].session_ids
+                }
+                stats.files_removed = self._remove_file_caches(deleted)
+
+                deleted_sessions.difference_update(
+                    session_id
+                    for cached_info in project_cache.cached_files.values()
+                    for session_id in cached_info.session_ids
+                )
+                deleted_outputs = [
+                    output
+                    for output in project_cache.outputs
+                    if not (self.project_path / output).exists()
+                ]
+                if deleted_sessions or deleted_outputs:
+                    for session_id in deleted_sessions:
+                        project_cache.sessions.pop(session_id, None)
+                    for output in deleted_outputs:
+                        del project_cache.outputs[output]
+                    self._save_project_cache()
+
+            stats.orphans_removed = self._remove_orphaned_caches()
+            stats.blobs_removed = self._sweep_blobs()
+        self._compact(bool(stats.files_removed or stats.orphans_removed), False)
+        stats.bytes_after = self.cache_size()
+        return stats
+
+    def cache_items(self) -> List[CacheItem]:
+        """Return what can be evicted from the cache, with sizes and access times.
+
+        Files cached before access times were recorded count as last used
+        when they were cached.
+        """
+        items: List[CacheItem] = []
+        if self._project_cache is not None:
+            sizes = self._sqlite.file_sizes() if self._sqlite is not None else {}
+            for file_name, cached_info in self._project_cache.cached_files.items():
+                if self._sqlite is None:
+                    jsonl_path = Path(file_name)
+                    sizes[file_name] = sum(
+                        path.stat().st_size
+                        for path in (
+                            self._get_cache_file_path(jsonl_path, cached_info.codec),
+                            self._get_timestamp_index_path(jsonl_path),
+                            self._get_aggregates_path(jsonl_path),
+                        )
+                        if path.exists()
+                    )
+                items.append(
+                    CacheItem(
+                        kind="file",
+                        name=file_name,
+                        size=sizes.get(file_name, 0),
+                        last_accessed=max(
+                            cached_info.last_accessed or cached_info.cached_mtime,
+                            self._accessed.get(file_name, 0.0),
+                        ),
+                    )
+                )
+        if self._fragments is not None or self.fragment_file.exists():
+            items.extend(self.fragments.usage())
+        return items
+
+    def evict(self, items: Iterable[CacheItem]) -> CacheGCStats:
+        """Remove items (from cache_items) and the blobs only they used.
+
+        Evicted files are parsed again the next time they are needed.
+        """
+        items = list(items)
+        stats = CacheGCStats()
+        with self.batch():
+            stats.files_evicted = self._remove_file_caches(
+                item.name for item in items if item.kind == "file"
+            )
+            days = [int(item.name) for item in items if item.kind == "fragments"]
+            if days:
+                stats.fragments_removed = self.fragments.evict(days)
+            stats.blobs_removed = self._sweep_blobs()
+        self._compact(bool(stats.files_evicted), bool(stats.fragments_removed))
+        return stats
 
     def _is_cache_version_compatible(self, cache_version: str) -> bool:
         """Check if a cache version is compatible with the current library version.
@@ -457,6 +2659,8 @@ class CacheManager:
 
         return {
             "cache_enabled": True,
+            "backend": self.backend,
+            "codec": self.codec,
             "cached_files_count": len(self._project_cache.cached_files),
             "total_cached_messages": self._project_cache.total_message_count,
             "total_sessions": len(self._project_cache.sessions),
@@ -465,6 +2669,229 @@ class CacheManager:
         }
 
 
+def _directory_size(path: Path) -> int:
+    """Return the total size of the files below path."""
+    total = 0
+    for file_path in path.rglob("*"):
+        try:
+            if file_path.is_file():
+                total += file_path.stat().st_size
+        except OSError:
+            continue
+    return total
+
+
+def collect_cache_garbage(
+    project_dirs: Iterable[Path],
+    library_version: str,
+    max_bytes: Optional[int] = None,
+) -> CacheGCStats:
+    """Collect the garbage of projects' caches, then evict to fit a budget.
+
+    Each project's cache first loses what belongs to deleted JSONL files
+    (see CacheManager.collect_garbage). Then, while the caches take more
+    than max_bytes in total, the least recently used cached files and
+    rendered fragments across all projects are evicted.
+    """
+    project_dirs = list(project_dirs)
+    stats = CacheGCStats()
+    sizes: Dict[Path, int] = {}
+    for project_dir in project_dirs:
+        cache_manager = CacheManager(project_dir, library_version)
+        try:
+            project_stats = cache_manager.collect_garbage()
+        finally:
+            cache_manager.close()
+        stats.merge(project_stats)
+        sizes[project_dir] = project_stats.bytes_after
+
+    # Evicting frees less than the items' sizes when their blobs are still
+    # used elsewhere, so go on until the measured total fits
+    while max_bytes is not None and sum(sizes.values()) > max_bytes:
+        candidates: List[Tuple[float, int, CacheItem]] = []
+        for project_index, project_dir in enumerate(project_dirs):
+            cache_manager = CacheManager(project_dir, library_version)
+            try:
+                candidates.extend(
+                    (item.last_accessed, project_index, item)
+                    for item in cache_manager.cache_items()
+                )
+            finally:
+                cache_manager.close()
+        if not candidates:
+            break
+        candidates.sort(key=lambda candidate: candidate[:2])
+
+        excess = sum(sizes.values()) - max_bytes
+        victims: Dict[int, List[CacheItem]] = {}
+        for _, project_index, item in candidates:
+            if excess <= 0:
+                break
+            victims.setdefault(project_index, []).append(item)
+            excess -= item.size
+
+        evicted = 0
+        for project_index, items in victims.items():
+            project_dir = project_dirs[project_index]
+            cache_manager = CacheManager(project_dir, library_version)
+            try:
+                evict_stats = cache_manager.evict(items)
+                sizes[project_dir] = cache_manager.cache_size()
+            finally:
+                cache_manager.close()
+            stats.merge(evict_stats)
+            evicted += evict_stats.files_evicted + evict_stats.fragments_removed
+        if not evicted:
+            break
+
+    stats.bytes_after = sum(sizes.values())
+    return stats
+
+
+def project_fingerprint(project_dir: Path) -> Optional[ProjectFingerprint]:
+    """Fingerprint a project's JSONL files with a single directory scan.
+
+    Returns None if the directory has no JSONL files (it isn't a project).
+    """
+    file_count = 0
+    max_mtime = 0.0
+    total_size = 0
+    try:
+        with os.scandir(project_dir) as dir_entries:
+            for dir_entry in dir_entries:
+                if not dir_entry.name.endswith(".jsonl") or not dir_entry.is_file():
+                    continue
+                stat = dir_entry.stat()
+                file_count += 1
+                max_mtime = max(max_mtime, stat.st_mtime)
+                total_size += stat.st_size
+    except OSError:
+        return None
+    if not file_count:
+        return None
+    return ProjectFingerprint(
+        file_count=file_count, max_mtime=max_mtime, total_size=total_size
+    )
+
+
+class ProjectsIndex:
+    """Index of every project under a projects root, in projects_index.json.
+
+    It holds each project's aggregates and sessions together with a
+    fingerprint of its JSONL files, so that the project list, the project
+    picker and the combined index page can answer for unchanged projects
+    without creating a CacheManager (and loading the project's own cache
+    index) for each one. Only process_projects_hierarchy records projects,
+    once their HTML is generated, so an unchanged fingerprint also means
+    the project's pages are current. The index is discarded when the
+    library version changes, as the generated HTML is then out of date as
+    well.
+
+    Concurrent runs can share the index: each saves only the projects it
+    changed on top of the index as last saved.
+    """
+
+    def __init__(self, projects_path: Path, library_version: str):
+        self.projects_path = projects_path
+        self.library_version = library_version
+        self.index_file = projects_path / PROJECTS_INDEX_FILE
+        self.lock_file = projects_path / PROJECTS_INDEX_LOCK_FILE
+        self._fingerprints: Dict[str, Optional[ProjectFingerprint]] = {}
+        # Projects updated (or forgotten, as None) since the index was saved
+        self._changes: Dict[str, Optional[IndexedProject]] = {}
+        self._data = self._read()
+
+    def _read(self) -> ProjectsIndexData:
+        """Read the saved index, or an empty one if it is missing or outdated."""
+        if self.index_file.exists():
+            try:
+                with open(self.index_file, "r", encoding="utf-8") as f:
+                    data = ProjectsIndexData.model_validate(json.load(f))
+                if data.version == self.library_version:
+                    return data
+            except Exception as e:
+                print(f"Warning: Failed to load projects index, will rebuild: {e}")
+        return ProjectsIndexData(version=self.library_version)
+
+    def fingerprint(self, project_dir: Path) -> Optional[ProjectFingerprint]:
+        """Fingerprint a project, scanning its directory once per index."""
+        if project_dir.name not in self._fingerprints:
+            self._fingerprints[project_dir.name] = project_fingerprint(project_dir)
+        return self._fingerprints[project_dir.name]
+
+    def discover_projects(self) -> List[Path]:
+        """Return the directories below the root that hold JSONL files."""
+        try:
+            child_dirs = [
+                Path(dir_entry.path)
+                for dir_entry in os.scandir(self.projects_path)
+                if dir_entry.is_dir()
+            ]
+        except OSError:
+            return []
+        project_dirs = sorted(
+            child_dir for child_dir in child_dirs if self.fingerprint(child_dir)
+        )
+
+        # Forget projects that are gone
+        names = {project_dir.name for project_dir in project_dirs}
+        for name in list(self._data.projects):
+            if name not in names:
+                del self._data.projects[name]
+                self._changes[name] = None
+        return project_dirs
+
+    def get_project_cache(self, project_dir: Path) -> Optional[ProjectCache]:
+        """Return the indexed aggregates of a project, if it hasn't changed."""
+        indexed = self._data.projects.get(project_dir.name)
+        if indexed is None or indexed.fingerprint != self.fingerprint(project_dir):
+            return None
+        return indexed.project
+
+    def update_project(self, project_dir: Path, project_cache: ProjectCache) -> None:
+        """Record a project's aggregates against its current fingerprint."""
+        fingerprint = self.fingerprint(project_dir)
+        if fingerprint is None:
+            return
+        indexed = IndexedProject(
+            fingerprint=fingerprint,
+            project=project_cache.model_copy(
+                update={"cached_files": {}, "outputs": {}}
+            ),
+        )
+        self._data.projects[project_dir.name] = indexed
+        self._changes[project_dir.name] = indexed
+
+    def forget_project(self, project_dir: Path) -> None:
+        """Drop a project from the index, e.g. after its cache was cleared."""
+        if self._data.projects.pop(project_dir.name, None) is not None:
+            self._changes[project_dir.name] = None
+
+    def save(self) -> None:
+        """Write the projects changed since the last save.
+
+        Under the index lock, the changes are applied to the index as saved
+        by any other run in the meantime, and the file is replaced
+        atomically.
+        """
+        if not self._changes:
+            return
+        try:
+            with file_lock(self.lock_file):
+                data = self._read()
+                for name, indexed in self._changes.items():
+                    if indexed is None:
+                        data.projects.pop(name, None)
+                    else:
+                        data.projects[name] = indexed
+                with atomic_write(self.index_file) as f:
+                    f.write(data.model_dump_json())
+            self._data = data
+            self._changes = {}
+        except Exception as e:
+            print(f"Warning: Failed to save projects index: {e}")
+
+
 def get_library_version() -> str:
     """Get the current library version from package metadata or pyproject.toml."""
     # First try to get version from installed package metadata
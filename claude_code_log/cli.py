@@ -4,14 +4,31 @@
 import logging
 import os
 import sys
+import time
 from pathlib import Path
 from typing import Optional, List
 
 import click
 from git import Repo, InvalidGitRepositoryError
 
-from .converter import convert_jsonl_to_html, process_projects_hierarchy
-from .cache import CacheManager, get_library_version
+from .converter import (
+    build_project_caches,
+    convert_jsonl_to_html,
+    process_projects_hierarchy,
+)
+from .cache import (
+    CACHE_BACKENDS,
+    DEFAULT_CACHE_CODEC,
+    PROJECTS_INDEX_FILE,
+    CacheBackend,
+    CacheCodec,
+    CacheManager,
+    ProjectsIndex,
+    available_codecs,
+    collect_cache_garbage,
+    get_library_version,
+)
+from .models import VALIDATION_LEVELS, ValidationLevel
 
 
 def _launch_tui_with_cache_check(project_path: Path) -> Optional[str]:
@@ -96,9 +113,8 @@ def find_projects_by_cwd(
         return []
 
     # Get all valid project directories
-    project_dirs = [
-        d for d in projects_dir.iterdir() if d.is_dir() and list(d.glob("*.jsonl"))
-    ]
+    projects_index = ProjectsIndex(projects_dir, get_library_version())
+    project_dirs = projects_index.discover_projects()
 
     # Tier 1: Check for exact match to current working directory
     exact_matches = _find_exact_matches(project_dirs, current_cwd_path)
@@ -111,7 +127,11 @@ def find_projects_by_cwd(
         return git_root_matches
 
     # Tier 3: Fall back to relative path matching
-    return _find_relative_matches(project_dirs, current_cwd_path)
+    relative_matches = _find_relative_matches(
+        project_dirs, current_cwd_path, projects_index
+    )
+    projects_index.save()
+    return relative_matches
 
 
 def _find_exact_matches(project_dirs: List[Path], current_cwd_path: Path) -> List[Path]:
@@ -145,29 +165,43 @@ def _find_git_root_matches(
 
 
 def _find_relative_matches(
-    project_dirs: List[Path], current_cwd_path: Path
+    project_dirs: List[Path],
+    current_cwd_path: Path,
+    projects_index: Optional[ProjectsIndex] = None,
 ) -> List[Path]:
-    """Find projects using relative path matching (original behavior)."""
+    """Find projects using relative path matching (original behavior).
+
+    Working directories of projects unchanged since they were indexed come
+    from projects_index; other projects' caches are loaded (and built if
+    needed). Those aren't recorded in the index, which only holds projects
+    whose HTML is up to date.
+    """
     relative_matches: List[Path] = []
 
     for project_dir in project_dirs:
         try:
-            # Load cache to check for working directories
-            cache_manager = CacheManager(project_dir, get_library_version())
-            project_cache = cache_manager.get_cached_project_data()
-
-            # Build cache if needed
-            if not project_cache or not project_cache.working_directories:
-                jsonl_files = list(project_dir.glob("*.jsonl"))
-                if jsonl_files:
-                    try:
-                        convert_jsonl_to_html(project_dir, silent=True)
-                        project_cache = cache_manager.get_cached_project_data()
-                    except Exception as e:
-                        logging.warning(
-                            f"Failed to build cache for project {project_dir.name}: {e}"
-                        )
-                        project_cache = None
+            project_cache = (
+                projects_index.get_project_cache(project_dir)
+                if projects_index is not None
+                else None
+            )
+            if project_cache is None or not project_cache.working_directories:
+                # Load cache to check for working directories
+                cache_manager = CacheManager(project_dir, get_library_version())
+                project_cache = cache_manager.get_cached_project_data()
+
+                # Build cache if needed
+                if not project_cache or not project_cache.working_directories:
+                    jsonl_files = list(project_dir.glob("*.jsonl"))
+                    if jsonl_files:
+                        try:
+                            convert_jsonl_to_html(project_dir, silent=True)
+                            project_cache = cache_manager.get_cached_project_data()
+                        except Exception as e:
+                            logging.warning(
+                                f"Failed to build cache for project {project_dir.name}: {e}"
+                            )
+                            project_cache = None
 
             if project_cache and project_cache.working_directories:
                 # Check for relative matches
@@ -204,27 +238,31 @@ def _clear_caches(input_path: Path, all_projects: bool) -> None:
         if all_projects:
             # Clear cache for all project directories
             click.echo("Clearing caches for all projects...")
-            project_dirs = [
-                d
-                for d in input_path.iterdir()
-                if d.is_dir() and list(d.glob("*.jsonl"))
-            ]
+            projects_index = ProjectsIndex(input_path, library_version)
+            project_dirs = projects_index.discover_projects()
 
             for project_dir in project_dirs:
                 try:
                     cache_manager = CacheManager(project_dir, library_version)
                     cache_manager.clear_cache()
+                    projects_index.forget_project(project_dir)
                     click.echo(f"  Cleared cache for {project_dir.name}")
                 except Exception as e:
                     click.echo(
                         f"  Warning: Failed to clear cache for {project_dir.name}: {e}"
                     )
+            projects_index.save()
 
         elif input_path.is_dir():
             # Clear cache for single directory
             click.echo(f"Clearing cache for {input_path}...")
             cache_manager = CacheManager(input_path, library_version)
             cache_manager.clear_cache()
+            # Only when the parent is a projects root with an index
+            if (input_path.parent / PROJECTS_INDEX_FILE).exists():
+                projects_index = ProjectsIndex(input_path.parent, library_version)
+                projects_index.forget_project(input_path)
+                projects_index.save()
         else:
             # Single file - no cache to clear
             click.echo("Cache clearing not applicable for single files.")
@@ -233,17 +271,112 @@ def _clear_caches(input_path: Path, all_projects: bool) -> None:
         click.echo(f"Warning: Failed to clear cache: {e}")
 
 
+def _build_caches(
+    input_path: Path,
+    jobs: int,
+    validation: ValidationLevel,
+    cache_backend: Optional[CacheBackend],
+    cache_codec: CacheCodec,
+    cache_level: Optional[int],
+) -> None:
+    """Bring the caches of a project, or of all projects, up to date."""
+    if list(input_path.glob("*.jsonl")):
+        projects_path = input_path.parent
+        project_dirs = [input_path]
+    else:
+        projects_path = input_path
+        project_dirs = ProjectsIndex(
+            input_path, get_library_version()
+        ).discover_projects()
+    if not project_dirs:
+        click.echo(f"No projects with JSONL files found in {input_path}")
+        return
+
+    start = time.perf_counter()
+    files_parsed = 0
+    bytes_parsed = 0
+    failures: List[str] = []
+    with click.progressbar(
+        build_project_caches(
+            projects_path,
+            project_dirs,
+            jobs,
+            validation,
+            cache_backend,
+            cache_codec,
+            cache_level,
+        ),
+        length=len(project_dirs),
+        label="Building caches",
+        item_show_func=lambda stats: stats.project if stats else None,
+    ) as results:
+        for stats in results:
+            files_parsed += stats.files_parsed
+            bytes_parsed += stats.bytes_parsed
+            if stats.error:
+                failures.append(f"{stats.project}: {stats.error}")
+
+    click.echo(
+        f"Parsed {files_parsed} files ({bytes_parsed / 1_000_000:.1f} MB) in "
+        f"{len(project_dirs)} projects in {time.perf_counter() - start:.1f}s"
+    )
+    for failure in failures:
+        click.echo(f"Warning: Failed to build cache for {failure}")
+
+
+_SIZE_UNITS = {"": 1, "K": 1000, "M": 1000**2, "G": 1000**3, "T": 1000**4}
+
+
+def _parse_size(
+    ctx: click.Context, param: click.Parameter, value: Optional[str]
+) -> Optional[int]:
+    """Parse a size such as 500M or 2G (decimal units) into bytes."""
+    if value is None:
+        return None
+    number = value.strip().upper().removesuffix("B")
+    unit = number[-1:] if number[-1:] in _SIZE_UNITS else ""
+    try:
+        size = float(number[: len(number) - len(unit)]) * _SIZE_UNITS[unit]
+    except ValueError:
+        raise click.BadParameter(f"{value!r} is not a size like 500M or 2G")
+    if size < 0:
+        raise click.BadParameter("the size can't be negative")
+    return int(size)
+
+
+def _collect_cache_garbage(input_path: Path, max_bytes: Optional[int]) -> None:
+    """Remove stale cache data of a project, or of all projects, and evict."""
+    if list(input_path.glob("*.jsonl")):
+        project_dirs = [input_path]
+    else:
+        project_dirs = ProjectsIndex(
+            input_path, get_library_version()
+        ).discover_projects()
+    if not project_dirs:
+        click.echo(f"No projects with JSONL files found in {input_path}")
+        return
+
+    click.echo(f"Collecting cache garbage for {len(project_dirs)} projects...")
+    stats = collect_cache_garbage(project_dirs, get_library_version(), max_bytes)
+    click.echo(
+        f"Removed the caches of {stats.files_removed} deleted files and "
+        f"{stats.orphans_removed} orphaned cache files, evicted "
+        f"{stats.files_evicted} cached files and {stats.fragments_removed} "
+        f"rendered fragments, and removed {stats.blobs_removed} blobs: "
+        f"{stats.bytes_before / 1_000_000:.1f} MB -> "
+        f"{stats.bytes_after / 1_000_000:.1f} MB"
+    )
+
+
 def _clear_html_files(input_path: Path, all_projects: bool) -> None:
     """Clear HTML files for the specified path."""
     try:
         if all_projects:
             # Clear HTML files for all project directories
             click.echo("Clearing HTML files for all projects...")
-            project_dirs = [
-                d
-                for d in input_path.iterdir()
-                if d.is_dir() and list(d.glob("*.jsonl"))
-            ]
+            project_dirs = ProjectsIndex(
+                input_path, get_library_version()
+            ).discover_projects()
 
             total_removed = 0
             for project_dir in project_dirs:
@@ -342,6 +475,22 @@ def _clear_html_files(input_path: Path, all_projects: bool) -> None:
     is_flag=True,
     help="Clear all cache directories before processing",
 )
+@click.option(
+    "--build-cache",
+    is_flag=True,
+    help="Bring the caches of all projects (or of INPUT_PATH's project) up to date without generating HTML, e.g. from cron; use with --jobs to build projects in parallel",
+)
+@click.option(
+    "--gc-cache",
+    is_flag=True,
+    help="Remove cached data of deleted JSONL files and unused blobs from all projects' caches (or from INPUT_PATH's), then evict down to --cache-max-size",
+)
+@click.option(
+    "--cache-max-size",
+    callback=_parse_size,
+    default=None,
+    help="Total size the caches are evicted down to by --gc-cache (e.g. 500M, 2G), least recently used first",
+)
 @click.option(
     "--clear-html",
     is_flag=True,
@@ -352,6 +501,40 @@ def _clear_html_files(input_path: Path, all_projects: bool) -> None:
     is_flag=True,
     help="Launch interactive TUI for session browsing and management",
 )
+@click.option(
+    "--validation",
+    type=click.Choice(VALIDATION_LEVELS),
+    default="none",
+    show_default=True,
+    help="Transcript validation level: none (fastest, no per-field checks), basic (Pydantic models) or strict (also check assistant messages against the Anthropic schema to detect drift)",
+)
+@click.option(
+    "-j",
+    "--jobs",
+    type=click.IntRange(min=1),
+    default=1,
+    show_default=True,
+    help="Number of worker processes used to parse transcript files (with --all-projects, to process projects in parallel)",
+)
+@click.option(
+    "--cache-backend",
+    type=click.Choice(CACHE_BACKENDS),
+    default=None,
+    help="Cache store: json (per-file JSON caches) or sqlite (one indexed SQLite database per project; an existing JSON cache is migrated). Defaults to the store already in use, or json",
+)
+@click.option(
+    "--cache-codec",
+    type=click.Choice(available_codecs()),
+    default=DEFAULT_CACHE_CODEC,
+    show_default=True,
+    help="Compression of JSON cache files: none, gzip, lzma, or zstd (needs the zstandard package). Files cached with another codec are rewritten when they change",
+)
+@click.option(
+    "--cache-level",
+    type=int,
+    default=None,
+    help="Compression level for --cache-codec (default: gzip 6, lzma 6, zstd 3)",
+)
 def main(
     input_path: Optional[Path],
     output: Optional[Path],
@@ -362,8 +545,16 @@ def main(
     no_individual_sessions: bool,
     no_cache: bool,
     clear_cache: bool,
+    build_cache: bool,
+    gc_cache: bool,
+    cache_max_size: Optional[int],
     clear_html: bool,
     tui: bool,
+    validation: ValidationLevel,
+    jobs: int,
+    cache_backend: Optional[CacheBackend],
+    cache_codec: CacheCodec,
+    cache_level: Optional[int],
 ) -> None:
     """Convert Claude transcript JSONL files to HTML.
 
@@ -390,11 +581,9 @@ def main(
                     click.echo(f"Error: Projects directory not found: {input_path}")
                     return
 
-                project_dirs = [
-                    d
-                    for d in input_path.iterdir()
-                    if d.is_dir() and list(d.glob("*.jsonl"))
-                ]
+                project_dirs = ProjectsIndex(
+                    input_path, get_library_version()
+                ).discover_projects()
 
                 if not project_dirs:
                     click.echo(f"No projects with JSONL files found in {input_path}")
@@ -475,11 +664,30 @@ def main(
         # Handle cache clearing
         if clear_cache:
             _clear_caches(input_path, all_projects)
-            if clear_cache and not (from_date or to_date or input_path.is_file()):
+            if clear_cache and not (
+                from_date or to_date or input_path.is_file() or build_cache or gc_cache
+            ):
                 # If only clearing cache, exit after clearing
                 click.echo("Cache cleared successfully.")
                 return
 
+        # Handle cache prebuilding and garbage collection
+        if build_cache or gc_cache:
+            if not input_path.exists():
+                raise FileNotFoundError(f"Projects directory not found: {input_path}")
+            if build_cache:
+                _build_caches(
+                    input_path,
+                    jobs,
+                    validation,
+                    cache_backend,
+                    cache_codec,
+                    cache_level,
+                )
+            if gc_cache:
+                _collect_cache_garbage(input_path, cache_max_size)
+            return
+
         # Handle HTML files clearing
         if clear_html:
             _clear_html_files(input_path, all_projects)
@@ -495,16 +703,20 @@ def main(
 
             click.echo(f"Processing all projects in {input_path}...")
             output_path = process_projects_hierarchy(
-                input_path, from_date, to_date, not no_cache
+                input_path,
+                from_date,
+                to_date,
+                not no_cache,
+                validation,
+                jobs,
+                cache_backend,
+                cache_codec,
+                cache_level,
             )
 
             # Count processed projects
             project_count = len(
-                [
-                    d
-                    for d in input_path.iterdir()
-                    if d.is_dir() and list(d.glob("*.jsonl"))
-                ]
+                ProjectsIndex(input_path, get_library_version()).discover_projects()
             )
             click.echo(
                 f"Successfully processed {project_count} projects and created index at {output_path}"
@@ -545,6 +757,11 @@ def main(
             to_date,
             not no_individual_sessions,
             not no_cache,
+            validation=validation,
+            jobs=jobs,
+            cache_backend=cache_backend,
+            cache_codec=cache_codec,
+            cache_level=cache_level,
         )
         if input_path.is_file():
             click.echo(f"Successfully converted {input_path} to {output_path}")
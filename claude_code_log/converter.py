@@ -1,38 +1,205 @@
 #!/usr/bin/env python3
 """Convert Claude transcript JSONL files to HTML."""
 
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
 from pathlib import Path
+import time
 import traceback
-from typing import List, Optional, Dict, Any, TYPE_CHECKING
+from typing import (
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Dict,
+    Any,
+    Tuple,
+    TYPE_CHECKING,
+)
+
+from pydantic import BaseModel
 
 if TYPE_CHECKING:
     from .cache import CacheManager
 
+from .aggregates import SessionAggregator
 from .utils import (
-    should_use_as_session_starter,
-    create_session_preview,
     extract_working_directories,
+    record_working_directory,
+    sort_working_directories,
+)
+from .cache import (
+    DEFAULT_CACHE_CODEC,
+    CacheBackend,
+    CacheCodec,
+    CacheManager,
+    ProjectCache,
+    ProjectsIndex,
+    build_fingerprint,
+    get_library_version,
 )
-from .cache import CacheManager, SessionCacheData, get_library_version
+from .fileio import atomic_write, atomic_write_text
 from .parser import (
-    load_transcript,
-    load_directory_transcripts,
+    find_session_files,
+    is_in_date_range,
+    iter_messages_by_date,
+    iter_project,
+    iter_transcript,
+    load_transcript,  # noqa: F401  # re-exported for callers
+    load_directory_transcripts,  # noqa: F401  # re-exported for callers
     filter_messages_by_date,
+    parse_date_range,
+    update_transcript_cache,
 )
 from .models import (
     TranscriptEntry,
-    AssistantTranscriptEntry,
-    SummaryTranscriptEntry,
-    UserTranscriptEntry,
+    ValidationLevel,
+    ValidationStats,
 )
 from .renderer import (
-    generate_html,
-    generate_session_html,
+    SessionIndex,
+    generate_html,  # noqa: F401  # re-exported for callers
+    render_html_chunks,
+    render_session_html_chunks,
     generate_projects_index_html,
+    format_timestamp_range_ms,
     is_html_outdated,
     get_project_display_name,
 )
 
+# Name of a project directory's combined transcript page
+COMBINED_HTML_FILE = "combined_transcripts.html"
+
+
+class ProjectPipeline:
+    """Read a project's entries once for everything a run derives from them.
+
+    A run updates the project's cache and collects the navigation of the
+    combined page and of each session page. scan() feeds all of these from a
+    single stream of the entries; only pages that must be written stream
+    them again to render (the navigation has to come first, and the
+    entries are never all held in memory). The input can also be a single
+    transcript file, which has no cache and no session pages.
+
+    loads counts the streams of the whole project and session_loads the
+    reads for session pages (one per group of sessions sharing files), so
+    that duplicate reads show up in the report.
+    """
+
+    def __init__(
+        self,
+        input_path: Path,
+        cache_manager: Optional[CacheManager] = None,
+        from_date: Optional[str] = None,
+        to_date: Optional[str] = None,
+        silent: bool = False,
+        validation: ValidationLevel = "none",
+        validation_stats: Optional[ValidationStats] = None,
+        jobs: int = 1,
+    ) -> None:
+        self.input_path = input_path
+        self.cache_manager = cache_manager
+        self.from_date = from_date
+        self.to_date = to_date
+        self.silent = silent
+        self.validation = validation
+        self.validation_stats = validation_stats
+        self.jobs = jobs
+        self.loads = 0
+        self.session_loads = 0
+        self.session_index = SessionIndex()
+        # Sessions with messages in the date range, in order of appearance
+        self.session_ids: Dict[str, None] = {}
+        self.working_directories: Dict[str, str] = {}
+
+    def entries(
+        self, silent: bool = True, count_validation: bool = False
+    ) -> Iterator[TranscriptEntry]:
+        """Stream the project's entries, within the date range where possible.
+
+        Validation failures are only counted with count_validation, so that
+        entries streamed more than once are counted once.
+        """
+        self.loads += 1
+        validation_stats = self.validation_stats if count_validation else None
+        if self.input_path.is_file():
+            return iter_transcript(
+                self.input_path,
+                from_date=self.from_date,
+                to_date=self.to_date,
+                silent=silent,
+                validation=self.validation,
+                validation_stats=validation_stats,
+                jobs=self.jobs,
+            )
+        return iter_project(
+            self.input_path,
+            self.cache_manager,
+            self.from_date,
+            self.to_date,
+            silent,
+            self.validation,
+            validation_stats,
+            jobs=self.jobs,
+        )
+
+    def scan(self, collect_sessions: bool = True) -> None:
+        """Update the cache if needed and collect navigation, in one pass.
+
+        With collect_sessions, the sessions to write pages for are collected
+        as well; their navigation is part of the combined page's.
+        """
+        from_dt, to_dt = parse_date_range(self.from_date, self.to_date)
+        cache_manager = self.cache_manager
+        update_cache = cache_manager is not None and _cache_needs_update(
+            self.input_path, cache_manager, self.from_date, self.to_date
+        )
+
+        def collect(messages: Iterable[TranscriptEntry]) -> Iterator[TranscriptEntry]:
+            for message in messages:
+                record_working_directory(self.working_directories, message)
+                if is_in_date_range(message, from_dt, to_dt):
+                    self.session_index.add(message)
+                    session_id = getattr(message, "sessionId", "")
+                    if collect_sessions and session_id:
+                        self.session_ids[session_id] = None
+                yield message
+
+        messages = collect(self.entries(self.silent, count_validation=True))
+        if cache_manager is None or not update_cache:
+            for _ in messages:
+                pass
+            return
+
+        # Save the cache index once for the whole update
+        if not self.silent:
+            print(f"Updating cache for {self.input_path.name}...")
+        with cache_manager.batch():
+            if self.from_date is not None or self.to_date is not None:
+                _update_cache_with_session_data(cache_manager, messages)
+                return
+            # Changed files are cached with their aggregates as the stream
+            # reaches them, so the project's are merged from the files'
+            for _ in messages:
+                pass
+            if not _update_cache_from_files(self.input_path, cache_manager):
+                _update_cache_with_session_data(cache_manager, self.entries())
+
+    @property
+    def session_indexes(self) -> Dict[str, SessionIndex]:
+        """The navigation of each session's page, taken from the combined one."""
+        return {
+            session_id: self.session_index.for_session(session_id)
+            for session_id in self.session_ids
+        }
+
+    def report_loads(self) -> None:
+        """Print how many times the entries were read."""
+        print(
+            f"Read the entries of {self.input_path.name} {self.loads} time(s)"
+            f" for the project and {self.session_loads} time(s) for session pages"
+        )
+
 
 def convert_jsonl_to_html(
     input_path: Path,
@@ -42,48 +209,95 @@ def convert_jsonl_to_html(
     generate_individual_sessions: bool = True,
     use_cache: bool = True,
     silent: bool = False,
+    validation: ValidationLevel = "none",
+    validation_stats: Optional[ValidationStats] = None,
+    jobs: int = 1,
+    cache_backend: Optional[CacheBackend] = None,
+    cache_codec: CacheCodec = DEFAULT_CACHE_CODEC,
+    cache_level: Optional[int] = None,
 ) -> Path:
-    """Convert JSONL transcript(s) to HTML file(s)."""
+    """Convert JSONL transcript(s) to HTML file(s).
+
+    If validation_stats is given, failure counts are added to it and reporting
+    is left to the caller; otherwise a validation report is printed at the end.
+    With jobs > 1, transcript files, and byte ranges of very large files, are
+    parsed in a process pool. cache_backend selects the cache store, and
+    cache_codec and cache_level the compression of JSON caches (see
+    CacheManager).
+    """
     if not input_path.exists():
         raise FileNotFoundError(f"Input path not found: {input_path}")
 
+    report_validation = validation_stats is None
+    if validation_stats is None:
+        validation_stats = ValidationStats(level=validation)
+
     # Initialize cache manager for directory mode
     cache_manager = None
     if use_cache and input_path.is_dir():
         try:
             library_version = get_library_version()
-            cache_manager = CacheManager(input_path, library_version)
+            cache_manager = CacheManager(
+                input_path, library_version, cache_backend, cache_codec, cache_level
+            )
         except Exception as e:
             print(f"Warning: Failed to initialize cache manager: {e}")
 
-    if input_path.is_file():
-        # Single file mode - cache only available for directory mode
-        if output_path is None:
-            output_path = input_path.with_suffix(".html")
-        messages = load_transcript(input_path, silent=silent)
-        title = f"Claude Transcript - {input_path.stem}"
-    else:
-        # Directory mode - Cache-First Approach
-        if output_path is None:
-            output_path = input_path / "combined_transcripts.html"
+    pipeline = ProjectPipeline(
+        input_path,
+        cache_manager,
+        from_date,
+        to_date,
+        silent,
+        validation,
+        validation_stats,
+        jobs,
+    )
+    try:
+        output_path = _convert_project(
+            pipeline, output_path, generate_individual_sessions
+        )
+    finally:
+        if cache_manager is not None:
+            # Also records which cached files were read, for cache eviction
+            cache_manager.close()
+
+    if report_validation and not silent:
+        _print_validation_report(validation_stats)
+    return output_path
 
-        # Phase 1: Ensure cache is fresh and populated
-        ensure_fresh_cache(input_path, cache_manager, from_date, to_date, silent)
 
-        # Phase 2: Load messages (will use fresh cache when available)
-        messages = load_directory_transcripts(
-            input_path, cache_manager, from_date, to_date, silent
+def _convert_project(
+    pipeline: ProjectPipeline,
+    output_path: Optional[Path],
+    generate_individual_sessions: bool,
+) -> Path:
+    """Write the combined page (and session pages) of a pipeline's input."""
+    input_path = pipeline.input_path
+    cache_manager = pipeline.cache_manager
+    from_date, to_date = pipeline.from_date, pipeline.to_date
+    if output_path is None:
+        output_path = (
+            input_path.with_suffix(".html")
+            if input_path.is_file()
+            else input_path / COMBINED_HTML_FILE
         )
 
-        # Extract working directories directly from parsed messages
-        working_directories = extract_working_directories(messages)
+    # Messages are streamed twice so that only aggregates stay in memory: the
+    # scan updates the cache and collects session navigation (and per-session
+    # navigation for session pages), the second pass renders
+    collect_sessions = generate_individual_sessions and input_path.is_dir()
+    pipeline.scan(collect_sessions)
 
-        project_title = get_project_display_name(input_path.name, working_directories)
+    if input_path.is_file():
+        title = f"Claude Transcript - {input_path.stem}"
+    else:
+        # Extract working directories directly from parsed messages
+        project_title = get_project_display_name(
+            input_path.name, sort_working_directories(pipeline.working_directories)
+        )
         title = f"Claude Transcripts - {project_title}"
 
-    # Apply date filtering
-    messages = filter_messages_by_date(messages, from_date, to_date)
-
     # Update title to include date range if specified
     if from_date or to_date:
         date_range_parts: List[str] = []
@@ -95,41 +309,92 @@ def convert_jsonl_to_html(
         title += f" ({date_range_str})"
 
     # Generate combined HTML file (check if regeneration needed)
-    assert output_path is not None
-    should_regenerate = (
-        is_html_outdated(output_path)
-        or from_date is not None
-        or to_date is not None
-        or not output_path.exists()
-    )
+    fingerprint = None
+    if cache_manager is not None:
+        fingerprint = build_fingerprint(
+            input_path.glob("*.jsonl"),
+            title,
+            *_date_range_params(*parse_date_range(from_date, to_date)),
+            cache_manager=cache_manager,
+        )
 
-    if should_regenerate:
-        html_content = generate_html(messages, title)
-        output_path.write_text(html_content, encoding="utf-8")
+    if not _is_output_current(
+        output_path, fingerprint, cache_manager, from_date, to_date
+    ):
+        messages = iter_messages_by_date(pipeline.entries(), from_date, to_date)
+        _write_html_chunks(
+            output_path,
+            render_html_chunks(
+                messages,
+                pipeline.session_index,
+                title,
+                fragment_cache=(
+                    cache_manager.fragments if cache_manager is not None else None
+                ),
+            ),
+        )
+        if cache_manager is not None and fingerprint is not None:
+            cache_manager.record_outputs({output_path: fingerprint})
     else:
         print(f"HTML file {output_path.name} is current, skipping regeneration")
 
     # Generate individual session files if requested and in directory mode
-    if generate_individual_sessions and input_path.is_dir():
-        _generate_individual_session_files(
-            messages, input_path, from_date, to_date, cache_manager
-        )
+    if collect_sessions:
+        _generate_individual_session_files(pipeline)
 
+    if not pipeline.silent:
+        pipeline.report_loads()
     return output_path
 
 
-def ensure_fresh_cache(
-    project_dir: Path,
+def _date_range_params(
+    from_dt: Optional[datetime], to_dt: Optional[datetime]
+) -> List[Optional[str]]:
+    """Fingerprint parameters of a resolved date range."""
+    return [dt.isoformat() if dt is not None else None for dt in (from_dt, to_dt)]
+
+
+def _is_output_current(
+    output_path: Path,
+    fingerprint: Optional[str],
     cache_manager: Optional[CacheManager],
-    from_date: Optional[str] = None,
-    to_date: Optional[str] = None,
-    silent: bool = False,
+    from_date: Optional[str],
+    to_date: Optional[str],
 ) -> bool:
-    """Ensure cache is fresh and populated. Returns True if cache was updated."""
-    if cache_manager is None:
+    """Check whether an HTML file can be kept as it is.
+
+    With a cache, the file is current if it was generated from inputs with
+    the same fingerprint. Without one there is no record of its inputs, so
+    it is current if it was written by this library version, unless a date
+    range is given.
+    """
+    if not output_path.exists():
         return False
+    if cache_manager is not None and fingerprint is not None:
+        return cache_manager.get_output_fingerprint(output_path) == fingerprint
+    return not is_html_outdated(output_path) and from_date is None and to_date is None
+
+
+def _write_html_chunks(output_path: Path, chunks: Iterable[str]) -> None:
+    """Write streamed HTML to a file, replacing it only once complete."""
+    with atomic_write(output_path) as f:
+        for chunk in chunks:
+            f.write(chunk)
 
-    # Check if cache needs updating
+
+def _print_validation_report(validation_stats: ValidationStats) -> None:
+    """Print validation failure counts when there is something to report."""
+    if validation_stats.level == "strict" or validation_stats.failure_count:
+        print(validation_stats.format_report())
+
+
+def _cache_needs_update(
+    project_dir: Path,
+    cache_manager: CacheManager,
+    from_date: Optional[str],
+    to_date: Optional[str],
+) -> bool:
+    """Check whether a project's cached aggregates must be computed again."""
     jsonl_files = list(project_dir.glob("*.jsonl"))
     if not jsonl_files:
         return False
@@ -138,158 +403,95 @@ def ensure_fresh_cache(
     cached_project_data = cache_manager.get_cached_project_data()
 
     # Check various invalidation conditions
-    needs_update = (
+    return bool(
         cached_project_data is None
         or from_date is not None
         or to_date is not None
         or cache_manager.get_modified_files(jsonl_files)  # Files changed
-        or (cached_project_data.total_message_count == 0 and jsonl_files)  # Stale cache
+        or cached_project_data.total_message_count == 0  # Stale cache
     )
 
-    if not needs_update:
-        return False  # Cache is already fresh
 
-    # Load and process messages to populate cache
-    print(f"Updating cache for {project_dir.name}...")
-    messages = load_directory_transcripts(
-        project_dir, cache_manager, from_date, to_date, silent
-    )
+def ensure_fresh_cache(
+    project_dir: Path,
+    cache_manager: Optional[CacheManager],
+    from_date: Optional[str] = None,
+    to_date: Optional[str] = None,
+    silent: bool = False,
+    validation: ValidationLevel = "none",
+    validation_stats: Optional[ValidationStats] = None,
+    jobs: int = 1,
+) -> bool:
+    """Ensure cache is fresh and populated. Returns True if cache was updated."""
+    if cache_manager is None or not _cache_needs_update(
+        project_dir, cache_manager, from_date, to_date
+    ):
+        return False
+
+    # Populate the cache, saving the cache index once for the whole update
+    if not silent:
+        print(f"Updating cache for {project_dir.name}...")
+    with cache_manager.batch():
+        if from_date is None and to_date is None:
+            # Only changed files are read, grown ones from where they were
+            # cached, and the project's aggregates are merged from the files'
+            jsonl_files = list(project_dir.glob("*.jsonl"))
+            for jsonl_path in cache_manager.get_modified_files(jsonl_files):
+                update_transcript_cache(
+                    jsonl_path,
+                    cache_manager,
+                    silent=silent,
+                    validation=validation,
+                    validation_stats=validation_stats,
+                    jobs=jobs,
+                )
+            if _update_cache_from_files(project_dir, cache_manager):
+                return True
+
+        # Stream messages through the aggregation otherwise
+        messages = iter_project(
+            project_dir,
+            cache_manager,
+            from_date,
+            to_date,
+            silent,
+            validation,
+            validation_stats,
+            jobs=jobs,
+        )
 
-    # Update cache with fresh data
-    _update_cache_with_session_data(cache_manager, messages)
+        # Update cache with fresh data
+        _update_cache_with_session_data(cache_manager, messages)
     return True
 
 
 def _update_cache_with_session_data(
-    cache_manager: CacheManager, messages: List[TranscriptEntry]
+    cache_manager: CacheManager, messages: Iterable[TranscriptEntry]
 ) -> None:
-    """Update cache with session and project aggregate data."""
-    from .parser import extract_text_content
-
-    # Collect session data (similar to _collect_project_sessions but for cache)
-    session_summaries: Dict[str, str] = {}
-    uuid_to_session: Dict[str, str] = {}
-    uuid_to_session_backup: Dict[str, str] = {}
-
-    # Build mapping from message UUID to session ID
-    for message in messages:
-        if hasattr(message, "uuid") and hasattr(message, "sessionId"):
-            message_uuid = getattr(message, "uuid", "")
-            session_id = getattr(message, "sessionId", "")
-            if message_uuid and session_id:
-                if type(message) is AssistantTranscriptEntry:
-                    uuid_to_session[message_uuid] = session_id
-                else:
-                    uuid_to_session_backup[message_uuid] = session_id
-
-    # Map summaries to sessions
-    for message in messages:
-        if isinstance(message, SummaryTranscriptEntry):
-            leaf_uuid = message.leafUuid
-            if leaf_uuid in uuid_to_session:
-                session_summaries[uuid_to_session[leaf_uuid]] = message.summary
-            elif (
-                leaf_uuid in uuid_to_session_backup
-                and uuid_to_session_backup[leaf_uuid] not in session_summaries
-            ):
-                session_summaries[uuid_to_session_backup[leaf_uuid]] = message.summary
-
-    # Group messages by session and calculate session data
-    sessions_cache_data: Dict[str, SessionCacheData] = {}
-
-    # Track token usage and timestamps for project aggregates
-    total_input_tokens = 0
-    total_output_tokens = 0
-    total_cache_creation_tokens = 0
-    total_cache_read_tokens = 0
-    total_message_count = len(messages)
-    earliest_timestamp = ""
-    latest_timestamp = ""
-    seen_request_ids: set[str] = set()
-
-    for message in messages:
-        # Update project-level timestamp tracking
-        if hasattr(message, "timestamp"):
-            message_timestamp = getattr(message, "timestamp", "")
-            if message_timestamp:
-                if not latest_timestamp or message_timestamp > latest_timestamp:
-                    latest_timestamp = message_timestamp
-                if not earliest_timestamp or message_timestamp < earliest_timestamp:
-                    earliest_timestamp = message_timestamp
-
-        # Process session-level data (skip summaries)
-        if hasattr(message, "sessionId") and not isinstance(
-            message, SummaryTranscriptEntry
-        ):
-            session_id = getattr(message, "sessionId", "")
-            if not session_id:
-                continue
-
-            if session_id not in sessions_cache_data:
-                sessions_cache_data[session_id] = SessionCacheData(
-                    session_id=session_id,
-                    summary=session_summaries.get(session_id),
-                    first_timestamp=getattr(message, "timestamp", ""),
-                    last_timestamp=getattr(message, "timestamp", ""),
-                    message_count=0,
-                    first_user_message="",
-                    cwd=getattr(message, "cwd", None),
-                )
+    """Update cache with session and project aggregate data.
 
-            session_cache = sessions_cache_data[session_id]
-            session_cache.message_count += 1
-            current_timestamp = getattr(message, "timestamp", "")
-            if current_timestamp:
-                session_cache.last_timestamp = current_timestamp
-
-            # Get first user message for preview
-            if (
-                isinstance(message, UserTranscriptEntry)
-                and not session_cache.first_user_message
-                and hasattr(message, "message")
-            ):
-                first_user_content = extract_text_content(message.message.content)
-                if should_use_as_session_starter(first_user_content):
-                    session_cache.first_user_message = create_session_preview(
-                        first_user_content
-                    )
-
-        # Calculate token usage for assistant messages
-        if message.type == "assistant" and hasattr(message, "message"):
-            assistant_message = getattr(message, "message")
-            request_id = getattr(message, "requestId", None)
-            session_id = getattr(message, "sessionId", "")
-
-            if (
-                hasattr(assistant_message, "usage")
-                and assistant_message.usage
-                and request_id
-                and request_id not in seen_request_ids
-            ):
-                seen_request_ids.add(request_id)
-                usage = assistant_message.usage
-
-                # Add to project totals
-                total_input_tokens += usage.input_tokens or 0
-                total_output_tokens += usage.output_tokens or 0
-                if usage.cache_creation_input_tokens:
-                    total_cache_creation_tokens += usage.cache_creation_input_tokens
-                if usage.cache_read_input_tokens:
-                    total_cache_read_tokens += usage.cache_read_input_tokens
-
-                # Add to session totals
-                if session_id in sessions_cache_data:
-                    session_cache = sessions_cache_data[session_id]
-                    session_cache.total_input_tokens += usage.input_tokens or 0
-                    session_cache.total_output_tokens += usage.output_tokens or 0
-                    if usage.cache_creation_input_tokens:
-                        session_cache.total_cache_creation_tokens += (
-                            usage.cache_creation_input_tokens
-                        )
-                    if usage.cache_read_input_tokens:
-                        session_cache.total_cache_read_tokens += (
-                            usage.cache_read_input_tokens
-                        )
+    Messages are consumed in a single pass, so they can be streamed.
+    """
+    _store_aggregates(cache_manager, SessionAggregator.from_entries(messages))
+
+
+def _update_cache_from_files(project_dir: Path, cache_manager: CacheManager) -> bool:
+    """Update cache with the aggregates of the project's cached files, merged.
+
+    Returns False, leaving the cache as it is, if a file isn't cached.
+    """
+    aggregator = cache_manager.merge_file_aggregates(list(project_dir.glob("*.jsonl")))
+    if aggregator is None:
+        return False
+    _store_aggregates(cache_manager, aggregator)
+    return True
+
+
+def _store_aggregates(
+    cache_manager: CacheManager, aggregator: SessionAggregator
+) -> None:
+    """Store the session and project aggregates of a project in its cache."""
+    sessions_cache_data = aggregator.session_data()
 
     # Update cache with session data
     cache_manager.update_session_cache(sessions_cache_data)
@@ -301,13 +503,13 @@ def _update_cache_with_session_data(
 
     # Update cache with project aggregates
     cache_manager.update_project_aggregates(
-        total_message_count=total_message_count,
-        total_input_tokens=total_input_tokens,
-        total_output_tokens=total_output_tokens,
-        total_cache_creation_tokens=total_cache_creation_tokens,
-        total_cache_read_tokens=total_cache_read_tokens,
-        earliest_timestamp=earliest_timestamp,
-        latest_timestamp=latest_timestamp,
+        total_message_count=aggregator.total_message_count,
+        total_input_tokens=aggregator.total_input_tokens,
+        total_output_tokens=aggregator.total_output_tokens,
+        total_cache_creation_tokens=aggregator.total_cache_creation_tokens,
+        total_cache_read_tokens=aggregator.total_cache_read_tokens,
+        earliest_timestamp=aggregator.earliest_timestamp,
+        latest_timestamp=aggregator.latest_timestamp,
     )
 
 
@@ -326,131 +528,179 @@ def _format_session_timestamp_range(first_timestamp: str, last_timestamp: str) -
         return ""
 
 
-def _collect_project_sessions(messages: List[TranscriptEntry]) -> List[Dict[str, Any]]:
+def _collect_project_sessions(aggregator: SessionAggregator) -> List[Dict[str, Any]]:
     """Collect session data for project index navigation."""
-    from .parser import extract_text_content
-
-    # Pre-process to find and attach session summaries
-    # This matches the logic from renderer.py generate_html() exactly
-    session_summaries: Dict[str, str] = {}
-    uuid_to_session: Dict[str, str] = {}
-    uuid_to_session_backup: Dict[str, str] = {}
-
-    # Build mapping from message UUID to session ID across ALL messages
-    # This allows summaries from later sessions to be matched to earlier sessions
-    for message in messages:
-        if hasattr(message, "uuid") and hasattr(message, "sessionId"):
-            message_uuid = getattr(message, "uuid", "")
-            session_id = getattr(message, "sessionId", "")
-            if message_uuid and session_id:
-                # There is often duplication, in that case we want to prioritise the assistant
-                # message because summaries are generated from Claude's (last) success message
-                if type(message) is AssistantTranscriptEntry:
-                    uuid_to_session[message_uuid] = session_id
-                else:
-                    uuid_to_session_backup[message_uuid] = session_id
-
-    # Map summaries to sessions via leafUuid -> message UUID -> session ID
-    # Summaries can be in different sessions than the messages they summarize
-    for message in messages:
-        if isinstance(message, SummaryTranscriptEntry):
-            leaf_uuid = message.leafUuid
-            if leaf_uuid in uuid_to_session:
-                session_summaries[uuid_to_session[leaf_uuid]] = message.summary
-            elif (
-                leaf_uuid in uuid_to_session_backup
-                and uuid_to_session_backup[leaf_uuid] not in session_summaries
-            ):
-                session_summaries[uuid_to_session_backup[leaf_uuid]] = message.summary
-
-    # Group messages by session
-    sessions: Dict[str, Dict[str, Any]] = {}
-    for message in messages:
-        if hasattr(message, "sessionId") and not isinstance(
-            message, SummaryTranscriptEntry
-        ):
-            session_id = getattr(message, "sessionId", "")
-            if not session_id:
-                continue
-
-            if session_id not in sessions:
-                sessions[session_id] = {
-                    "id": session_id,
-                    "summary": session_summaries.get(session_id),
-                    "first_timestamp": getattr(message, "timestamp", ""),
-                    "last_timestamp": getattr(message, "timestamp", ""),
-                    "message_count": 0,
-                    "first_user_message": "",
-                }
-
-            sessions[session_id]["message_count"] += 1
-            current_timestamp = getattr(message, "timestamp", "")
-            if current_timestamp:
-                sessions[session_id]["last_timestamp"] = current_timestamp
-
-            # Get first user message for preview (skip system messages)
-            if (
-                isinstance(message, UserTranscriptEntry)
-                and not sessions[session_id]["first_user_message"]
-                and hasattr(message, "message")
-            ):
-                first_user_content = extract_text_content(message.message.content)
-                if should_use_as_session_starter(first_user_content):
-                    sessions[session_id]["first_user_message"] = create_session_preview(
-                        first_user_content
-                    )
+    # Sort by first timestamp (ascending order, oldest first like transcript page)
+    ordered_sessions = sorted(
+        aggregator.session_data().values(),
+        key=lambda s: -1 if s.first_timestamp_ms is None else s.first_timestamp_ms,
+    )
 
     # Convert to list format with formatted timestamps
     session_list: List[Dict[str, Any]] = []
-    for session_data in sessions.values():
-        from .renderer import format_timestamp
-
-        first_ts = session_data["first_timestamp"]
-        last_ts = session_data["last_timestamp"]
-        timestamp_range = ""
-        if first_ts and last_ts:
-            if first_ts == last_ts:
-                timestamp_range = format_timestamp(first_ts)
-            else:
-                timestamp_range = (
-                    f"{format_timestamp(first_ts)} - {format_timestamp(last_ts)}"
-                )
-        elif first_ts:
-            timestamp_range = format_timestamp(first_ts)
-
+    for session_data in ordered_sessions:
         session_dict: Dict[str, Any] = {
-            "id": session_data["id"],
-            "summary": session_data["summary"],
-            "timestamp_range": timestamp_range,
-            "message_count": session_data["message_count"],
-            "first_user_message": session_data["first_user_message"]
-            if session_data["first_user_message"] != ""
+            "id": session_data.session_id,
+            "summary": session_data.summary,
+            "timestamp_range": format_timestamp_range_ms(
+                session_data.first_timestamp_ms, session_data.last_timestamp_ms
+            ),
+            "message_count": session_data.message_count,
+            "first_user_message": session_data.first_user_message
+            if session_data.first_user_message != ""
             else "[No user message found in session.]",
         }
         session_list.append(session_dict)
 
-    # Sort by first timestamp (ascending order, oldest first like transcript page)
-    return sorted(
-        session_list, key=lambda s: s.get("timestamp_range", ""), reverse=False
-    )
+    return session_list
 
 
-def _generate_individual_session_files(
-    messages: List[TranscriptEntry],
-    output_dir: Path,
-    from_date: Optional[str] = None,
-    to_date: Optional[str] = None,
-    cache_manager: Optional["CacheManager"] = None,
+class _SessionPage:
+    """A session page to write, with what rendering it needs."""
+
+    def __init__(
+        self,
+        session_id: str,
+        path: Path,
+        title: str,
+        session_index: SessionIndex,
+        jsonl_files: List[Path],
+    ) -> None:
+        self.session_id = session_id
+        self.path = path
+        self.title = title
+        self.session_index = session_index
+        # The files that may contain the session's messages
+        self.jsonl_files = jsonl_files
+
+
+def _group_session_pages(pages: List[_SessionPage]) -> List[List[_SessionPage]]:
+    """Group pages so that sessions sharing a file are in the same group."""
+    parent: Dict[Path, Path] = {}
+
+    def find(jsonl_path: Path) -> Path:
+        root = parent.setdefault(jsonl_path, jsonl_path)
+        while root != parent[root]:
+            root = parent[root]
+        parent[jsonl_path] = root
+        return root
+
+    for page in pages:
+        first, *others = page.jsonl_files
+        for jsonl_path in others:
+            parent[find(jsonl_path)] = find(first)
+
+    groups: Dict[Path, List[_SessionPage]] = {}
+    for page in pages:
+        groups.setdefault(find(page.jsonl_files[0]), []).append(page)
+    return list(groups.values())
+
+
+def _write_session_pages(
+    project_dir: Path,
+    cache_manager: Optional[CacheManager],
+    pages: List[_SessionPage],
+    jsonl_files: List[Path],
+    session_summaries: Dict[str, str],
+    from_date: Optional[str],
+    to_date: Optional[str],
+    validation: ValidationLevel,
 ) -> None:
-    """Generate individual HTML files for each session."""
-    # Find all unique session IDs
-    session_ids: set[str] = set()
-    for message in messages:
-        if hasattr(message, "sessionId"):
-            session_id: str = getattr(message, "sessionId")
-            if session_id:
-                session_ids.add(session_id)
+    """Render a group of session pages from one read of their files.
+
+    The SQLite cache looks each session up directly. Otherwise the group's
+    files are streamed once and their messages partitioned by session, so
+    each file is read once however many sessions it holds.
+    """
+    partitioned: Optional[Dict[str, List[TranscriptEntry]]] = None
+    for page in pages:
+        cached_session = (
+            cache_manager.load_session_entries(
+                page.session_id, page.jsonl_files, from_date, to_date, validation
+            )
+            if cache_manager is not None
+            else None
+        )
+        if cached_session is not None:
+            session_messages: Iterable[TranscriptEntry] = (
+                message
+                for message in iter_messages_by_date(cached_session, from_date, to_date)
+                if getattr(message, "sessionId", None) == page.session_id
+            )
+        else:
+            if partitioned is None:
+                partitioned = {other.session_id: [] for other in pages}
+                for message in iter_messages_by_date(
+                    iter_project(
+                        project_dir,
+                        cache_manager,
+                        from_date,
+                        to_date,
+                        silent=True,
+                        validation=validation,
+                        jsonl_files=jsonl_files,
+                    ),
+                    from_date,
+                    to_date,
+                ):
+                    bucket = partitioned.get(getattr(message, "sessionId", None) or "")
+                    if bucket is not None:
+                        bucket.append(message)
+            session_messages = partitioned.pop(page.session_id)
+
+        _write_html_chunks(
+            page.path,
+            render_session_html_chunks(
+                session_messages,
+                page.session_index,
+                page.session_id,
+                page.title,
+                cache_manager,
+                session_summaries,
+            ),
+        )
 
+
+def _write_session_pages_worker(
+    project_dir: Path,
+    cache_settings: Optional[Tuple[str, CacheBackend, CacheCodec, int]],
+    *args: Any,
+) -> None:
+    """Process pool worker: render a group of session pages.
+
+    The worker opens its own cache manager from cache_settings (the library
+    version, backend, codec and level), or renders without a cache.
+    """
+    cache_manager = (
+        CacheManager(project_dir, *cache_settings)
+        if cache_settings is not None
+        else None
+    )
+    try:
+        _write_session_pages(project_dir, cache_manager, *args)
+    finally:
+        if cache_manager is not None:
+            cache_manager.close()
+
+
+def _generate_individual_session_files(pipeline: ProjectPipeline) -> None:
+    """Generate individual HTML files for each session.
+
+    Uses the navigation the pipeline's scan collected for each session from
+    its (date-filtered) messages, and the project-wide summaries. Only the
+    pages whose inputs changed are written. Their messages are read again,
+    once per group of sessions sharing files, and with jobs > 1 the groups
+    are rendered in a process pool.
+    """
+    output_dir = pipeline.input_path
+    cache_manager = pipeline.cache_manager
+    from_date, to_date = pipeline.from_date, pipeline.to_date
+    session_summaries = pipeline.session_index.session_summaries
+    jsonl_files = list(output_dir.glob("*.jsonl"))
+    session_files = find_session_files(jsonl_files, cache_manager)
+    date_range = _date_range_params(*parse_date_range(from_date, to_date))
+    fingerprints: Dict[Path, str] = {}
+    pages: List[_SessionPage] = []
     # Get session data from cache for better titles
     session_data: Dict[str, Any] = {}
     working_directories = None
@@ -465,7 +715,7 @@ def _generate_individual_session_files(
     project_title = get_project_display_name(output_dir.name, working_directories)
 
     # Generate HTML file for each session
-    for session_id in session_ids:
+    for session_id, session_index in pipeline.session_indexes.items():
         # Create session-specific title using cache data if available
         if session_id in session_data:
             session_cache = session_data[session_id]
@@ -497,213 +747,440 @@ def _generate_individual_session_files(
 
         # Check if session file needs regeneration
         session_file_path = output_dir / f"session-{session_id}.html"
+        candidate_files = session_files.get(session_id, jsonl_files)
+
+        # Regenerate when the session's files, title, summary or date range
+        # changed since it was generated
+        fingerprint = None
+        if cache_manager is not None:
+            fingerprint = build_fingerprint(
+                candidate_files,
+                session_id,
+                session_title,
+                session_summaries.get(session_id),
+                bool(session_data),
+                *date_range,
+                cache_manager=cache_manager,
+            )
 
-        # Only regenerate if outdated, doesn't exist, or date filtering is active
-        should_regenerate_session = (
-            is_html_outdated(session_file_path)
-            or from_date is not None
-            or to_date is not None
-            or not session_file_path.exists()
-        )
-
-        if should_regenerate_session:
-            # Generate session HTML
-            session_html = generate_session_html(
-                messages, session_id, session_title, cache_manager
+        if not _is_output_current(
+            session_file_path, fingerprint, cache_manager, from_date, to_date
+        ):
+            pages.append(
+                _SessionPage(
+                    session_id,
+                    session_file_path,
+                    session_title,
+                    session_index,
+                    candidate_files,
+                )
             )
-            # Write session file
-            session_file_path.write_text(session_html, encoding="utf-8")
+            if fingerprint is not None:
+                fingerprints[session_file_path] = fingerprint
         else:
             print(
                 f"Session file {session_file_path.name} is current, skipping regeneration"
             )
 
+    groups = _group_session_pages(pages)
+    pipeline.session_loads += len(groups)
+    render_args: List[Tuple[Any, ...]] = []
+    for group in groups:
+        group_files = {jsonl_path for page in group for jsonl_path in page.jsonl_files}
+        render_args.append(
+            (
+                group,
+                # The group's files, in the order the project's are merged in
+                [jsonl_path for jsonl_path in jsonl_files if jsonl_path in group_files],
+                session_summaries,
+                from_date,
+                to_date,
+                pipeline.validation,
+            )
+        )
+    if pipeline.jobs <= 1 or len(groups) <= 1:
+        for args in render_args:
+            _write_session_pages(output_dir, cache_manager, *args)
+    else:
+        cache_settings = None
+        if cache_manager is not None:
+            # Let the workers use the fragments rendered so far
+            cache_manager.fragments.flush()
+            cache_settings = (
+                cache_manager.library_version,
+                cache_manager.backend,
+                cache_manager.codec,
+                cache_manager.codec_level,
+            )
+        with ProcessPoolExecutor(
+            max_workers=min(pipeline.jobs, len(groups))
+        ) as executor:
+            futures = [
+                executor.submit(
+                    _write_session_pages_worker, output_dir, cache_settings, *args
+                )
+                for args in render_args
+            ]
+            for future in as_completed(futures):
+                future.result()
+
+    if cache_manager is not None:
+        cache_manager.record_outputs(fingerprints)
+
+
+def _project_summary(
+    project_dir: Path,
+    html_file_name: str,
+    jsonl_count: int,
+    last_modified: float,
+    project_cache: ProjectCache,
+) -> Dict[str, Any]:
+    """Build a project's entry of the projects index page from its cache."""
+    return {
+        "name": project_dir.name,
+        "path": project_dir,
+        "html_file": f"{project_dir.name}/{html_file_name}",
+        "jsonl_count": jsonl_count,
+        "message_count": project_cache.total_message_count,
+        "last_modified": last_modified,
+        "total_input_tokens": project_cache.total_input_tokens,
+        "total_output_tokens": project_cache.total_output_tokens,
+        "total_cache_creation_tokens": project_cache.total_cache_creation_tokens,
+        "total_cache_read_tokens": project_cache.total_cache_read_tokens,
+        "latest_timestamp": project_cache.latest_timestamp,
+        "earliest_timestamp": project_cache.earliest_timestamp,
+        "working_directories": project_cache.working_directories,
+        "sessions": [
+            {
+                "id": session_data.session_id,
+                "summary": session_data.summary,
+                "timestamp_range": _format_session_timestamp_range(
+                    session_data.first_timestamp,
+                    session_data.last_timestamp,
+                ),
+                "message_count": session_data.message_count,
+                "first_user_message": session_data.first_user_message
+                or "[No user message found in session.]",
+            }
+            for session_data in project_cache.sessions.values()
+        ],
+    }
+
+
+def _project_pages_exist(project_dir: Path, project_cache: ProjectCache) -> bool:
+    """Check that the combined page and the pages of all sessions exist."""
+    return (project_dir / COMBINED_HTML_FILE).exists() and all(
+        (project_dir / f"session-{session_id}.html").exists()
+        for session_id in project_cache.sessions
+    )
+
+
+def _process_project(
+    project_dir: Path,
+    jsonl_count: int,
+    last_modified: float,
+    from_date: Optional[str],
+    to_date: Optional[str],
+    use_cache: bool,
+    validation: ValidationLevel,
+    jobs: int,
+    cache_backend: Optional[CacheBackend],
+    cache_codec: CacheCodec,
+    cache_level: Optional[int],
+) -> Tuple[Optional[Dict[str, Any]], Optional[ProjectCache], ValidationStats]:
+    """Bring a project's cache and HTML up to date, possibly in a worker process.
+
+    Returns the project's entry of the projects index page (None if it
+    failed), its cache index for the projects index (None without a cache)
+    and the validation stats of the transcripts that were parsed.
+    """
+    library_version = get_library_version()
+    validation_stats = ValidationStats(level=validation)
+    cache_manager = None
+    try:
+        # Initialize cache manager for this project
+        if use_cache:
+            try:
+                cache_manager = CacheManager(
+                    project_dir,
+                    library_version,
+                    cache_backend,
+                    cache_codec,
+                    cache_level,
+                )
+            except Exception as e:
+                print(f"Warning: Failed to initialize cache for {project_dir}: {e}")
+
+        # One pipeline reads the project's entries for the cache update, the
+        # HTML (including individual session files) and the index summary
+        pipeline = ProjectPipeline(
+            project_dir,
+            cache_manager,
+            from_date,
+            to_date,
+            validation=validation,
+            validation_stats=validation_stats,
+            jobs=jobs,
+        )
+        output_path = _convert_project(pipeline, None, True)
+
+        # Use fresh cached data for index aggregation
+        if cache_manager is not None:
+            cached_project_data = cache_manager.get_cached_project_data()
+            if cached_project_data is not None:
+                summary = _project_summary(
+                    project_dir,
+                    output_path.name,
+                    jsonl_count,
+                    last_modified,
+                    cached_project_data,
+                )
+                return summary, cached_project_data, validation_stats
+
+        # Fallback for when cache is not available (should be rare)
+        print(
+            f"Warning: No cached data available for {project_dir.name}, using fallback processing"
+        )
+        messages = list(pipeline.entries())
+        if from_date or to_date:
+            messages = filter_messages_by_date(messages, from_date, to_date)
+
+        # Calculate token usage aggregation, first/last interaction timestamps
+        # and the session data for this project
+        aggregator = SessionAggregator.from_entries(messages)
+
+        summary = {
+            "name": project_dir.name,
+            "path": project_dir,
+            "html_file": f"{project_dir.name}/{output_path.name}",
+            "jsonl_count": jsonl_count,
+            "message_count": aggregator.total_message_count,
+            "last_modified": last_modified,
+            "total_input_tokens": aggregator.total_input_tokens,
+            "total_output_tokens": aggregator.total_output_tokens,
+            "total_cache_creation_tokens": aggregator.total_cache_creation_tokens,
+            "total_cache_read_tokens": aggregator.total_cache_read_tokens,
+            "latest_timestamp": aggregator.latest_timestamp,
+            "earliest_timestamp": aggregator.earliest_timestamp,
+            "working_directories": extract_working_directories(messages),
+            "sessions": _collect_project_sessions(aggregator),
+        }
+        return summary, None, validation_stats
+    except Exception as e:
+        print(
+            f"Warning: Failed to process {project_dir}: {e}\n{traceback.format_exc()}"
+        )
+    finally:
+        if cache_manager is not None:
+            # Also records which cached files were read, for cache eviction
+            cache_manager.close()
+    return None, None, validation_stats
+
 
 def process_projects_hierarchy(
     projects_path: Path,
     from_date: Optional[str] = None,
     to_date: Optional[str] = None,
     use_cache: bool = True,
+    validation: ValidationLevel = "none",
+    jobs: int = 1,
+    cache_backend: Optional[CacheBackend] = None,
+    cache_codec: CacheCodec = DEFAULT_CACHE_CODEC,
+    cache_level: Optional[int] = None,
 ) -> Path:
-    """Process the entire ~/.claude/projects/ hierarchy and create linked HTML files."""
+    """Process the entire ~/.claude/projects/ hierarchy and create linked HTML files.
+
+    With jobs > 1, projects are processed in a process pool, each in a
+    single worker; a failing project is reported and left out of the index.
+    """
     if not projects_path.exists():
         raise FileNotFoundError(f"Projects path not found: {projects_path}")
 
+    # Get library version for cache management
+    library_version = get_library_version()
+
     # Find all project directories (those with JSONL files)
-    project_dirs: List[Path] = []
-    for child in projects_path.iterdir():
-        if child.is_dir() and list(child.glob("*.jsonl")):
-            project_dirs.append(child)
+    projects_index = ProjectsIndex(projects_path, library_version)
+    project_dirs = projects_index.discover_projects()
 
     if not project_dirs:
         raise FileNotFoundError(
             f"No project directories with JSONL files found in {projects_path}"
         )
 
-    # Get library version for cache management
-    library_version = get_library_version()
-
-    # Process each project directory
-    project_summaries: List[Dict[str, Any]] = []
-    for project_dir in sorted(project_dirs):
-        try:
-            # Initialize cache manager for this project
-            cache_manager = None
-            if use_cache:
+    # Projects unchanged since the last run are answered from the projects
+    # index, without loading their caches or transcripts, unless some of
+    # their pages were deleted
+    use_projects_index = use_cache and not (from_date or to_date)
+    summaries: List[Optional[Dict[str, Any]]] = [None] * len(project_dirs)
+    pending: List[Tuple[int, Path, int, float]] = []
+    for position, project_dir in enumerate(project_dirs):
+        fingerprint = projects_index.fingerprint(project_dir)
+        jsonl_count = fingerprint.file_count if fingerprint else 0
+        last_modified = fingerprint.max_mtime if fingerprint else 0.0
+        indexed_project = (
+            projects_index.get_project_cache(project_dir)
+            if use_projects_index
+            else None
+        )
+        if indexed_project is not None and _project_pages_exist(
+            project_dir, indexed_project
+        ):
+            summaries[position] = _project_summary(
+                project_dir,
+                COMBINED_HTML_FILE,
+                jsonl_count,
+                last_modified,
+                indexed_project,
+            )
+        else:
+            pending.append((position, project_dir, jsonl_count, last_modified))
+
+    validation_stats = ValidationStats(level=validation)
+
+    def record(
+        position: int,
+        summary: Optional[Dict[str, Any]],
+        project_cache: Optional[ProjectCache],
+        project_validation_stats: ValidationStats,
+    ) -> None:
+        summaries[position] = summary
+        validation_stats.merge(project_validation_stats)
+        if use_projects_index and project_cache is not None:
+            projects_index.update_project(project_dirs[position], project_cache)
+
+    # With several projects to process, each worker takes whole projects and
+    # parses their files itself, rather than every project using the pool
+    parallel = jobs > 1 and len(pending) > 1
+    project_args = (
+        from_date,
+        to_date,
+        use_cache,
+        validation,
+        1 if parallel else jobs,
+        cache_backend,
+        cache_codec,
+        cache_level,
+    )
+    if not parallel:
+        for position, *project in pending:
+            record(position, *_process_project(*project, *project_args))
+    else:
+        with ProcessPoolExecutor(max_workers=min(jobs, len(pending))) as executor:
+            futures = {
+                executor.submit(_process_project, *project, *project_args): position
+                for position, *project in pending
+            }
+            for future in as_completed(futures):
+                position = futures[future]
                 try:
-                    cache_manager = CacheManager(project_dir, library_version)
+                    record(position, *future.result())
                 except Exception as e:
-                    print(f"Warning: Failed to initialize cache for {project_dir}: {e}")
+                    # The worker died, or its result couldn't be sent back
+                    print(f"Warning: Failed to process {project_dirs[position]}: {e}")
 
-            # Phase 1: Ensure cache is fresh and populated
-            ensure_fresh_cache(project_dir, cache_manager, from_date, to_date)
+    # Keep the index page in project order, whatever order they finished in
+    project_summaries = [summary for summary in summaries if summary is not None]
 
-            # Phase 2: Generate HTML for this project (including individual session files)
-            output_path = convert_jsonl_to_html(
-                project_dir, None, from_date, to_date, True, use_cache
-            )
-
-            # Get project info for index - use cached data if available
-            jsonl_files = list(project_dir.glob("*.jsonl"))
-            jsonl_count = len(jsonl_files)
-            last_modified: float = (
-                max(f.stat().st_mtime for f in jsonl_files) if jsonl_files else 0.0
-            )
-
-            # Phase 3: Use fresh cached data for index aggregation
-            if cache_manager is not None:
-                cached_project_data = cache_manager.get_cached_project_data()
-                if cached_project_data is not None:
-                    # Use cached aggregation data
-                    project_summaries.append(
-                        {
-                            "name": project_dir.name,
-                            "path": project_dir,
-                            "html_file": f"{project_dir.name}/{output_path.name}",
-                            "jsonl_count": jsonl_count,
-                            "message_count": cached_project_data.total_message_count,
-                            "last_modified": last_modified,
-                            "total_input_tokens": cached_project_data.total_input_tokens,
-                            "total_output_tokens": cached_project_data.total_output_tokens,
-                            "total_cache_creation_tokens": cached_project_data.total_cache_creation_tokens,
-                            "total_cache_read_tokens": cached_project_data.total_cache_read_tokens,
-                            "latest_timestamp": cached_project_data.latest_timestamp,
-                            "earliest_timestamp": cached_project_data.earliest_timestamp,
-                            "working_directories": cached_project_data.working_directories,
-                            "sessions": [
-                                {
-                                    "id": session_data.session_id,
-                                    "summary": session_data.summary,
-                                    "timestamp_range": _format_session_timestamp_range(
-                                        session_data.first_timestamp,
-                                        session_data.last_timestamp,
-                                    ),
-                                    "message_count": session_data.message_count,
-                                    "first_user_message": session_data.first_user_message
-                                    or "[No user message found in session.]",
-                                }
-                                for session_data in cached_project_data.sessions.values()
-                            ],
-                        }
-                    )
-                    continue
-
-            # Fallback for when cache is not available (should be rare)
-            print(
-                f"Warning: No cached data available for {project_dir.name}, using fallback processing"
-            )
-            messages = load_directory_transcripts(
-                project_dir, cache_manager, from_date, to_date
-            )
-            if from_date or to_date:
-                messages = filter_messages_by_date(messages, from_date, to_date)
-
-            # Calculate token usage aggregation and find first/last interaction timestamps
-            total_input_tokens = 0
-            total_output_tokens = 0
-            total_cache_creation_tokens = 0
-            total_cache_read_tokens = 0
-            latest_timestamp = ""
-            earliest_timestamp = ""
-
-            # Track requestIds to avoid double-counting tokens
-            seen_request_ids: set[str] = set()
-
-            # Collect session data for this project
-            sessions_data = _collect_project_sessions(messages)
-
-            for message in messages:
-                # Track latest and earliest timestamps across all messages
-                if hasattr(message, "timestamp"):
-                    message_timestamp = getattr(message, "timestamp", "")
-                    if message_timestamp:
-                        # Track latest timestamp
-                        if not latest_timestamp or message_timestamp > latest_timestamp:
-                            latest_timestamp = message_timestamp
-
-                        # Track earliest timestamp
-                        if (
-                            not earliest_timestamp
-                            or message_timestamp < earliest_timestamp
-                        ):
-                            earliest_timestamp = message_timestamp
-
-                # Calculate token usage for assistant messages
-                if message.type == "assistant" and hasattr(message, "message"):
-                    assistant_message = getattr(message, "message")
-                    request_id = getattr(message, "requestId", None)
-
-                    if (
-                        hasattr(assistant_message, "usage")
-                        and assistant_message.usage
-                        and request_id
-                        and request_id not in seen_request_ids
-                    ):
-                        # Mark requestId as seen to avoid double-counting
-                        seen_request_ids.add(request_id)
-
-                        usage = assistant_message.usage
-                        total_input_tokens += usage.input_tokens or 0
-                        total_output_tokens += usage.output_tokens or 0
-                        if usage.cache_creation_input_tokens:
-                            total_cache_creation_tokens += (
-                                usage.cache_creation_input_tokens
-                            )
-                        if usage.cache_read_input_tokens:
-                            total_cache_read_tokens += usage.cache_read_input_tokens
-
-            project_summaries.append(
-                {
-                    "name": project_dir.name,
-                    "path": project_dir,
-                    "html_file": f"{project_dir.name}/{output_path.name}",
-                    "jsonl_count": jsonl_count,
-                    "message_count": len(messages),
-                    "last_modified": last_modified,
-                    "total_input_tokens": total_input_tokens,
-                    "total_output_tokens": total_output_tokens,
-                    "total_cache_creation_tokens": total_cache_creation_tokens,
-                    "total_cache_read_tokens": total_cache_read_tokens,
-                    "latest_timestamp": latest_timestamp,
-                    "earliest_timestamp": earliest_timestamp,
-                    "working_directories": extract_working_directories(messages),
-                    "sessions": sessions_data,
-                }
-            )
-        except Exception as e:
-            print(
-                f"Warning: Failed to process {project_dir}: {e}\n"
-                f"Previous (in alphabetical order) file before error: {project_summaries[-1]}"
-                f"\n{traceback.format_exc()}"
-            )
-            continue
+    projects_index.save()
+    _print_validation_report(validation_stats)
 
     # Generate index HTML (always regenerate if outdated)
     index_path = projects_path / "index.html"
     if is_html_outdated(index_path) or from_date or to_date:
         index_html = generate_projects_index_html(project_summaries, from_date, to_date)
-        index_path.write_text(index_html, encoding="utf-8")
+        atomic_write_text(index_path, index_html)
     else:
         print("Index HTML is current, skipping regeneration")
 
     return index_path
+
+
+class CacheBuildStats(BaseModel):
+    """What bringing a project's cache up to date took."""
+
+    project: str
+    files_parsed: int = 0
+    bytes_parsed: int = 0
+    seconds: float = 0.0
+    error: Optional[str] = None
+
+
+def _build_project_cache(
+    project_dir: Path,
+    validation: ValidationLevel,
+    cache_backend: Optional[CacheBackend],
+    cache_codec: CacheCodec,
+    cache_level: Optional[int],
+) -> CacheBuildStats:
+    """Bring a project's cache up to date, in a worker process."""
+    start = time.perf_counter()
+    stats = CacheBuildStats(project=project_dir.name)
+    try:
+        cache_manager = CacheManager(
+            project_dir, get_library_version(), cache_backend, cache_codec, cache_level
+        )
+        try:
+            for jsonl_path in cache_manager.get_modified_files(
+                list(project_dir.glob("*.jsonl"))
+            ):
+                # Grown files are only parsed from where they were cached
+                append_position = cache_manager.get_append_position(jsonl_path)
+                stats.files_parsed += 1
+                stats.bytes_parsed += jsonl_path.stat().st_size - (
+                    append_position[0] if append_position else 0
+                )
+            ensure_fresh_cache(
+                project_dir, cache_manager, silent=True, validation=validation
+            )
+        finally:
+            cache_manager.close()
+    except Exception as e:
+        stats.error = str(e)
+    stats.seconds = time.perf_counter() - start
+    return stats
+
+
+def build_project_caches(
+    projects_path: Path,
+    project_dirs: Optional[List[Path]] = None,
+    jobs: int = 1,
+    validation: ValidationLevel = "none",
+    cache_backend: Optional[CacheBackend] = None,
+    cache_codec: CacheCodec = DEFAULT_CACHE_CODEC,
+    cache_level: Optional[int] = None,
+) -> Iterator[CacheBuildStats]:
+    """Bring the caches of projects up to date, without generating HTML.
+
+    project_dirs defaults to all the projects in projects_path. With
+    jobs > 1, projects are processed in a process pool, each in a single
+    worker. Stats are yielded as each project is done, in completion order.
+
+    The projects index is left alone: its entries stand for generated HTML,
+    which a cache build doesn't bring up to date.
+    """
+    if not projects_path.exists():
+        raise FileNotFoundError(f"Projects path not found: {projects_path}")
+
+    if project_dirs is None:
+        project_dirs = ProjectsIndex(
+            projects_path, get_library_version()
+        ).discover_projects()
+    build_args = (validation, cache_backend, cache_codec, cache_level)
+
+    if jobs <= 1 or len(project_dirs) <= 1:
+        for project_dir in project_dirs:
+            yield _build_project_cache(project_dir, *build_args)
+        return
+
+    with ProcessPoolExecutor(max_workers=min(jobs, len(project_dirs))) as executor:
+        futures = [
+            executor.submit(_build_project_cache, project_dir, *build_args)
+            for project_dir in project_dirs
+        ]
+        try:
+            for future in as_completed(futures):
+                yield future.result()
+        finally:
+            for future in futures:
+                future.cancel()
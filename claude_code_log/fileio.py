@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""Atomic file writes and advisory locks for sharing output between runs.
+
+Several invocations (a cron job, the TUI, a parallel run) can work on the
+same projects at once. Every cache and HTML file is written under a
+temporary name and renamed into place, so readers never need a lock: they
+see either the previous or the new file, never a partial one. Writers that
+read-modify-write shared state, such as a project's cache index, hold an
+exclusive advisory lock around the update.
+"""
+
+import os
+import secrets
+from contextlib import contextmanager
+from pathlib import Path
+from typing import IO, Any, Iterator
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None  # type: ignore[assignment]
+
+# Suffix of temporary files; stale ones are left behind only by a crash
+TEMP_SUFFIX = ".tmp"
+
+
+def _temp_path(path: Path) -> Path:
+    """Return a unique temporary path next to path."""
+    return path.with_name(
+        f".{path.name}.{os.getpid()}.{secrets.token_hex(4)}{TEMP_SUFFIX}"
+    )
+
+
+@contextmanager
+def atomic_write(
+    path: Path, binary: bool = False, durable: bool = False
+) -> Iterator[IO[Any]]:
+    """Open a file for writing that replaces path only once fully written.
+
+    The file is written next to path and renamed over it when the block
+    exits; on error it is removed and path is left untouched. With durable,
+    the data is flushed to disk before the rename, so that a crash can't
+    leave an empty file in place of the old one.
+    """
+    temp_path = _temp_path(path)
+    # Exclusive creation gives the file the usual permissions (unlike mkstemp)
+    if binary:
+        f: IO[Any] = open(temp_path, "xb")
+    else:
+        f = open(temp_path, "x", encoding="utf-8")
+    try:
+        with f:
+            yield f
+            if durable:
+                f.flush()
+                os.fsync(f.fileno())
+        os.replace(temp_path, path)
+    except BaseException:
+        temp_path.unlink(missing_ok=True)
+        raise
+
+
+def atomic_write_text(path: Path, text: str, durable: bool = False) -> None:
+    """Replace a text file atomically."""
+    with atomic_write(path, durable=durable) as f:
+        f.write(text)
+
+
+def atomic_write_bytes(path: Path, data: bytes, durable: bool = False) -> None:
+    """Replace a binary file atomically."""
+    with atomic_write(path, binary=True, durable=durable) as f:
+        f.write(data)
+
+
+@contextmanager
+def file_lock(lock_path: Path) -> Iterator[None]:
+    """Hold an exclusive advisory lock on lock_path, waiting for it if need be.
+
+    The lock file is created if missing and left in place afterwards. Locks
+    only exclude other holders of the same lock (readers of atomically
+    written files don't need one). Where fcntl isn't available (Windows)
+    this doesn't lock.
+    """
+    if fcntl is None:  # pragma: no cover - Windows
+        yield
+        return
+    with open(lock_path, "a") as f:
+        fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(f.fileno(), fcntl.LOCK_UN)
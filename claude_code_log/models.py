@@ -3,8 +3,26 @@
 Enhanced to leverage official Anthropic types where beneficial.
 """
 
-from typing import Any, List, Union, Optional, Dict, Literal, cast
-from pydantic import BaseModel
+from datetime import datetime, timedelta, timezone
+from typing import (
+    Any,
+    Callable,
+    Iterable,
+    List,
+    Union,
+    Optional,
+    Dict,
+    Literal,
+    TypeVar,
+    cast,
+)
+from pydantic import (
+    BaseModel,
+    Field,
+    SerializerFunctionWrapHandler,
+    field_serializer,
+    model_validator,
+)
 
 from anthropic.types import Message as AnthropicMessage
 from anthropic.types import StopReason
@@ -104,10 +122,23 @@ ContentItem = Union[
 ]
 
 
+def _serialize_content(value: Any, handler: SerializerFunctionWrapHandler) -> Any:
+    """Serialise content still held as raw JSON (see LazyContentList) as-is."""
+    if isinstance(value, LazyContentList) and value.pending:
+        return list(list.__iter__(value))
+    return handler(value)
+
+
 class UserMessage(BaseModel):
     role: Literal["user"]
     content: Union[str, List[ContentItem]]
 
+    @field_serializer("content", mode="wrap")
+    def _serialize_lazy_content(
+        self, value: Any, handler: SerializerFunctionWrapHandler
+    ) -> Any:
+        return _serialize_content(value, handler)
+
 
 class AssistantMessage(BaseModel):
     """Assistant message model compatible with Anthropic's Message type."""
@@ -121,6 +152,12 @@ class AssistantMessage(BaseModel):
     stop_sequence: Optional[str] = None
     usage: Optional[UsageInfo] = None
 
+    @field_serializer("content", mode="wrap")
+    def _serialize_lazy_content(
+        self, value: Any, handler: SerializerFunctionWrapHandler
+    ) -> Any:
+        return _serialize_content(value, handler)
+
     @classmethod
     def from_anthropic_message(
         cls, anthropic_msg: AnthropicMessage
@@ -186,6 +223,26 @@ ToolUseResult = Union[
 ]
 
 
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_ONE_MS = timedelta(milliseconds=1)
+
+
+def timestamp_to_ms(timestamp: Optional[str]) -> Optional[int]:
+    """Parse an ISO timestamp to epoch milliseconds, or None if it can't be parsed.
+
+    Naive timestamps are taken to be UTC.
+    """
+    if not isinstance(timestamp, str) or not timestamp:
+        return None
+    try:
+        dt = datetime.fromisoformat(timestamp)
+    except ValueError:
+        return None
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return (dt - _EPOCH) // _ONE_MS
+
+
 class BaseTranscriptEntry(BaseModel):
     parentUuid: Optional[str]
     isSidechain: bool
@@ -196,6 +253,13 @@ class BaseTranscriptEntry(BaseModel):
     uuid: str
     timestamp: str
     isMeta: Optional[bool] = None
+    # Parsed once at load time for sorting, filtering and display; not cached
+    timestamp_ms: Optional[int] = Field(default=None, exclude=True)
+
+    @model_validator(mode="after")
+    def _parse_timestamp_ms(self) -> "BaseTranscriptEntry":
+        self.timestamp_ms = timestamp_to_ms(self.timestamp)
+        return self
 
 
 class UserTranscriptEntry(BaseTranscriptEntry):
@@ -203,6 +267,12 @@ class UserTranscriptEntry(BaseTranscriptEntry):
     message: UserMessage
     toolUseResult: Optional[ToolUseResult] = None
 
+    @field_serializer("toolUseResult", mode="wrap")
+    def _serialize_tool_use_result(
+        self, value: Any, handler: SerializerFunctionWrapHandler
+    ) -> Any:
+        return _serialize_content(value, handler)
+
 
 class AssistantTranscriptEntry(BaseTranscriptEntry):
     type: Literal["assistant"]
@@ -323,11 +393,361 @@ def parse_message_content(content_data: Any) -> Union[str, List[ContentItem]]:
         return str(content_data)
 
 
+ValidationLevel = Literal["none", "basic", "strict"]
+VALIDATION_LEVELS: tuple[ValidationLevel, ...] = ("none", "basic", "strict")
+
+# Checks run at each validation level, reported by name in ValidationStats
+_LEVEL_CHECKS: Dict[str, tuple[ValidationLevel, ...]] = {
+    "none": ("none",),
+    "basic": ("basic",),
+    "strict": ("basic", "strict"),
+}
+
+
+class ValidationStats(BaseModel):
+    """Counts of decoded entries and of failures at each validation level."""
+
+    level: ValidationLevel = "none"
+    entries_checked: int = 0
+    failures: Dict[str, int] = {level: 0 for level in VALIDATION_LEVELS}
+
+    @property
+    def failure_count(self) -> int:
+        return sum(self.failures.values())
+
+    def merge(self, other: "ValidationStats") -> None:
+        """Add the counts from another stats object to this one."""
+        self.entries_checked += other.entries_checked
+        for level, count in other.failures.items():
+            self.failures[level] = self.failures.get(level, 0) + count
+
+    def format_report(self) -> str:
+        """Describe how many entries failed each check that was run."""
+        parts = [
+            f"{check}: {self.failures.get(check, 0)}"
+            for check in _LEVEL_CHECKS[self.level]
+        ]
+        return (
+            f"Validation ({self.level}): {self.entries_checked} entries checked, "
+            f"failures by level - {', '.join(parts)}"
+        )
+
+
+_ModelT = TypeVar("_ModelT", bound=BaseModel)
+
+# Per-model (field names, default values) used by _construct
+_CONSTRUCT_INFO: Dict[type, tuple[frozenset[str], Dict[str, Any]]] = {}
+
+
+def _construct(model_cls: type[_ModelT], values: Dict[str, Any]) -> _ModelT:
+    """Create a model instance from trusted values without validation.
+
+    Behaves like model_construct for our alias-free models (unknown keys are
+    dropped, missing optional fields get their defaults), but skips the
+    per-field alias handling that dominates model_construct's cost.
+    """
+    info = _CONSTRUCT_INFO.get(model_cls)
+    if info is None:
+        fields = model_cls.model_fields
+        defaults = {
+            name: field.get_default(call_default_factory=True)
+            for name, field in fields.items()
+            if not field.is_required()
+        }
+        info = _CONSTRUCT_INFO[model_cls] = (frozenset(fields), defaults)
+
+    field_names, defaults = info
+    field_values = defaults.copy()
+    fields_set: set[str] = set()
+    for name, value in values.items():
+        if name in field_names:
+            field_values[name] = value
+            fields_set.add(name)
+
+    instance = model_cls.__new__(model_cls)
+    object.__setattr__(instance, "__dict__", field_values)
+    object.__setattr__(instance, "__pydantic_fields_set__", fields_set)
+    object.__setattr__(instance, "__pydantic_extra__", None)
+    object.__setattr__(instance, "__pydantic_private__", None)
+    return instance
+
+
+def construct_content_item(item_data: Any) -> ContentItem:
+    """Build a content item from trusted JSON data without running validation.
+
+    This mirrors parse_content_item but always produces our own content models
+    via _construct, skipping both Pydantic validation and the Anthropic
+    type probing.
+    """
+    if not isinstance(item_data, dict):
+        return _construct(TextContent, {"type": "text", "text": str(item_data)})
+
+    item = cast(Dict[str, Any], item_data)
+    content_type = item.get("type")
+    if content_type == "text":
+        return _construct(TextContent, item)
+    elif content_type == "tool_use":
+        return _construct(ToolUseContent, item)
+    elif content_type == "tool_result":
+        return _construct(ToolResultContent, item)
+    elif content_type == "thinking":
+        return _construct(ThinkingContent, item)
+    elif content_type == "image":
+        source = item.get("source")
+        if isinstance(source, dict):
+            return _construct(
+                ImageContent,
+                {
+                    "type": "image",
+                    "source": _construct(ImageSource, cast(Dict[str, Any], source)),
+                },
+            )
+    # Fallback to text content for unknown or malformed types
+    return _construct(TextContent, {"type": "text", "text": str(item_data)})
+
+
+class LazyContentList(List[ContentItem]):
+    """A list of content items kept as raw JSON until first read.
+
+    Most consumers of an entry only look at its identifiers, timestamps and
+    usage, so the content models are built with construct_content_item the
+    first time the list's items are read. Length and truthiness don't need
+    the models, and serialisation (model_dump, pickling) passes the raw JSON
+    through as long as the items haven't been built.
+
+    If resolve is given, each raw item is passed through it before its model
+    is built (the cache uses this to load payloads kept out of line).
+    """
+
+    __slots__ = ("_pending", "_resolve")
+
+    def __init__(
+        self,
+        raw_items: Iterable[Any] = (),
+        resolve: Optional[Callable[[Any], Any]] = None,
+    ) -> None:
+        super().__init__(raw_items)
+        self._pending = True
+        self._resolve = resolve
+
+    def set_resolver(self, resolve: Optional[Callable[[Any], Any]]) -> None:
+        """Set the function applied to raw items before they are built."""
+        self._resolve = resolve
+
+    @property
+    def pending(self) -> bool:
+        """Whether the items are still raw JSON."""
+        return self._pending
+
+    def materialise(self) -> None:
+        """Build the content models of all items still held as raw JSON."""
+        if self._pending:
+            self._pending = False
+            resolve = self._resolve
+            list.__setitem__(
+                self,
+                slice(None),
+                [
+                    item
+                    if isinstance(item, BaseModel)
+                    else construct_content_item(
+                        item if resolve is None else resolve(item)
+                    )
+                    for item in list.__iter__(self)
+                ],
+            )
+
+    def __reduce__(self) -> Any:
+        if self._pending:
+            return (LazyContentList, (list(list.__iter__(self)), self._resolve))
+        return (list, (list(list.__iter__(self)),))
+
+
+def _materialising(name: str) -> Any:
+    """Wrap a list method so that it builds the content models first.
+
+    Lazy lists passed as arguments (as in comparisons) are built as well.
+    """
+    method = getattr(list, name)
+
+    def wrapper(self: LazyContentList, *args: Any, **kwargs: Any) -> Any:
+        self.materialise()
+        for arg in args:
+            if isinstance(arg, LazyContentList):
+                arg.materialise()
+        return method(self, *args, **kwargs)
+
+    wrapper.__name__ = name
+    wrapper.__doc__ = method.__doc__
+    return wrapper
+
+
+for _name in (
+    "__iter__",
+    "__reversed__",
+    "__getitem__",
+    "__contains__",
+    "__eq__",
+    "__ne__",
+    "__lt__",
+    "__le__",
+    "__gt__",
+    "__ge__",
+    "__add__",
+    "__mul__",
+    "__rmul__",
+    "__repr__",
+    "copy",
+    "count",
+    "index",
+    "pop",
+    "remove",
+    "sort",
+):
+    setattr(LazyContentList, _name, _materialising(_name))
+
+
+def construct_message_content(content_data: Any) -> Union[str, List[ContentItem]]:
+    """Build message content without validation, handling string and list formats.
+
+    List content is returned as a LazyContentList, so its items are only
+    turned into models when they are read.
+    """
+    if isinstance(content_data, str):
+        return content_data
+    elif isinstance(content_data, list):
+        return LazyContentList(cast(List[Any], content_data))
+    else:
+        return str(content_data)
+
+
+# Keys the fast decoder insists on, so that downstream code can rely on them
+_REQUIRED_ENTRY_KEYS: Dict[str, frozenset[str]] = {
+    "user": frozenset({"uuid", "sessionId", "timestamp", "message"}),
+    "assistant": frozenset({"uuid", "sessionId", "timestamp", "message"}),
+    "system": frozenset({"uuid", "sessionId", "timestamp", "content"}),
+    "summary": frozenset({"summary", "leafUuid"}),
+}
+
+
+def _check_required_keys(data: Dict[str, Any], entry_type: str) -> None:
+    """Raise ValueError if an entry lacks keys every consumer relies on."""
+    missing = _REQUIRED_ENTRY_KEYS[entry_type] - data.keys()
+    if missing:
+        raise ValueError(
+            f"{entry_type} entry is missing required fields: {', '.join(sorted(missing))}"
+        )
+
+
+# Fields each entry model requires. Entries lacking one are validated instead
+# of constructed, so they are rejected just as with validation rather than
+# built with the field unset
+_MODEL_REQUIRED_KEYS: Dict[str, frozenset[str]] = {
+    entry_type: frozenset(
+        name for name, field in model_cls.model_fields.items() if field.is_required()
+    )
+    for entry_type, model_cls in (
+        ("user", UserTranscriptEntry),
+        ("assistant", AssistantTranscriptEntry),
+        ("system", SystemTranscriptEntry),
+        ("summary", SummaryTranscriptEntry),
+    )
+}
+
+
+def _require_message(data: Dict[str, Any]) -> Dict[str, Any]:
+    """Return the nested message object, raising if it is missing or malformed."""
+    message_data = data.get("message")
+    if not isinstance(message_data, dict) or "content" not in message_data:
+        raise ValueError(f"{data.get('type')} entry has no message content")
+    return cast(Dict[str, Any], message_data)
+
+
+def construct_transcript_entry(data: Dict[str, Any]) -> TranscriptEntry:
+    """
+    Build a TranscriptEntry from trusted JSON data without Pydantic validation.
+
+    This is the fast decoding path used by default when loading transcripts:
+    models are created with _construct, so no per-field validation or
+    coercion happens. Only the structure needed by the renderer (the nested
+    message content and the identifying fields) is checked, and entries
+    missing a field the models require are handed to parse_transcript_entry.
+    Use parse_transcript_entry when full validation is wanted.
+
+    Args:
+        data: Dictionary parsed from JSON
+
+    Returns:
+        The appropriate TranscriptEntry subclass
+
+    Raises:
+        ValueError: If the data doesn't match any known transcript entry type
+    """
+    entry_type = data.get("type")
+    if entry_type in _REQUIRED_ENTRY_KEYS:
+        _check_required_keys(data, entry_type)
+        if not _MODEL_REQUIRED_KEYS[entry_type] <= data.keys():
+            return parse_transcript_entry(data)
+
+    if entry_type == "user":
+        message_data = _require_message(data)
+        entry_data = data.copy()
+        entry_data["timestamp_ms"] = timestamp_to_ms(data["timestamp"])
+        entry_data["message"] = _construct(
+            UserMessage,
+            {
+                "role": "user",
+                "content": construct_message_content(message_data["content"]),
+            },
+        )
+        tool_use_result = data.get("toolUseResult")
+        if isinstance(tool_use_result, list):
+            # MCP tool results are lists of content items
+            result_items = cast(List[Any], tool_use_result)
+            if (
+                result_items
+                and isinstance(result_items[0], dict)
+                and "type" in result_items[0]
+            ):
+                entry_data["toolUseResult"] = LazyContentList(
+                    item for item in result_items if isinstance(item, dict)
+                )
+        return _construct(UserTranscriptEntry, entry_data)
+
+    elif entry_type == "assistant":
+        message_data = _require_message(data)
+        message_copy = message_data.copy()
+        message_copy["content"] = construct_message_content(message_data["content"])
+        usage_data = message_data.get("usage")
+        message_copy["usage"] = (
+            _construct(UsageInfo, cast(Dict[str, Any], usage_data))
+            if isinstance(usage_data, dict)
+            else None
+        )
+        entry_data = data.copy()
+        entry_data["timestamp_ms"] = timestamp_to_ms(data["timestamp"])
+        entry_data["message"] = _construct(AssistantMessage, message_copy)
+        return _construct(AssistantTranscriptEntry, entry_data)
+
+    elif entry_type == "summary":
+        return _construct(SummaryTranscriptEntry, data)
+
+    elif entry_type == "system":
+        entry_data = data.copy()
+        entry_data["timestamp_ms"] = timestamp_to_ms(data["timestamp"])
+        return _construct(SystemTranscriptEntry, entry_data)
+
+    else:
+        raise ValueError(f"Unknown transcript entry type: {entry_type}")
+
+
 def parse_transcript_entry(data: Dict[str, Any]) -> TranscriptEntry:
     """
     Parse a JSON dictionary into the appropriate TranscriptEntry type.
 
-    Enhanced to optionally use official Anthropic types for assistant messages.
+    Every entry is validated against our Pydantic models. Compatibility with
+    the official Anthropic Message type is checked separately, only in strict
+    mode (see decode_transcript_entry).
 
     Args:
         data: Dictionary parsed from JSON
@@ -370,16 +790,6 @@ def parse_transcript_entry(data: Dict[str, Any]) -> TranscriptEntry:
         # Enhanced assistant message parsing with optional Anthropic types
         data_copy = data.copy()
 
-        # Validate compatibility with official Anthropic Message type
-        if "message" in data_copy:
-            try:
-                message_data = data_copy["message"]
-                AnthropicMessage.model_validate(message_data)
-                # Successfully validated - our data is compatible with official Anthropic types
-            except Exception:
-                # Validation failed - continue with standard parsing
-                pass
-
         # Standard parsing path (works for all cases)
         if "message" in data_copy and "content" in data_copy["message"]:
             message_copy = data_copy["message"].copy()
@@ -400,3 +810,49 @@ def parse_transcript_entry(data: Dict[str, Any]) -> TranscriptEntry:
 
     else:
         raise ValueError(f"Unknown transcript entry type: {entry_type}")
+
+
+def is_anthropic_compatible(message_data: Any) -> bool:
+    """Check whether an assistant message validates as an official Anthropic Message."""
+    try:
+        AnthropicMessage.model_validate(message_data)
+        return True
+    except Exception:
+        return False
+
+
+def decode_transcript_entry(
+    data: Dict[str, Any],
+    validation: ValidationLevel = "none",
+    stats: Optional[ValidationStats] = None,
+) -> TranscriptEntry:
+    """
+    Decode a JSON dictionary into a TranscriptEntry at the given validation level.
+
+    - none: build models without validation (construct_transcript_entry)
+    - basic: validate against our Pydantic models (parse_transcript_entry)
+    - strict: basic, plus a schema-drift check of assistant messages against
+      the official Anthropic Message type. Entries failing only that check
+      are still returned, but counted in stats.
+
+    Raises:
+        ValueError: If the entry fails the none or basic level checks
+    """
+    if stats is not None:
+        stats.entries_checked += 1
+
+    try:
+        if validation == "none":
+            return construct_transcript_entry(data)
+        entry = parse_transcript_entry(data)
+    except ValueError:
+        if stats is not None:
+            stats.failures["none" if validation == "none" else "basic"] += 1
+        raise
+
+    if validation == "strict" and entry.type == "assistant":
+        if not is_anthropic_compatible(data.get("message")):
+            if stats is not None:
+                stats.failures["strict"] += 1
+
+    return entry
@@ -1,20 +1,43 @@
 #!/usr/bin/env python3
 """Parse and extract data from Claude transcript JSONL files."""
 
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+import heapq
 import json
+import mmap
+import os
+from functools import lru_cache
 from pathlib import Path
 import re
-from typing import Any, List, Optional, Union, TYPE_CHECKING
-from datetime import datetime
+from typing import (
+    Any,
+    Callable,
+    Deque,
+    Dict,
+    FrozenSet,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    Union,
+    TYPE_CHECKING,
+)
+from datetime import datetime, timedelta, timezone
 import dateparser
 
 from .models import (
     TranscriptEntry,
     SummaryTranscriptEntry,
-    parse_transcript_entry,
+    parse_transcript_entry,  # noqa: F401  # re-exported for callers
+    decode_transcript_entry,
     ContentItem,
     TextContent,
     ThinkingContent,
+    ValidationLevel,
+    ValidationStats,
+    timestamp_to_ms,
 )
 
 if TYPE_CHECKING:
@@ -49,6 +72,10 @@ def extract_text_content(content: Union[str, List[ContentItem], None]) -> str:
         return str(content) if content else ""
 
 
+_EPOCH = datetime(1970, 1, 1)
+_ONE_MS = timedelta(milliseconds=1)
+
+
 def parse_timestamp(timestamp_str: str) -> Optional[datetime]:
     """Parse ISO timestamp to datetime object."""
     try:
@@ -57,14 +84,10 @@ def parse_timestamp(timestamp_str: str) -> Optional[datetime]:
         return None
 
 
-def filter_messages_by_date(
-    messages: List[TranscriptEntry], from_date: Optional[str], to_date: Optional[str]
-) -> List[TranscriptEntry]:
-    """Filter messages based on date range."""
-    if not from_date and not to_date:
-        return messages
-
-    # Parse the date strings using dateparser
+def parse_date_range(
+    from_date: Optional[str], to_date: Optional[str]
+) -> Tuple[Optional[datetime], Optional[datetime]]:
+    """Parse --from-date/--to-date strings into naive datetime bounds."""
     from_dt = None
     to_dt = None
 
@@ -84,44 +107,445 @@ def filter_messages_by_date(
         if to_date in ["today", "yesterday"] or "days ago" in to_date:
             to_dt = to_dt.replace(hour=23, minute=59, second=59, microsecond=999999)
 
-    filtered_messages: List[TranscriptEntry] = []
+    return from_dt, to_dt
+
+
+def date_range_to_ms(
+    from_dt: Optional[datetime], to_dt: Optional[datetime]
+) -> Tuple[Optional[int], Optional[int]]:
+    """Convert bounds from parse_date_range to inclusive epoch millisecond bounds.
+
+    The naive bounds are taken to be UTC, like naive transcript timestamps.
+    The lower bound is rounded up and the upper bound down, so that comparing
+    millisecond timestamps gives the same result as comparing datetimes.
+    """
+    if from_dt is not None and from_dt.tzinfo is not None:
+        from_dt = from_dt.astimezone(timezone.utc).replace(tzinfo=None)
+    if to_dt is not None and to_dt.tzinfo is not None:
+        to_dt = to_dt.astimezone(timezone.utc).replace(tzinfo=None)
+
+    from_ms = to_ms = None
+    if from_dt is not None:
+        from_ms = -((_EPOCH - from_dt) // _ONE_MS)
+    if to_dt is not None:
+        to_ms = (to_dt - _EPOCH) // _ONE_MS
+    return from_ms, to_ms
+
+
+def is_in_date_range(
+    message: TranscriptEntry, from_dt: Optional[datetime], to_dt: Optional[datetime]
+) -> bool:
+    """Check whether a message falls within bounds from parse_date_range."""
+    if from_dt is None and to_dt is None:
+        return True
+
+    # Handle SummaryTranscriptEntry which doesn't have timestamp
+    if isinstance(message, SummaryTranscriptEntry):
+        return True
+
+    timestamp_ms = message.timestamp_ms
+    if timestamp_ms is None:
+        return False
+
+    from_ms, to_ms = date_range_to_ms(from_dt, to_dt)
+    if from_ms is not None and timestamp_ms < from_ms:
+        return False
+    if to_ms is not None and timestamp_ms > to_ms:
+        return False
+
+    return True
+
+
+def iter_messages_by_date(
+    messages: Iterable[TranscriptEntry],
+    from_date: Optional[str],
+    to_date: Optional[str],
+) -> Iterator[TranscriptEntry]:
+    """Lazily filter messages based on date range."""
+    if not from_date and not to_date:
+        yield from messages
+        return
+
+    from_dt, to_dt = parse_date_range(from_date, to_date)
     for message in messages:
-        # Handle SummaryTranscriptEntry which doesn't have timestamp
-        if isinstance(message, SummaryTranscriptEntry):
-            filtered_messages.append(message)
-            continue
+        if is_in_date_range(message, from_dt, to_dt):
+            yield message
+
 
-        timestamp_str = message.timestamp
-        if not timestamp_str:
-            continue
+def filter_messages_by_date(
+    messages: List[TranscriptEntry], from_date: Optional[str], to_date: Optional[str]
+) -> List[TranscriptEntry]:
+    """Filter messages based on date range."""
+    if not from_date and not to_date:
+        return messages
 
-        message_dt = parse_timestamp(timestamp_str)
-        if not message_dt:
-            continue
+    return list(iter_messages_by_date(messages, from_date, to_date))
 
-        # Convert to naive datetime for comparison (dateparser returns naive datetimes)
-        if message_dt.tzinfo:
-            message_dt = message_dt.replace(tzinfo=None)
 
-        # Check if message falls within date range
-        if from_dt and message_dt < from_dt:
-            continue
-        if to_dt and message_dt > to_dt:
-            continue
+class TimestampPrefilter:
+    """Cheap date-range check on the raw text of ISO timestamps.
 
-        filtered_messages.append(message)
+    Only the "YYYY-MM-DDTHH:MM:SS" prefix is compared, as a string, with the
+    bounds. For UTC timestamps that is the time is_in_date_range compares, at
+    second resolution, so a timestamp is only rejected when it is certainly
+    out of range; is_in_date_range still decides the rest. Timestamps not in
+    that form, or with another UTC offset, are never rejected.
+    """
 
-    return filtered_messages
+    def __init__(self, from_dt: Optional[datetime], to_dt: Optional[datetime]):
+        self.from_dt = from_dt
+        self.to_dt = to_dt
+        self.from_key = from_dt.isoformat()[:19] if from_dt else None
+        self.to_key = to_dt.isoformat()[:19] if to_dt else None
+        self.from_ms, self.to_ms = date_range_to_ms(from_dt, to_dt)
 
+    @classmethod
+    def from_dates(
+        cls, from_date: Optional[str], to_date: Optional[str]
+    ) -> "TimestampPrefilter":
+        """Create a prefilter for --from-date/--to-date strings."""
+        return cls(*parse_date_range(from_date, to_date))
 
-def load_transcript(
+    @staticmethod
+    def _prefix(timestamp: str) -> Optional[str]:
+        prefix = timestamp[:19]
+        if len(prefix) != 19 or prefix[4] + prefix[7] + prefix[10] != "--T":
+            return None
+        offset = timestamp[19:]
+        if not offset.endswith(("Z", "+00:00", "-00:00")) and (
+            "+" in offset or "-" in offset
+        ):
+            return None
+        return prefix
+
+    def may_contain(self, timestamp: str) -> bool:
+        """False only if the timestamp is certainly outside the range."""
+        prefix = self._prefix(timestamp)
+        if prefix is None:
+            return True
+        if self.from_key and prefix < self.from_key:
+            return False
+        if self.to_key and prefix > self.to_key:
+            return False
+        return True
+
+    def contains(self, timestamp: str) -> bool:
+        """Exact check; the timestamp is only parsed within a bound's second.
+
+        Timestamps that can't be parsed are kept.
+        """
+        prefix = self._prefix(timestamp)
+        if prefix is not None and prefix != self.from_key and prefix != self.to_key:
+            return self.may_contain(timestamp)
+
+        timestamp_ms = timestamp_to_ms(timestamp)
+        if timestamp_ms is None:
+            return True
+        if self.from_ms is not None and timestamp_ms < self.from_ms:
+            return False
+        if self.to_ms is not None and timestamp_ms > self.to_ms:
+            return False
+        return True
+
+    def may_overlap(self, earliest: str, latest: str) -> bool:
+        """False only if all timestamps in [earliest, latest] are out of range."""
+        earliest_prefix = self._prefix(earliest)
+        latest_prefix = self._prefix(latest)
+        if earliest_prefix is None or latest_prefix is None:
+            return True
+        if self.from_key and latest_prefix < self.from_key:
+            return False
+        if self.to_key and earliest_prefix > self.to_key:
+            return False
+        return True
+
+    def line_may_match(self, raw_line: bytes) -> bool:
+        """Check the timestamp fields of a raw JSONL line without decoding it.
+
+        Nested content may hold timestamp fields too, so the line is kept if
+        any of them may be in range, or if it has none (like summaries).
+        """
+        timestamps = _TIMESTAMP_FIELD.findall(raw_line)
+        if not timestamps:
+            return True
+        return any(
+            self.may_contain(timestamp.decode("latin-1")) for timestamp in timestamps
+        )
+
+
+def _decode_json_line(raw_line: bytes) -> Any:
+    """Decode one JSONL line, tolerating invalid UTF-8 like the text-mode reader did."""
+    try:
+        return json.loads(raw_line)
+    except UnicodeDecodeError:
+        return json.loads(raw_line.decode("utf-8", errors="replace"))
+
+
+def _line_text(raw_line: bytes) -> str:
+    """Decode a raw line for error messages."""
+    return raw_line.decode("utf-8", errors="replace")
+
+
+class _ParsePosition:
+    """Byte offset and line number just past the last consumed line of a file."""
+
+    def __init__(self, offset: int = 0, line_no: int = 0) -> None:
+        self.offset = offset
+        self.line_no = line_no
+
+
+def _decode_transcript_line(
+    raw_line: bytes,
+    line_no: int,
+    jsonl_path: Path,
+    validation: ValidationLevel,
+    validation_stats: Optional[ValidationStats],
+) -> Optional[TranscriptEntry]:
+    """Decode one stripped JSONL line, printing why it was skipped if it fails."""
+    try:
+        entry_dict: dict[str, Any] | str = _decode_json_line(raw_line)
+        if not isinstance(entry_dict, dict):
+            print(
+                f"Line {line_no} of {jsonl_path} is not a JSON object: {_line_text(raw_line)}"
+            )
+            return None
+
+        entry_type: str | None = entry_dict.get("type")
+
+        if entry_type in ["user", "assistant", "summary", "system"]:
+            return decode_transcript_entry(entry_dict, validation, validation_stats)
+        print(
+            f"Line {line_no} of {jsonl_path} is not a recognised message type: {_line_text(raw_line)}"
+        )
+    except json.JSONDecodeError as e:
+        print(f"Line {line_no} of {jsonl_path} | JSON decode error: {str(e)}")
+    except ValueError as e:
+        # Extract a more descriptive error message
+        error_msg = str(e)
+        if "validation error" in error_msg.lower():
+            err_no_url = re.sub(
+                r"    For further information visit https://errors.pydantic(.*)\n?",
+                "",
+                error_msg,
+            )
+            print(f"Line {line_no} of {jsonl_path} | {err_no_url}")
+        else:
+            print(
+                f"Line {line_no} of {jsonl_path} | ValueError: {error_msg}"
+                "\n{traceback.format_exc()}"
+            )
+    except Exception as e:
+        print(
+            f"Line {line_no} of {jsonl_path} | Unexpected error: {str(e)}"
+            "\n{traceback.format_exc()}"
+        )
+    return None
+
+
+def _decode_lines(
+    raw_lines: Iterable[bytes],
+    jsonl_path: Path,
+    position: _ParsePosition,
+    validation: ValidationLevel,
+    validation_stats: Optional[ValidationStats],
+    keep_line: Optional[Callable[[bytes], bool]] = None,
+) -> Iterator[TranscriptEntry]:
+    """Yield the entries decoded from raw lines read at position, advancing it.
+
+    A last line without a newline may still be being written, so position
+    only moves past it once it decodes. Lines rejected by keep_line are
+    skipped without being decoded.
+    """
+    offset = position.offset
+    line_no = position.line_no
+    for raw_line in raw_lines:
+        offset += len(raw_line)
+        line = raw_line.strip()
+        entry = (
+            _decode_transcript_line(
+                line, line_no, jsonl_path, validation, validation_stats
+            )
+            if line and (keep_line is None or keep_line(line))
+            else None
+        )
+        line_no += 1
+        if raw_line.endswith(b"\n") or entry is not None:
+            position.offset = offset
+            position.line_no = line_no
+        if entry is not None:
+            yield entry
+
+
+def _iter_transcript_lines(
+    jsonl_path: Path,
+    position: _ParsePosition,
+    validation: ValidationLevel,
+    validation_stats: Optional[ValidationStats],
+    keep_line: Optional[Callable[[bytes], bool]] = None,
+) -> Iterator[TranscriptEntry]:
+    """Yield the entries decoded from position onwards, advancing position."""
+    with open(jsonl_path, "rb") as f:
+        f.seek(position.offset)
+        yield from _decode_lines(
+            f, jsonl_path, position, validation, validation_stats, keep_line
+        )
+
+
+# Files with more than this many unparsed bytes are split into ranges of
+# about this size and decoded in a process pool when jobs > 1
+PARALLEL_CHUNK_BYTES = 32 * 1024 * 1024
+
+
+def _split_line_ranges(
+    mapped: mmap.mmap, start: int, end: int, chunk_bytes: int
+) -> Iterator[Tuple[int, int]]:
+    """Split [start, end) into byte ranges that each end just after a newline.
+
+    The last range runs to end, whether or not the file ends with a newline.
+    """
+    while start < end:
+        newline = mapped.find(b"\n", min(start + chunk_bytes, end) - 1, end)
+        range_end = end if newline == -1 else newline + 1
+        yield start, range_end
+        start = range_end
+
+
+def _read_range_lines(mapped: mmap.mmap, start: int, end: int) -> Iterator[bytes]:
+    """Yield the raw lines of a newline-aligned byte range of a mapped file."""
+    mapped.seek(start)
+    while mapped.tell() < end:
+        yield mapped.readline()
+
+
+def _parse_line_range(
+    jsonl_path: Path,
+    start: int,
+    end: int,
+    first_line: int,
+    validation: ValidationLevel,
+    keep_line: Optional[Callable[[bytes], bool]] = None,
+) -> Tuple[List[TranscriptEntry], ValidationStats, int, int]:
+    """Process pool worker: decode the lines of one byte range of a file.
+
+    first_line is the line number of the line starting at start, so error
+    messages name the same lines as a sequential parse. Also returns the
+    byte offset and line number parsing stopped at.
+    """
+    validation_stats = ValidationStats(level=validation)
+    position = _ParsePosition(start, first_line)
+    with (
+        open(jsonl_path, "rb") as f,
+        mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped,
+    ):
+        entries = list(
+            _decode_lines(
+                _read_range_lines(mapped, start, end),
+                jsonl_path,
+                position,
+                validation,
+                validation_stats,
+                keep_line,
+            )
+        )
+    return entries, validation_stats, position.offset, position.line_no
+
+
+def _iter_transcript_chunks(
+    jsonl_path: Path,
+    position: _ParsePosition,
+    validation: ValidationLevel,
+    validation_stats: Optional[ValidationStats],
+    jobs: int,
+    keep_line: Optional[Callable[[bytes], bool]] = None,
+) -> Iterator[TranscriptEntry]:
+    """Like _iter_transcript_lines, but decode byte ranges in a process pool.
+
+    The file is memory-mapped and split into newline-aligned ranges of about
+    PARALLEL_CHUNK_BYTES. At most `jobs` ranges are in flight, and their
+    entries are yielded in file order.
+    """
+    with (
+        open(jsonl_path, "rb") as f,
+        mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped,
+    ):
+        ranges = _split_line_ranges(
+            mapped, position.offset, len(mapped), PARALLEL_CHUNK_BYTES
+        )
+        line_no = position.line_no
+        executor = ProcessPoolExecutor(max_workers=jobs)
+        futures: Deque[
+            "Future[Tuple[List[TranscriptEntry], ValidationStats, int, int]]"
+        ] = deque()
+        try:
+            while True:
+                # Keep `jobs` ranges in flight, numbering lines as we go
+                for start, end in ranges:
+                    futures.append(
+                        executor.submit(
+                            _parse_line_range,
+                            jsonl_path,
+                            start,
+                            end,
+                            line_no,
+                            validation,
+                            keep_line,
+                        )
+                    )
+                    line_no += mapped[start:end].count(b"\n")
+                    if len(futures) >= jobs:
+                        break
+                if not futures:
+                    break
+
+                entries, range_stats, offset, range_line_no = futures.popleft().result()
+                if validation_stats is not None:
+                    validation_stats.merge(range_stats)
+                position.offset = offset
+                position.line_no = range_line_no
+                yield from entries
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+
+def iter_transcript(
     jsonl_path: Path,
     cache_manager: Optional["CacheManager"] = None,
     from_date: Optional[str] = None,
     to_date: Optional[str] = None,
     silent: bool = False,
-) -> List[TranscriptEntry]:
-    """Load and parse JSONL transcript file, using cache if available."""
+    validation: ValidationLevel = "none",
+    validation_stats: Optional[ValidationStats] = None,
+    jobs: int = 1,
+) -> Iterator[TranscriptEntry]:
+    """Yield the entries of a JSONL transcript file in file order.
+
+    Lines are decoded straight from the raw bytes into transcript models. With
+    the default validation level ("none") no per-field validation happens;
+    "basic" validates every entry with the Pydantic models and "strict" also
+    checks assistant messages against the Anthropic Message schema. Failure
+    counts are added to validation_stats when given.
+
+    Cached entries are used when available. If the file has only been
+    appended to since it was cached, the cached entries are followed by the
+    lines parsed from the cached byte offset onwards. Otherwise the file is
+    parsed line by line. With a cache manager the entries are cached once the
+    file has been read to the end.
+
+    With jobs > 1, more than PARALLEL_CHUNK_BYTES of unparsed data are split
+    into newline-aligned byte ranges decoded by `jobs` worker processes.
+
+    Without a cache manager, from_date/to_date are pushed down into the scan:
+    lines whose timestamp fields are all out of range are skipped before they
+    are decoded (see TimestampPrefilter). The entries yielded may still
+    include some out of range, so callers filter them exactly.
+    """
+    position = _ParsePosition()
+    keep_line: Optional[Callable[[bytes], bool]] = None
+    if cache_manager is None and (from_date or to_date):
+        keep_line = TimestampPrefilter.from_dates(from_date, to_date).line_may_match
+    messages: Optional[List[TranscriptEntry]] = None
+    cached_count = 0
+
     # Try to load from cache first
     if cache_manager is not None:
         # Use filtered loading if date parameters are provided
@@ -135,65 +559,447 @@ def load_transcript(
         if cached_entries is not None:
             if not silent:
                 print(f"Loading {jsonl_path} from cache...")
-            return cached_entries
+            yield from cached_entries
+            return
 
-    # Parse from source file
-    messages: List[TranscriptEntry] = []
+        # Keep the parsed entries for the cache; when the file has only
+        # grown, the cached ones come first and only new lines are parsed
+        messages = []
+        appendable = cache_manager.load_appendable_entries(jsonl_path)
+        if appendable is not None:
+            cached_entries, offset, line_no = appendable
+            cached_count = len(cached_entries)
+            position = _ParsePosition(offset, line_no)
+            if not silent:
+                print(f"Loading {jsonl_path} from cache, parsing appended lines...")
+            yield from cached_entries
 
-    with open(jsonl_path, "r", encoding="utf-8", errors="replace") as f:
+    # Taken before reading, so lines appended while parsing aren't missed
+    source_stat = jsonl_path.stat() if cache_manager is not None else None
+    for entry in _iter_unparsed_lines(
+        jsonl_path, position, silent, validation, validation_stats, jobs, keep_line
+    ):
+        if messages is not None:
+            messages.append(entry)
+        yield entry
+
+    # Save to cache if cache manager is available
+    if cache_manager is not None and messages is not None:
+        _cache_parsed_entries(
+            jsonl_path, cache_manager, messages, cached_count, position, source_stat
+        )
+
+
+def update_transcript_cache(
+    jsonl_path: Path,
+    cache_manager: "CacheManager",
+    silent: bool = False,
+    validation: ValidationLevel = "none",
+    validation_stats: Optional[ValidationStats] = None,
+    jobs: int = 1,
+) -> None:
+    """Bring the cache of a JSONL transcript file up to date.
+
+    The cache ends up as if the file had been read with iter_transcript, but
+    the cached entries of a file that has only been appended to are not
+    loaded: the appended lines are parsed and stored after them.
+    """
+    if cache_manager.is_file_cached(jsonl_path):
+        return
+
+    position = _ParsePosition()
+    cached_count = 0
+    append_position = cache_manager.get_append_position(jsonl_path)
+    cached_info = cache_manager.get_cached_file_info(jsonl_path)
+    if append_position is not None and cached_info is not None:
+        position = _ParsePosition(*append_position)
+        cached_count = cached_info.message_count
         if not silent:
-            print(f"Processing {jsonl_path}...")
-        for line_no, line in enumerate(f):
-            line = line.strip()
-            if line:
-                try:
-                    entry_dict: dict[str, Any] | str = json.loads(line)
-                    if not isinstance(entry_dict, dict):
-                        print(
-                            f"Line {line_no} of {jsonl_path} is not a JSON object: {line}"
-                        )
-                        continue
+            print(f"Parsing lines appended to {jsonl_path}...")
 
-                    entry_type: str | None = entry_dict.get("type")
+    # Taken before reading, so lines appended while parsing aren't missed
+    source_stat = jsonl_path.stat()
+    entries = list(
+        _iter_unparsed_lines(
+            jsonl_path, position, silent, validation, validation_stats, jobs
+        )
+    )
+    _cache_parsed_entries(
+        jsonl_path, cache_manager, entries, cached_count, position, source_stat
+    )
 
-                    if entry_type in ["user", "assistant", "summary", "system"]:
-                        # Parse using Pydantic models
-                        entry = parse_transcript_entry(entry_dict)
-                        messages.append(entry)
-                    else:
-                        print(
-                            f"Line {line_no} of {jsonl_path} is not a recognised message type: {line}"
-                        )
-                except json.JSONDecodeError as e:
-                    print(
-                        f"Line {line_no} of {jsonl_path} | JSON decode error: {str(e)}"
-                    )
-                except ValueError as e:
-                    # Extract a more descriptive error message
-                    error_msg = str(e)
-                    if "validation error" in error_msg.lower():
-                        err_no_url = re.sub(
-                            r"    For further information visit https://errors.pydantic(.*)\n?",
-                            "",
-                            error_msg,
-                        )
-                        print(f"Line {line_no} of {jsonl_path} | {err_no_url}")
-                    else:
-                        print(
-                            f"Line {line_no} of {jsonl_path} | ValueError: {error_msg}"
-                            "\n{traceback.format_exc()}"
-                        )
-                except Exception as e:
-                    print(
-                        f"Line {line_no} of {jsonl_path} | Unexpected error: {str(e)}"
-                        "\n{traceback.format_exc()}"
+
+def _iter_unparsed_lines(
+    jsonl_path: Path,
+    position: _ParsePosition,
+    silent: bool,
+    validation: ValidationLevel,
+    validation_stats: Optional[ValidationStats],
+    jobs: int,
+    keep_line: Optional[Callable[[bytes], bool]] = None,
+) -> Iterator[TranscriptEntry]:
+    """Decode the lines of a file from position on, in worker processes if worth it."""
+    if not silent and position.offset == 0:
+        print(f"Processing {jsonl_path}...")
+    if jobs > 1 and jsonl_path.stat().st_size - position.offset > (
+        PARALLEL_CHUNK_BYTES
+    ):
+        return _iter_transcript_chunks(
+            jsonl_path, position, validation, validation_stats, jobs, keep_line
+        )
+    return _iter_transcript_lines(
+        jsonl_path, position, validation, validation_stats, keep_line
+    )
+
+
+def _cache_parsed_entries(
+    jsonl_path: Path,
+    cache_manager: "CacheManager",
+    entries: List[TranscriptEntry],
+    cached_count: int,
+    position: _ParsePosition,
+    source_stat: Optional[os.stat_result],
+) -> None:
+    """Store entries parsed up to position, after cached_count cached ones."""
+    if cached_count:
+        cache_manager.append_cached_entries(
+            jsonl_path,
+            entries,
+            cached_count,
+            position.offset,
+            position.line_no,
+            source_stat,
+        )
+    else:
+        cache_manager.save_cached_entries(
+            jsonl_path, entries, position.offset, position.line_no, source_stat
+        )
+
+
+def load_transcript(
+    jsonl_path: Path,
+    cache_manager: Optional["CacheManager"] = None,
+    from_date: Optional[str] = None,
+    to_date: Optional[str] = None,
+    silent: bool = False,
+    validation: ValidationLevel = "none",
+    validation_stats: Optional[ValidationStats] = None,
+    jobs: int = 1,
+) -> List[TranscriptEntry]:
+    """Load and parse JSONL transcript file, using cache if available.
+
+    See iter_transcript for the decoding, validation and jobs options.
+    """
+    return list(
+        iter_transcript(
+            jsonl_path,
+            cache_manager,
+            from_date,
+            to_date,
+            silent,
+            validation,
+            validation_stats,
+            jobs,
+        )
+    )
+
+
+def _entry_timestamp(entry: TranscriptEntry) -> int:
+    """Sort key for chronological ordering; entries without timestamps sort first."""
+    timestamp_ms = getattr(entry, "timestamp_ms", None)
+    return -1 if timestamp_ms is None else timestamp_ms
+
+
+_TIMESTAMP_FIELD = re.compile(rb'"timestamp"\s*:\s*"([^"]*)"')
+_SESSION_ID_FIELD = re.compile(rb'"sessionId"\s*:\s*"([^"]*)"')
+
+
+def _entry_timestamp_ms(raw_timestamp: bytes) -> int:
+    """The _entry_timestamp sort key of a raw timestamp value."""
+    timestamp_ms = timestamp_to_ms(raw_timestamp.decode("utf-8", errors="replace"))
+    return -1 if timestamp_ms is None else timestamp_ms
+
+
+@lru_cache(maxsize=4096)
+def _scan_transcript_bytes(
+    path: str, mtime_ns: int, size: int
+) -> Tuple[int, FrozenSet[str]]:
+    """Scan raw bytes for the earliest timestamp and the session ids of a file.
+
+    The scan matches field patterns without decoding JSON, so it may pick up
+    values from nested content as well: the earliest timestamp is a lower
+    bound and the session ids a superset. Timestamps can carry any UTC
+    offset, so each is converted to epoch milliseconds before comparing; the
+    earliest is returned as the _entry_timestamp sort key, which is -1 if a
+    timestamp can't be parsed (as such entries sort first). Results are
+    memoised per file version (mtime and size).
+    """
+    if size == 0:
+        return -1, frozenset()
+
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as m:
+        earliest_ms = min(
+            (
+                _entry_timestamp_ms(match.group(1))
+                for match in _TIMESTAMP_FIELD.finditer(m)
+            ),
+            default=-1,
+        )
+        session_ids = frozenset(
+            match.group(1).decode("utf-8", errors="replace")
+            for match in _SESSION_ID_FIELD.finditer(m)
+        )
+    return earliest_ms, session_ids
+
+
+def _scan_transcript_file(jsonl_path: Path) -> Tuple[int, FrozenSet[str]]:
+    """Memoised _scan_transcript_bytes for the current version of a file."""
+    stat = jsonl_path.stat()
+    return _scan_transcript_bytes(str(jsonl_path), stat.st_mtime_ns, stat.st_size)
+
+
+def _transcript_file_outline(
+    jsonl_path: Path, cache_manager: Optional["CacheManager"] = None
+) -> Tuple[int, FrozenSet[str]]:
+    """The earliest timestamp sort key and the session ids of a file.
+
+    They are taken from the cache index when the file's cache is current,
+    and scanned from its raw bytes otherwise.
+    """
+    if cache_manager is not None and cache_manager.is_file_cached(jsonl_path):
+        cached_info = cache_manager.get_cached_file_info(jsonl_path)
+        # Files cached before earliest_ms was recorded are scanned
+        if cached_info is not None and (
+            cached_info.earliest_ms is not None or not cached_info.earliest_timestamp
+        ):
+            earliest_ms = cached_info.earliest_ms
+            return (
+                -1 if earliest_ms is None else earliest_ms,
+                frozenset(cached_info.session_ids),
+            )
+    return _scan_transcript_file(jsonl_path)
+
+
+def find_session_files(
+    jsonl_files: Iterable[Path], cache_manager: Optional["CacheManager"] = None
+) -> Dict[str, List[Path]]:
+    """Map session ids to the JSONL files that may contain their messages.
+
+    Every file holding a message of a session is listed, but a file can be
+    listed for a session it only mentions, so callers still filter entries.
+    Files whose cache is current are looked up in the cache index.
+    """
+    session_files: Dict[str, List[Path]] = {}
+    for jsonl_path in jsonl_files:
+        _, session_ids = _transcript_file_outline(jsonl_path, cache_manager)
+        for session_id in session_ids:
+            session_files.setdefault(session_id, []).append(jsonl_path)
+    return session_files
+
+
+def _parse_sorted_transcript(
+    jsonl_path: Path,
+    validation: ValidationLevel,
+    keep_line: Optional[Callable[[bytes], bool]] = None,
+) -> Tuple[List[TranscriptEntry], ValidationStats, int, int, os.stat_result]:
+    """Process pool worker: parse a file from source and sort its entries.
+
+    Also returns the byte offset and line number parsing stopped at, and the
+    stat of the file before it was read, which are recorded in the cache.
+    """
+    validation_stats = ValidationStats(level=validation)
+    position = _ParsePosition()
+    source_stat = jsonl_path.stat()
+    entries = list(
+        _iter_transcript_lines(
+            jsonl_path, position, validation, validation_stats, keep_line
+        )
+    )
+    entries.sort(key=_entry_timestamp)
+    return entries, validation_stats, position.offset, position.line_no, source_stat
+
+
+def _iter_sorted_transcripts(
+    jsonl_files: List[Path],
+    cache_manager: Optional["CacheManager"] = None,
+    from_date: Optional[str] = None,
+    to_date: Optional[str] = None,
+    silent: bool = False,
+    validation: ValidationLevel = "none",
+    validation_stats: Optional[ValidationStats] = None,
+    jobs: int = 1,
+) -> Iterator[List[TranscriptEntry]]:
+    """Yield each file's entries sorted by timestamp, in the order given.
+
+    With jobs > 1, files that have to be parsed from source are parsed ahead
+    of time in a process pool, with at most `jobs` files in flight. Cached
+    files are loaded in this process, which also writes the new caches.
+    """
+    # Cached and appended-to files are cheap to load here
+    uncached = {
+        jsonl_path
+        for jsonl_path in jsonl_files
+        if cache_manager is None
+        or not (
+            cache_manager.is_file_cached(jsonl_path)
+            or cache_manager.get_append_position(jsonl_path) is not None
+        )
+    }
+
+    if jobs <= 1 or len(uncached) < 2:
+        # A single file to parse can still be split across the workers
+        for jsonl_path in jsonl_files:
+            entries = load_transcript(
+                jsonl_path,
+                cache_manager,
+                from_date,
+                to_date,
+                silent,
+                validation,
+                validation_stats,
+                jobs,
+            )
+            entries.sort(key=_entry_timestamp)
+            yield entries
+        return
+
+    # Without a cache the date range can be pushed into the workers' scan
+    keep_line: Optional[Callable[[bytes], bool]] = None
+    if cache_manager is None and (from_date or to_date):
+        keep_line = TimestampPrefilter.from_dates(from_date, to_date).line_may_match
+
+    executor = ProcessPoolExecutor(max_workers=min(jobs, len(uncached)))
+    futures: Dict[
+        int,
+        "Future[Tuple[List[TranscriptEntry], ValidationStats, int, int, os.stat_result]]",
+    ] = {}
+    next_submit = 0
+    try:
+        for file_index, jsonl_path in enumerate(jsonl_files):
+            # Keep the pool busy with the next files that need parsing
+            while next_submit < len(jsonl_files) and len(futures) < jobs:
+                if jsonl_files[next_submit] in uncached:
+                    futures[next_submit] = executor.submit(
+                        _parse_sorted_transcript,
+                        jsonl_files[next_submit],
+                        validation,
+                        keep_line,
                     )
+                next_submit += 1
 
-    # Save to cache if cache manager is available
-    if cache_manager is not None:
-        cache_manager.save_cached_entries(jsonl_path, messages)
+            future = futures.pop(file_index, None)
+            if future is None:
+                entries = load_transcript(
+                    jsonl_path,
+                    cache_manager,
+                    from_date,
+                    to_date,
+                    silent,
+                    validation,
+                    validation_stats,
+                )
+                entries.sort(key=_entry_timestamp)
+                yield entries
+                continue
+
+            if not silent:
+                print(f"Processing {jsonl_path}...")
+            entries, file_stats, parsed_offset, parsed_lines, source_stat = (
+                future.result()
+            )
+            if validation_stats is not None:
+                validation_stats.merge(file_stats)
+            if cache_manager is not None:
+                cache_manager.save_cached_entries(
+                    jsonl_path, entries, parsed_offset, parsed_lines, source_stat
+                )
+            yield entries
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
+
+
+def iter_project(
+    directory_path: Path,
+    cache_manager: Optional["CacheManager"] = None,
+    from_date: Optional[str] = None,
+    to_date: Optional[str] = None,
+    silent: bool = False,
+    validation: ValidationLevel = "none",
+    validation_stats: Optional[ValidationStats] = None,
+    jsonl_files: Optional[List[Path]] = None,
+    jobs: int = 1,
+) -> Iterator[TranscriptEntry]:
+    """Yield the entries of all JSONL files in a directory in timestamp order.
 
-    return messages
+    Files are merged lazily: each file is only loaded once the merge reaches
+    the earliest timestamp it contains, and its entries are released as they
+    are yielded. Peak memory is therefore bounded by the files whose time
+    ranges overlap rather than by the size of the project. Ties keep the
+    order of load_directory_transcripts; entries without a timestamp
+    (summaries) are yielded as soon as their file is loaded.
+
+    Files are ordered by their earliest timestamp, from the cache index for
+    cached files. Pass jsonl_files to merge a subset of the directory's
+    files. With jobs > 1, upcoming files are parsed ahead in a process pool.
+    """
+    if jsonl_files is None:
+        jsonl_files = list(directory_path.glob("*.jsonl"))
+
+    # Files in the order they will be opened, loaded ahead when jobs > 1
+    opening_order = sorted(
+        (
+            _transcript_file_outline(jsonl_path, cache_manager)[0],
+            file_index,
+            jsonl_path,
+        )
+        for file_index, jsonl_path in enumerate(jsonl_files)
+    )
+    loader = _iter_sorted_transcripts(
+        [jsonl_path for _, _, jsonl_path in opening_order],
+        cache_manager,
+        from_date,
+        to_date,
+        silent,
+        validation,
+        validation_stats,
+        jobs,
+    )
+    # Files still to be loaded, ordered so the next one to open is last
+    pending = opening_order[::-1]
+    # Per-file entries in reverse chronological order, consumed with pop()
+    open_files: Dict[int, List[TranscriptEntry]] = {}
+    heap: List[Tuple[int, int, int, TranscriptEntry]] = []
+    positions: Dict[int, int] = {}
+
+    def push_next(file_index: int) -> None:
+        entries = open_files[file_index]
+        if not entries:
+            del open_files[file_index]
+            return
+        entry = entries.pop()
+        position = positions[file_index] = positions.get(file_index, -1) + 1
+        heapq.heappush(heap, (_entry_timestamp(entry), file_index, position, entry))
+
+    try:
+        while pending or heap:
+            # Open every file that may hold an entry ordered before the heap top
+            while pending and (
+                not heap or (pending[-1][0], pending[-1][1]) < (heap[0][0], heap[0][1])
+            ):
+                _, file_index, _ = pending.pop()
+                entries = next(loader)
+                entries.reverse()
+                open_files[file_index] = entries
+                push_next(file_index)
+
+            if not heap:
+                continue
+
+            _, file_index, _, entry = heapq.heappop(heap)
+            push_next(file_index)
+            yield entry
+    finally:
+        loader.close()
 
 
 def load_directory_transcripts(
@@ -202,24 +1008,30 @@ def load_directory_transcripts(
     from_date: Optional[str] = None,
     to_date: Optional[str] = None,
     silent: bool = False,
+    validation: ValidationLevel = "none",
+    validation_stats: Optional[ValidationStats] = None,
+    jobs: int = 1,
 ) -> List[TranscriptEntry]:
-    """Load all JSONL transcript files from a directory and combine them."""
-    all_messages: List[TranscriptEntry] = []
+    """Load all JSONL transcript files from a directory and combine them.
 
+    Files are parsed in a process pool when jobs > 1. Each file's entries are
+    sorted and the files are combined with a k-way merge.
+    """
     # Find all .jsonl files
     jsonl_files = list(directory_path.glob("*.jsonl"))
 
-    for jsonl_file in jsonl_files:
-        messages = load_transcript(
-            jsonl_file, cache_manager, from_date, to_date, silent
+    sorted_files = list(
+        _iter_sorted_transcripts(
+            jsonl_files,
+            cache_manager,
+            from_date,
+            to_date,
+            silent,
+            validation,
+            validation_stats,
+            jobs,
         )
-        all_messages.extend(messages)
-
-    # Sort all messages chronologically
-    def get_timestamp(entry: TranscriptEntry) -> str:
-        if hasattr(entry, "timestamp"):
-            return entry.timestamp  # type: ignore
-        return ""
+    )
 
-    all_messages.sort(key=get_timestamp)
-    return all_messages
+    # Merge chronologically; ties keep file order like a stable sort would
+    return list(heapq.merge(*sorted_files, key=_entry_timestamp))
@@ -3,17 +3,28 @@
 
 import json
 from pathlib import Path
-from typing import List, Optional, Union, Dict, Any, cast, TYPE_CHECKING
+from typing import (
+    Any,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    Union,
+    cast,
+    TYPE_CHECKING,
+)
 
 if TYPE_CHECKING:
-    from .cache import CacheManager
-from datetime import datetime
+    from .cache import CacheManager, FragmentCache
+from datetime import datetime, timezone
+from functools import lru_cache
 import html
 import mistune
 from jinja2 import Environment, FileSystemLoader
 
 from .models import (
-    AssistantTranscriptEntry,
     TranscriptEntry,
     SummaryTranscriptEntry,
     SystemTranscriptEntry,
@@ -23,7 +34,9 @@ from .models import (
     ToolUseContent,
     ThinkingContent,
     ImageContent,
+    timestamp_to_ms,
 )
+from .aggregates import SessionAggregator
 from .parser import extract_text_content
 from .utils import (
     is_command_message,
@@ -31,8 +44,6 @@ from .utils import (
     is_bash_input,
     is_bash_output,
     should_skip_message,
-    should_use_as_session_starter,
-    create_session_preview,
 )
 from .cache import get_library_version
 
@@ -108,26 +119,62 @@ def is_html_outdated(html_file_path: Path) -> bool:
     return html_version != current_version
 
 
+TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+
+@lru_cache(maxsize=4096)
+def _format_epoch_second(epoch_second: int, fmt: str) -> str:
+    """Format a UTC epoch second; memoised as many messages share a second."""
+    return datetime.fromtimestamp(epoch_second, timezone.utc).strftime(fmt)
+
+
+def format_timestamp_ms(
+    timestamp_ms: Optional[int], fmt: str = TIMESTAMP_FORMAT
+) -> str:
+    """Format an epoch millisecond timestamp for display in UTC."""
+    if timestamp_ms is None:
+        return ""
+    return _format_epoch_second(timestamp_ms // 1000, fmt)
+
+
+def format_timestamps_ms(
+    timestamps_ms: Iterable[Optional[int]], fmt: str = TIMESTAMP_FORMAT
+) -> List[str]:
+    """Format a batch of epoch millisecond timestamps for display in UTC.
+
+    Each distinct second in the batch is formatted once.
+    """
+    formatted: Dict[Optional[int], str] = {None: ""}
+    results: List[str] = []
+    for timestamp_ms in timestamps_ms:
+        second = None if timestamp_ms is None else timestamp_ms // 1000
+        text = formatted.get(second)
+        if text is None:
+            text = formatted[second] = _format_epoch_second(cast(int, second), fmt)
+        results.append(text)
+    return results
+
+
 def format_timestamp(timestamp_str: str | None) -> str:
     """Format ISO timestamp for display, converting to UTC."""
     if timestamp_str is None:
         return ""
-    try:
-        dt = datetime.fromisoformat(timestamp_str.replace("Z", "+00:00"))
-        # Convert to UTC if timezone-aware
-        if dt.tzinfo is not None:
-            utc_timetuple = dt.utctimetuple()
-            dt = datetime(
-                utc_timetuple.tm_year,
-                utc_timetuple.tm_mon,
-                utc_timetuple.tm_mday,
-                utc_timetuple.tm_hour,
-                utc_timetuple.tm_min,
-                utc_timetuple.tm_sec,
-            )
-        return dt.strftime("%Y-%m-%d %H:%M:%S")
-    except (ValueError, AttributeError):
+    timestamp_ms = timestamp_to_ms(timestamp_str)
+    if timestamp_ms is None:
         return timestamp_str
+    return format_timestamp_ms(timestamp_ms)
+
+
+def format_timestamp_range_ms(
+    first_ms: Optional[int], last_ms: Optional[int], separator: str = " - "
+) -> str:
+    """Format a first/last epoch millisecond pair as a display range."""
+    if first_ms is None:
+        return ""
+    if last_ms is None or last_ms == first_ms:
+        return format_timestamp_ms(first_ms)
+    first, last = format_timestamps_ms((first_ms, last_ms))
+    return f"{first}{separator}{last}"
 
 
 def escape_html(text: str) -> str:
@@ -563,28 +610,25 @@ class TemplateProject:
         last_modified_dt = datetime.fromtimestamp(self.last_modified)
         self.formatted_date = last_modified_dt.strftime("%Y-%m-%d %H:%M:%S")
 
-        # Format interaction time range
+        # Format interaction time range, parsing each timestamp once
+        earliest_formatted, latest_formatted = (
+            format_timestamp(timestamp) if timestamp else ""
+            for timestamp in (self.earliest_timestamp, self.latest_timestamp)
+        )
         if self.earliest_timestamp and self.latest_timestamp:
             if self.earliest_timestamp == self.latest_timestamp:
                 # Single interaction
-                self.formatted_time_range = format_timestamp(self.latest_timestamp)
+                self.formatted_time_range = latest_formatted
             else:
                 # Time range
-                earliest_formatted = format_timestamp(self.earliest_timestamp)
-                latest_formatted = format_timestamp(self.latest_timestamp)
                 self.formatted_time_range = (
                     f"{earliest_formatted} to {latest_formatted}"
                 )
-        elif self.latest_timestamp:
-            self.formatted_time_range = format_timestamp(self.latest_timestamp)
         else:
-            self.formatted_time_range = ""
+            self.formatted_time_range = latest_formatted
 
         # Format last interaction timestamp (kept for backward compatibility)
-        if self.latest_timestamp:
-            self.formatted_last_interaction = format_timestamp(self.latest_timestamp)
-        else:
-            self.formatted_last_interaction = ""
+        self.formatted_last_interaction = latest_formatted
 
         # Format token usage
         self.token_summary = ""
@@ -1073,6 +1117,148 @@ def _process_regular_message(
     return css_class, content_html, message_type
 
 
+def _split_message_content(
+    message_content: Union[str, List[ContentItem]],
+) -> tuple[Union[str, List[ContentItem]], List[ContentItem]]:
+    """Separate tool/thinking/image items from the text content of a message."""
+    tool_items: List[ContentItem] = []
+
+    if not isinstance(message_content, list):
+        # Single string content
+        return message_content, tool_items
+
+    text_only_items: List[ContentItem] = []
+    for item in message_content:
+        # Check for both custom types and Anthropic types
+        item_type = getattr(item, "type", None)
+        is_tool_item = isinstance(
+            item,
+            (ToolUseContent, ToolResultContent, ThinkingContent, ImageContent),
+        ) or item_type in ("tool_use", "tool_result", "thinking", "image")
+
+        if is_tool_item:
+            tool_items.append(item)
+        else:
+            text_only_items.append(item)
+    return text_only_items, tool_items
+
+
+class SessionIndex:
+    """Session summaries and navigation collected in a first pass over messages.
+
+    The transcript template shows the session navigation before any message,
+    so rendering needs two passes: every message is fed through add() first,
+    then render_html_chunks() renders a second iteration of the same messages.
+    Only the aggregates of a SessionAggregator are kept, so the messages
+    themselves can be streamed.
+    """
+
+    def __init__(self, aggregator: Optional[SessionAggregator] = None) -> None:
+        self.aggregator = aggregator if aggregator is not None else SessionAggregator()
+        self._session_summaries: Optional[Dict[str, str]] = None
+
+    @classmethod
+    def from_messages(cls, messages: Iterable[TranscriptEntry]) -> "SessionIndex":
+        """Build an index from all the given messages."""
+        session_index = cls()
+        for message in messages:
+            session_index.add(message)
+        return session_index
+
+    def add(self, message: TranscriptEntry) -> None:
+        """Record a message in the order it will be rendered."""
+        self._session_summaries = None
+
+        # Summaries and system messages are rendered but don't count towards
+        # sessions, nor do messages that won't be rendered
+        if isinstance(message, (SummaryTranscriptEntry, SystemTranscriptEntry)):
+            self.aggregator.add_links(message)
+            return
+        message_content = message.message.content
+        text_content = extract_text_content(message_content)
+        _, tool_items = _split_message_content(message_content)
+        if (not text_content.strip() and not tool_items) or should_skip_message(
+            text_content
+        ):
+            self.aggregator.add_links(message)
+            return
+
+        self.aggregator.add(message)
+
+    def for_session(self, session_id: str) -> "SessionIndex":
+        """Return the index of a single session's messages.
+
+        Summaries still resolve through the links of every message added.
+        """
+        aggregator = self.aggregator
+        session = aggregator.sessions.get(session_id)
+        # Constructed without validation, which would copy the shared maps
+        return SessionIndex(
+            SessionAggregator.model_construct(
+                sessions={session_id: session} if session is not None else {},
+                uuid_to_session=aggregator.uuid_to_session,
+                uuid_to_session_backup=aggregator.uuid_to_session_backup,
+                summaries=aggregator.summaries,
+            )
+        )
+
+    @property
+    def session_summaries(self) -> Dict[str, str]:
+        """Summaries mapped to sessions via leafUuid -> message UUID -> session ID."""
+        if self._session_summaries is None:
+            self._session_summaries = self.aggregator.session_summaries
+        return self._session_summaries
+
+    def get_session_nav(
+        self, session_summaries: Optional[Dict[str, str]] = None
+    ) -> List[Dict[str, Any]]:
+        """Prepare session navigation data for the transcript template.
+
+        session_summaries overrides the summaries resolved by this index.
+        """
+        if session_summaries is None:
+            session_summaries = self.session_summaries
+        session_nav: List[Dict[str, Any]] = []
+        for session_id, session_info in self.aggregator.sessions.items():
+            # Format timestamp range
+            timestamp_range = format_timestamp_range_ms(
+                session_info.first_timestamp_ms, session_info.last_timestamp_ms
+            )
+
+            # Format token usage summary
+            token_summary = ""
+            total_input = session_info.total_input_tokens
+            total_output = session_info.total_output_tokens
+            total_cache_creation = session_info.total_cache_creation_tokens
+            total_cache_read = session_info.total_cache_read_tokens
+
+            if total_input > 0 or total_output > 0:
+                token_parts: List[str] = []
+                if total_input > 0:
+                    token_parts.append(f"Input: {total_input}")
+                if total_output > 0:
+                    token_parts.append(f"Output: {total_output}")
+                if total_cache_creation > 0:
+                    token_parts.append(f"Cache Creation: {total_cache_creation}")
+                if total_cache_read > 0:
+                    token_parts.append(f"Cache Read: {total_cache_read}")
+                token_summary = "Token usage – " + " | ".join(token_parts)
+
+            session_nav.append(
+                {
+                    "id": session_id,
+                    "summary": session_summaries.get(session_id),
+                    "timestamp_range": timestamp_range,
+                    "message_count": session_info.message_count,
+                    "first_user_message": session_info.first_user_message
+                    if session_info.first_user_message != ""
+                    else "[No user message found in session.]",
+                    "token_summary": token_summary,
+                }
+            )
+        return session_nav
+
+
 def _get_combined_transcript_link(cache_manager: "CacheManager") -> Optional[str]:
     """Get link to combined transcript if available."""
     try:
@@ -1084,6 +1270,39 @@ def _get_combined_transcript_link(cache_manager: "CacheManager") -> Optional[str
         return None
 
 
+def render_session_html_chunks(
+    session_messages: Iterable[TranscriptEntry],
+    session_index: SessionIndex,
+    session_id: str,
+    title: Optional[str] = None,
+    cache_manager: Optional["CacheManager"] = None,
+    session_summaries: Optional[Dict[str, str]] = None,
+) -> Iterator[str]:
+    """Stream the HTML of a single session page.
+
+    session_messages must only contain messages of the session, and
+    session_index must have been built from the same messages. Summary
+    entries live outside the session, so pass the project's
+    session_summaries to show them. With a cache manager, message
+    fragments are taken from its fragment cache.
+    """
+    # Get combined transcript link if cache manager is available
+    combined_link = None
+    fragment_cache = None
+    if cache_manager is not None:
+        combined_link = _get_combined_transcript_link(cache_manager)
+        fragment_cache = cache_manager.fragments
+
+    return render_html_chunks(
+        session_messages,
+        session_index,
+        title or f"Session {session_id[:8]}",
+        combined_transcript_link=combined_link,
+        session_summaries=session_summaries,
+        fragment_cache=fragment_cache,
+    )
+
+
 def generate_session_html(
     messages: List[TranscriptEntry],
     session_id: str,
@@ -1098,23 +1317,14 @@ def generate_session_html(
         if hasattr(msg, "sessionId") and getattr(msg, "sessionId") == session_id
     ]
 
-    # Get combined transcript link if cache manager is available
-    combined_link = None
-    if cache_manager is not None:
-        combined_link = _get_combined_transcript_link(cache_manager)
-
-    if not session_messages:
-        return generate_html(
-            [],
-            title or f"Session {session_id[:8]}",
-            combined_transcript_link=combined_link,
+    return "".join(
+        render_session_html_chunks(
+            session_messages,
+            SessionIndex.from_messages(session_messages),
+            session_id,
+            title,
+            cache_manager,
         )
-
-    # Use the existing generate_html function but with filtered messages and combined link
-    return generate_html(
-        session_messages,
-        title or f"Session {session_id[:8]}",
-        combined_transcript_link=combined_link,
     )
 
 
@@ -1124,172 +1334,275 @@ def generate_html(
     combined_transcript_link: Optional[str] = None,
 ) -> str:
     """Generate HTML from transcript messages using Jinja2 templates."""
+    return "".join(
+        render_html_chunks(
+            messages,
+            SessionIndex.from_messages(messages),
+            title,
+            combined_transcript_link,
+        )
+    )
+
+
+def render_html_chunks(
+    messages: Iterable[TranscriptEntry],
+    session_index: SessionIndex,
+    title: Optional[str] = None,
+    combined_transcript_link: Optional[str] = None,
+    session_summaries: Optional[Dict[str, str]] = None,
+    fragment_cache: Optional["FragmentCache"] = None,
+) -> Iterator[str]:
+    """Stream transcript HTML as it is rendered.
+
+    messages is iterated once, lazily, while the template is rendered, so it
+    can be a generator over a project. session_index must have been built
+    from the same messages in the same order. session_summaries overrides
+    the summaries resolved by session_index. With a fragment_cache, only
+    messages not rendered before are rendered.
+    """
     if not title:
         title = "Claude Transcript"
+    if session_summaries is None:
+        session_summaries = session_index.session_summaries
 
-    # Pre-process to find and attach session summaries
-    session_summaries: Dict[str, str] = {}
-    uuid_to_session: Dict[str, str] = {}
-    uuid_to_session_backup: Dict[str, str] = {}
-
-    # Build mapping from message UUID to session ID
-    for message in messages:
-        if hasattr(message, "uuid") and hasattr(message, "sessionId"):
-            message_uuid = getattr(message, "uuid", "")
-            session_id = getattr(message, "sessionId", "")
-            if message_uuid and session_id:
-                # There is often duplication, in that case we want to prioritise the assistant
-                # message because summaries are generated from Claude's (last) success message
-                if type(message) is AssistantTranscriptEntry:
-                    uuid_to_session[message_uuid] = session_id
-                else:
-                    uuid_to_session_backup[message_uuid] = session_id
-
-    # Map summaries to sessions via leafUuid -> message UUID -> session ID
-    for message in messages:
-        if isinstance(message, SummaryTranscriptEntry):
-            leaf_uuid = message.leafUuid
-            if leaf_uuid in uuid_to_session:
-                session_summaries[uuid_to_session[leaf_uuid]] = message.summary
-            elif (
-                leaf_uuid in uuid_to_session_backup
-                and uuid_to_session_backup[leaf_uuid] not in session_summaries
-            ):
-                session_summaries[uuid_to_session_backup[leaf_uuid]] = message.summary
-
-    # Attach summaries to messages
-    for message in messages:
-        if hasattr(message, "sessionId"):
-            session_id = getattr(message, "sessionId", "")
-            if session_id in session_summaries:
-                setattr(message, "_session_summary", session_summaries[session_id])
-
-    # Group messages by session and collect session info for navigation
-    sessions: Dict[str, Dict[str, Any]] = {}
-    session_order: List[str] = []
-    seen_sessions: set[str] = set()
+    # Render template
+    env = _get_template_environment()
+    template = env.get_template("transcript.html")
+    return template.generate(
+        title=title,
+        messages=_iter_template_messages(messages, session_summaries, fragment_cache),
+        sessions=session_index.get_session_nav(session_summaries),
+        combined_transcript_link=combined_transcript_link,
+        library_version=get_library_version(),
+    )
 
-    # Track requestIds to avoid double-counting token usage
-    seen_request_ids: set[str] = set()
-    # Track which messages should show token usage (first occurrence of each requestId)
-    show_tokens_for_message: set[str] = set()
 
-    # Process messages into template-friendly format
-    template_messages: List[TemplateMessage] = []
+# A rendered part of a message: (message_type, css_class, content_html)
+_Fragment = Tuple[str, str, str]
+# A message's text part, if any, and its tool, thinking and image parts
+_MessageFragments = Tuple[Optional[_Fragment], List[_Fragment]]
 
-    for message in messages:
-        message_type = message.type
 
-        # Skip summary messages - they should already be attached to their sessions
-        if isinstance(message, SummaryTranscriptEntry):
-            continue
+def _render_message_fragments(
+    message: TranscriptEntry,
+) -> Optional[_MessageFragments]:
+    """Render the parts of a user or assistant message to HTML.
 
-        # Handle system messages separately
-        if isinstance(message, SystemTranscriptEntry):
-            session_id = getattr(message, "sessionId", "unknown")
-            timestamp = getattr(message, "timestamp", "")
-            formatted_timestamp = format_timestamp(timestamp) if timestamp else ""
-
-            # Create level-specific styling and icons
-            level = getattr(message, "level", "info")
-            level_icon = {"warning": "⚠️", "error": "❌", "info": "ℹ️"}.get(level, "ℹ️")
-            level_css = f"system system-{level}"
-
-            escaped_content = escape_html(message.content)
-            content_html = f"<strong>{level_icon} System {level.title()}:</strong> {escaped_content}"
-
-            system_template_message = TemplateMessage(
-                message_type=f"System {level.title()}",
-                content_html=content_html,
-                formatted_timestamp=formatted_timestamp,
-                css_class=level_css,
-                session_id=session_id,
-            )
-            template_messages.append(system_template_message)
-            continue
+    Returns None for messages that aren't shown. The result only depends on
+    the message's type, sidechain flag and content, which is what
+    FragmentCache keys it on.
+    """
+    message_type = message.type
 
-        # Extract message content first to check for duplicates
-        # Must be UserTranscriptEntry or AssistantTranscriptEntry
-        message_content = message.message.content  # type: ignore
-        text_content = extract_text_content(message_content)
+    # Must be UserTranscriptEntry or AssistantTranscriptEntry
+    message_content = message.message.content  # type: ignore
+    text_content = extract_text_content(message_content)
+
+    # Separate tool/thinking/image content from text content
+    text_only_content, tool_items = _split_message_content(message_content)
+
+    # Skip if no meaningful content
+    if not text_content.strip() and not tool_items:
+        return None
+
+    # Skip messages that should be filtered out
+    if should_skip_message(text_content):
+        return None
+
+    # Determine CSS class and content based on message type
+    if is_command_message(text_content):
+        css_class, content_html, message_type = _process_command_message(text_content)
+    elif is_local_command_output(text_content):
+        css_class, content_html, message_type = _process_local_command_output(
+            text_content
+        )
+    elif is_bash_input(text_content):
+        css_class, content_html, message_type = _process_bash_input(text_content)
+    elif is_bash_output(text_content):
+        css_class, content_html, message_type = _process_bash_output(text_content)
+    else:
+        css_class, content_html, message_type = _process_regular_message(
+            text_only_content, message_type, getattr(message, "isSidechain", False)
+        )
 
-        # Separate tool/thinking/image content from text content
-        tool_items: List[ContentItem] = []
-        text_only_content: Union[str, List[ContentItem]] = []
-
-        if isinstance(message_content, list):
-            text_only_items: List[ContentItem] = []
-            for item in message_content:
-                # Check for both custom types and Anthropic types
-                item_type = getattr(item, "type", None)
-                is_tool_item = isinstance(
-                    item,
-                    (ToolUseContent, ToolResultContent, ThinkingContent, ImageContent),
-                ) or item_type in ("tool_use", "tool_result", "thinking", "image")
-
-                if is_tool_item:
-                    tool_items.append(item)
-                else:
-                    text_only_items.append(item)
-            text_only_content = text_only_items
+    # Main message (if it has text content)
+    main_fragment: Optional[_Fragment] = None
+    if text_only_content and (
+        isinstance(text_only_content, str)
+        and text_only_content.strip()
+        or isinstance(text_only_content, list)
+        and text_only_content
+    ):
+        main_fragment = (message_type, css_class, content_html)
+
+    # Separate messages for each tool/thinking/image item
+    tool_fragments: List[_Fragment] = []
+    for tool_item in tool_items:
+        # Handle both custom types and Anthropic types
+        item_type = getattr(tool_item, "type", None)
+
+        if isinstance(tool_item, ToolUseContent) or item_type == "tool_use":
+            # Convert Anthropic type to our format if necessary
+            if not isinstance(tool_item, ToolUseContent):
+                tool_use_converted = ToolUseContent(
+                    type="tool_use",
+                    id=getattr(tool_item, "id", ""),
+                    name=getattr(tool_item, "name", ""),
+                    input=getattr(tool_item, "input", {}),
+                )
+            else:
+                tool_use_converted = tool_item
+
+            tool_content_html = format_tool_use_content(tool_use_converted)
+            escaped_name = escape_html(tool_use_converted.name)
+            escaped_id = escape_html(tool_use_converted.id)
+            if tool_use_converted.name == "TodoWrite":
+                tool_message_type = f"📝 Todo List (ID: {escaped_id})"
+            else:
+                tool_message_type = f"Tool Use: {escaped_name} (ID: {escaped_id})"
+            tool_css_class = "tool_use"
+        elif isinstance(tool_item, ToolResultContent) or item_type == "tool_result":
+            # Convert Anthropic type to our format if necessary
+            if not isinstance(tool_item, ToolResultContent):
+                tool_result_converted = ToolResultContent(
+                    type="tool_result",
+                    tool_use_id=getattr(tool_item, "tool_use_id", ""),
+                    content=getattr(tool_item, "content", ""),
+                    is_error=getattr(tool_item, "is_error", False),
+                )
+            else:
+                tool_result_converted = tool_item
+
+            tool_content_html = format_tool_result_content(tool_result_converted)
+            escaped_id = escape_html(tool_result_converted.tool_use_id)
+            error_indicator = " (🚨 Error)" if tool_result_converted.is_error else ""
+            tool_message_type = f"Tool Result{error_indicator}: {escaped_id}"
+            tool_css_class = "tool_result"
+        elif isinstance(tool_item, ThinkingContent) or item_type == "thinking":
+            # Convert Anthropic type to our format if necessary
+            if not isinstance(tool_item, ThinkingContent):
+                thinking_converted = ThinkingContent(
+                    type="thinking",
+                    thinking=getattr(tool_item, "thinking", str(tool_item)),
+                )
+            else:
+                thinking_converted = tool_item
+
+            tool_content_html = format_thinking_content(thinking_converted)
+            tool_message_type = "Thinking"
+            tool_css_class = "thinking"
+        elif isinstance(tool_item, ImageContent) or item_type == "image":
+            # Convert Anthropic type to our format if necessary
+            if not isinstance(tool_item, ImageContent):
+                # For now, skip Anthropic image types - we'll handle when we encounter them
+                continue
+            else:
+                tool_content_html = format_image_content(tool_item)
+            tool_message_type = "Image"
+            tool_css_class = "image"
         else:
-            # Single string content
-            text_only_content = message_content
+            # Handle unknown content types
+            tool_content_html = (
+                f"<p>Unknown content type: {escape_html(str(type(tool_item)))}</p>"
+            )
+            tool_message_type = "Unknown Content"
+            tool_css_class = "unknown"
 
-        # Skip if no meaningful content
-        if not text_content.strip() and not tool_items:
-            continue
+        # Preserve sidechain context for tool/thinking/image content within sidechain messages
+        if getattr(message, "isSidechain", False):
+            tool_css_class += " sidechain"
 
-        # Skip messages that should be filtered out
-        if should_skip_message(text_content):
-            continue
+        tool_fragments.append((tool_message_type, tool_css_class, tool_content_html))
 
-        # Check message types for special handling
-        is_command = is_command_message(text_content)
-        is_local_output = is_local_command_output(text_content)
-        is_bash_cmd = is_bash_input(text_content)
-        is_bash_result = is_bash_output(text_content)
-
-        # Check if we're in a new session
-        session_id = getattr(message, "sessionId", "unknown")
-        session_summary = getattr(message, "_session_summary", None)
-
-        # Track sessions for navigation and add session header if new
-        if session_id not in sessions:
-            # Get the session summary for this session (may be None)
-            current_session_summary = getattr(message, "_session_summary", None)
-
-            # Get first user message content for preview
-            first_user_message = ""
-            if (
-                message_type == "user"
-                and hasattr(message, "message")
-                and should_use_as_session_starter(text_content)
-            ):
-                content = extract_text_content(message.message.content)
-                first_user_message = create_session_preview(content)
-
-            sessions[session_id] = {
-                "id": session_id,
-                "summary": current_session_summary,
-                "first_timestamp": getattr(message, "timestamp", ""),
-                "last_timestamp": getattr(message, "timestamp", ""),
-                "message_count": 0,
-                "first_user_message": first_user_message,
-                "total_input_tokens": 0,
-                "total_output_tokens": 0,
-                "total_cache_creation_tokens": 0,
-                "total_cache_read_tokens": 0,
-            }
-            session_order.append(session_id)
+    return main_fragment, tool_fragments
+
+
+def _message_fragments(
+    message: TranscriptEntry, fragment_cache: Optional["FragmentCache"]
+) -> Optional[_MessageFragments]:
+    """Render a message's fragments, or take them from the fragment cache."""
+    if fragment_cache is None:
+        return _render_message_fragments(message)
+
+    key = fragment_cache.key(message)
+    stored = fragment_cache.get(key)
+    if stored is not None:
+        # Fragments come back as JSON lists, which unpack like the tuples
+        return cast(Optional[_MessageFragments], json.loads(stored))
+
+    fragments = _render_message_fragments(message)
+    fragment_cache.put(key, json.dumps(fragments))
+    return fragments
+
+
+def _iter_template_messages(
+    messages: Iterable[TranscriptEntry],
+    session_summaries: Dict[str, str],
+    fragment_cache: Optional["FragmentCache"] = None,
+) -> Iterator[TemplateMessage]:
+    """Process messages into template-friendly format.
+
+    With a fragment cache, only messages whose content wasn't rendered
+    before are rendered; new fragments are stored once all are processed.
+    """
+    seen_sessions: set[str] = set()
+
+    # Track requestIds to avoid double-counting token usage
+    seen_request_ids: set[str] = set()
+    # Track which messages should show token usage (first occurrence of each requestId)
+    show_tokens_for_message: set[str] = set()
+
+    try:
+        for message in messages:
+            message_type = message.type
+
+            # Skip summary messages - they should already be attached to their sessions
+            if isinstance(message, SummaryTranscriptEntry):
+                continue
+
+            # Handle system messages separately
+            if isinstance(message, SystemTranscriptEntry):
+                session_id = getattr(message, "sessionId", "unknown")
+                formatted_timestamp = format_timestamp_ms(message.timestamp_ms)
+
+                # Create level-specific styling and icons
+                level = getattr(message, "level", "info")
+                level_icon = {"warning": "⚠️", "error": "❌", "info": "ℹ️"}.get(
+                    level, "ℹ️"
+                )
+                level_css = f"system system-{level}"
+
+                escaped_content = escape_html(message.content)
+                content_html = f"<strong>{level_icon} System {level.title()}:</strong> {escaped_content}"
+
+                system_template_message = TemplateMessage(
+                    message_type=f"System {level.title()}",
+                    content_html=content_html,
+                    formatted_timestamp=formatted_timestamp,
+                    css_class=level_css,
+                    session_id=session_id,
+                )
+                yield system_template_message
+                continue
+
+            # Render the message's text and tool items, skipping empty and
+            # filtered out messages
+            fragments = _message_fragments(message, fragment_cache)
+            if fragments is None:
+                continue
+            main_fragment, tool_fragments = fragments
+
+            # Check if we're in a new session
+            session_id = getattr(message, "sessionId", "unknown")
+            session_summary = session_summaries.get(session_id)
 
-            # Add session header message
+            # Add session header message if new
             if session_id not in seen_sessions:
                 seen_sessions.add(session_id)
                 # Create a meaningful session title
                 session_title = (
-                    f"{current_session_summary} • {session_id[:8]}"
-                    if current_session_summary
+                    f"{session_summary} • {session_id[:8]}"
+                    if session_summary
                     else session_id[:8]
                 )
 
@@ -1298,282 +1611,90 @@ def generate_html(
                     content_html=session_title,
                     formatted_timestamp="",
                     css_class="session-header",
-                    session_summary=current_session_summary,
+                    session_summary=session_summary,
                     session_id=session_id,
                     is_session_header=True,
                 )
-                template_messages.append(session_header)
-
-        # Update first user message if this is a user message and we don't have one yet
-        elif message_type == "user" and not sessions[session_id]["first_user_message"]:
-            if hasattr(message, "message"):
-                first_user_content = extract_text_content(message.message.content)
-                if should_use_as_session_starter(first_user_content):
-                    sessions[session_id]["first_user_message"] = create_session_preview(
-                        first_user_content
-                    )
-
-        sessions[session_id]["message_count"] += 1
-
-        # Update last timestamp for this session
-        current_timestamp = getattr(message, "timestamp", "")
-        if current_timestamp:
-            sessions[session_id]["last_timestamp"] = current_timestamp
-
-        # Extract and accumulate token usage for assistant messages
-        # Only count tokens for the first message with each requestId to avoid duplicates
-        if message_type == "assistant" and hasattr(message, "message"):
-            assistant_message = getattr(message, "message")
-            request_id = getattr(message, "requestId", None)
-            message_uuid = getattr(message, "uuid", "")
-
-            if (
-                hasattr(assistant_message, "usage")
-                and assistant_message.usage
-                and request_id
-                and request_id not in seen_request_ids
-            ):
-                # Mark this requestId as seen to avoid double-counting
-                seen_request_ids.add(request_id)
-                # Mark this specific message UUID as one that should show token usage
-                show_tokens_for_message.add(message_uuid)
-
-                usage = assistant_message.usage
-                sessions[session_id]["total_input_tokens"] += usage.input_tokens
-                sessions[session_id]["total_output_tokens"] += usage.output_tokens
-                if usage.cache_creation_input_tokens:
-                    sessions[session_id]["total_cache_creation_tokens"] += (
-                        usage.cache_creation_input_tokens
-                    )
-                if usage.cache_read_input_tokens:
-                    sessions[session_id]["total_cache_read_tokens"] += (
-                        usage.cache_read_input_tokens
-                    )
-
-        # Get timestamp (only for non-summary messages)
-        timestamp = (
-            getattr(message, "timestamp", "") if hasattr(message, "timestamp") else ""
-        )
-        formatted_timestamp = format_timestamp(timestamp) if timestamp else ""
-
-        # Extract token usage for assistant messages
-        # Only show token usage for the first message with each requestId to avoid duplicates
-        token_usage_str: Optional[str] = None
-        if message_type == "assistant" and hasattr(message, "message"):
-            assistant_message = getattr(message, "message")
-            message_uuid = getattr(message, "uuid", "")
-
-            if (
-                hasattr(assistant_message, "usage")
-                and assistant_message.usage
-                and message_uuid in show_tokens_for_message
-            ):
-                # Only show token usage for messages marked as first occurrence of requestId
-                usage = assistant_message.usage
-                token_parts = [
-                    f"Input: {usage.input_tokens}",
-                    f"Output: {usage.output_tokens}",
-                ]
-                if usage.cache_creation_input_tokens:
-                    token_parts.append(
-                        f"Cache Creation: {usage.cache_creation_input_tokens}"
-                    )
-                if usage.cache_read_input_tokens:
-                    token_parts.append(f"Cache Read: {usage.cache_read_input_tokens}")
-                token_usage_str = " | ".join(token_parts)
-
-        # Determine CSS class and content based on message type and duplicate status
-        if is_command:
-            css_class, content_html, message_type = _process_command_message(
-                text_content
-            )
-        elif is_local_output:
-            css_class, content_html, message_type = _process_local_command_output(
-                text_content
-            )
-        elif is_bash_cmd:
-            css_class, content_html, message_type = _process_bash_input(text_content)
-        elif is_bash_result:
-            css_class, content_html, message_type = _process_bash_output(text_content)
-        else:
-            css_class, content_html, message_type = _process_regular_message(
-                text_only_content, message_type, getattr(message, "isSidechain", False)
-            )
-
-        # Create main message (if it has text content)
-        if text_only_content and (
-            isinstance(text_only_content, str)
-            and text_only_content.strip()
-            or isinstance(text_only_content, list)
-            and text_only_content
-        ):
-            template_message = TemplateMessage(
-                message_type=message_type,
-                content_html=content_html,
-                formatted_timestamp=formatted_timestamp,
-                css_class=css_class,
-                session_summary=session_summary,
-                session_id=session_id,
-                token_usage=token_usage_str,
-            )
-            template_messages.append(template_message)
-
-        # Create separate messages for each tool/thinking/image item
-        for tool_item in tool_items:
-            tool_timestamp = getattr(message, "timestamp", "")
-            tool_formatted_timestamp = (
-                format_timestamp(tool_timestamp) if tool_timestamp else ""
+                yield session_header
+
+            # Track the first message with each requestId to avoid duplicate token usage
+            if message_type == "assistant" and hasattr(message, "message"):
+                assistant_message = getattr(message, "message")
+                request_id = getattr(message, "requestId", None)
+                message_uuid = getattr(message, "uuid", "")
+
+                if (
+                    hasattr(assistant_message, "usage")
+                    and assistant_message.usage
+                    and request_id
+                    and request_id not in seen_request_ids
+                ):
+                    # Mark this requestId as seen to avoid double-counting
+                    seen_request_ids.add(request_id)
+                    # Mark this specific message UUID as one that should show token usage
+                    show_tokens_for_message.add(message_uuid)
+
+            # Get timestamp (only for non-summary messages)
+            formatted_timestamp = format_timestamp_ms(
+                getattr(message, "timestamp_ms", None)
             )
 
-            # Handle both custom types and Anthropic types
-            item_type = getattr(tool_item, "type", None)
-
-            if isinstance(tool_item, ToolUseContent) or item_type == "tool_use":
-                # Convert Anthropic type to our format if necessary
-                if not isinstance(tool_item, ToolUseContent):
-                    tool_use_converted = ToolUseContent(
-                        type="tool_use",
-                        id=getattr(tool_item, "id", ""),
-                        name=getattr(tool_item, "name", ""),
-                        input=getattr(tool_item, "input", {}),
-                    )
-                else:
-                    tool_use_converted = tool_item
-
-                tool_content_html = format_tool_use_content(tool_use_converted)
-                escaped_name = escape_html(tool_use_converted.name)
-                escaped_id = escape_html(tool_use_converted.id)
-                if tool_use_converted.name == "TodoWrite":
-                    tool_message_type = f"📝 Todo List (ID: {escaped_id})"
-                else:
-                    tool_message_type = f"Tool Use: {escaped_name} (ID: {escaped_id})"
-                tool_css_class = "tool_use"
-            elif isinstance(tool_item, ToolResultContent) or item_type == "tool_result":
-                # Convert Anthropic type to our format if necessary
-                if not isinstance(tool_item, ToolResultContent):
-                    tool_result_converted = ToolResultContent(
-                        type="tool_result",
-                        tool_use_id=getattr(tool_item, "tool_use_id", ""),
-                        content=getattr(tool_item, "content", ""),
-                        is_error=getattr(tool_item, "is_error", False),
-                    )
-                else:
-                    tool_result_converted = tool_item
-
-                tool_content_html = format_tool_result_content(tool_result_converted)
-                escaped_id = escape_html(tool_result_converted.tool_use_id)
-                error_indicator = (
-                    " (🚨 Error)" if tool_result_converted.is_error else ""
-                )
-                tool_message_type = f"Tool Result{error_indicator}: {escaped_id}"
-                tool_css_class = "tool_result"
-            elif isinstance(tool_item, ThinkingContent) or item_type == "thinking":
-                # Convert Anthropic type to our format if necessary
-                if not isinstance(tool_item, ThinkingContent):
-                    thinking_converted = ThinkingContent(
-                        type="thinking",
-                        thinking=getattr(tool_item, "thinking", str(tool_item)),
-                    )
-                else:
-                    thinking_converted = tool_item
-
-                tool_content_html = format_thinking_content(thinking_converted)
-                tool_message_type = "Thinking"
-                tool_css_class = "thinking"
-            elif isinstance(tool_item, ImageContent) or item_type == "image":
-                # Convert Anthropic type to our format if necessary
-                if not isinstance(tool_item, ImageContent):
-                    # For now, skip Anthropic image types - we'll handle when we encounter them
-                    continue
-                else:
-                    tool_content_html = format_image_content(tool_item)
-                tool_message_type = "Image"
-                tool_css_class = "image"
-            else:
-                # Handle unknown content types
-                tool_content_html = (
-                    f"<p>Unknown content type: {escape_html(str(type(tool_item)))}</p>"
+            # Extract token usage for assistant messages
+            # Only show token usage for the first message with each requestId to avoid duplicates
+            token_usage_str: Optional[str] = None
+            if message_type == "assistant" and hasattr(message, "message"):
+                assistant_message = getattr(message, "message")
+                message_uuid = getattr(message, "uuid", "")
+
+                if (
+                    hasattr(assistant_message, "usage")
+                    and assistant_message.usage
+                    and message_uuid in show_tokens_for_message
+                ):
+                    # Only show token usage for messages marked as first occurrence of requestId
+                    usage = assistant_message.usage
+                    token_parts = [
+                        f"Input: {usage.input_tokens}",
+                        f"Output: {usage.output_tokens}",
+                    ]
+                    if usage.cache_creation_input_tokens:
+                        token_parts.append(
+                            f"Cache Creation: {usage.cache_creation_input_tokens}"
+                        )
+                    if usage.cache_read_input_tokens:
+                        token_parts.append(
+                            f"Cache Read: {usage.cache_read_input_tokens}"
+                        )
+                    token_usage_str = " | ".join(token_parts)
+
+            # Create main message (if it has text content)
+            if main_fragment is not None:
+                fragment_type, css_class, content_html = main_fragment
+                template_message = TemplateMessage(
+                    message_type=fragment_type,
+                    content_html=content_html,
+                    formatted_timestamp=formatted_timestamp,
+                    css_class=css_class,
+                    session_summary=session_summary,
+                    session_id=session_id,
+                    token_usage=token_usage_str,
                 )
-                tool_message_type = "Unknown Content"
-                tool_css_class = "unknown"
-
-            # Preserve sidechain context for tool/thinking/image content within sidechain messages
-            if getattr(message, "isSidechain", False):
-                tool_css_class += " sidechain"
-
-            tool_template_message = TemplateMessage(
-                message_type=tool_message_type,
-                content_html=tool_content_html,
-                formatted_timestamp=tool_formatted_timestamp,
-                css_class=tool_css_class,
-                session_summary=session_summary,
-                session_id=session_id,
-            )
-            template_messages.append(tool_template_message)
-
-    # Prepare session navigation data
-    session_nav: List[Dict[str, Any]] = []
-    for session_id in session_order:
-        session_info = sessions[session_id]
-
-        # Format timestamp range
-        first_ts = session_info["first_timestamp"]
-        last_ts = session_info["last_timestamp"]
-        timestamp_range = ""
-        if first_ts and last_ts:
-            if first_ts == last_ts:
-                timestamp_range = format_timestamp(first_ts)
-            else:
-                timestamp_range = (
-                    f"{format_timestamp(first_ts)} - {format_timestamp(last_ts)}"
+                yield template_message
+
+            # Create separate messages for each tool/thinking/image item
+            for tool_message_type, tool_css_class, tool_content_html in tool_fragments:
+                tool_template_message = TemplateMessage(
+                    message_type=tool_message_type,
+                    content_html=tool_content_html,
+                    formatted_timestamp=formatted_timestamp,
+                    css_class=tool_css_class,
+                    session_summary=session_summary,
+                    session_id=session_id,
                 )
-        elif first_ts:
-            timestamp_range = format_timestamp(first_ts)
-
-        # Format token usage summary
-        token_summary = ""
-        total_input = session_info["total_input_tokens"]
-        total_output = session_info["total_output_tokens"]
-        total_cache_creation = session_info["total_cache_creation_tokens"]
-        total_cache_read = session_info["total_cache_read_tokens"]
-
-        if total_input > 0 or total_output > 0:
-            token_parts: List[str] = []
-            if total_input > 0:
-                token_parts.append(f"Input: {total_input}")
-            if total_output > 0:
-                token_parts.append(f"Output: {total_output}")
-            if total_cache_creation > 0:
-                token_parts.append(f"Cache Creation: {total_cache_creation}")
-            if total_cache_read > 0:
-                token_parts.append(f"Cache Read: {total_cache_read}")
-            token_summary = "Token usage – " + " | ".join(token_parts)
-
-        session_nav.append(
-            {
-                "id": session_id,
-                "summary": session_info["summary"],
-                "timestamp_range": timestamp_range,
-                "message_count": session_info["message_count"],
-                "first_user_message": session_info["first_user_message"]
-                if session_info["first_user_message"] != ""
-                else "[No user message found in session.]",
-                "token_summary": token_summary,
-            }
-        )
-
-    # Render template
-    env = _get_template_environment()
-    template = env.get_template("transcript.html")
-    return str(
-        template.render(
-            title=title,
-            messages=template_messages,
-            sessions=session_nav,
-            combined_transcript_link=combined_transcript_link,
-            library_version=get_library_version(),
-        )
-    )
+                yield tool_template_message
+    finally:
+        if fragment_cache is not None:
+            fragment_cache.flush()
 
 
 def generate_projects_index_html(
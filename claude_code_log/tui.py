@@ -3,9 +3,8 @@
 
 import os
 import webbrowser
-from datetime import datetime
 from pathlib import Path
-from typing import ClassVar, Dict, Optional, cast
+from typing import ClassVar, Dict, Optional, Tuple, cast
 
 from textual.app import App, ComposeResult
 from textual.binding import Binding, BindingType
@@ -19,9 +18,44 @@ from textual.widgets import (
 )
 from textual.reactive import reactive
 
-from .cache import CacheManager, SessionCacheData, get_library_version
+from .cache import (
+    CacheManager,
+    ProjectsIndex,
+    SessionCacheData,
+    get_library_version,
+)
 from .converter import ensure_fresh_cache
-from .renderer import get_project_display_name
+from .models import timestamp_to_ms
+from .renderer import (
+    format_timestamp_ms,
+    format_timestamps_ms,
+    get_project_display_name,
+)
+
+DATE_FORMAT = "%Y-%m-%d"
+SESSION_TIME_FORMAT = "%m-%d %H:%M"
+
+
+def _sort_key_ms(timestamp_ms: Optional[int]) -> int:
+    """Sort key for epoch milliseconds; missing timestamps sort oldest."""
+    return -1 if timestamp_ms is None else timestamp_ms
+
+
+def _session_times_ms(
+    session_data: SessionCacheData,
+) -> Tuple[Optional[int], Optional[int]]:
+    """Epoch milliseconds of a session's first and last timestamps.
+
+    Timestamps are only parsed for sessions cached without their millisecond
+    values.
+    """
+    first_ms = session_data.first_timestamp_ms
+    if first_ms is None:
+        first_ms = timestamp_to_ms(session_data.first_timestamp)
+    last_ms = session_data.last_timestamp_ms
+    if last_ms is None:
+        last_ms = timestamp_to_ms(session_data.last_timestamp)
+    return first_ms, last_ms
 
 
 class ProjectSelector(App[Path]):
@@ -57,6 +91,12 @@ class ProjectSelector(App[Path]):
         self.theme = "gruvbox"
         self.projects = projects
         self.matching_projects = matching_projects
+        # Session counts of unchanged projects come from the projects index
+        self.projects_index = (
+            ProjectsIndex(projects[0].parent, get_library_version())
+            if projects
+            else None
+        )
 
     def compose(self) -> ComposeResult:
         """Create the UI layout."""
@@ -98,17 +138,23 @@ class ProjectSelector(App[Path]):
         # Add rows
         for project_path in self.projects:
             try:
-                cache_manager = CacheManager(project_path, get_library_version())
-                project_cache = cache_manager.get_cached_project_data()
-
-                if not project_cache or not project_cache.sessions:
-                    try:
-                        ensure_fresh_cache(project_path, cache_manager, silent=True)
-                        # Reload cache after ensuring it's fresh
-                        project_cache = cache_manager.get_cached_project_data()
-                    except Exception:
-                        # If cache building fails, continue with empty cache
-                        project_cache = None
+                project_cache = (
+                    self.projects_index.get_project_cache(project_path)
+                    if self.projects_index is not None
+                    else None
+                )
+                if project_cache is None:
+                    cache_manager = CacheManager(project_path, get_library_version())
+                    project_cache = cache_manager.get_cached_project_data()
+
+                    if not project_cache or not project_cache.sessions:
+                        try:
+                            ensure_fresh_cache(project_path, cache_manager, silent=True)
+                            # Reload cache after ensuring it's fresh
+                            project_cache = cache_manager.get_cached_project_data()
+                        except Exception:
+                            # If cache building fails, continue with empty cache
+                            project_cache = None
 
                 # Get project info
                 session_count = (
@@ -139,6 +185,9 @@ class ProjectSelector(App[Path]):
                     "Unknown",
                 )
 
+        if self.projects_index is not None:
+            self.projects_index.save()
+
     def on_data_table_row_highlighted(self, _event: DataTable.RowHighlighted) -> None:
         """Handle row highlighting (cursor movement) in the projects table."""
         self._update_selected_project_from_cursor()
@@ -338,20 +387,30 @@ class SessionBrowser(App[Optional[str]]):
         table.add_column("Tokens", width=tokens_width)
 
         # Sort sessions by start time (newest first)
+        session_times = {
+            session_id: _session_times_ms(session_data)
+            for session_id, session_data in self.sessions.items()
+        }
         sorted_sessions = sorted(
-            self.sessions.items(), key=lambda x: x[1].first_timestamp, reverse=True
+            self.sessions.items(),
+            key=lambda x: _sort_key_ms(session_times[x[0]][0]),
+            reverse=True,
+        )
+
+        # Format all start and end times in one batch
+        formatted_times = format_timestamps_ms(
+            (
+                timestamp_ms
+                for session_id, _ in sorted_sessions
+                for timestamp_ms in session_times[session_id]
+            ),
+            SESSION_TIME_FORMAT,
         )
 
         # Add rows
-        for session_id, session_data in sorted_sessions:
-            # Format timestamps - use short format for narrow terminals
-            use_short_format = terminal_width < 120
-            start_time = self.format_timestamp(
-                session_data.first_timestamp, short_format=use_short_format
-            )
-            end_time = self.format_timestamp(
-                session_data.last_timestamp, short_format=use_short_format
-            )
+        for index, (session_id, session_data) in enumerate(sorted_sessions):
+            start_time = formatted_times[2 * index] or "Unknown"
+            end_time = formatted_times[2 * index + 1] or "Unknown"
 
             # Format token count
             total_tokens = (
@@ -400,22 +459,21 @@ class SessionBrowser(App[Optional[str]]):
 
         # Find date range
         if self.sessions:
-            timestamps = [
-                s.first_timestamp for s in self.sessions.values() if s.first_timestamp
-            ]
-            earliest = min(timestamps) if timestamps else ""
-            latest = (
-                max(
-                    s.last_timestamp for s in self.sessions.values() if s.last_timestamp
-                )
-                if self.sessions
-                else ""
+            session_times = [_session_times_ms(s) for s in self.sessions.values()]
+            earliest = min(
+                (first for first, _ in session_times if first is not None),
+                default=None,
+            )
+            latest = max(
+                (last for _, last in session_times if last is not None),
+                default=None,
             )
 
             date_range = ""
-            if earliest and latest:
-                earliest_date = self.format_timestamp(earliest, date_only=True)
-                latest_date = self.format_timestamp(latest, date_only=True)
+            if earliest is not None and latest is not None:
+                earliest_date, latest_date = format_timestamps_ms(
+                    (earliest, latest), DATE_FORMAT
+                )
                 if earliest_date == latest_date:
                     date_range = earliest_date
                 else:
@@ -470,16 +528,12 @@ class SessionBrowser(App[Optional[str]]):
         self, timestamp: str, date_only: bool = False, short_format: bool = False
     ) -> str:
         """Format timestamp for display."""
-        try:
-            dt = datetime.fromisoformat(timestamp.replace("Z", "+00:00"))
-            if date_only:
-                return dt.strftime("%Y-%m-%d")
-            elif short_format:
-                return dt.strftime("%m-%d %H:%M")
-            else:
-                return dt.strftime("%m-%d %H:%M")
-        except (ValueError, AttributeError):
+        timestamp_ms = timestamp_to_ms(timestamp)
+        if timestamp_ms is None:
             return "Unknown"
+        if date_only:
+            return format_timestamp_ms(timestamp_ms, DATE_FORMAT)
+        return format_timestamp_ms(timestamp_ms, SESSION_TIME_FORMAT)
 
     def on_data_table_row_highlighted(self, _event: DataTable.RowHighlighted) -> None:
         """Handle row highlighting (cursor movement) in the sessions table."""
@@ -1,7 +1,7 @@
 #!/usr/bin/env python3
 """Utility functions for message filtering and processing."""
 
-from typing import Union, List
+from typing import Dict, Iterable, Union, List
 
 from claude_code_log.cache import SessionCacheData
 from .models import ContentItem, TextContent, TranscriptEntry
@@ -116,8 +116,34 @@ def extract_text_content_length(content: Union[str, List[ContentItem]]) -> int:
     return total_length
 
 
+def record_working_directory(
+    working_directories: Dict[str, str],
+    entry: Union[TranscriptEntry, SessionCacheData],
+) -> None:
+    """Record an entry's working directory and timestamp in a cwd -> timestamp map."""
+    cwd = getattr(entry, "cwd", None)
+    if not cwd:
+        return
+
+    # Get appropriate timestamp based on entry type
+    if isinstance(entry, SessionCacheData):
+        timestamp = entry.last_timestamp
+    elif hasattr(entry, "timestamp"):
+        timestamp = getattr(entry, "timestamp", "")
+    else:
+        timestamp = ""
+
+    working_directories[cwd] = timestamp
+
+
+def sort_working_directories(working_directories: Dict[str, str]) -> List[str]:
+    """Return the paths of a cwd -> timestamp map, most recent first."""
+    sorted_dirs = sorted(working_directories.items(), key=lambda x: x[1], reverse=True)
+    return [path for path, _ in sorted_dirs]
+
+
 def extract_working_directories(
-    entries: List[TranscriptEntry] | List[SessionCacheData],
+    entries: Iterable[TranscriptEntry] | Iterable[SessionCacheData],
 ) -> List[str]:
     """Extract unique working directories from a list of entries.
 
@@ -129,23 +155,9 @@ def extract_working_directories(
     Returns:
         List of unique working directory paths found in the entries
     """
-    working_directories: dict[str, str] = {}
+    working_directories: Dict[str, str] = {}
 
     for entry in entries:
-        cwd = getattr(entry, "cwd", None)
-        if not cwd:
-            continue
-
-        # Get appropriate timestamp based on entry type
-        if isinstance(entry, SessionCacheData):
-            timestamp = entry.last_timestamp
-        elif hasattr(entry, "timestamp"):
-            timestamp = getattr(entry, "timestamp", "")
-        else:
-            timestamp = ""
+        record_working_directory(working_directories, entry)
 
-        working_directories[cwd] = timestamp
-
-    # Sort by timestamp (most recent first) and return just the paths
-    sorted_dirs = sorted(working_directories.items(), key=lambda x: x[1], reverse=True)
-    return [path for path, _ in sorted_dirs]
+    return sort_working_directories(working_directories)
@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Benchmark cache compression codecs on the bundled docs/cache corpus.
+
+The corpus is flattened into JSONL transcripts (see benchmark_parsing.py) and
+parsed once. For each codec and level, every file's entries are written to a
+fresh JSON cache with CacheManager.save_cached_entries, and the script
+reports the size of the cache files, the time to write them and the best
+time to load them all back with load_cached_entries. Large payloads go to
+the (uncompressed) blob store whatever the codec, so its size is reported
+separately.
+
+Loads are timed from the page cache. To compare codecs for slow disks, the
+time to read each cache's bytes at --disk-mbps is added to its load time:
+a codec pays off when the bytes it saves take longer to read than it takes
+to decompress them.
+
+Usage:
+    uv run python scripts/benchmark_cache_codecs.py [--repeat N] [--disk-mbps N ...]
+"""
+
+import argparse
+import shutil
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from benchmark_parsing import build_corpus
+
+from claude_code_log.cache import (
+    BLOB_DIR,
+    DEFAULT_CODEC_LEVELS,
+    CacheCodec,
+    CacheManager,
+    available_codecs,
+)
+from claude_code_log.models import TranscriptEntry
+from claude_code_log.parser import load_transcript
+
+# Levels compared for each codec, besides its default
+EXTRA_LEVELS: Dict[CacheCodec, Tuple[int, ...]] = {
+    "gzip": (1, 9),
+    "lzma": (0,),
+    "zstd": (1, 9, 19),
+}
+
+
+def configurations() -> List[Tuple[CacheCodec, Optional[int]]]:
+    """Return the (codec, level) pairs to compare."""
+    configs: List[Tuple[CacheCodec, Optional[int]]] = []
+    for codec in available_codecs():
+        default_level = DEFAULT_CODEC_LEVELS[codec]
+        levels = sorted({default_level, *EXTRA_LEVELS.get(codec, ())} - {None})
+        configs.extend((codec, level) for level in levels or [None])
+    return configs
+
+
+def directory_size(path: Path) -> int:
+    """Return the total size of the files below path."""
+    return sum(p.stat().st_size for p in path.rglob("*") if p.is_file())
+
+
+def benchmark_codec(
+    project_dir: Path,
+    parsed: Dict[Path, List[TranscriptEntry]],
+    codec: CacheCodec,
+    level: Optional[int],
+    repeat: int,
+) -> Tuple[int, int, float, float]:
+    """Return cache and blob bytes, write time and best load time of a codec."""
+    shutil.rmtree(project_dir / "cache", ignore_errors=True)
+    manager = CacheManager(project_dir, "benchmark", "json", codec, level)
+
+    start = time.perf_counter()
+    with manager.batch():
+        for jsonl_path, entries in parsed.items():
+            manager.save_cached_entries(jsonl_path, entries)
+    write_seconds = time.perf_counter() - start
+
+    blob_bytes = directory_size(manager.cache_dir / BLOB_DIR)
+    cache_bytes = directory_size(manager.cache_dir) - blob_bytes
+
+    load_seconds = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for jsonl_path in parsed:
+            manager.load_cached_entries(jsonl_path)
+        load_seconds = min(load_seconds, time.perf_counter() - start)
+    return cache_bytes, blob_bytes, write_seconds, load_seconds
+
+
+def run_benchmark(repeat: int, disk_mbps: List[float]) -> None:
+    """Compare every available codec and print a small report."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        project_dir = Path(temp_dir)
+        jsonl_files = build_corpus(project_dir)
+        parsed = {p: load_transcript(p, silent=True) for p in jsonl_files}
+        total_entries = sum(len(entries) for entries in parsed.values())
+        print(f"Corpus: {len(jsonl_files)} files, {total_entries} entries")
+
+        disk_headers = "".join(f"  @{mbps:g}MB/s" for mbps in disk_mbps)
+        print(
+            f"  {'codec':<8}{'level':>6}{'cache MB':>10}{'blobs MB':>10}"
+            f"{'write s':>9}{'load s':>8}{disk_headers}"
+        )
+        for codec, level in configurations():
+            cache_bytes, blob_bytes, write_seconds, load_seconds = benchmark_codec(
+                project_dir, parsed, codec, level, repeat
+            )
+            read_bytes = cache_bytes + blob_bytes
+            disk_columns = "".join(
+                f"{load_seconds + read_bytes / (mbps * 1_000_000):>{len(f'  @{mbps:g}MB/s')}.3f}"
+                for mbps in disk_mbps
+            )
+            print(
+                f"  {codec:<8}{'-' if level is None else level:>6}"
+                f"{cache_bytes / 1_000_000:>10.1f}{blob_bytes / 1_000_000:>10.1f}"
+                f"{write_seconds:>9.3f}{load_seconds:>8.3f}{disk_columns}"
+            )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument(
+        "--repeat", type=int, default=3, help="Load runs per codec (best is kept)"
+    )
+    parser.add_argument(
+        "--disk-mbps",
+        type=float,
+        nargs="+",
+        default=[50.0, 500.0],
+        help="Disk read speeds (MB/s) to estimate cold load times for",
+    )
+    args = parser.parse_args()
+    run_benchmark(args.repeat, args.disk_mbps)
@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+"""
+Benchmark transcript decoding on the bundled docs/cache corpus.
+
+The cache files in docs/cache hold the entries of a real project, keyed by
+timestamp. This script flattens them back into JSONL transcripts in a
+temporary directory and times load_transcript at each validation level: the
+default unvalidated decoder ("none"), Pydantic validation ("basic") and
+Pydantic plus the Anthropic schema check ("strict"). It then times
+load_directory_transcripts on the whole corpus, and load_transcript on all of
+it concatenated into one file, with one process and with --jobs worker
+processes. Finally it measures what lazy content materialisation saves: the
+time and memory per entry of building the content models that unvalidated
+loading defers until content is read.
+
+Usage:
+    uv run python scripts/benchmark_parsing.py [--repeat N] [--jobs N]
+"""
+
+import argparse
+import json
+import os
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+from claude_code_log.models import (
+    VALIDATION_LEVELS,
+    LazyContentList,
+    TranscriptEntry,
+    ValidationLevel,
+)
+from claude_code_log.parser import load_directory_transcripts, load_transcript
+
+CORPUS_DIR = Path(__file__).parent.parent / "docs" / "cache"
+
+
+def build_corpus(output_dir: Path) -> List[Path]:
+    """Write one JSONL file per cached transcript in docs/cache."""
+    jsonl_files: List[Path] = []
+    for cache_file in sorted(CORPUS_DIR.glob("*.json")):
+        if cache_file.name == "index.json":
+            continue
+        with open(cache_file, "r", encoding="utf-8") as f:
+            cache_data: Dict[str, List[Dict[str, Any]]] = json.load(f)
+
+        jsonl_path = output_dir / f"{cache_file.stem}.jsonl"
+        with open(jsonl_path, "w", encoding="utf-8") as f:
+            for entries in cache_data.values():
+                for entry in entries:
+                    f.write(json.dumps(entry) + "\n")
+        jsonl_files.append(jsonl_path)
+    return jsonl_files
+
+
+def time_loader(
+    jsonl_files: List[Path], loader: Callable[[Path], int], repeat: int
+) -> float:
+    """Return the best wall time over `repeat` runs of loading every file."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for jsonl_path in jsonl_files:
+            loader(jsonl_path)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def _loader_for(level: ValidationLevel) -> Callable[[Path], int]:
+    return lambda p: len(load_transcript(p, silent=True, validation=level))
+
+
+def time_directory_load(directory: Path, jobs: int, repeat: int) -> float:
+    """Return the best wall time of load_directory_transcripts with `jobs`."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        load_directory_transcripts(directory, silent=True, jobs=jobs)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def time_large_file_load(jsonl_path: Path, jobs: int, repeat: int) -> float:
+    """Return the best wall time of load_transcript on one file with `jobs`."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        load_transcript(jsonl_path, silent=True, jobs=jobs)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def print_jobs_comparison(timer: Callable[[int], float], jobs: int) -> None:
+    """Print the wall time with one process and with `jobs` processes."""
+    serial = timer(1)
+    for job_count in sorted({1, jobs}):
+        seconds = serial if job_count == 1 else timer(job_count)
+        print(
+            f"  jobs={job_count:<4} {seconds:8.3f}s  {serial / seconds:5.1f}x vs jobs=1"
+        )
+
+
+def materialise_content(entries: List[TranscriptEntry]) -> None:
+    """Build every content model that loading left as raw JSON."""
+    for entry in entries:
+        message = getattr(entry, "message", None)
+        for content in (
+            getattr(message, "content", None),
+            getattr(entry, "toolUseResult", None),
+        ):
+            if isinstance(content, LazyContentList):
+                content.materialise()
+
+
+def print_lazy_content_savings(jsonl_files: List[Path]) -> None:
+    """Print the time and memory per entry that lazy content saves."""
+    start = time.perf_counter()
+    entries = [e for p in jsonl_files for e in load_transcript(p, silent=True)]
+    load_seconds = time.perf_counter() - start
+    start = time.perf_counter()
+    materialise_content(entries)
+    materialise_seconds = time.perf_counter() - start
+    del entries
+
+    tracemalloc.start()
+    entries = [e for p in jsonl_files for e in load_transcript(p, silent=True)]
+    lazy_bytes = tracemalloc.get_traced_memory()[0]
+    materialise_content(entries)
+    materialised_bytes = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    count = len(entries)
+    print(f"Lazy content ({count} entries):")
+    print(
+        f"  load      {load_seconds:8.3f}s  {lazy_bytes / count / 1024:7.2f} KB/entry"
+    )
+    print(
+        f"  +content  {materialise_seconds:8.3f}s  "
+        f"{(materialised_bytes - lazy_bytes) / count / 1024:7.2f} KB/entry  "
+        f"{materialise_seconds / count * 1_000_000:5.1f} us/entry saved until read"
+    )
+
+
+def run_benchmark(repeat: int, jobs: int) -> None:
+    """Run the validation level and jobs comparisons and print a small report."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        jsonl_files = build_corpus(Path(temp_dir))
+        total_bytes = sum(p.stat().st_size for p in jsonl_files)
+        total_entries = sum(len(load_transcript(p, silent=True)) for p in jsonl_files)
+
+        print(
+            f"Corpus: {len(jsonl_files)} files, {total_entries} entries, "
+            f"{total_bytes / 1_000_000:.1f} MB"
+        )
+
+        results = {
+            level: time_loader(jsonl_files, _loader_for(level), repeat)
+            for level in VALIDATION_LEVELS
+        }
+
+        baseline = results["strict"]
+        for name, seconds in results.items():
+            print(
+                f"  {name:<8} {seconds:8.3f}s  "
+                f"{total_bytes / 1_000_000 / seconds:7.1f} MB/s  "
+                f"{baseline / seconds:5.1f}x vs strict"
+            )
+
+        print(f"Directory load ({os.cpu_count()} CPUs):")
+        print_jobs_comparison(
+            lambda job_count: time_directory_load(Path(temp_dir), job_count, repeat),
+            jobs,
+        )
+
+        with tempfile.TemporaryDirectory() as large_dir:
+            large_file = Path(large_dir) / "large.jsonl"
+            with open(large_file, "wb") as f:
+                for jsonl_path in jsonl_files:
+                    f.write(jsonl_path.read_bytes())
+            print(f"Single file load ({total_bytes / 1_000_000:.1f} MB):")
+            print_jobs_comparison(
+                lambda job_count: time_large_file_load(large_file, job_count, repeat),
+                jobs,
+            )
+
+        print_lazy_content_savings(jsonl_files)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument(
+        "--repeat", type=int, default=3, help="Runs per decoder (best is kept)"
+    )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="Worker processes for the directory load comparison",
+    )
+    args = parser.parse_args()
+    run_benchmark(args.repeat, args.jobs)
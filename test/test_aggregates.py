@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""Tests for the incremental session and project aggregates."""
+
+from pathlib import Path
+from typing import Any, Dict, List
+
+import pytest
+
+from claude_code_log.aggregates import SessionAggregator
+from claude_code_log.models import TranscriptEntry, parse_transcript_entry
+from claude_code_log.parser import load_transcript
+from claude_code_log.renderer import SessionIndex
+
+TEST_DATA_DIR = Path(__file__).parent / "test_data"
+
+
+def _assistant_entry(
+    uuid: str, session_id: str, timestamp: str, request_id: str, output_tokens: int
+) -> TranscriptEntry:
+    return parse_transcript_entry(
+        {
+            "type": "assistant",
+            "timestamp": timestamp,
+            "parentUuid": None,
+            "isSidechain": False,
+            "userType": "human",
+            "cwd": "/tmp",
+            "sessionId": session_id,
+            "version": "1.0.0",
+            "uuid": uuid,
+            "requestId": request_id,
+            "message": {
+                "id": f"msg-{uuid}",
+                "type": "message",
+                "role": "assistant",
+                "model": "claude-3-sonnet-20240229",
+                "content": [{"type": "text", "text": f"Reply {uuid}"}],
+                "stop_reason": "end_turn",
+                "stop_sequence": None,
+                "usage": {"input_tokens": 10, "output_tokens": output_tokens},
+            },
+        }
+    )
+
+
+def _user_entry(uuid: str, session_id: str, timestamp: str) -> TranscriptEntry:
+    return parse_transcript_entry(
+        {
+            "type": "user",
+            "timestamp": timestamp,
+            "parentUuid": None,
+            "isSidechain": False,
+            "userType": "human",
+            "cwd": "/tmp",
+            "sessionId": session_id,
+            "version": "1.0.0",
+            "uuid": uuid,
+            "message": {"role": "user", "content": f"Question {uuid}"},
+        }
+    )
+
+
+def _summary_entry(leaf_uuid: str, summary: str) -> TranscriptEntry:
+    return parse_transcript_entry(
+        {"type": "summary", "summary": summary, "leafUuid": leaf_uuid}
+    )
+
+
+def _dump(aggregator: SessionAggregator) -> Dict[str, Any]:
+    data = aggregator.model_dump()
+    data["session_data"] = {
+        session_id: session.model_dump()
+        for session_id, session in aggregator.session_data().items()
+    }
+    return data
+
+
+@pytest.fixture
+def entries() -> List[TranscriptEntry]:
+    return load_transcript(TEST_DATA_DIR / "representative_messages.jsonl")
+
+
+class TestSessionAggregator:
+    def test_merge_matches_single_pass(self, entries: List[TranscriptEntry]):
+        expected = _dump(SessionAggregator.from_entries(entries))
+        assert expected["sessions"]
+        for split in range(len(entries) + 1):
+            merged = SessionAggregator.from_entries(entries[:split])
+            merged.merge(SessionAggregator.from_entries(entries[split:]))
+            assert _dump(merged) == expected, split
+
+    def test_merge_after_round_trip(self, entries: List[TranscriptEntry]):
+        split = len(entries) // 2
+        first = SessionAggregator.model_validate_json(
+            SessionAggregator.from_entries(entries[:split]).model_dump_json()
+        )
+        first.merge(
+            SessionAggregator.model_validate_json(
+                SessionAggregator.from_entries(entries[split:]).model_dump_json()
+            )
+        )
+        assert _dump(first) == _dump(SessionAggregator.from_entries(entries))
+
+    def test_requests_counted_once_across_parts(self):
+        first = SessionAggregator.from_entries(
+            [_assistant_entry("a1", "s1", "2025-01-01T10:00:00Z", "req-1", 5)]
+        )
+        second = SessionAggregator.from_entries(
+            [
+                # The same response split over two entries, and a new one
+                _assistant_entry("a2", "s1", "2025-01-01T10:00:01Z", "req-1", 5),
+                _assistant_entry("a3", "s2", "2025-01-01T11:00:00Z", "req-2", 7),
+            ]
+        )
+        first.merge(second)
+
+        assert first.total_message_count == 3
+        assert first.total_output_tokens == 12
+        assert first.sessions["s1"].total_output_tokens == 5
+        assert first.sessions["s1"].message_count == 2
+        assert first.sessions["s1"].last_timestamp == "2025-01-01T10:00:01Z"
+        assert first.sessions["s2"].total_output_tokens == 7
+        assert first.earliest_timestamp == "2025-01-01T10:00:00Z"
+        assert first.latest_timestamp == "2025-01-01T11:00:00Z"
+
+    def test_first_user_message_of_overlapping_parts(self):
+        # The session starts in the first file, but its first user message
+        # is in the second, before the first file's
+        first_entries = [
+            _assistant_entry("a1", "s1", "2025-01-01T10:00:00Z", "req-1", 1),
+            _user_entry("a2", "s1", "2025-01-01T10:30:00Z"),
+        ]
+        second_entries = [_user_entry("b1", "s1", "2025-01-01T10:10:00Z")]
+        expected = SessionAggregator.from_file_entries(first_entries + second_entries)
+        assert expected.sessions["s1"].first_user_message == "Question b1"
+
+        for parts in (
+            (first_entries, second_entries),
+            (second_entries, first_entries),
+        ):
+            merged = SessionAggregator.from_entries(parts[0])
+            merged.merge(SessionAggregator.from_entries(parts[1]))
+            assert merged.sessions["s1"].first_user_message == "Question b1"
+            assert merged.sessions["s1"].first_timestamp == "2025-01-01T10:00:00Z"
+
+    def test_summaries_link_across_parts(self):
+        # A summary in a later file naming the leaf of an earlier session,
+        # and one in an earlier file naming a later session's leaf
+        first = SessionAggregator.from_entries(
+            [
+                _summary_entry("b2", "Session B summary"),
+                _user_entry("a1", "s-a", "2025-01-01T10:00:00Z"),
+                _assistant_entry("a2", "s-a", "2025-01-01T10:00:05Z", "req-a", 1),
+            ]
+        )
+        second = SessionAggregator.from_entries(
+            [
+                _user_entry("b1", "s-b", "2025-01-02T10:00:00Z"),
+                _assistant_entry("b2", "s-b", "2025-01-02T10:00:05Z", "req-b", 1),
+                _summary_entry("a2", "Session A summary"),
+            ]
+        )
+        assert first.session_summaries == {}
+        assert second.session_summaries == {}
+
+        first.merge(second)
+        assert first.session_summaries == {
+            "s-a": "Session A summary",
+            "s-b": "Session B summary",
+        }
+        assert first.session_data()["s-b"].summary == "Session B summary"
+        # The aggregated sessions themselves are left unresolved
+        assert first.sessions["s-b"].summary is None
+
+    def test_assistant_uuid_takes_precedence(self):
+        aggregator = SessionAggregator()
+        aggregator.add(_user_entry("shared", "s-user", "2025-01-01T10:00:00Z"))
+        aggregator.add(
+            _assistant_entry("shared", "s-assistant", "2025-01-01T10:01:00Z", "r", 1)
+        )
+        aggregator.add(_summary_entry("shared", "Summary"))
+        assert aggregator.session_summaries == {"s-assistant": "Summary"}
+
+
+class TestSessionIndex:
+    def test_for_session_matches_combined_navigation(
+        self, entries: List[TranscriptEntry]
+    ):
+        session_index = SessionIndex.from_messages(entries)
+        combined = {nav["id"]: nav for nav in session_index.get_session_nav()}
+        assert combined
+        for session_id, nav in combined.items():
+            assert session_index.for_session(session_id).get_session_nav() == [nav]
+
+    def test_for_unknown_session_is_empty(self, entries: List[TranscriptEntry]):
+        session_index = SessionIndex.from_messages(entries)
+        assert session_index.for_session("missing").get_session_nav() == []
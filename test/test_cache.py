@@ -2,7 +2,11 @@
 """Tests for caching functionality."""
 
 import json
+import os
+import pickle
 import tempfile
+import threading
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from datetime import datetime
 from unittest.mock import patch
@@ -10,11 +14,32 @@ from unittest.mock import patch
 import pytest
 
 from claude_code_log.cache import (
+    ACCESS_TIME_RESOLUTION,
+    BLOB_THRESHOLD,
+    CACHE_BACKENDS,
+    CACHE_LOCK_FILE,
+    BlobStore,
+    CacheItem,
     CacheManager,
+    FragmentCache,
+    ProjectsIndex,
+    TimestampIndex,
+    available_codecs,
+    collect_cache_garbage,
+    project_fingerprint,
     get_library_version,
     ProjectCache,
     SessionCacheData,
 )
+from claude_code_log import parser
+from claude_code_log.aggregates import SessionAggregator
+from claude_code_log.converter import ensure_fresh_cache
+from claude_code_log.fileio import atomic_write, atomic_write_text
+from claude_code_log.renderer import (
+    SessionIndex,
+    _render_message_fragments,
+    render_html_chunks,
+)
 from claude_code_log.models import (
     UserTranscriptEntry,
     AssistantTranscriptEntry,
@@ -620,3 +645,1440 @@ class TestCacheErrorHandling:
                 cache_dir.chmod(0o755)
             except OSError:
                 pass
+
+
+def _jsonl_line(uuid: str, timestamp: str) -> str:
+    entry = {
+        "type": "user",
+        "timestamp": timestamp,
+        "parentUuid": None,
+        "isSidechain": False,
+        "userType": "human",
+        "cwd": "/test",
+        "sessionId": "session1",
+        "version": "1.0.0",
+        "uuid": uuid,
+        "message": {"role": "user", "content": "Hello " + uuid},
+    }
+    return json.dumps(entry) + "\n"
+
+
+def _touch_later(path: Path) -> None:
+    """Move the mtime forward so the mtime check sees the file as modified."""
+    stat = path.stat()
+    os.utime(path, (stat.st_atime + 10, stat.st_mtime + 10))
+
+
+class TestIncrementalParsing:
+    """Test parsing only the lines appended since a file was cached."""
+
+    @pytest.fixture(params=CACHE_BACKENDS)
+    def cache_manager(self, temp_project_dir, mock_version, request):
+        return CacheManager(temp_project_dir, mock_version, request.param)
+
+    @pytest.fixture
+    def jsonl_path(self, temp_project_dir):
+        path = temp_project_dir / "session.jsonl"
+        path.write_text(
+            _jsonl_line("u1", "2023-01-01T10:00:00Z")
+            + _jsonl_line("u2", "2023-01-01T10:01:00Z")
+        )
+        return path
+
+    def _load(self, jsonl_path, cache_manager):
+        with patch.object(
+            parser, "_decode_transcript_line", wraps=parser._decode_transcript_line
+        ) as decode:
+            entries = parser.load_transcript(jsonl_path, cache_manager, silent=True)
+        return [e.uuid for e in entries], decode.call_count
+
+    def test_records_parsed_offset(self, cache_manager, jsonl_path):
+        self._load(jsonl_path, cache_manager)
+
+        info = cache_manager.get_cached_project_data().cached_files[jsonl_path.name]
+        assert info.parsed_offset == jsonl_path.stat().st_size
+        assert info.parsed_lines == 2
+        assert info.tail_checksum
+
+    def test_appended_lines_only_are_parsed(self, cache_manager, jsonl_path):
+        self._load(jsonl_path, cache_manager)
+        with open(jsonl_path, "a") as f:
+            f.write(_jsonl_line("u3", "2023-01-01T10:02:00Z"))
+        _touch_later(jsonl_path)
+
+        assert not cache_manager.is_file_cached(jsonl_path)
+        assert cache_manager.get_append_position(jsonl_path) is not None
+        uuids, decoded = self._load(jsonl_path, cache_manager)
+        assert uuids == ["u1", "u2", "u3"]
+        assert decoded == 1
+
+        # The merged cache is up to date again
+        assert cache_manager.is_file_cached(jsonl_path)
+        cached = cache_manager.load_cached_entries(jsonl_path)
+        assert [e.uuid for e in cached] == ["u1", "u2", "u3"]
+        info = cache_manager.get_cached_project_data().cached_files[jsonl_path.name]
+        assert info.parsed_lines == 3
+        assert info.message_count == 3
+
+    def test_line_appended_within_mtime_tolerance(self, cache_manager, jsonl_path):
+        self._load(jsonl_path, cache_manager)
+        info = cache_manager.get_cached_file_info(jsonl_path)
+        with open(jsonl_path, "a") as f:
+            f.write(_jsonl_line("u3", "2023-01-01T10:02:00Z"))
+        # Appended in the same second the file was cached in
+        os.utime(jsonl_path, (info.source_mtime, info.source_mtime))
+
+        assert not cache_manager.is_file_cached(jsonl_path)
+        uuids, decoded = self._load(jsonl_path, cache_manager)
+        assert uuids == ["u1", "u2", "u3"]
+        assert decoded == 1
+
+    def test_source_stat_taken_before_parsing(self, cache_manager, jsonl_path):
+        source_stat = jsonl_path.stat()
+        with open(jsonl_path, "a") as f:
+            f.write(_jsonl_line("u3", "2023-01-01T10:02:00Z"))
+        # As if u3 was appended while the first two lines were parsed
+        entries = parser.load_transcript(jsonl_path, silent=True)[:2]
+        cache_manager.save_cached_entries(
+            jsonl_path,
+            entries,
+            len(_jsonl_line("u1", "2023-01-01T10:00:00Z")) * 2,
+            2,
+            source_stat,
+        )
+
+        assert not cache_manager.is_file_cached(jsonl_path)
+        uuids, decoded = self._load(jsonl_path, cache_manager)
+        assert uuids == ["u1", "u2", "u3"]
+        assert decoded == 1
+
+    def test_append_leaves_cached_entries_alone(self, cache_manager, jsonl_path):
+        self._load(jsonl_path, cache_manager)
+        with open(jsonl_path, "a") as f:
+            f.write(_jsonl_line("u3", "2023-01-01T10:02:00Z"))
+        _touch_later(jsonl_path)
+
+        with (
+            patch.object(
+                cache_manager,
+                "_read_cached_entries",
+                wraps=cache_manager._read_cached_entries,
+            ) as read_cached,
+            patch.object(
+                cache_manager,
+                "_serialize_entry",
+                wraps=cache_manager._serialize_entry,
+            ) as serialize,
+        ):
+            parser.update_transcript_cache(jsonl_path, cache_manager, silent=True)
+        assert read_cached.call_count == 0
+        assert serialize.call_count == 1
+
+        assert cache_manager.is_file_cached(jsonl_path)
+        cached = cache_manager.load_cached_entries(jsonl_path)
+        assert [e.uuid for e in cached] == ["u1", "u2", "u3"]
+        info = cache_manager.get_cached_file_info(jsonl_path)
+        assert info.message_count == 3
+        assert info.earliest_timestamp == "2023-01-01T10:00:00Z"
+        assert info.latest_timestamp == "2023-01-01T10:02:00Z"
+
+    def test_entries_without_timestamp_appended_twice(self, cache_manager, jsonl_path):
+        self._load(jsonl_path, cache_manager)
+        for leaf_uuid in ("u1", "u2"):
+            with open(jsonl_path, "a") as f:
+                f.write(
+                    json.dumps(
+                        {"type": "summary", "summary": leaf_uuid, "leafUuid": leaf_uuid}
+                    )
+                    + "\n"
+                )
+            _touch_later(jsonl_path)
+            with patch.object(
+                cache_manager,
+                "_read_cached_entries",
+                wraps=cache_manager._read_cached_entries,
+            ) as read_cached:
+                parser.update_transcript_cache(jsonl_path, cache_manager, silent=True)
+            assert read_cached.call_count == 0
+
+        cached = cache_manager.load_cached_entries(jsonl_path)
+        assert [e.leafUuid if e.type == "summary" else e.uuid for e in cached] == [
+            "u1",
+            "u2",
+            "u1",
+            "u2",
+        ]
+        assert cache_manager.get_cached_file_info(jsonl_path).no_timestamp_count == 2
+        filtered = cache_manager.load_cached_entries_filtered(
+            jsonl_path, "2023-01-02", None
+        )
+        assert len(filtered) == 2
+
+    def test_appended_timestamp_already_cached(self, cache_manager, jsonl_path):
+        self._load(jsonl_path, cache_manager)
+        with open(jsonl_path, "a") as f:
+            f.write(_jsonl_line("u3", "2023-01-01T10:01:00Z"))
+        _touch_later(jsonl_path)
+
+        uuids, decoded = self._load(jsonl_path, cache_manager)
+        assert uuids == ["u1", "u2", "u3"]
+        assert decoded == 1
+        cached = cache_manager.load_cached_entries(jsonl_path)
+        assert [e.uuid for e in cached] == ["u1", "u2", "u3"]
+
+    def test_rewritten_prefix_falls_back_to_full_parse(self, cache_manager, jsonl_path):
+        self._load(jsonl_path, cache_manager)
+        jsonl_path.write_text(
+            _jsonl_line("x1", "2023-01-01T10:00:00Z")
+            + _jsonl_line("x2", "2023-01-01T10:01:00Z")
+            + _jsonl_line("x3", "2023-01-01T10:02:00Z")
+        )
+        _touch_later(jsonl_path)
+
+        assert cache_manager.get_append_position(jsonl_path) is None
+        uuids, decoded = self._load(jsonl_path, cache_manager)
+        assert uuids == ["x1", "x2", "x3"]
+        assert decoded == 3
+
+    def test_truncated_file_falls_back_to_full_parse(self, cache_manager, jsonl_path):
+        self._load(jsonl_path, cache_manager)
+        jsonl_path.write_text(_jsonl_line("u1", "2023-01-01T10:00:00Z"))
+        _touch_later(jsonl_path)
+
+        assert cache_manager.get_append_position(jsonl_path) is None
+        uuids, _ = self._load(jsonl_path, cache_manager)
+        assert uuids == ["u1"]
+
+    def test_partial_last_line_is_parsed_once_complete(self, cache_manager, jsonl_path):
+        line = _jsonl_line("u3", "2023-01-01T10:02:00Z")
+        with open(jsonl_path, "a") as f:
+            f.write(line[:20])
+        size_before_partial = jsonl_path.stat().st_size - 20
+
+        uuids, _ = self._load(jsonl_path, cache_manager)
+        assert uuids == ["u1", "u2"]
+        info = cache_manager.get_cached_project_data().cached_files[jsonl_path.name]
+        assert info.parsed_offset == size_before_partial
+
+        with open(jsonl_path, "a") as f:
+            f.write(line[20:])
+        _touch_later(jsonl_path)
+
+        uuids, decoded = self._load(jsonl_path, cache_manager)
+        assert uuids == ["u1", "u2", "u3"]
+        assert decoded == 1
+
+    def test_line_numbers_continue_after_offset(
+        self, cache_manager, jsonl_path, capsys
+    ):
+        self._load(jsonl_path, cache_manager)
+        with open(jsonl_path, "a") as f:
+            f.write("not json\n")
+        _touch_later(jsonl_path)
+
+        self._load(jsonl_path, cache_manager)
+        assert "Line 2 of" in capsys.readouterr().out
+
+
+class TestSqliteBackend:
+    """Test the SQLite cache store."""
+
+    @pytest.fixture
+    def sqlite_manager(self, temp_project_dir, mock_version):
+        manager = CacheManager(temp_project_dir, mock_version, "sqlite")
+        yield manager
+        manager.close()
+
+    def _write_session(self, path: Path, session_id: str, timestamps) -> None:
+        lines = []
+        for index, timestamp in enumerate(timestamps):
+            entry = json.loads(_jsonl_line(f"{session_id}-{index}", timestamp))
+            entry["sessionId"] = session_id
+            lines.append(json.dumps(entry) + "\n")
+        path.write_text("".join(lines))
+
+    def test_save_and_load_entries(
+        self, sqlite_manager, temp_project_dir, sample_entries
+    ):
+        jsonl_path = temp_project_dir / "test.jsonl"
+        jsonl_path.write_text("dummy content")
+        sqlite_manager.save_cached_entries(jsonl_path, sample_entries)
+
+        assert sqlite_manager.db_file.exists()
+        assert not list(sqlite_manager.cache_dir.glob("*.json"))
+        assert sqlite_manager.is_file_cached(jsonl_path)
+
+        loaded = sqlite_manager.load_cached_entries(jsonl_path)
+        assert loaded == sample_entries
+
+    def test_index_is_persisted(self, temp_project_dir, mock_version, sample_entries):
+        jsonl_path = temp_project_dir / "test.jsonl"
+        jsonl_path.write_text("dummy content")
+        manager = CacheManager(temp_project_dir, mock_version, "sqlite")
+        manager.save_cached_entries(jsonl_path, sample_entries)
+        manager.update_working_directories(["/test"])
+        manager.close()
+
+        # The existing database is picked up without naming the backend
+        reopened = CacheManager(temp_project_dir, mock_version)
+        assert reopened.backend == "sqlite"
+        assert reopened.is_file_cached(jsonl_path)
+        project_cache = reopened.get_cached_project_data()
+        assert project_cache.working_directories == ["/test"]
+        assert project_cache.cached_files[jsonl_path.name].session_ids == ["session1"]
+        reopened.close()
+
+    def test_filtered_loading_uses_timestamp_range(
+        self, sqlite_manager, temp_project_dir
+    ):
+        jsonl_path = temp_project_dir / "session.jsonl"
+        self._write_session(
+            jsonl_path,
+            "s1",
+            ["2023-01-01T10:00:00Z", "2023-01-02T10:00:00Z", "2023-01-03T10:00:00Z"],
+        )
+        with open(jsonl_path, "a") as f:
+            f.write(json.dumps({"type": "summary", "summary": "S", "leafUuid": "x"}))
+            f.write("\n")
+        parser.load_transcript(jsonl_path, sqlite_manager, silent=True)
+
+        filtered = sqlite_manager.load_cached_entries_filtered(
+            jsonl_path, "2023-01-02", "2023-01-02"
+        )
+        assert [getattr(e, "uuid", e.type) for e in filtered] == ["s1-1", "summary"]
+
+    def test_session_entries_across_files(self, sqlite_manager, temp_project_dir):
+        first = temp_project_dir / "first.jsonl"
+        second = temp_project_dir / "second.jsonl"
+        self._write_session(first, "s1", ["2023-01-01T10:00:00Z"])
+        self._write_session(second, "s1", ["2023-01-01T09:00:00Z"])
+        other = temp_project_dir / "other.jsonl"
+        self._write_session(other, "s2", ["2023-01-01T08:00:00Z"])
+
+        # Nothing is returned until all the session's files are cached
+        assert sqlite_manager.load_session_entries("s1", [first, second]) is None
+
+        for path in (first, second, other):
+            parser.load_transcript(path, sqlite_manager, silent=True)
+        entries = sqlite_manager.load_session_entries("s1", [first, second])
+        assert [e.uuid for e in entries] == ["s1-0", "s1-0"]
+        assert [e.timestamp for e in entries] == [
+            "2023-01-01T09:00:00Z",
+            "2023-01-01T10:00:00Z",
+        ]
+
+        in_range = sqlite_manager.load_session_entries(
+            "s1", [first, second], "2023-01-01 09:30", None
+        )
+        assert [e.timestamp for e in in_range] == ["2023-01-01T10:00:00Z"]
+
+    def test_json_cache_is_migrated(self, temp_project_dir, mock_version):
+        jsonl_path = temp_project_dir / "session.jsonl"
+        self._write_session(
+            jsonl_path, "s1", ["2023-01-01T10:00:00Z", "2023-01-01T10:01:00Z"]
+        )
+        json_manager = CacheManager(temp_project_dir, mock_version)
+        parser.load_transcript(jsonl_path, json_manager, silent=True)
+        json_manager.update_working_directories(["/test"])
+        assert json_manager.index_file.exists()
+
+        sqlite_manager = CacheManager(temp_project_dir, mock_version, "sqlite")
+        assert not json_manager.index_file.exists()
+        assert not list(sqlite_manager.cache_dir.glob("*.json"))
+        assert sqlite_manager.is_file_cached(jsonl_path)
+        assert [e.uuid for e in sqlite_manager.load_cached_entries(jsonl_path)] == [
+            "s1-0",
+            "s1-1",
+        ]
+        project_cache = sqlite_manager.get_cached_project_data()
+        assert project_cache.working_directories == ["/test"]
+        sqlite_manager.close()
+
+    def test_switching_to_json_discards_database(
+        self, temp_project_dir, mock_version, sample_entries
+    ):
+        jsonl_path = temp_project_dir / "test.jsonl"
+        jsonl_path.write_text("dummy content")
+        sqlite_manager = CacheManager(temp_project_dir, mock_version, "sqlite")
+        sqlite_manager.save_cached_entries(jsonl_path, sample_entries)
+        sqlite_manager.close()
+
+        json_manager = CacheManager(temp_project_dir, mock_version, "json")
+        assert not json_manager.db_file.exists()
+        assert not json_manager.is_file_cached(jsonl_path)
+
+    def test_clear_cache(self, sqlite_manager, temp_project_dir, sample_entries):
+        jsonl_path = temp_project_dir / "test.jsonl"
+        jsonl_path.write_text("dummy content")
+        sqlite_manager.save_cached_entries(jsonl_path, sample_entries)
+
+        sqlite_manager.clear_cache()
+        assert not sqlite_manager.is_file_cached(jsonl_path)
+        reopened = CacheManager(temp_project_dir, "1.0.0-test", "sqlite")
+        assert reopened.get_cached_project_data().cached_files == {}
+        reopened.close()
+
+
+class TestBatchedIndexWrites:
+    """Test deferring cache index writes to the end of a batch."""
+
+    @pytest.fixture(params=CACHE_BACKENDS)
+    def backend(self, request):
+        return request.param
+
+    def _write_lines(self, path: Path, *uuids: str) -> None:
+        with open(path, "a") as f:
+            for minute, uuid in enumerate(uuids):
+                f.write(_jsonl_line(uuid, f"2023-01-01T10:{minute:02d}:00Z"))
+
+    def _indexed_files(self, temp_project_dir, mock_version, backend):
+        manager = CacheManager(temp_project_dir, mock_version, backend)
+        cached_files = manager.get_cached_project_data().cached_files
+        manager.close()
+        return set(cached_files)
+
+    def test_index_saved_once_per_batch(self, temp_project_dir, mock_version, backend):
+        manager = CacheManager(temp_project_dir, mock_version, backend)
+        for name in ("a.jsonl", "b.jsonl"):
+            self._write_lines(temp_project_dir / name, name)
+
+        with patch.object(
+            CacheManager,
+            "_save_project_cache",
+            autospec=True,
+            side_effect=CacheManager._save_project_cache,
+        ) as save:
+            with manager.batch():
+                with manager.batch():
+                    for name in ("a.jsonl", "b.jsonl"):
+                        parser.load_transcript(
+                            temp_project_dir / name, manager, silent=True
+                        )
+                manager.update_working_directories(["/test"])
+                assert not self._indexed_files(temp_project_dir, mock_version, backend)
+        manager.close()
+
+        # Every update asked for a save, but the index was written once
+        assert save.call_count == 4
+        assert not manager._index_dirty
+        assert self._indexed_files(temp_project_dir, mock_version, backend) == {
+            "a.jsonl",
+            "b.jsonl",
+        }
+        assert not list(manager.cache_dir.glob("*.tmp"))
+
+    def test_index_saved_when_batch_fails(
+        self, temp_project_dir, mock_version, backend
+    ):
+        manager = CacheManager(temp_project_dir, mock_version, backend)
+        jsonl_path = temp_project_dir / "a.jsonl"
+        self._write_lines(jsonl_path, "u1")
+
+        with pytest.raises(RuntimeError):
+            with manager.batch():
+                parser.load_transcript(jsonl_path, manager, silent=True)
+                raise RuntimeError("interrupted")
+        manager.close()
+
+        assert self._indexed_files(temp_project_dir, mock_version, backend) == {
+            "a.jsonl"
+        }
+
+    def test_unsaved_append_is_parsed_again(
+        self, temp_project_dir, mock_version, backend
+    ):
+        jsonl_path = temp_project_dir / "a.jsonl"
+        self._write_lines(jsonl_path, "u1")
+        manager = CacheManager(temp_project_dir, mock_version, backend)
+        parser.load_transcript(jsonl_path, manager, silent=True)
+
+        # The appended entries are stored, but the run stops before the
+        # batch saves the index
+        self._write_lines(jsonl_path, "u2")
+        _touch_later(jsonl_path)
+        with patch.object(manager, "_save_project_cache"):
+            parser.load_transcript(jsonl_path, manager, silent=True)
+        manager.close()
+
+        reopened = CacheManager(temp_project_dir, mock_version, backend)
+        entries = parser.load_transcript(jsonl_path, reopened, silent=True)
+        assert [e.uuid for e in entries] == ["u1", "u2"]
+        reopened.close()
+
+
+class TestBlobStore:
+    """Test keeping large message content payloads in the blob store."""
+
+    @pytest.fixture(params=CACHE_BACKENDS)
+    def blob_manager(self, temp_project_dir, mock_version, request):
+        manager = CacheManager(temp_project_dir, mock_version, request.param)
+        yield manager
+        manager.close()
+
+    def _tool_result_line(self, uuid: str, payload: str) -> str:
+        entry = json.loads(_jsonl_line(uuid, "2023-01-01T10:00:00Z"))
+        entry["message"]["content"] = [
+            {"type": "tool_result", "tool_use_id": "tool1", "content": payload},
+            {
+                "type": "image",
+                "source": {"type": "base64", "media_type": "image/png", "data": "AA"},
+            },
+        ]
+        return json.dumps(entry) + "\n"
+
+    def _blob_files(self, manager):
+        return [
+            path for path in (manager.cache_dir / "blobs").rglob("*") if path.is_file()
+        ]
+
+    def test_large_payloads_are_stored_once(self, blob_manager, temp_project_dir):
+        payload = "x" * BLOB_THRESHOLD
+        for name in ("a.jsonl", "b.jsonl"):
+            (temp_project_dir / name).write_text(
+                self._tool_result_line(f"{name}-1", payload)
+                + self._tool_result_line(f"{name}-2", payload)
+            )
+            parser.load_transcript(temp_project_dir / name, blob_manager, silent=True)
+
+        blob_files = self._blob_files(blob_manager)
+        assert len(blob_files) == 1
+        assert blob_files[0].read_text() == payload
+        if blob_manager.backend == "json":
+            cache_text = (blob_manager.cache_dir / "a.json").read_text()
+            assert payload not in cache_text
+            assert '"$blob"' in cache_text
+
+        # Short strings stay inline
+        entries = blob_manager.load_cached_entries(temp_project_dir / "a.jsonl")
+        assert entries[0].message.content[1].source.data == "AA"
+        assert entries[0].message.content[0].content == payload
+
+    def test_references_are_resolved_lazily(self, blob_manager, temp_project_dir):
+        payload = "y" * BLOB_THRESHOLD
+        jsonl_path = temp_project_dir / "a.jsonl"
+        jsonl_path.write_text(self._tool_result_line("u1", payload))
+        parser.load_transcript(jsonl_path, blob_manager, silent=True)
+
+        with patch.object(BlobStore, "get", autospec=True) as get:
+            get.return_value = payload
+            entries = blob_manager.load_cached_entries(jsonl_path)
+            assert entries[0].uuid == "u1"
+            assert len(entries[0].message.content) == 2
+            assert get.call_count == 0
+
+            assert entries[0].message.content[0].content == payload
+            assert get.call_count == 1
+
+    def test_validated_load_resolves_references(self, blob_manager, temp_project_dir):
+        payload = "z" * BLOB_THRESHOLD
+        jsonl_path = temp_project_dir / "a.jsonl"
+        jsonl_path.write_text(self._tool_result_line("u1", payload))
+        parser.load_transcript(jsonl_path, blob_manager, silent=True)
+
+        entries = blob_manager.load_cached_entries(jsonl_path, "basic")
+        assert entries[0].message.content[0].content == payload
+
+    def test_pickled_entries_keep_references(self, blob_manager, temp_project_dir):
+        payload = "p" * BLOB_THRESHOLD
+        jsonl_path = temp_project_dir / "a.jsonl"
+        jsonl_path.write_text(self._tool_result_line("u1", payload))
+        parser.load_transcript(jsonl_path, blob_manager, silent=True)
+
+        entries = blob_manager.load_cached_entries(jsonl_path)
+        restored = pickle.loads(pickle.dumps(entries))
+        assert restored[0].message.content[0].content == payload
+
+    def test_missing_blob_is_replaced_by_placeholder(
+        self, blob_manager, temp_project_dir
+    ):
+        jsonl_path = temp_project_dir / "a.jsonl"
+        jsonl_path.write_text(self._tool_result_line("u1", "m" * BLOB_THRESHOLD))
+        parser.load_transcript(jsonl_path, blob_manager, silent=True)
+        for blob_file in self._blob_files(blob_manager):
+            blob_file.unlink()
+
+        entries = blob_manager.load_cached_entries(jsonl_path)
+        assert entries[0].message.content[0].content == "[Cached content missing]"
+
+    def test_clear_cache_removes_blobs(self, blob_manager, temp_project_dir):
+        jsonl_path = temp_project_dir / "a.jsonl"
+        jsonl_path.write_text(self._tool_result_line("u1", "c" * BLOB_THRESHOLD))
+        parser.load_transcript(jsonl_path, blob_manager, silent=True)
+        assert self._blob_files(blob_manager)
+
+        blob_manager.clear_cache()
+        assert not (blob_manager.cache_dir / "blobs").exists()
+
+
+class TestCacheCodecs:
+    """Test compressed JSON cache files."""
+
+    @pytest.fixture(params=[c for c in available_codecs() if c != "none"])
+    def codec(self, request):
+        return request.param
+
+    @pytest.fixture
+    def jsonl_path(self, temp_project_dir):
+        path = temp_project_dir / "session.jsonl"
+        path.write_text(
+            _jsonl_line("u1", "2023-01-01T10:00:00Z")
+            + _jsonl_line("u2", "2023-01-02T10:00:00Z")
+        )
+        return path
+
+    def _uuids(self, entries):
+        return [e.uuid for e in entries]
+
+    def test_round_trip(self, temp_project_dir, mock_version, codec, jsonl_path):
+        manager = CacheManager(temp_project_dir, mock_version, "json", codec, 1)
+        parser.load_transcript(jsonl_path, manager, silent=True)
+
+        cache_file = manager._get_cache_file_path(jsonl_path)
+        assert cache_file.name != "session.json"
+        assert cache_file.exists()
+        assert b"u1" not in cache_file.read_bytes()
+        cached_info = manager.get_cached_file_info(jsonl_path)
+        assert (cached_info.codec, cached_info.codec_level) == (codec, 1)
+
+        reopened = CacheManager(temp_project_dir, mock_version)
+        assert self._uuids(reopened.load_cached_entries(jsonl_path)) == ["u1", "u2"]
+        filtered = reopened.load_cached_entries_filtered(
+            jsonl_path, "2023-01-02", "2023-01-02"
+        )
+        assert self._uuids(filtered) == ["u2"]
+
+    def test_codec_change_rewrites_cache(
+        self, temp_project_dir, mock_version, codec, jsonl_path
+    ):
+        manager = CacheManager(temp_project_dir, mock_version, "json", codec)
+        parser.load_transcript(jsonl_path, manager, silent=True)
+        compressed_file = manager._get_cache_file_path(jsonl_path)
+
+        # Files cached with another codec stay readable...
+        plain = CacheManager(temp_project_dir, mock_version, "json", "none")
+        assert plain.is_file_cached(jsonl_path)
+
+        # ...and are written with the new codec once they change
+        with open(jsonl_path, "a") as f:
+            f.write(_jsonl_line("u3", "2023-01-03T10:00:00Z"))
+        _touch_later(jsonl_path)
+        entries = parser.load_transcript(jsonl_path, plain, silent=True)
+        assert self._uuids(entries) == ["u1", "u2", "u3"]
+        assert not compressed_file.exists()
+        assert (temp_project_dir / "cache" / "session.json").exists()
+        assert plain.get_cached_file_info(jsonl_path).codec == "none"
+
+    def test_appended_lines_are_cached(
+        self, temp_project_dir, mock_version, codec, jsonl_path
+    ):
+        manager = CacheManager(temp_project_dir, mock_version, "json", codec)
+        parser.load_transcript(jsonl_path, manager, silent=True)
+        with open(jsonl_path, "a") as f:
+            f.write(_jsonl_line("u3", "2023-01-03T10:00:00Z"))
+        _touch_later(jsonl_path)
+        parser.load_transcript(jsonl_path, manager, silent=True)
+
+        reopened = CacheManager(temp_project_dir, mock_version, "json", codec)
+        assert self._uuids(reopened.load_cached_entries(jsonl_path)) == [
+            "u1",
+            "u2",
+            "u3",
+        ]
+
+    def test_blobs_are_compressed(self, temp_project_dir, mock_version, codec):
+        manager = CacheManager(temp_project_dir, mock_version, "json", codec)
+        digest = manager._blobs.put("b" * BLOB_THRESHOLD)
+        blob_files = list((manager.cache_dir / "blobs").rglob(f"{digest}*"))
+        assert len(blob_files) == 1
+        assert blob_files[0].name != digest
+        assert blob_files[0].stat().st_size < BLOB_THRESHOLD
+
+        # A plain store finds the compressed blob rather than storing it again
+        plain = BlobStore(manager.cache_dir / "blobs")
+        assert plain.put("b" * BLOB_THRESHOLD) == digest
+        assert plain.get(digest) == "b" * BLOB_THRESHOLD
+        assert len(list((manager.cache_dir / "blobs").rglob(f"{digest}*"))) == 1
+
+    def test_clear_cache_removes_compressed_files(
+        self, temp_project_dir, mock_version, codec, jsonl_path
+    ):
+        manager = CacheManager(temp_project_dir, mock_version, "json", codec)
+        parser.load_transcript(jsonl_path, manager, silent=True)
+        manager.clear_cache()
+        # Only the lock file, which concurrent runs may be waiting on, is kept
+        assert [path.name for path in manager.cache_dir.iterdir()] == [CACHE_LOCK_FILE]
+
+    def test_unavailable_codec(self, temp_project_dir, mock_version):
+        with patch("claude_code_log.cache._zstd_module", return_value=None):
+            assert "zstd" not in available_codecs()
+            with pytest.raises(ValueError):
+                CacheManager(temp_project_dir, mock_version, "json", "zstd")
+
+
+class TestTimestampIndex:
+    """Test range queries on the sorted timestamp index of JSON caches."""
+
+    @pytest.fixture(params=available_codecs())
+    def manager(self, temp_project_dir, mock_version, request):
+        return CacheManager(temp_project_dir, mock_version, "json", request.param)
+
+    @pytest.fixture
+    def jsonl_path(self, temp_project_dir):
+        path = temp_project_dir / "session.jsonl"
+        path.write_text(
+            json.dumps({"type": "summary", "summary": "S", "leafUuid": "u1"})
+            + "\n"
+            + "".join(
+                _jsonl_line(f"u{day}", f"2023-01-{day:02d}T10:00:00Z")
+                for day in (3, 1, 2, 5, 4)
+            )
+        )
+        return path
+
+    def _filtered(self, manager, jsonl_path, from_date, to_date):
+        with patch.object(
+            CacheManager,
+            "_read_json_cache_file",
+            side_effect=AssertionError("cache file parsed whole"),
+        ):
+            entries = manager.load_cached_entries_filtered(
+                jsonl_path, from_date, to_date
+            )
+        return [getattr(entry, "uuid", entry.type) for entry in entries]
+
+    def test_spans_in_range(self, temp_project_dir):
+        stat = temp_project_dir.stat()
+        index = TimestampIndex.build(
+            [
+                ("2023-01-02T00:00:00Z", 30, 40),
+                ("_no_timestamp", 0, 10),
+                ("2023-01-01T00:00:00Z", 10, 20),
+                ("2023-01-03T00:00:00Z", 50, 60),
+            ],
+            stat,
+        )
+        day = 24 * 3600 * 1000
+        jan_1 = 1672531200000
+        assert index.timestamps == [jan_1, jan_1 + day, jan_1 + 2 * day]
+        # Bounds are inclusive; spans come back in document order
+        assert index.spans_in_range(jan_1 + day, jan_1 + 2 * day) == [
+            (0, 10),
+            (30, 40),
+            (50, 60),
+        ]
+        assert index.spans_in_range(None, jan_1) == [(0, 10), (10, 20)]
+        assert index.spans_in_range(jan_1 + 1, jan_1 + day - 1) == [(0, 10)]
+
+    def test_filtered_load_reads_only_range(self, manager, jsonl_path):
+        parser.load_transcript(jsonl_path, manager, silent=True)
+
+        assert self._filtered(manager, jsonl_path, "2023-01-02", "2023-01-03") == [
+            "summary",
+            "u3",
+            "u2",
+        ]
+        assert self._filtered(manager, jsonl_path, "2023-01-05", None) == [
+            "summary",
+            "u5",
+        ]
+
+    def test_appended_keys_are_indexed(
+        self, temp_project_dir, mock_version, manager, jsonl_path
+    ):
+        parser.load_transcript(jsonl_path, manager, silent=True)
+        with open(jsonl_path, "a") as f:
+            f.write(_jsonl_line("u6", "2023-01-06T10:00:00Z"))
+        _touch_later(jsonl_path)
+        parser.load_transcript(jsonl_path, manager, silent=True)
+
+        reopened = CacheManager(temp_project_dir, mock_version)
+        assert self._filtered(reopened, jsonl_path, "2023-01-04", "2023-01-06") == [
+            "summary",
+            "u5",
+            "u4",
+            "u6",
+        ]
+
+    def test_cache_without_current_index(self, manager, jsonl_path):
+        parser.load_transcript(jsonl_path, manager, silent=True)
+        cache_file = manager._get_cache_file_path(jsonl_path)
+        # As if another run replaced the cache file after the index was read
+        os.utime(cache_file, ns=(0, 0))
+
+        filtered = manager.load_cached_entries_filtered(
+            jsonl_path, "2023-01-02", "2023-01-03"
+        )
+        assert [getattr(entry, "uuid", entry.type) for entry in filtered] == [
+            "summary",
+            "u3",
+            "u2",
+        ]
+
+
+class TestProjectsIndex:
+    """Test the index of all projects at the projects root."""
+
+    @pytest.fixture
+    def projects_dir(self, temp_project_dir):
+        for name in ("project-a", "project-b"):
+            project_dir = temp_project_dir / name
+            project_dir.mkdir()
+            (project_dir / "session.jsonl").write_text(
+                _jsonl_line(f"{name}-1", "2023-01-01T10:00:00Z")
+            )
+        (temp_project_dir / "not-a-project").mkdir()
+        return temp_project_dir
+
+    def _project_cache(self, project_dir, message_count):
+        return ProjectCache(
+            version="1.0.0-test",
+            cache_created=datetime.now().isoformat(),
+            last_updated=datetime.now().isoformat(),
+            project_path=str(project_dir),
+            cached_files={},
+            sessions={},
+            total_message_count=message_count,
+            working_directories=["/test"],
+        )
+
+    def test_fingerprint(self, projects_dir):
+        project_dir = projects_dir / "project-a"
+        (project_dir / "other.txt").write_text("ignored")
+        fingerprint = project_fingerprint(project_dir)
+        assert fingerprint.file_count == 1
+        assert fingerprint.total_size == (project_dir / "session.jsonl").stat().st_size
+        assert project_fingerprint(projects_dir / "not-a-project") is None
+
+    def test_discover_projects(self, projects_dir, mock_version):
+        projects_index = ProjectsIndex(projects_dir, mock_version)
+        assert projects_index.discover_projects() == [
+            projects_dir / "project-a",
+            projects_dir / "project-b",
+        ]
+
+    def test_unchanged_projects_are_answered_from_index(
+        self, projects_dir, mock_version
+    ):
+        project_dir = projects_dir / "project-a"
+        projects_index = ProjectsIndex(projects_dir, mock_version)
+        assert projects_index.get_project_cache(project_dir) is None
+        projects_index.update_project(project_dir, self._project_cache(project_dir, 3))
+        projects_index.save()
+
+        reloaded = ProjectsIndex(projects_dir, mock_version)
+        project_cache = reloaded.get_project_cache(project_dir)
+        assert project_cache.total_message_count == 3
+        assert project_cache.working_directories == ["/test"]
+        assert reloaded.get_project_cache(projects_dir / "project-b") is None
+
+    def test_changed_project_is_not_answered(self, projects_dir, mock_version):
+        project_dir = projects_dir / "project-a"
+        projects_index = ProjectsIndex(projects_dir, mock_version)
+        projects_index.update_project(project_dir, self._project_cache(project_dir, 3))
+        projects_index.save()
+
+        with open(project_dir / "session.jsonl", "a") as f:
+            f.write(_jsonl_line("new", "2023-01-01T10:01:00Z"))
+        assert (
+            ProjectsIndex(projects_dir, mock_version).get_project_cache(project_dir)
+            is None
+        )
+
+    def test_index_is_discarded_on_version_change(self, projects_dir, mock_version):
+        project_dir = projects_dir / "project-a"
+        projects_index = ProjectsIndex(projects_dir, mock_version)
+        projects_index.update_project(project_dir, self._project_cache(project_dir, 3))
+        projects_index.save()
+
+        assert (
+            ProjectsIndex(projects_dir, "2.0.0").get_project_cache(project_dir) is None
+        )
+
+    def test_removed_projects_are_forgotten(self, projects_dir, mock_version):
+        project_dir = projects_dir / "project-b"
+        projects_index = ProjectsIndex(projects_dir, mock_version)
+        projects_index.update_project(project_dir, self._project_cache(project_dir, 1))
+        projects_index.save()
+
+        (project_dir / "session.jsonl").unlink()
+        projects_index = ProjectsIndex(projects_dir, mock_version)
+        assert projects_index.discover_projects() == [projects_dir / "project-a"]
+        projects_index.save()
+        data = json.loads((projects_dir / "projects_index.json").read_text())
+        assert data["projects"] == {}
+
+
+def _cache_file_in_process(
+    project_dir: Path, version: str, backend: str, name: str
+) -> None:
+    """Parse and cache one JSONL file with a manager of its own."""
+    manager = CacheManager(project_dir, version, backend)
+    parser.load_transcript(project_dir / name, manager, silent=True)
+    manager.close()
+
+
+class TestConcurrentAccess:
+    """Test sharing caches and outputs between concurrent runs."""
+
+    @pytest.fixture(params=CACHE_BACKENDS)
+    def backend(self, request):
+        return request.param
+
+    def _write_files(self, project_dir: Path, count: int) -> list[str]:
+        names = [f"file-{i}.jsonl" for i in range(count)]
+        for i, name in enumerate(names):
+            (project_dir / name).write_text(
+                _jsonl_line(f"u{i}", f"2023-01-01T10:{i:02d}:00Z")
+            )
+        return names
+
+    def _indexed_files(self, project_dir, mock_version, backend):
+        manager = CacheManager(project_dir, mock_version, backend)
+        cached_files = set(manager.get_cached_project_data().cached_files)
+        manager.close()
+        return cached_files
+
+    def test_managers_keep_each_others_updates(
+        self, temp_project_dir, mock_version, backend
+    ):
+        first_name, second_name = self._write_files(temp_project_dir, 2)
+        # Both managers load the (empty) index before either saves
+        first = CacheManager(temp_project_dir, mock_version, backend)
+        second = CacheManager(temp_project_dir, mock_version, backend)
+        parser.load_transcript(temp_project_dir / first_name, first, silent=True)
+        parser.load_transcript(temp_project_dir / second_name, second, silent=True)
+
+        # The second picked up the first's file before saving its own
+        assert set(second.get_cached_project_data().cached_files) == {
+            first_name,
+            second_name,
+        }
+        first.close()
+        second.close()
+        assert self._indexed_files(temp_project_dir, mock_version, backend) == {
+            first_name,
+            second_name,
+        }
+
+    def test_parallel_processes(self, temp_project_dir, mock_version, backend):
+        names = self._write_files(temp_project_dir, 8)
+        with ProcessPoolExecutor(max_workers=4) as executor:
+            futures = [
+                executor.submit(
+                    _cache_file_in_process,
+                    temp_project_dir,
+                    mock_version,
+                    backend,
+                    name,
+                )
+                for name in names
+            ]
+            for future in futures:
+                future.result()
+
+        manager = CacheManager(temp_project_dir, mock_version, backend)
+        assert set(manager.get_cached_project_data().cached_files) == set(names)
+        for i, name in enumerate(names):
+            entries = manager.load_cached_entries(temp_project_dir / name)
+            assert entries is not None
+            assert [entry.uuid for entry in entries] == [f"u{i}"]
+        manager.close()
+        assert not list(manager.cache_dir.glob("*.tmp"))
+
+    def test_batch_excludes_other_managers(self, temp_project_dir, mock_version):
+        (name,) = self._write_files(temp_project_dir, 1)
+        holder = CacheManager(temp_project_dir, mock_version)
+        waiter = CacheManager(temp_project_dir, mock_version)
+        cached = threading.Event()
+
+        def cache_file() -> None:
+            parser.load_transcript(temp_project_dir / name, waiter, silent=True)
+            cached.set()
+
+        with holder.batch():
+            thread = threading.Thread(target=cache_file)
+            thread.start()
+            # The other manager waits for the lock before updating the cache
+            assert not cached.wait(0.2)
+        thread.join(timeout=10)
+        assert cached.is_set()
+        assert self._indexed_files(temp_project_dir, mock_version, "json") == {name}
+
+    def test_append_after_concurrent_rewrite(self, temp_project_dir, mock_version):
+        jsonl_path = temp_project_dir / "a.jsonl"
+        jsonl_path.write_text(_jsonl_line("u1", "2023-01-01T10:00:00Z"))
+        stale = CacheManager(temp_project_dir, mock_version)
+        parser.load_transcript(jsonl_path, stale, silent=True)
+
+        # Another run caches the grown file first
+        with open(jsonl_path, "a") as f:
+            f.write(_jsonl_line("u2", "2023-01-01T10:01:00Z"))
+        _touch_later(jsonl_path)
+        other = CacheManager(temp_project_dir, mock_version)
+        parser.load_transcript(jsonl_path, other, silent=True)
+
+        # Appending what the stale manager parsed must not duplicate entries
+        entries = parser.load_transcript(jsonl_path, silent=True)
+        stale.append_cached_entries(
+            jsonl_path, entries[1:], 1, jsonl_path.stat().st_size, 2
+        )
+        cached = CacheManager(temp_project_dir, mock_version).load_cached_entries(
+            jsonl_path
+        )
+        assert cached is not None
+        assert [entry.uuid for entry in cached] == ["u1", "u2"]
+        cache_text = (temp_project_dir / "cache" / "a.json").read_text()
+        assert cache_text.count('"uuid":"u2"') == 1
+
+    def test_projects_indexes_merge_on_save(self, temp_project_dir, mock_version):
+        for name in ("project-a", "project-b"):
+            (temp_project_dir / name).mkdir()
+            (temp_project_dir / name / "session.jsonl").write_text(
+                _jsonl_line(name, "2023-01-01T10:00:00Z")
+            )
+        first = ProjectsIndex(temp_project_dir, mock_version)
+        second = ProjectsIndex(temp_project_dir, mock_version)
+        for projects_index, name in ((first, "project-a"), (second, "project-b")):
+            project_dir = temp_project_dir / name
+            projects_index.update_project(
+                project_dir, CacheManager(project_dir, mock_version)._project_cache
+            )
+            projects_index.save()
+
+        data = json.loads((temp_project_dir / "projects_index.json").read_text())
+        assert set(data["projects"]) == {"project-a", "project-b"}
+
+    def test_failed_write_keeps_previous_file(self, temp_project_dir):
+        path = temp_project_dir / "combined_transcripts.html"
+        atomic_write_text(path, "previous")
+        with pytest.raises(RuntimeError):
+            with atomic_write(path) as f:
+                f.write("partial")
+                raise RuntimeError("interrupted")
+        assert path.read_text() == "previous"
+        assert [p.name for p in temp_project_dir.iterdir()] == [path.name]
+
+
+class TestFragmentCache:
+    """Test storing the rendered HTML fragments of messages."""
+
+    @pytest.fixture
+    def jsonl_path(self, temp_project_dir):
+        jsonl_path = temp_project_dir / "a.jsonl"
+        jsonl_path.write_text(
+            _jsonl_line("u1", "2023-01-01T10:00:00Z")
+            + _jsonl_line("u2", "2023-01-01T10:01:00Z")
+        )
+        return jsonl_path
+
+    def test_key_depends_on_content_and_version(self, cache_manager, jsonl_path):
+        first, second = parser.load_transcript(jsonl_path, silent=True)
+        fragments = cache_manager.fragments
+        assert fragments.key(first) != fragments.key(second)
+        assert fragments.key(first) == fragments.key(first.model_copy())
+        sidechain = first.model_copy(update={"isSidechain": True})
+        assert fragments.key(first) != fragments.key(sidechain)
+
+        other_version = FragmentCache(
+            cache_manager.cache_dir / "other.db", "2.0.0-test"
+        )
+        assert other_version.key(first) != fragments.key(first)
+        other_version.close()
+
+    def test_key_does_not_build_content(self, cache_manager, temp_project_dir):
+        entry_data = json.loads(_jsonl_line("u1", "2023-01-01T10:00:00Z"))
+        entry_data["message"]["content"] = [{"type": "text", "text": "Hello"}]
+        jsonl_path = temp_project_dir / "b.jsonl"
+        jsonl_path.write_text(json.dumps(entry_data) + "\n")
+        (entry,) = parser.load_transcript(jsonl_path, silent=True)
+
+        cache_manager.fragments.key(entry)
+        assert entry.message.content.pending
+
+    def test_fragments_persist(self, temp_project_dir, mock_version, jsonl_path):
+        manager = CacheManager(temp_project_dir, mock_version)
+        manager.fragments.put("key", "[null, []]")
+        assert manager.fragments.get("key") == "[null, []]"
+        manager.close()
+
+        manager = CacheManager(temp_project_dir, mock_version)
+        assert manager.fragments.get("key") == "[null, []]"
+        manager.close()
+
+        # A new library version renders everything again
+        manager = CacheManager(temp_project_dir, "2.0.0-test")
+        assert manager.fragments.get("key") is None
+        manager.close()
+
+    def test_clear_cache_clears_fragments(self, cache_manager):
+        cache_manager.fragments.put("key", "null")
+        cache_manager.fragments.flush()
+        cache_manager.clear_cache()
+        assert cache_manager.fragments.get("key") is None
+
+    def test_rendering_reuses_fragments(self, cache_manager, jsonl_path):
+        entries = parser.load_transcript(jsonl_path, silent=True)
+        session_index = SessionIndex.from_messages(entries)
+        expected = "".join(render_html_chunks(entries, session_index, "Test"))
+
+        with patch(
+            "claude_code_log.renderer._render_message_fragments",
+            wraps=_render_message_fragments,
+        ) as render:
+            for _ in range(2):
+                html = "".join(
+                    render_html_chunks(
+                        entries,
+                        session_index,
+                        "Test",
+                        fragment_cache=cache_manager.fragments,
+                    )
+                )
+                assert html == expected
+        # Each message was rendered once
+        assert render.call_count == 2
+
+
+class TestCacheGarbageCollection:
+    """Test removing stale cache data and evicting down to a size budget."""
+
+    @pytest.fixture(params=CACHE_BACKENDS)
+    def backend(self, request):
+        return request.param
+
+    def _cache(self, project_dir, backend, *names, payload=""):
+        """Write and cache one JSONL file per name; return the manager."""
+        manager = CacheManager(project_dir, "1.0.0-test", backend)
+        for name in names:
+            jsonl_path = project_dir / f"{name}.jsonl"
+            if payload:
+                line = json.loads(_jsonl_line(f"{name}-1", "2023-01-01T10:00:00Z"))
+                line["message"]["content"] = [
+                    {"type": "tool_result", "tool_use_id": "t", "content": payload}
+                ]
+                jsonl_path.write_text(json.dumps(line) + "\n")
+            else:
+                jsonl_path.write_text(_jsonl_line(f"{name}-1", "2023-01-01T10:00:00Z"))
+            parser.load_transcript(jsonl_path, manager, silent=True)
+            manager.update_session_cache(
+                {
+                    f"session-{name}": SessionCacheData(
+                        session_id=f"session-{name}",
+                        first_timestamp="2023-01-01T10:00:00Z",
+                        last_timestamp="2023-01-01T10:00:00Z",
+                        message_count=1,
+                        first_user_message="Hello",
+                    )
+                }
+            )
+            cached_info = manager._project_cache.cached_files[jsonl_path.name]
+            cached_info.session_ids = [f"session-{name}"]
+        manager._save_project_cache()
+        return manager
+
+    def _blob_files(self, manager):
+        return [p for p in (manager.cache_dir / "blobs").rglob("*") if p.is_file()]
+
+    def test_deleted_files_are_removed(self, temp_project_dir, backend):
+        manager = self._cache(temp_project_dir, backend, "a", "b")
+        manager.close()
+        (temp_project_dir / "a.jsonl").unlink()
+
+        manager = CacheManager(temp_project_dir, "1.0.0-test", backend)
+        stats = manager.collect_garbage()
+        assert stats.files_removed == 1
+        assert stats.bytes_after <= stats.bytes_before
+        assert set(manager._project_cache.cached_files) == {"b.jsonl"}
+        assert set(manager._project_cache.sessions) == {"session-b"}
+        if backend == "json":
+            assert not (manager.cache_dir / "a.json").exists()
+            assert (manager.cache_dir / "b.json").exists()
+        assert manager.load_cached_entries(temp_project_dir / "b.jsonl")
+        manager.close()
+
+        # Nothing is left to collect
+        manager = CacheManager(temp_project_dir, "1.0.0-test", backend)
+        assert manager.collect_garbage().files_removed == 0
+        manager.close()
+
+    def test_orphaned_caches_are_removed(self, temp_project_dir, backend):
+        manager = self._cache(temp_project_dir, backend, "a", "b")
+        # Forget b without deleting its cached entries
+        del manager._project_cache.cached_files["b.jsonl"]
+        manager._save_project_cache()
+
+        stats = manager.collect_garbage()
+        assert stats.orphans_removed >= 1
+        if backend == "json":
+            assert not (manager.cache_dir / "b.json").exists()
+        else:
+            assert set(manager._sqlite.file_sizes()) == {"a.jsonl"}
+        assert manager.load_cached_entries(temp_project_dir / "a.jsonl")
+        manager.close()
+
+    def test_unreferenced_blobs_are_swept(self, temp_project_dir, backend):
+        manager = self._cache(
+            temp_project_dir, backend, "a", payload="x" * BLOB_THRESHOLD
+        )
+        manager = self._cache(
+            temp_project_dir, backend, "b", payload="y" * BLOB_THRESHOLD
+        )
+        assert len(self._blob_files(manager)) == 2
+        (temp_project_dir / "a.jsonl").unlink()
+
+        stats = manager.collect_garbage()
+        assert stats.blobs_removed == 1
+        (blob_file,) = self._blob_files(manager)
+        assert blob_file.read_text() == "y" * BLOB_THRESHOLD
+        entries = manager.load_cached_entries(temp_project_dir / "b.jsonl")
+        assert entries[0].message.content[0].content == "y" * BLOB_THRESHOLD
+        manager.close()
+
+    def test_access_times_are_recorded(self, temp_project_dir, backend):
+        with patch("claude_code_log.cache.time.time", return_value=1000.0):
+            manager = self._cache(temp_project_dir, backend, "a")
+            manager.close()
+        manager = CacheManager(temp_project_dir, "1.0.0-test", backend)
+        assert manager._project_cache.cached_files["a.jsonl"].last_accessed == 1000.0
+
+        # Reads are noted once per resolution period, and saved on close
+        later = 1000.0 + ACCESS_TIME_RESOLUTION
+        with patch("claude_code_log.cache.time.time", return_value=later):
+            manager.load_cached_entries(temp_project_dir / "a.jsonl")
+        assert manager._project_cache.cached_files["a.jsonl"].last_accessed == 1000.0
+        manager.close()
+        manager = CacheManager(temp_project_dir, "1.0.0-test", backend)
+        assert manager._project_cache.cached_files["a.jsonl"].last_accessed == later
+        manager.close()
+
+    def test_eviction_removes_least_recently_used_first(self, temp_project_dir):
+        projects = [temp_project_dir / name for name in ("p1", "p2")]
+        for project_index, project_dir in enumerate(projects):
+            project_dir.mkdir()
+            self._cache(project_dir, "json", "a", "b").close()
+            # p1/a is the oldest, then p2/a, p1/b and p2/b
+            manager = CacheManager(project_dir, "1.0.0-test")
+            for file_index, name in enumerate(("a.jsonl", "b.jsonl")):
+                cached_info = manager._project_cache.cached_files[name]
+                cached_info.last_accessed = 100.0 * file_index + project_index + 1
+            manager._save_project_cache()
+            manager.close()
+
+        def cached(project_dir):
+            manager = CacheManager(project_dir, "1.0.0-test")
+            names = set(manager._project_cache.cached_files)
+            manager.close()
+            return names
+
+        # No budget: nothing to evict
+        stats = collect_cache_garbage(projects, "1.0.0-test")
+        assert stats.files_evicted == 0
+        total = stats.bytes_after
+
+        # Just too small for everything: the oldest file goes
+        stats = collect_cache_garbage(projects, "1.0.0-test", total - 1)
+        assert stats.files_evicted == 1
+        assert stats.bytes_after <= total - 1
+        assert cached(projects[0]) == {"b.jsonl"}
+        assert cached(projects[1]) == {"a.jsonl", "b.jsonl"}
+
+        # Evicted files are parsed again when needed
+        manager = CacheManager(projects[0], "1.0.0-test")
+        assert not manager.is_file_cached(projects[0] / "a.jsonl")
+        assert parser.load_transcript(projects[0] / "a.jsonl", manager, silent=True)
+        manager.close()
+
+        # A zero budget empties every cache
+        stats = collect_cache_garbage(projects, "1.0.0-test", 0)
+        assert cached(projects[0]) == cached(projects[1]) == set()
+
+    def test_fragments_are_evicted_by_day(self, temp_project_dir):
+        manager = CacheManager(temp_project_dir, "1.0.0-test")
+        fragments = manager.fragments
+        today = fragments._today
+        # A fragment last used on day 10
+        fragments._today = 10
+        fragments.put("old", "null")
+        fragments.flush()
+        fragments._today = today
+        fragments.put("new", "null")
+        fragments.flush()
+
+        items = [item for item in manager.cache_items() if item.kind == "fragments"]
+        assert len(items) == 2
+        oldest = min(items, key=lambda item: item.last_accessed)
+        assert oldest == CacheItem(
+            kind="fragments", name="10", size=oldest.size, last_accessed=864000.0
+        )
+        assert manager.evict([oldest]).fragments_removed == 1
+        assert fragments.get("old") is None
+        assert fragments.get("new") == "null"
+        manager.close()
+
+
+class TestFileAggregates:
+    """Test project aggregates merged from each cached file's own."""
+
+    @pytest.fixture(params=CACHE_BACKENDS)
+    def backend(self, request):
+        return request.param
+
+    @pytest.fixture
+    def project_dir(self, temp_project_dir):
+        # The files reuse request IDs across sessions with different usage
+        test_data = Path(__file__).parent / "test_data"
+        for name in (
+            "representative_messages",
+            "session_b",
+            "edge_cases",
+            "todowrite_examples",
+        ):
+            (temp_project_dir / f"{name}.jsonl").write_bytes(
+                (test_data / f"{name}.jsonl").read_bytes()
+            )
+        return temp_project_dir
+
+    def _expected(self, project_dir):
+        """Aggregate the project's entries as a single stream."""
+        return SessionAggregator.from_entries(
+            parser.iter_project(project_dir, silent=True)
+        )
+
+    def _assert_aggregates(self, manager, expected):
+        project_cache = manager.get_cached_project_data()
+        assert project_cache.total_message_count == expected.total_message_count
+        assert project_cache.total_input_tokens == expected.total_input_tokens
+        assert project_cache.total_output_tokens == expected.total_output_tokens
+        assert project_cache.earliest_timestamp == expected.earliest_timestamp
+        assert project_cache.latest_timestamp == expected.latest_timestamp
+        assert project_cache.sessions == expected.session_data()
+
+    def test_project_aggregates_match_stream(self, project_dir, backend):
+        manager = CacheManager(project_dir, "1.0.0-test", backend)
+        assert ensure_fresh_cache(project_dir, manager, silent=True)
+
+        self._assert_aggregates(manager, self._expected(project_dir))
+        for jsonl_path in project_dir.glob("*.jsonl"):
+            assert manager.get_file_aggregates(jsonl_path) is not None
+        manager.close()
+
+    def test_only_changed_file_is_read(self, project_dir, backend):
+        manager = CacheManager(project_dir, "1.0.0-test", backend)
+        ensure_fresh_cache(project_dir, manager, silent=True)
+        manager.close()
+
+        jsonl_path = project_dir / "session_b.jsonl"
+        with open(jsonl_path, "a") as f:
+            f.write(_jsonl_line("appended", "2025-07-03T16:30:00Z"))
+        _touch_later(jsonl_path)
+
+        manager = CacheManager(project_dir, "1.0.0-test", backend)
+        with (
+            patch.object(
+                parser, "_decode_transcript_line", wraps=parser._decode_transcript_line
+            ) as decode,
+            patch.object(
+                CacheManager,
+                "_read_cached_entries",
+                autospec=True,
+                side_effect=CacheManager._read_cached_entries,
+            ) as read_cached,
+        ):
+            assert ensure_fresh_cache(project_dir, manager, silent=True)
+        # Only the appended line is decoded; no cached entries are read
+        assert decode.call_count == 1
+        assert read_cached.call_args_list == []
+
+        self._assert_aggregates(manager, self._expected(project_dir))
+        assert manager.get_cached_project_data().sessions["session1"].message_count == 1
+        assert manager.get_file_aggregates(jsonl_path).model_dump() == (
+            SessionAggregator.from_file_entries(
+                manager.load_cached_entries(jsonl_path)
+            ).model_dump()
+        )
+        manager.close()
+
+    def test_missing_file_aggregates_are_computed_once(self, project_dir, backend):
+        manager = CacheManager(project_dir, "1.0.0-test", backend)
+        ensure_fresh_cache(project_dir, manager, silent=True)
+        # As cached before files recorded their aggregates
+        if backend == "sqlite":
+            manager._sqlite._conn.execute("DELETE FROM file_aggregates")
+            manager._sqlite._conn.commit()
+        else:
+            for aggregates_file in manager.cache_dir.glob("*.aggs"):
+                aggregates_file.unlink()
+        manager.close()
+
+        manager = CacheManager(project_dir, "1.0.0-test", backend)
+        jsonl_files = sorted(project_dir.glob("*.jsonl"))
+        merged = manager.merge_file_aggregates(jsonl_files)
+        assert merged is not None
+        assert merged.session_data() == self._expected(project_dir).session_data()
+        manager.close()
+
+        manager = CacheManager(project_dir, "1.0.0-test", backend)
+        with patch.object(CacheManager, "_read_cached_entries") as read_cached:
+            assert manager.merge_file_aggregates(jsonl_files) is not None
+        read_cached.assert_not_called()
+        manager.close()
+
+    def test_aggregates_kept_out_of_index(self, project_dir, backend):
+        manager = CacheManager(project_dir, "1.0.0-test", backend)
+        ensure_fresh_cache(project_dir, manager, silent=True)
+        if backend == "json":
+            assert b"uuid_to_session" not in manager.index_file.read_bytes()
+            assert len(list(manager.cache_dir.glob("*.aggs"))) == 4
+        else:
+            rows = manager._sqlite._conn.execute("SELECT data FROM files").fetchall()
+            assert rows and all("uuid_to_session" not in data for (data,) in rows)
+
+        # A file version the aggregates weren't stored for has none
+        jsonl_path = sorted(project_dir.glob("*.jsonl"))[0]
+        manager.get_cached_file_info(jsonl_path).message_count += 1
+        assert manager.get_file_aggregates(jsonl_path) is None
+
+        # Removed along with the file's cache
+        jsonl_path.unlink()
+        manager.collect_garbage()
+        if backend == "json":
+            assert len(list(manager.cache_dir.glob("*.aggs"))) == 3
+        else:
+            assert manager._sqlite.read_file_aggregates(jsonl_path.name) is None
+        manager.close()
+
+    def test_uncached_file_has_no_merged_aggregates(self, project_dir, backend):
+        manager = CacheManager(project_dir, "1.0.0-test", backend)
+        jsonl_files = sorted(project_dir.glob("*.jsonl"))
+        parser.load_transcript(jsonl_files[0], manager, silent=True)
+        assert manager.merge_file_aggregates(jsonl_files[:1]) is not None
+        assert manager.merge_file_aggregates(jsonl_files) is None
+        manager.close()
+
+    def test_summary_links_to_session_in_other_file(self, temp_project_dir, backend):
+        (temp_project_dir / "a.jsonl").write_text(
+            _jsonl_line("u1", "2023-01-01T10:00:00Z")
+        )
+        (temp_project_dir / "b.jsonl").write_text(
+            json.dumps({"type": "summary", "summary": "Greeting", "leafUuid": "u1"})
+            + "\n"
+        )
+        manager = CacheManager(temp_project_dir, "1.0.0-test", backend)
+        ensure_fresh_cache(temp_project_dir, manager, silent=True)
+        assert manager.get_cached_project_data().sessions["session1"].summary == (
+            "Greeting"
+        )
+
+        # Changing the file with the summary leaves the other's aggregates
+        (temp_project_dir / "b.jsonl").write_text(
+            json.dumps({"type": "summary", "summary": "Hello again", "leafUuid": "u1"})
+            + "\n"
+        )
+        _touch_later(temp_project_dir / "b.jsonl")
+        manager.close()
+        manager = CacheManager(temp_project_dir, "1.0.0-test", backend)
+        ensure_fresh_cache(temp_project_dir, manager, silent=True)
+        assert manager.get_cached_project_data().sessions["session1"].summary == (
+            "Hello again"
+        )
+        manager.close()
@@ -2,6 +2,7 @@
 """Integration tests for cache functionality with CLI and converter."""
 
 import json
+import os
 import tempfile
 from pathlib import Path
 from unittest.mock import patch
@@ -10,9 +11,19 @@ from datetime import datetime
 import pytest
 from click.testing import CliRunner
 
-from claude_code_log.cli import main
-from claude_code_log.converter import convert_jsonl_to_html, process_projects_hierarchy
-from claude_code_log.cache import CacheManager
+from claude_code_log.cli import find_projects_by_cwd, main
+from claude_code_log.converter import (
+    ProjectPipeline,
+    _write_session_pages,
+    convert_jsonl_to_html,
+    process_projects_hierarchy,
+)
+from claude_code_log.cache import CacheManager, get_library_version
+from claude_code_log.parser import iter_project
+from claude_code_log.renderer import (
+    _render_message_fragments,
+    generate_projects_index_html,
+)
 
 
 @pytest.fixture
@@ -127,14 +138,34 @@ class TestCacheIntegrationCLI:
         cache_files = list(cache_dir.glob("*.json"))
         assert len(cache_files) > 0
 
-        # Clear cache
-        result2 = runner.invoke(main, [str(project_dir), "--clear-cache"])
+        # Clear cache; the parent directory has no projects index to update
+        with patch("claude_code_log.cli.ProjectsIndex") as projects_index:
+            result2 = runner.invoke(main, [str(project_dir), "--clear-cache"])
         assert result2.exit_code == 0
+        projects_index.assert_not_called()
 
         # Verify cache is cleared
         cache_files = list(cache_dir.glob("*.json")) if cache_dir.exists() else []
         assert len(cache_files) == 0
 
+    def test_cli_clear_cache_forgets_indexed_project(
+        self, temp_projects_dir, sample_jsonl_data
+    ):
+        """Test --clear-cache on a project drops it from its root's index."""
+        project_dir = temp_projects_dir / "project-0"
+        project_dir.mkdir()
+        with open(project_dir / "session-0.jsonl", "w") as f:
+            for entry in sample_jsonl_data:
+                f.write(json.dumps(entry) + "\n")
+        process_projects_hierarchy(projects_path=temp_projects_dir, use_cache=True)
+        index_file = temp_projects_dir / "projects_index.json"
+        assert "project-0" in json.loads(index_file.read_text())["projects"]
+
+        runner = CliRunner()
+        result = runner.invoke(main, [str(project_dir), "--clear-cache"])
+        assert result.exit_code == 0
+        assert "project-0" not in json.loads(index_file.read_text())["projects"]
+
     def test_cli_all_projects_caching(self, temp_projects_dir, sample_jsonl_data):
         """Test caching with --all-projects flag."""
         # Create multiple projects
@@ -183,6 +214,125 @@ class TestCacheIntegrationCLI:
         )
         assert result2.exit_code == 0
 
+    @pytest.mark.parametrize("jobs", ["1", "2"])
+    def test_cli_build_cache(self, temp_projects_dir, sample_jsonl_data, jobs):
+        """Test --build-cache fills every project's cache without writing HTML."""
+        for i in range(3):
+            project_dir = temp_projects_dir / f"project-{i}"
+            project_dir.mkdir()
+            with open(project_dir / f"session-{i}.jsonl", "w") as f:
+                for entry in sample_jsonl_data:
+                    f.write(json.dumps(entry) + "\n")
+
+        runner = CliRunner()
+        result = runner.invoke(
+            main, [str(temp_projects_dir), "--build-cache", "--jobs", jobs]
+        )
+        assert result.exit_code == 0
+        assert "Parsed 3 files" in result.output
+        assert "in 3 projects" in result.output
+
+        for i in range(3):
+            project_dir = temp_projects_dir / f"project-{i}"
+            cache_manager = CacheManager(project_dir, "1.0.0")
+            assert not cache_manager.get_modified_files(
+                list(project_dir.glob("*.jsonl"))
+            )
+            assert not list(project_dir.glob("*.html"))
+        # The projects index records generated HTML, which isn't built here
+        assert not (temp_projects_dir / "projects_index.json").exists()
+
+        # Caches that are up to date aren't parsed again
+        result = runner.invoke(main, [str(temp_projects_dir), "--build-cache"])
+        assert result.exit_code == 0
+        assert "Parsed 0 files" in result.output
+
+        # A single project can be built on its own
+        jsonl_file = temp_projects_dir / "project-1" / "session-1.jsonl"
+        with open(jsonl_file, "a") as f:
+            f.write(json.dumps(sample_jsonl_data[0]) + "\n")
+        stat = jsonl_file.stat()
+        os.utime(jsonl_file, (stat.st_atime, stat.st_mtime + 10))
+        result = runner.invoke(
+            main, [str(temp_projects_dir / "project-1"), "--build-cache"]
+        )
+        assert result.exit_code == 0
+        assert "Parsed 1 files" in result.output
+        assert "in 1 projects" in result.output
+
+    def test_cli_build_cache_then_all_projects(
+        self, temp_projects_dir, sample_jsonl_data
+    ):
+        """Test pages are regenerated for messages cached by --build-cache."""
+        project_dir = temp_projects_dir / "project-0"
+        project_dir.mkdir()
+        jsonl_file = project_dir / "session-0.jsonl"
+        with open(jsonl_file, "w") as f:
+            for entry in sample_jsonl_data:
+                f.write(json.dumps(entry) + "\n")
+
+        runner = CliRunner()
+        result = runner.invoke(main, [str(temp_projects_dir), "--all-projects"])
+        assert result.exit_code == 0
+
+        new_entry = dict(
+            sample_jsonl_data[0],
+            uuid="user-2",
+            timestamp="2023-01-01T10:02:00Z",
+            message={"role": "user", "content": "A message added later"},
+        )
+        with open(jsonl_file, "a") as f:
+            f.write(json.dumps(new_entry) + "\n")
+        stat = jsonl_file.stat()
+        os.utime(jsonl_file, (stat.st_atime, stat.st_mtime + 10))
+
+        result = runner.invoke(main, [str(temp_projects_dir), "--build-cache"])
+        assert result.exit_code == 0
+        result = runner.invoke(main, [str(temp_projects_dir), "--all-projects"])
+        assert result.exit_code == 0
+
+        assert "A message added later" in (
+            (project_dir / "combined_transcripts.html").read_text()
+        )
+        assert "A message added later" in (
+            (project_dir / "session-session-1.html").read_text()
+        )
+
+    def test_cli_gc_cache(self, temp_projects_dir, sample_jsonl_data):
+        """Test --gc-cache drops deleted files' caches and evicts to a budget."""
+        for i in range(2):
+            project_dir = temp_projects_dir / f"project-{i}"
+            project_dir.mkdir()
+            for name in ("a", "b"):
+                with open(project_dir / f"{name}.jsonl", "w") as f:
+                    for entry in sample_jsonl_data:
+                        f.write(json.dumps(entry) + "\n")
+
+        runner = CliRunner()
+        result = runner.invoke(main, [str(temp_projects_dir), "--build-cache"])
+        assert result.exit_code == 0
+        (temp_projects_dir / "project-0" / "a.jsonl").unlink()
+
+        result = runner.invoke(main, [str(temp_projects_dir), "--gc-cache"])
+        assert result.exit_code == 0
+        assert "Removed the caches of 1 deleted files" in result.output
+        assert not (temp_projects_dir / "project-0" / "cache" / "a.json").exists()
+
+        result = runner.invoke(
+            main, [str(temp_projects_dir), "--gc-cache", "--cache-max-size", "0"]
+        )
+        assert result.exit_code == 0
+        assert "evicted 3 cached files" in result.output
+        for i in range(2):
+            cache_dir = temp_projects_dir / f"project-{i}" / "cache"
+            assert [p.name for p in cache_dir.glob("*.json")] == ["index.json"]
+
+        result = runner.invoke(
+            main, [str(temp_projects_dir), "--gc-cache", "--cache-max-size", "lots"]
+        )
+        assert result.exit_code != 0
+        assert "not a size" in result.output
+
 
 class TestCacheIntegrationConverter:
     """Test cache integration with converter functions."""
@@ -254,6 +404,394 @@ class TestCacheIntegrationConverter:
         )
         assert output2.exists()
 
+    def test_process_projects_hierarchy_uses_projects_index(
+        self, temp_projects_dir, sample_jsonl_data
+    ):
+        """Test unchanged projects are answered from the projects index."""
+        for i in range(2):
+            project_dir = temp_projects_dir / f"project-{i}"
+            project_dir.mkdir()
+            with open(project_dir / f"session-{i}.jsonl", "w") as f:
+                for entry in sample_jsonl_data:
+                    f.write(json.dumps(entry) + "\n")
+
+        process_projects_hierarchy(projects_path=temp_projects_dir, use_cache=True)
+        assert (temp_projects_dir / "projects_index.json").exists()
+
+        # Grow one project; only that one is loaded again
+        changed_file = temp_projects_dir / "project-1" / "session-1.jsonl"
+        with open(changed_file, "a") as f:
+            f.write(json.dumps(sample_jsonl_data[0]) + "\n")
+
+        with patch(
+            "claude_code_log.converter.CacheManager", wraps=CacheManager
+        ) as cache_manager:
+            index_path = process_projects_hierarchy(
+                projects_path=temp_projects_dir, use_cache=True
+            )
+        opened = {call.args[0].name for call in cache_manager.call_args_list}
+        assert opened == {"project-1"}
+
+        index_html = index_path.read_text()
+        assert "project-0" in index_html
+        assert "project-1" in index_html
+
+    def test_pages_fingerprint_the_cache_they_render(
+        self, setup_test_project, sample_jsonl_data
+    ):
+        """Test a page rendered from a stale cache is rebuilt once it's fresh."""
+        project_dir = setup_test_project
+        jsonl_file = project_dir / "session-1.jsonl"
+        convert_jsonl_to_html(project_dir, silent=True)
+
+        # A cache from before sizes were recorded, which can't tell that a
+        # line was appended within the mtime tolerance
+        cache_manager = CacheManager(project_dir, get_library_version())
+        with cache_manager.batch():
+            cached_info = cache_manager.get_cached_file_info(jsonl_file)
+            cached_info.source_size = None
+            cache_manager._save_project_cache()
+        cache_manager.close()
+        new_entry = dict(
+            sample_jsonl_data[0],
+            uuid="user-2",
+            timestamp="2023-01-01T10:02:00Z",
+            message={"role": "user", "content": "A message added later"},
+        )
+        with open(jsonl_file, "a") as f:
+            f.write(json.dumps(new_entry) + "\n")
+        os.utime(jsonl_file, (cached_info.source_mtime, cached_info.source_mtime))
+        convert_jsonl_to_html(project_dir, silent=True)
+
+        # Once the cache sees the change, the pages are generated again
+        stat = jsonl_file.stat()
+        os.utime(jsonl_file, (stat.st_atime, stat.st_mtime + 10))
+        convert_jsonl_to_html(project_dir, silent=True)
+        assert "A message added later" in (
+            (project_dir / "combined_transcripts.html").read_text()
+        )
+        assert "A message added later" in (
+            (project_dir / "session-session-1.html").read_text()
+        )
+
+    def test_project_lookup_does_not_index_stale_caches(
+        self, temp_projects_dir, sample_jsonl_data
+    ):
+        """Test projects read for cwd matching aren't recorded as up to date."""
+        project_dir = temp_projects_dir / "project-0"
+        project_dir.mkdir()
+        jsonl_file = project_dir / "session-0.jsonl"
+        with open(jsonl_file, "w") as f:
+            for entry in sample_jsonl_data:
+                f.write(json.dumps(entry) + "\n")
+        process_projects_hierarchy(projects_path=temp_projects_dir, use_cache=True)
+
+        new_entry = dict(
+            sample_jsonl_data[0],
+            uuid="user-2",
+            timestamp="2023-01-01T10:02:00Z",
+            message={"role": "user", "content": "A message added later"},
+        )
+        with open(jsonl_file, "a") as f:
+            f.write(json.dumps(new_entry) + "\n")
+        stat = jsonl_file.stat()
+        os.utime(jsonl_file, (stat.st_atime, stat.st_mtime + 10))
+
+        # Matched by working directory from the project's (stale) cache
+        assert find_projects_by_cwd(temp_projects_dir, "/test/subdir") == [project_dir]
+        process_projects_hierarchy(projects_path=temp_projects_dir, use_cache=True)
+        assert "A message added later" in (
+            (project_dir / "combined_transcripts.html").read_text()
+        )
+
+    def test_process_projects_hierarchy_regenerates_deleted_pages(
+        self, temp_projects_dir, sample_jsonl_data
+    ):
+        """Test unchanged projects missing a session page are processed again."""
+        project_dir = temp_projects_dir / "project-0"
+        project_dir.mkdir()
+        with open(project_dir / "session-0.jsonl", "w") as f:
+            for entry in sample_jsonl_data:
+                f.write(json.dumps(entry) + "\n")
+
+        process_projects_hierarchy(projects_path=temp_projects_dir, use_cache=True)
+        session_pages = list(project_dir.glob("session-*.html"))
+        assert session_pages
+        session_pages[0].unlink()
+
+        process_projects_hierarchy(projects_path=temp_projects_dir, use_cache=True)
+        assert session_pages[0].exists()
+
+    @pytest.mark.parametrize("jobs", [1, 3])
+    def test_process_projects_hierarchy_in_parallel(
+        self, temp_projects_dir, sample_jsonl_data, jobs
+    ):
+        """Test projects processed in parallel are indexed in project order."""
+        for i in range(4):
+            project_dir = temp_projects_dir / f"project-{i}"
+            project_dir.mkdir()
+            with open(project_dir / f"session-{i}.jsonl", "w") as f:
+                for entry in sample_jsonl_data:
+                    f.write(json.dumps(entry) + "\n")
+
+        with patch(
+            "claude_code_log.converter.generate_projects_index_html",
+            wraps=generate_projects_index_html,
+        ) as generate_index:
+            process_projects_hierarchy(
+                projects_path=temp_projects_dir, use_cache=True, jobs=jobs
+            )
+        project_summaries = generate_index.call_args.args[0]
+        assert [summary["name"] for summary in project_summaries] == [
+            f"project-{i}" for i in range(4)
+        ]
+        for i in range(4):
+            project_dir = temp_projects_dir / f"project-{i}"
+            assert (project_dir / "combined_transcripts.html").exists()
+            assert (project_dir / "session-session-1.html").exists()
+
+        # Every project was indexed, so nothing is processed again
+        with patch("claude_code_log.converter.CacheManager") as cache_manager:
+            process_projects_hierarchy(
+                projects_path=temp_projects_dir, use_cache=True, jobs=jobs
+            )
+        cache_manager.assert_not_called()
+
+    def test_process_projects_hierarchy_isolates_failures(
+        self, temp_projects_dir, sample_jsonl_data, capsys
+    ):
+        """Test a failing project is reported and the others are still indexed."""
+        for i in range(3):
+            project_dir = temp_projects_dir / f"project-{i}"
+            project_dir.mkdir()
+            with open(project_dir / f"session-{i}.jsonl", "w") as f:
+                for entry in sample_jsonl_data:
+                    f.write(json.dumps(entry) + "\n")
+
+        scan = ProjectPipeline.scan
+
+        def fail_project_1(pipeline, *args, **kwargs):
+            if pipeline.input_path.name == "project-1":
+                raise RuntimeError("unreadable project")
+            return scan(pipeline, *args, **kwargs)
+
+        with patch.object(
+            ProjectPipeline, "scan", autospec=True, side_effect=fail_project_1
+        ):
+            index_path = process_projects_hierarchy(
+                projects_path=temp_projects_dir, use_cache=True
+            )
+        assert "Failed to process" in capsys.readouterr().out
+        index_html = index_path.read_text()
+        assert "project-0/" in index_html
+        assert "project-1/" not in index_html
+        assert "project-2/" in index_html
+
+    def test_project_entries_are_read_once_per_pass(
+        self, setup_test_project, temp_projects_dir
+    ):
+        """Test the cache update and navigation share one read of the project."""
+        with patch(
+            "claude_code_log.converter.iter_project", wraps=iter_project
+        ) as project_reads:
+            convert_jsonl_to_html(
+                setup_test_project, generate_individual_sessions=False
+            )
+        # One scan that updates the cache, one pass to render
+        assert project_reads.call_count == 2
+
+        with patch(
+            "claude_code_log.converter.iter_project", wraps=iter_project
+        ) as project_reads:
+            convert_jsonl_to_html(
+                setup_test_project, generate_individual_sessions=False
+            )
+        # Nothing changed: only the scan for the navigation
+        assert project_reads.call_count == 1
+
+        # Date-filtered runs bypass the projects index and refresh the cache
+        with patch.object(
+            ProjectPipeline, "report_loads", autospec=True
+        ) as report_loads:
+            process_projects_hierarchy(temp_projects_dir, from_date="2023-01-01")
+        (pipeline,) = [call.args[0] for call in report_loads.call_args_list]
+        assert pipeline.loads == 2
+        assert pipeline.session_loads == 1
+
+    def _write_sessions(self, path, sample_jsonl_data, session_numbers):
+        """Write copies of the sample conversation, one per session, to a file."""
+        with open(path, "w") as f:
+            for n in session_numbers:
+                for entry in sample_jsonl_data[:2]:
+                    entry = json.loads(json.dumps(entry))
+                    entry.update(uuid=f"{entry['uuid']}-{n}", sessionId=f"s{n}")
+                    entry["timestamp"] = entry["timestamp"].replace("10:", f"{10 + n}:")
+                    f.write(json.dumps(entry) + "\n")
+
+    def test_session_pages_read_shared_files_once(
+        self, temp_projects_dir, sample_jsonl_data
+    ):
+        """Test sessions sharing a file are partitioned from one read of it."""
+        project_dir = temp_projects_dir / "shared"
+        project_dir.mkdir()
+        self._write_sessions(project_dir / "a.jsonl", sample_jsonl_data, [1, 2, 3])
+        self._write_sessions(project_dir / "b.jsonl", sample_jsonl_data, [4])
+
+        with patch(
+            "claude_code_log.converter.iter_project", wraps=iter_project
+        ) as project_reads:
+            convert_jsonl_to_html(project_dir)
+        session_reads = [
+            call.kwargs["jsonl_files"]
+            for call in project_reads.call_args_list
+            if "jsonl_files" in call.kwargs
+        ]
+        assert sorted([path.name for path in files] for files in session_reads) == [
+            ["a.jsonl"],
+            ["b.jsonl"],
+        ]
+
+        # Each page only has its own session's messages
+        for n in range(1, 5):
+            page = (project_dir / f"session-s{n}.html").read_text()
+            for other in range(1, 5):
+                assert (f"2023-01-01 {10 + other}:00:00" in page) == (other == n)
+
+    def test_session_pages_rendered_in_parallel(
+        self, temp_projects_dir, sample_jsonl_data
+    ):
+        """Test session pages rendered in a process pool match serial ones."""
+        pages = {}
+        for jobs in (1, 2):
+            project_dir = temp_projects_dir / f"jobs-{jobs}"
+            project_dir.mkdir()
+            for n in range(1, 4):
+                self._write_sessions(project_dir / f"{n}.jsonl", sample_jsonl_data, [n])
+            convert_jsonl_to_html(project_dir, jobs=jobs)
+            pages[jobs] = {
+                path.name: path.read_text()
+                for path in sorted(project_dir.glob("session-*.html"))
+            }
+        assert len(pages[1]) == 3
+        assert pages[1].keys() == pages[2].keys()
+        for name, html in pages[1].items():
+            # Pages only differ by the project directory name in their title
+            assert html.replace("jobs-1", "jobs-2") == pages[2][name]
+
+        # Only the session whose file changed is written again
+        project_dir = temp_projects_dir / "jobs-2"
+        changed_file = project_dir / "2.jsonl"
+        self._write_sessions(changed_file, sample_jsonl_data, [2, 5])
+        stat = changed_file.stat()
+        os.utime(changed_file, (stat.st_atime, stat.st_mtime + 10))
+        with (
+            patch("claude_code_log.converter._write_session_pages_worker") as worker,
+            patch(
+                "claude_code_log.converter._write_session_pages",
+                wraps=_write_session_pages,
+            ) as write_pages,
+        ):
+            convert_jsonl_to_html(project_dir, jobs=2)
+        worker.assert_not_called()
+        (call,) = write_pages.call_args_list
+        assert [page.session_id for page in call.args[2]] == ["s2", "s5"]
+
+    def test_convert_renders_only_new_messages(
+        self, setup_test_project, sample_jsonl_data, temp_projects_dir
+    ):
+        """Test regenerated pages take unchanged messages from the fragment cache."""
+        convert_jsonl_to_html(setup_test_project, generate_individual_sessions=False)
+
+        new_entry = json.loads(json.dumps(sample_jsonl_data[1]))
+        new_entry.update(
+            uuid="assistant-2", timestamp="2023-01-01T10:02:00Z", requestId="req-2"
+        )
+        new_entry["message"]["content"] = [{"type": "text", "text": "Anything else?"}]
+        with open(setup_test_project / "session-1.jsonl", "a") as f:
+            f.write(json.dumps(new_entry) + "\n")
+        # Make sure the modification is seen within the mtime tolerance
+        stat = (setup_test_project / "session-1.jsonl").stat()
+        os.utime(
+            setup_test_project / "session-1.jsonl",
+            (stat.st_atime, stat.st_mtime + 10),
+        )
+
+        output = setup_test_project / "combined_transcripts.html"
+        output.unlink()
+        with patch(
+            "claude_code_log.renderer._render_message_fragments",
+            wraps=_render_message_fragments,
+        ) as render:
+            convert_jsonl_to_html(
+                setup_test_project, generate_individual_sessions=False
+            )
+        assert render.call_count == 1
+
+        uncached = temp_projects_dir / "uncached.html"
+        convert_jsonl_to_html(
+            setup_test_project,
+            uncached,
+            generate_individual_sessions=False,
+            use_cache=False,
+        )
+        assert output.read_text() == uncached.read_text()
+
+    def test_convert_regenerates_only_changed_pages(
+        self, setup_test_project, sample_jsonl_data
+    ):
+        """Test that only pages whose inputs changed are regenerated."""
+        other_session = []
+        for entry in sample_jsonl_data[:2]:
+            entry = json.loads(json.dumps(entry))
+            entry.update(uuid=f"other-{entry['uuid']}", sessionId="session-2")
+            other_session.append(entry)
+        with open(setup_test_project / "session-2.jsonl", "w") as f:
+            for entry in other_session:
+                f.write(json.dumps(entry) + "\n")
+
+        def written_pages(**kwargs):
+            with patch(
+                "claude_code_log.converter._write_html_chunks"
+            ) as write_html_chunks:
+                write_html_chunks.side_effect = lambda path, chunks: path.write_text(
+                    "".join(chunks)
+                )
+                convert_jsonl_to_html(setup_test_project, **kwargs)
+            return {call.args[0].name for call in write_html_chunks.call_args_list}
+
+        assert written_pages() == {
+            "combined_transcripts.html",
+            "session-session-1.html",
+            "session-session-2.html",
+        }
+        assert written_pages() == set()
+
+        # Touching a file doesn't change what the pages are generated from
+        stat = (setup_test_project / "session-2.jsonl").stat()
+        os.utime(
+            setup_test_project / "session-2.jsonl",
+            (stat.st_atime, stat.st_mtime + 10),
+        )
+        assert written_pages() == set()
+
+        new_entry = json.loads(json.dumps(sample_jsonl_data[1]))
+        new_entry.update(uuid="assistant-2", timestamp="2023-01-01T10:02:00Z")
+        with open(setup_test_project / "session-1.jsonl", "a") as f:
+            f.write(json.dumps(new_entry) + "\n")
+        assert written_pages() == {
+            "combined_transcripts.html",
+            "session-session-1.html",
+        }
+
+        # A date filtered run replaces the pages, so they are rebuilt after it
+        assert written_pages(from_date="2023-01-02") == {"combined_transcripts.html"}
+        assert "combined_transcripts.html" in written_pages()
+        assert written_pages() == set()
+
+        # Deleted pages are regenerated
+        (setup_test_project / "session-session-2.html").unlink()
+        assert written_pages() == {"session-session-2.html"}
+
 
 class TestCachePerformanceIntegration:
     """Test cache performance benefits in integration scenarios."""
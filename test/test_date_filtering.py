@@ -5,8 +5,13 @@ import json
 import tempfile
 from datetime import datetime, timedelta
 from pathlib import Path
+from unittest.mock import patch
+
+from claude_code_log import parser
+from claude_code_log.cache import CacheManager
 from claude_code_log.converter import filter_messages_by_date, convert_jsonl_to_html
 from claude_code_log.models import parse_transcript_entry
+from claude_code_log.parser import TimestampPrefilter, load_transcript
 
 
 def create_test_message(timestamp_str: str, text: str) -> dict:
@@ -165,6 +170,111 @@ def test_natural_language_dates():
             raise
 
 
+def test_timestamp_prefilter():
+    """Test the cheap timestamp checks used to push the date range down."""
+    prefilter = TimestampPrefilter(
+        datetime(2025, 6, 10, 12, 0, 0, 500000), datetime(2025, 6, 11, 8, 30)
+    )
+
+    assert not prefilter.may_contain("2025-06-10T11:59:59.999Z")
+    assert prefilter.may_contain("2025-06-10T12:00:00.100Z")  # same second
+    assert prefilter.may_contain("2025-06-11T08:30:00Z")
+    assert not prefilter.may_contain("2025-06-11T08:30:01Z")
+    assert prefilter.may_contain("not a timestamp")
+
+    # contains() decides the bound's second exactly
+    assert not prefilter.contains("2025-06-10T12:00:00.100Z")
+    assert prefilter.contains("2025-06-10T12:00:00.600Z")
+    assert prefilter.contains("2025-06-10T18:00:00Z")
+
+    assert not prefilter.may_overlap("2025-06-01T00:00:00Z", "2025-06-09T00:00:00Z")
+    assert prefilter.may_overlap("2025-06-01T00:00:00Z", "2025-06-12T00:00:00Z")
+    assert not prefilter.may_overlap("2025-06-12T00:00:00Z", "2025-06-13T00:00:00Z")
+
+    # Raw lines are kept if any timestamp field may be in range, or if they
+    # have none
+    nested = json.dumps(
+        {
+            "timestamp": "2025-06-01T00:00:00Z",
+            "toolUseResult": {"timestamp": "2025-06-10T13:00:00Z"},
+        }
+    ).encode()
+    assert prefilter.line_may_match(nested)
+    assert not prefilter.line_may_match(b'{"timestamp": "2025-06-01T00:00:00Z"}')
+    assert prefilter.line_may_match(b'{"type": "summary"}')
+
+
+def test_offset_timestamps_compare_as_instants():
+    """Timestamps with a UTC offset are filtered by the instant they denote."""
+    message = parse_transcript_entry(
+        create_test_message("2025-06-10T14:30:00+02:00", "Half past noon UTC")
+    )
+    from_dt, to_dt = datetime(2025, 6, 10, 12, 0), datetime(2025, 6, 10, 13, 0)
+
+    assert parser.is_in_date_range(message, from_dt, to_dt)
+    assert not parser.is_in_date_range(message, None, datetime(2025, 6, 10, 12, 0))
+
+    # The prefix comparison doesn't apply to them, so they are never rejected
+    prefilter = TimestampPrefilter(from_dt, to_dt)
+    assert prefilter.may_contain("2025-06-10T14:30:00+02:00")
+    assert prefilter.contains("2025-06-10T14:30:00+02:00")
+    assert not prefilter.may_contain("2025-06-10T14:30:00+00:00")
+
+
+def test_date_range_is_pushed_into_scan(tmp_path):
+    """Lines out of range are rejected before they are decoded."""
+    timestamps = [f"2025-06-{day:02d}T10:00:00Z" for day in range(1, 11)]
+    jsonl_path = tmp_path / "session.jsonl"
+    with open(jsonl_path, "w") as f:
+        f.write(json.dumps({"type": "summary", "summary": "S", "leafUuid": "x"}))
+        f.write("\n")
+        for timestamp in timestamps:
+            f.write(json.dumps(create_test_message(timestamp, timestamp)) + "\n")
+
+    with patch.object(
+        parser, "_decode_transcript_line", wraps=parser._decode_transcript_line
+    ) as decode:
+        entries = load_transcript(
+            jsonl_path, from_date="2025-06-08", to_date="2025-06-10", silent=True
+        )
+    # The summary and the entries of June 8th and 9th
+    assert decode.call_count == 3
+
+    expected = filter_messages_by_date(
+        load_transcript(jsonl_path, silent=True), "2025-06-08", "2025-06-10"
+    )
+    filtered = filter_messages_by_date(entries, "2025-06-08", "2025-06-10")
+    assert [e.model_dump() for e in filtered] == [e.model_dump() for e in expected]
+    assert len(filtered) == 3
+
+
+def test_cached_files_out_of_range_are_skipped(tmp_path):
+    """The cache index lets filtered loads skip files entirely out of range."""
+    jsonl_path = tmp_path / "old.jsonl"
+    with open(jsonl_path, "w") as f:
+        for day in range(1, 4):
+            message = create_test_message(f"2025-06-0{day}T10:00:00Z", "old")
+            f.write(json.dumps(message) + "\n")
+
+    cache_manager = CacheManager(tmp_path, "1.0.0")
+    load_transcript(jsonl_path, cache_manager, silent=True)
+    info = cache_manager.get_cached_file_info(jsonl_path)
+    assert info is not None
+    assert info.earliest_timestamp == "2025-06-01T10:00:00Z"
+    assert info.latest_timestamp == "2025-06-03T10:00:00Z"
+
+    in_range = cache_manager.load_cached_entries_filtered(
+        jsonl_path, "2025-06-02", "2025-06-02"
+    )
+    assert in_range is not None and len(in_range) == 1
+
+    # An unreadable cache file proves it isn't opened for other ranges
+    cache_manager._get_cache_file_path(jsonl_path).write_text("corrupt")
+    assert (
+        cache_manager.load_cached_entries_filtered(jsonl_path, "2025-07-01", None) == []
+    )
+
+
 if __name__ == "__main__":
     test_date_filtering()
     test_invalid_date_handling()
@@ -0,0 +1,347 @@
+#!/usr/bin/env python3
+"""Tests for the streaming transcript pipeline."""
+
+import json
+import mmap
+import os
+from pathlib import Path
+from typing import Any, Dict, List
+from unittest.mock import patch
+
+import pytest
+
+from claude_code_log import parser
+from claude_code_log.cache import CacheManager
+from claude_code_log.converter import convert_jsonl_to_html
+from claude_code_log.models import ValidationStats
+from claude_code_log.parser import (
+    find_session_files,
+    iter_project,
+    iter_transcript,
+    load_directory_transcripts,
+    load_transcript,
+)
+from claude_code_log.renderer import SessionIndex, generate_html, render_html_chunks
+
+TEST_DATA_DIR = Path(__file__).parent / "test_data"
+
+
+def _user_entry(
+    uuid: str, session_id: str, timestamp: str, text: str
+) -> Dict[str, Any]:
+    return {
+        "type": "user",
+        "timestamp": timestamp,
+        "parentUuid": None,
+        "isSidechain": False,
+        "userType": "human",
+        "cwd": "/tmp",
+        "sessionId": session_id,
+        "version": "1.0.0",
+        "uuid": uuid,
+        "message": {"role": "user", "content": [{"type": "text", "text": text}]},
+    }
+
+
+def _write_jsonl(path: Path, entries: List[Dict[str, Any]]) -> None:
+    with open(path, "w", encoding="utf-8") as f:
+        for entry in entries:
+            f.write(json.dumps(entry) + "\n")
+
+
+@pytest.fixture
+def project_dir(tmp_path: Path) -> Path:
+    """Three files: two interleaved sessions and a later one."""
+    _write_jsonl(
+        tmp_path / "a.jsonl",
+        [
+            _user_entry("a1", "session-a", "2025-01-01T10:00:00Z", "A first"),
+            _user_entry("a3", "session-a", "2025-01-01T10:02:00Z", "A second"),
+            # Out of order within the file
+            _user_entry("a2", "session-a", "2025-01-01T10:01:30Z", "A late"),
+        ],
+    )
+    _write_jsonl(
+        tmp_path / "b.jsonl",
+        [
+            {"type": "summary", "summary": "Session B summary", "leafUuid": "b2"},
+            _user_entry("b1", "session-b", "2025-01-01T10:01:00Z", "B first"),
+            _user_entry("b2", "session-b", "2025-01-01T10:03:00Z", "B second"),
+        ],
+    )
+    _write_jsonl(
+        tmp_path / "c.jsonl",
+        [_user_entry("c1", "session-c", "2025-01-02T09:00:00Z", "C only")],
+    )
+    return tmp_path
+
+
+class TestIterTranscript:
+    def test_matches_load_transcript(self):
+        path = TEST_DATA_DIR / "representative_messages.jsonl"
+        streamed = list(iter_transcript(path, silent=True))
+        loaded = load_transcript(path, silent=True)
+        assert [e.model_dump() for e in streamed] == [e.model_dump() for e in loaded]
+
+    def test_is_lazy(self, tmp_path: Path):
+        path = tmp_path / "session.jsonl"
+        _write_jsonl(
+            path,
+            [
+                _user_entry("u1", "s", "2025-01-01T10:00:00Z", "one"),
+                _user_entry("u2", "s", "2025-01-01T10:01:00Z", "two"),
+            ],
+        )
+        entries = iter_transcript(path, silent=True)
+        first = next(entries)
+        assert first.uuid == "u1"  # type: ignore
+
+        # Lines not read yet are picked up by the running iterator
+        with open(path, "a", encoding="utf-8") as f:
+            f.write(
+                json.dumps(_user_entry("u3", "s", "2025-01-01T10:02:00Z", "three"))
+                + "\n"
+            )
+        assert [e.uuid for e in entries] == ["u2", "u3"]  # type: ignore
+
+
+class TestIterProject:
+    def test_timestamped_order_matches_directory_load(self, project_dir: Path):
+        streamed = [
+            getattr(e, "uuid", None) for e in iter_project(project_dir, silent=True)
+        ]
+        loaded = [
+            getattr(e, "uuid", None)
+            for e in load_directory_transcripts(project_dir, silent=True)
+        ]
+        assert [u for u in streamed if u] == [u for u in loaded if u]
+        assert [u for u in streamed if u] == ["a1", "b1", "a2", "a3", "b2", "c1"]
+        # The summary is yielded once its file has been opened
+        assert streamed.count(None) == 1
+
+    def test_mixed_offset_order(self, tmp_path: Path):
+        # a1 is at 05:00Z, so a.jsonl must be opened before b.jsonl even
+        # though its timestamp string sorts after b1's
+        _write_jsonl(
+            tmp_path / "a.jsonl",
+            [
+                _user_entry("a1", "s", "2025-01-01T10:00:00+05:00", "A first"),
+                _user_entry("a2", "s", "2025-01-01T06:30:00Z", "A second"),
+            ],
+        )
+        _write_jsonl(
+            tmp_path / "b.jsonl",
+            [
+                _user_entry("b1", "s", "2025-01-01T06:00:00Z", "B first"),
+                _user_entry("b2", "s", "2025-01-01T07:00:00Z", "B second"),
+            ],
+        )
+        streamed = [e.uuid for e in iter_project(tmp_path, silent=True)]  # type: ignore
+        loaded = [
+            e.uuid  # type: ignore
+            for e in load_directory_transcripts(tmp_path, silent=True)
+        ]
+        assert streamed == loaded == ["a1", "b1", "a2", "b2"]
+
+    def test_files_opened_lazily(self, project_dir: Path):
+        with patch.object(
+            parser, "load_transcript", wraps=parser.load_transcript
+        ) as load:
+            entries = iter_project(project_dir, silent=True)
+            next(entries)
+            assert {call.args[0].name for call in load.call_args_list} == {"a.jsonl"}
+
+            # b.jsonl starts before a.jsonl's second entry
+            next(entries)
+            assert load.call_count == 2
+
+            # c.jsonl is only needed once the first two files are exhausted
+            for _ in range(5):
+                next(entries)
+            assert load.call_count == 3
+
+    def test_jsonl_files_subset(self, project_dir: Path):
+        entries = iter_project(
+            project_dir, silent=True, jsonl_files=[project_dir / "c.jsonl"]
+        )
+        assert [getattr(e, "uuid", None) for e in entries] == ["c1"]
+
+    def test_find_session_files(self, project_dir: Path):
+        session_files = find_session_files(sorted(project_dir.glob("*.jsonl")))
+        assert {k: [p.name for p in v] for k, v in session_files.items()} == {
+            "session-a": ["a.jsonl"],
+            "session-b": ["b.jsonl"],
+            "session-c": ["c.jsonl"],
+        }
+
+    def test_cached_files_not_scanned(self, project_dir: Path):
+        cache_manager = CacheManager(project_dir, "1.0.0")
+        expected = [
+            getattr(e, "uuid", None)
+            for e in iter_project(project_dir, cache_manager, silent=True)
+        ]
+        jsonl_files = sorted(project_dir.glob("*.jsonl"))
+
+        with patch.object(
+            parser, "_scan_transcript_file", wraps=parser._scan_transcript_file
+        ) as scan:
+            cached = [
+                getattr(e, "uuid", None)
+                for e in iter_project(project_dir, cache_manager, silent=True)
+            ]
+            session_files = find_session_files(jsonl_files, cache_manager)
+            assert scan.call_count == 0
+
+            # An appended file is scanned again
+            with open(project_dir / "c.jsonl", "a", encoding="utf-8") as f:
+                f.write(
+                    json.dumps(
+                        _user_entry("c2", "session-c", "2025-01-02T09:01:00Z", "C")
+                    )
+                    + "\n"
+                )
+            os.utime(project_dir / "c.jsonl", (0, 0))
+            find_session_files(jsonl_files, cache_manager)
+            assert [call.args[0].name for call in scan.call_args_list] == ["c.jsonl"]
+
+        assert cached == expected
+        assert session_files == find_session_files(jsonl_files)
+
+
+class TestParallelLoading:
+    def test_directory_load_matches_serial(self, project_dir: Path):
+        serial = load_directory_transcripts(project_dir, silent=True)
+        parallel = load_directory_transcripts(project_dir, silent=True, jobs=2)
+        assert [e.model_dump() for e in parallel] == [e.model_dump() for e in serial]
+
+    def test_iter_project_matches_serial(self, project_dir: Path):
+        serial = [e.model_dump() for e in iter_project(project_dir, silent=True)]
+        parallel = [
+            e.model_dump() for e in iter_project(project_dir, silent=True, jobs=2)
+        ]
+        assert parallel == serial
+
+    def test_workers_fill_cache_and_stats(self, project_dir: Path):
+        cache_manager = CacheManager(project_dir, "1.0.0")
+        stats = ValidationStats(level="basic")
+        entries = load_directory_transcripts(
+            project_dir,
+            cache_manager,
+            silent=True,
+            validation="basic",
+            validation_stats=stats,
+            jobs=2,
+        )
+
+        assert stats.entries_checked == len(entries) == 7
+        for jsonl_path in project_dir.glob("*.jsonl"):
+            assert cache_manager.is_file_cached(jsonl_path)
+
+        # A second load comes from the cache, in the same order
+        cached = load_directory_transcripts(project_dir, cache_manager, jobs=2)
+        assert [getattr(e, "uuid", None) for e in cached] == [
+            getattr(e, "uuid", None) for e in entries
+        ]
+
+
+class TestChunkedParsing:
+    @pytest.fixture
+    def large_file(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+        """A file split into many ranges, with blank, broken and partial lines."""
+        monkeypatch.setattr(parser, "PARALLEL_CHUNK_BYTES", 1024)
+        lines = [
+            json.dumps(
+                _user_entry(f"u{i}", "s", f"2025-01-01T10:{i % 60:02d}:00Z", "x" * i)
+            )
+            for i in range(60)
+        ]
+        lines[7] = ""
+        lines[23] = "not json"
+        lines[41] = json.dumps({"type": "unknown"})
+        path = tmp_path / "large.jsonl"
+        # The last line is still being written
+        path.write_text("\n".join(lines) + "\n" + lines[-1][:30])
+        return path
+
+    def test_split_line_ranges(self, large_file: Path):
+        data = large_file.read_bytes()
+        with (
+            open(large_file, "rb") as f,
+            mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped,
+        ):
+            ranges = list(parser._split_line_ranges(mapped, 0, len(data), 1024))
+
+        assert len(ranges) > 3
+        assert ranges[0][0] == 0 and ranges[-1][1] == len(data)
+        for (_, end), (start, _) in zip(ranges, ranges[1:]):
+            assert end == start and data[end - 1 : end] == b"\n"
+
+    def test_matches_sequential_parse(self, large_file: Path):
+        serial = load_transcript(large_file, silent=True)
+        chunked = load_transcript(large_file, silent=True, jobs=2)
+        assert [e.model_dump() for e in chunked] == [e.model_dump() for e in serial]
+        assert len(chunked) == 57
+
+    def test_error_line_numbers_match(
+        self, large_file: Path, capfd: pytest.CaptureFixture[str]
+    ):
+        load_transcript(large_file, silent=True)
+        serial = capfd.readouterr().out
+        load_transcript(large_file, silent=True, jobs=2)
+        chunked = capfd.readouterr().out
+
+        assert "Line 23 of" in serial and "Line 41 of" in serial
+        assert sorted(chunked.splitlines()) == sorted(serial.splitlines())
+
+    def test_cache_position_matches(self, large_file: Path):
+        stats = ValidationStats(level="basic")
+        cache_manager = CacheManager(large_file.parent, "1.0.0")
+        load_transcript(
+            large_file,
+            cache_manager,
+            silent=True,
+            validation="basic",
+            validation_stats=stats,
+            jobs=2,
+        )
+
+        info = cache_manager.get_cached_file_info(large_file)
+        assert info is not None
+        assert info.parsed_offset == large_file.read_bytes().rindex(b"\n") + 1
+        assert info.parsed_lines == 60
+        assert stats.entries_checked == 57
+
+
+class TestStreamingRender:
+    def test_render_chunks_match_generate_html(self):
+        messages = load_transcript(
+            TEST_DATA_DIR / "representative_messages.jsonl", silent=True
+        )
+        session_index = SessionIndex.from_messages(messages)
+        streamed = "".join(render_html_chunks(iter(messages), session_index, "T"))
+        assert streamed == generate_html(messages, "T")
+
+    def test_session_pages_use_project_summaries(self, project_dir: Path):
+        convert_jsonl_to_html(project_dir, use_cache=False, silent=True)
+
+        combined = (project_dir / "combined_transcripts.html").read_text()
+        assert "Session B summary" in combined
+
+        session_b = (project_dir / "session-session-b.html").read_text()
+        assert "Session B summary" in session_b
+        assert "B second" in session_b
+        assert "A first" not in session_b
+
+    def test_date_filtered_session_pages(self, project_dir: Path):
+        convert_jsonl_to_html(
+            project_dir,
+            from_date="2025-01-02",
+            to_date="2025-01-03",
+            use_cache=False,
+            silent=True,
+        )
+        assert (project_dir / "session-session-c.html").exists()
+        assert not (project_dir / "session-session-a.html").exists()
+        combined = (project_dir / "combined_transcripts.html").read_text()
+        assert "C only" in combined
+        assert "A first" not in combined
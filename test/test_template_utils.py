@@ -6,6 +6,8 @@ from datetime import datetime
 from claude_code_log.parser import parse_timestamp, extract_text_content
 from claude_code_log.renderer import (
     format_timestamp,
+    format_timestamp_ms,
+    format_timestamps_ms,
     extract_command_info,
     escape_html,
 )
@@ -33,6 +35,30 @@ class TestTimestampHandling:
         result = format_timestamp(invalid_timestamp)
         assert result == invalid_timestamp
 
+    def test_format_timestamp_converts_offset_to_utc(self):
+        """Test timestamps with a UTC offset are displayed in UTC."""
+        result = format_timestamp("2025-06-14T12:30:45.123+02:00")
+        assert result == "2025-06-14 10:30:45"
+
+    def test_format_timestamp_ms(self):
+        """Test formatting epoch milliseconds, with and without a custom format."""
+        timestamp_ms = 1749897045123  # 2025-06-14T10:30:45.123Z
+        assert format_timestamp_ms(timestamp_ms) == "2025-06-14 10:30:45"
+        assert format_timestamp_ms(timestamp_ms, "%m-%d %H:%M") == "06-14 10:30"
+        assert format_timestamp_ms(None) == ""
+
+    def test_format_timestamps_ms_batch(self):
+        """Test batch formatting keeps order and handles missing timestamps."""
+        result = format_timestamps_ms(
+            [1749897045123, 1749897045999, None, 1749897046000]
+        )
+        assert result == [
+            "2025-06-14 10:30:45",
+            "2025-06-14 10:30:45",
+            "",
+            "2025-06-14 10:30:46",
+        ]
+
     def test_parse_timestamp_valid(self):
         """Test parsing valid ISO timestamps."""
         timestamp = "2025-06-14T10:30:45.123Z"
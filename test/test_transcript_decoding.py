@@ -0,0 +1,359 @@
+#!/usr/bin/env python3
+"""Tests for transcript decoding at the none, basic and strict validation levels."""
+
+import json
+import pickle
+from pathlib import Path
+
+import pytest
+
+from claude_code_log.models import (
+    AssistantTranscriptEntry,
+    ImageContent,
+    LazyContentList,
+    SummaryTranscriptEntry,
+    TextContent,
+    ToolResultContent,
+    ToolUseContent,
+    UserTranscriptEntry,
+    ValidationStats,
+    construct_transcript_entry,
+    decode_transcript_entry,
+)
+from claude_code_log.parser import extract_text_content, load_transcript
+from claude_code_log.renderer import generate_html
+
+TEST_DATA_DIR = Path(__file__).parent / "test_data"
+
+
+def _user_entry(**overrides):
+    entry = {
+        "type": "user",
+        "timestamp": "2025-06-11T22:45:17.436Z",
+        "parentUuid": None,
+        "isSidechain": False,
+        "userType": "human",
+        "cwd": "/tmp",
+        "sessionId": "test_session",
+        "version": "1.0.0",
+        "uuid": "user_001",
+        "message": {
+            "role": "user",
+            "content": [{"type": "text", "text": "Hello there"}],
+        },
+    }
+    entry.update(overrides)
+    return entry
+
+
+class TestConstructTranscriptEntry:
+    """Test the model_construct based decoder."""
+
+    def test_user_entry_content_items(self):
+        entry = construct_transcript_entry(
+            _user_entry(
+                message={
+                    "role": "user",
+                    "content": [
+                        {"type": "text", "text": "Look at this"},
+                        {
+                            "type": "tool_result",
+                            "tool_use_id": "tool_1",
+                            "content": "done",
+                        },
+                        {
+                            "type": "image",
+                            "source": {
+                                "type": "base64",
+                                "media_type": "image/png",
+                                "data": "AAAA",
+                            },
+                        },
+                    ],
+                }
+            )
+        )
+
+        assert isinstance(entry, UserTranscriptEntry)
+        content = entry.message.content
+        assert isinstance(content, list)
+        assert isinstance(content[0], TextContent)
+        assert isinstance(content[1], ToolResultContent)
+        assert content[1].is_error is None
+        assert isinstance(content[2], ImageContent)
+        assert content[2].source.media_type == "image/png"
+        assert extract_text_content(content) == "Look at this"
+
+    def test_assistant_entry_usage(self):
+        entry = construct_transcript_entry(
+            {
+                **_user_entry(type="assistant", uuid="assistant_001"),
+                "requestId": "req_1",
+                "message": {
+                    "id": "msg_1",
+                    "type": "message",
+                    "role": "assistant",
+                    "model": "claude-3",
+                    "content": [
+                        {"type": "tool_use", "id": "t1", "name": "Bash", "input": {}}
+                    ],
+                    "usage": {"input_tokens": 5, "output_tokens": 7},
+                },
+            }
+        )
+
+        assert isinstance(entry, AssistantTranscriptEntry)
+        assert isinstance(entry.message.content[0], ToolUseContent)
+        assert entry.message.usage is not None
+        assert entry.message.usage.input_tokens == 5
+        assert entry.message.usage.cache_read_input_tokens is None
+        assert entry.message.stop_reason is None
+
+    def test_summary_entry(self):
+        entry = construct_transcript_entry(
+            {"type": "summary", "summary": "A summary", "leafUuid": "user_001"}
+        )
+        assert isinstance(entry, SummaryTranscriptEntry)
+        assert entry.cwd is None
+
+    def test_timestamp_is_parsed_at_load(self):
+        data = _user_entry()
+        fast = construct_transcript_entry(data)
+        validated = decode_transcript_entry(data, "basic")
+
+        assert fast.timestamp_ms == 1749681917436
+        assert validated.timestamp_ms == fast.timestamp_ms
+        # Not written to the cache, where it is recomputed on load
+        assert "timestamp_ms" not in fast.model_dump()
+
+    def test_unparseable_timestamp_has_no_epoch(self):
+        entry = construct_transcript_entry(_user_entry(timestamp="yesterday-ish"))
+        assert entry.timestamp_ms is None
+
+    def test_missing_required_field_is_rejected(self):
+        data = _user_entry()
+        del data["timestamp"]
+        with pytest.raises(ValueError, match="missing required fields: timestamp"):
+            construct_transcript_entry(data)
+
+    @pytest.mark.parametrize(
+        "field", ["parentUuid", "isSidechain", "userType", "cwd", "version"]
+    )
+    def test_missing_model_field_is_validated(self, field):
+        data = _user_entry()
+        del data[field]
+        with pytest.raises(ValueError, match=field):
+            decode_transcript_entry(data, "basic")
+        with pytest.raises(ValueError, match=field):
+            construct_transcript_entry(data)
+
+    def test_message_without_content_is_rejected(self):
+        with pytest.raises(ValueError, match="no message content"):
+            construct_transcript_entry(_user_entry(message={"role": "user"}))
+
+    def test_unknown_type_is_rejected(self):
+        with pytest.raises(ValueError, match="Unknown transcript entry type"):
+            construct_transcript_entry({"type": "mystery"})
+
+
+class TestLazyContent:
+    """Test that unvalidated content stays raw JSON until it is read."""
+
+    def _entry(self):
+        return construct_transcript_entry(
+            _user_entry(
+                message={
+                    "role": "user",
+                    "content": [
+                        {"type": "text", "text": "Hello"},
+                        {"type": "tool_result", "tool_use_id": "t1", "content": "ok"},
+                    ],
+                }
+            )
+        )
+
+    def test_content_is_built_on_first_read(self):
+        content = self._entry().message.content
+        assert isinstance(content, LazyContentList)
+        assert content.pending
+        assert len(content) == 2
+
+        assert isinstance(content[1], ToolResultContent)
+        assert not content.pending
+        assert [type(item) for item in content] == [TextContent, ToolResultContent]
+
+    def test_lazy_lists_compare_by_content(self):
+        first = self._entry()
+        second = self._entry()
+        assert first.message.content == second.message.content
+        assert first == second
+        assert first.message.content != self._entry().message.content[:1]
+
+    def test_serialisation_keeps_content_raw(self):
+        entry = self._entry()
+        dumped = entry.model_dump()
+        assert dumped["message"]["content"][0] == {"type": "text", "text": "Hello"}
+        assert entry.message.content.pending
+
+        restored = pickle.loads(pickle.dumps(entry))
+        assert restored.message.content.pending
+        assert extract_text_content(restored.message.content) == "Hello"
+
+        # Built models serialise the same fields
+        entry.message.content.materialise()
+        rebuilt = entry.model_dump()["message"]["content"]
+        assert rebuilt[0] == dumped["message"]["content"][0]
+        assert rebuilt[1]["tool_use_id"] == "t1"
+
+    def test_mcp_tool_use_result_is_lazy(self):
+        entry = construct_transcript_entry(
+            _user_entry(toolUseResult=[{"type": "text", "text": "result"}])
+        )
+        assert isinstance(entry, UserTranscriptEntry)
+        result = entry.toolUseResult
+        assert isinstance(result, LazyContentList) and result.pending
+        assert isinstance(result[0], TextContent)
+
+
+class TestLoadTranscriptDecoders:
+    """Compare the fast decoder with strict validation on real test data."""
+
+    @pytest.mark.parametrize(
+        "file_name",
+        [
+            "representative_messages.jsonl",
+            "edge_cases.jsonl",
+            "session_b.jsonl",
+            "sidechain.jsonl",
+            "todowrite_examples.jsonl",
+        ],
+    )
+    def test_fast_and_strict_render_identically(self, file_name):
+        jsonl_path = TEST_DATA_DIR / file_name
+
+        fast_entries = load_transcript(jsonl_path, silent=True)
+        strict_entries = load_transcript(jsonl_path, silent=True, validation="strict")
+
+        assert [e.type for e in fast_entries] == [e.type for e in strict_entries]
+        assert generate_html(fast_entries, "Test") == generate_html(
+            strict_entries, "Test"
+        )
+
+    def test_invalid_lines_are_reported_and_skipped(self, tmp_path, capsys):
+        jsonl_path = tmp_path / "broken.jsonl"
+        broken = _user_entry(uuid="user_002")
+        del broken["message"]
+        jsonl_path.write_bytes(
+            b"\n".join(
+                [
+                    json.dumps(_user_entry()).encode(),
+                    b"{not json",
+                    json.dumps(broken).encode(),
+                    # Invalid UTF-8 inside a string is replaced, not fatal
+                    json.dumps(_user_entry(uuid="user_003"))
+                    .replace("Hello there", "Caf\\u00e9")
+                    .encode()
+                    .replace(b"Caf\\u00e9", b"Caf\xe9"),
+                ]
+            )
+        )
+
+        entries = load_transcript(jsonl_path, silent=True)
+
+        assert [e.uuid for e in entries] == ["user_001", "user_003"]  # type: ignore[union-attr]
+        output = capsys.readouterr().out
+        assert "Line 1 of" in output and "JSON decode error" in output
+        assert "Line 2 of" in output and "missing required fields" in output
+
+
+def _assistant_entry(**message_overrides):
+    message = {
+        "id": "msg_1",
+        "type": "message",
+        "role": "assistant",
+        "model": "claude-3",
+        "content": [{"type": "text", "text": "Hi"}],
+        "stop_reason": "end_turn",
+        "stop_sequence": None,
+        "usage": {"input_tokens": 5, "output_tokens": 7},
+    }
+    message.update(message_overrides)
+    return {
+        **_user_entry(type="assistant", uuid="assistant_001"),
+        "requestId": "req_1",
+        "message": message,
+    }
+
+
+class TestValidationLevels:
+    """Test decode_transcript_entry and the failure counts it records."""
+
+    def test_none_level_accepts_wrong_field_types(self):
+        stats = ValidationStats(level="none")
+        entry = decode_transcript_entry(
+            _user_entry(isSidechain="not a bool"), "none", stats
+        )
+        assert entry.isSidechain == "not a bool"  # type: ignore[union-attr]
+        assert stats.entries_checked == 1
+        assert stats.failure_count == 0
+
+    def test_basic_level_rejects_wrong_field_types(self):
+        stats = ValidationStats(level="basic")
+        with pytest.raises(ValueError):
+            decode_transcript_entry(
+                _user_entry(isSidechain="not a bool"), "basic", stats
+            )
+        assert stats.failures["basic"] == 1
+
+    def test_basic_level_skips_anthropic_check(self):
+        stats = ValidationStats(level="basic")
+        entry = decode_transcript_entry(_assistant_entry(usage=None), "basic", stats)
+        assert isinstance(entry, AssistantTranscriptEntry)
+        assert stats.failures["strict"] == 0
+
+    def test_strict_level_counts_schema_drift_but_keeps_entry(self):
+        stats = ValidationStats(level="strict")
+        # Anthropic's Message requires usage, ours does not
+        entry = decode_transcript_entry(_assistant_entry(usage=None), "strict", stats)
+        assert isinstance(entry, AssistantTranscriptEntry)
+        decode_transcript_entry(_assistant_entry(), "strict", stats)
+
+        assert stats.entries_checked == 2
+        assert stats.failures == {"none": 0, "basic": 0, "strict": 1}
+        assert stats.format_report() == (
+            "Validation (strict): 2 entries checked, "
+            "failures by level - basic: 0, strict: 1"
+        )
+
+    def test_stats_are_collected_through_load_transcript(self, tmp_path):
+        jsonl_path = tmp_path / "session.jsonl"
+        jsonl_path.write_text(
+            "\n".join(
+                [
+                    json.dumps(_user_entry()),
+                    json.dumps(_user_entry(uuid="user_002", isSidechain="bad")),
+                    json.dumps(_assistant_entry(usage=None)),
+                ]
+            )
+        )
+
+        stats = ValidationStats(level="strict")
+        entries = load_transcript(
+            jsonl_path, silent=True, validation="strict", validation_stats=stats
+        )
+
+        assert len(entries) == 2
+        assert stats.entries_checked == 3
+        assert stats.failures["basic"] == 1
+        assert stats.failures["strict"] == 1
+
+    def test_merge(self):
+        first = ValidationStats(level="basic", entries_checked=3)
+        first.failures["basic"] = 1
+        second = ValidationStats(level="basic", entries_checked=2)
+        second.failures["basic"] = 2
+
+        first.merge(second)
+
+        assert first.entries_checked == 5
+        assert first.failures["basic"] == 3
@@ -12,7 +12,7 @@ from textual.css.query import NoMatches
 from textual.widgets import DataTable, Label
 
 from claude_code_log.cache import CacheManager, SessionCacheData
-from claude_code_log.tui import SessionBrowser, run_session_browser
+from claude_code_log.tui import SessionBrowser, _session_times_ms, run_session_browser
 
 
 @pytest.fixture
@@ -778,6 +778,25 @@ class TestSessionBrowser:
                 assert "Project:" in stats_text
                 assert "Sessions:" in stats_text
 
+    def test_session_times_use_cached_milliseconds(self):
+        """Test session times come from the cached epoch milliseconds."""
+        session_data = SessionCacheData(
+            session_id="session-1",
+            first_timestamp="2025-01-01T10:00:00Z",
+            last_timestamp="2025-01-01T11:00:00Z",
+            message_count=2,
+            first_user_message="Hello",
+            first_timestamp_ms=1,
+            last_timestamp_ms=2,
+        )
+        with patch("claude_code_log.tui.timestamp_to_ms") as parse:
+            assert _session_times_ms(session_data) == (1, 2)
+        parse.assert_not_called()
+
+        # Sessions cached without them are parsed
+        session_data.first_timestamp_ms = session_data.last_timestamp_ms = None
+        assert _session_times_ms(session_data) == (1735725600000, 1735729200000)
+
 
 @pytest.mark.tui
 class TestRunSessionBrowser: